@@ -0,0 +1,101 @@
+"""
+可等待的 OneBot 动作请求
+
+普通 API 通过 websocket 发送请求后立即返回，回应作为独立事件广播给所有模块，
+需要各模块按 echo 自行匹配。本模块为每个请求分配唯一 echo，登记等待中的 Future，
+收到对应回应后直接把 data 返回给调用方，回应不再广播给其他模块。
+
+使用示例：
+    members = await call_action(websocket, "get_group_member_list", {"group_id": 123})
+    if members is None:
+        # 请求失败或超时
+        ...
+"""
+
+import json
+import asyncio
+import itertools
+from logger import logger
+
+# 可等待请求的echo标记，echo格式为 "<action>-await_id=<序号>"，保持以动作名开头
+AWAIT_ECHO_MARKER = "await_id="
+
+# 默认等待回应的超时时间，单位：秒
+DEFAULT_TIMEOUT = 10
+
+# 等待中的请求，echo -> Future
+_pending_futures = {}
+
+# 请求序号，保证同一进程内echo唯一
+_echo_counter = itertools.count(1)
+
+
+async def call_action(
+    websocket, action, params=None, timeout=DEFAULT_TIMEOUT, full_response=False
+):
+    """
+    发送动作请求并等待对应回应
+
+    Args:
+        websocket: WebSocket连接对象
+        action (str): 动作名称，如 get_group_member_list
+        params (dict, optional): 动作参数
+        timeout (float, optional): 等待回应的超时时间，单位：秒
+        full_response (bool, optional): 返回完整回应（含 status、retcode），
+            用于 data 为空的动作（如踢人）判断是否成功
+
+    Returns:
+        回应中的 data 字段；请求失败、回应状态非ok或超时时返回None。
+        full_response 为True时返回完整回应，状态非ok时也返回，请求失败或超时时返回None
+    """
+    echo = f"{action}-{AWAIT_ECHO_MARKER}{next(_echo_counter)}"
+    future = asyncio.get_running_loop().create_future()
+    _pending_futures[echo] = future
+
+    try:
+        payload = {"action": action, "params": params or {}, "echo": echo}
+        await websocket.send(json.dumps(payload))
+        response = await asyncio.wait_for(future, timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"[API]等待 {action} 回应超时（{timeout}秒）")
+        return None
+    except Exception as e:
+        logger.error(f"[API]执行 {action} 失败: {e}")
+        return None
+    finally:
+        _pending_futures.pop(echo, None)
+
+    if full_response:
+        return response
+    if response.get("status") != "ok":
+        logger.warning(
+            f"[API]{action} 执行失败: retcode={response.get('retcode')}, "
+            f"message={response.get('message', '')}"
+        )
+        return None
+    return response.get("data")
+
+
+def resolve_action_response(msg):
+    """
+    将回应交给等待中的请求
+
+    Args:
+        msg (dict): websocket 收到的事件
+
+    Returns:
+        bool: 回应属于可等待请求时返回True（含已超时的迟到回应），此时不应再分发给模块
+    """
+    echo = msg.get("echo")
+    if not isinstance(echo, str) or AWAIT_ECHO_MARKER not in echo:
+        return False
+
+    future = _pending_futures.pop(echo, None)
+    if future is not None and not future.done():
+        future.set_result(msg)
+    return True
+
+
+def get_pending_count():
+    """获取等待回应中的请求数量"""
+    return len(_pending_futures)
@@ -1,5 +1,6 @@
 import json
 from logger import logger
+from .action import call_action
 
 
 async def set_group_todo(websocket, group_id, message_id):
@@ -478,6 +479,18 @@ async def get_group_info(websocket, group_id):
         return False
 
 
+async def query_group_info(websocket, group_id, timeout=10):
+    """
+    获取群信息并等待回应
+
+    Returns:
+        dict: 群信息，失败或超时返回None
+    """
+    return await call_action(
+        websocket, "get_group_info", {"group_id": group_id}, timeout=timeout
+    )
+
+
 async def get_group_info_ex(websocket, group_id):
     """
     获取群信息
@@ -644,6 +657,18 @@ async def get_group_list(websocket, no_cache):
         return False
 
 
+async def query_group_list(websocket, no_cache=False, timeout=10):
+    """
+    获取群列表并等待回应
+
+    Returns:
+        list: 群列表，失败或超时返回None
+    """
+    return await call_action(
+        websocket, "get_group_list", {"no_cache": no_cache}, timeout=timeout
+    )
+
+
 async def get_group_member_info(websocket, group_id, user_id, no_cache):
     """
     获取群成员信息
@@ -662,6 +687,23 @@ async def get_group_member_info(websocket, group_id, user_id, no_cache):
         return False
 
 
+async def query_group_member_info(
+    websocket, group_id, user_id, no_cache=False, timeout=10
+):
+    """
+    获取群成员信息并等待回应
+
+    Returns:
+        dict: 群成员信息，失败或超时返回None
+    """
+    return await call_action(
+        websocket,
+        "get_group_member_info",
+        {"group_id": group_id, "user_id": user_id, "no_cache": no_cache},
+        timeout=timeout,
+    )
+
+
 async def get_group_member_list(websocket, group_id, no_cache=False, note=""):
     """
     获取群成员列表
@@ -688,6 +730,26 @@ async def get_group_member_list(websocket, group_id, no_cache=False, note=""):
         return False
 
 
+async def query_group_member_list(websocket, group_id, no_cache=False, timeout=30):
+    """
+    获取群成员列表并等待回应，大群的回应较慢，默认超时时间更长
+
+    参数:
+        websocket: WebSocket连接
+        group_id (str): 群号,必需
+        no_cache (bool): 是否不使用缓存,可选
+        timeout (float): 等待回应的超时时间，单位：秒
+    返回:
+        list: 群成员列表，失败或超时返回None
+    """
+    return await call_action(
+        websocket,
+        "get_group_member_list",
+        {"group_id": group_id, "no_cache": no_cache},
+        timeout=timeout,
+    )
+
+
 async def get_group_honor_info(websocket, group_id):
     """
     获取群荣誉信息
@@ -1,5 +1,6 @@
 import json
 from logger import logger
+from .action import call_action
 
 
 # 使用cq码发送群消息
@@ -265,6 +266,23 @@ async def get_msg(websocket, message_id, note=""):
         logger.error(f"[API]执行获取消息详情失败: {e}")
 
 
+async def query_msg(websocket, message_id, timeout=10):
+    """
+    获取消息详情并等待回应
+
+    参数:
+        websocket: WebSocket连接对象
+        message_id: str 消息ID
+        timeout: float 等待回应的超时时间，单位：秒
+
+    返回:
+        dict: 消息详情，失败或超时返回None
+    """
+    return await call_action(
+        websocket, "get_msg", {"message_id": message_id}, timeout=timeout
+    )
+
+
 async def get_image(websocket, file_id):
     """
     获取图片消息详情
@@ -345,6 +363,38 @@ async def get_group_msg_history(websocket, group_id, count=20, message_seq=0, no
         logger.error(f"[API]执行获取群历史消息失败: {e}")
 
 
+async def query_group_msg_history(
+    websocket, group_id, count=20, message_seq=0, timeout=10
+):
+    """
+    获取群历史消息并等待回应
+
+    Args:
+        websocket: WebSocket连接对象
+        group_id: 群号
+        count: 获取消息数量，默认20
+        message_seq: 起始消息序号，默认为0
+        timeout: 等待回应的超时时间，单位：秒
+
+    Returns:
+        list: 消息列表（倒序），失败或超时返回None
+    """
+    data = await call_action(
+        websocket,
+        "get_group_msg_history",
+        {
+            "group_id": group_id,
+            "message_seq": message_seq,
+            "count": count,
+            "reverseOrder": True,  # 是否倒序
+        },
+        timeout=timeout,
+    )
+    if data is None:
+        return None
+    return data.get("messages", [])
+
+
 async def set_msg_emoji_like(websocket, message_id, emoji_id, set):
     """
     贴表情
@@ -439,6 +489,15 @@ async def get_forward_msg(websocket, message_id, note=""):
         logger.error(f"[API]执行获取合并转发消息失败: {e}")
 
 
+async def query_forward_msg(websocket, message_id, timeout=10):
+    """
+    获取合并转发消息并等待回应，失败或超时返回None
+    """
+    return await call_action(
+        websocket, "get_forward_msg", {"message_id": message_id}, timeout=timeout
+    )
+
+
 async def send_forward_msg(
     websocket,
     user_id=None,
@@ -1,5 +1,6 @@
 import json
 from logger import logger
+from .action import call_action
 
 
 async def set_qq_profile(websocket, nickname, personal_note, sex):
@@ -237,6 +238,15 @@ async def get_stranger_info(websocket, user_id):
         return False
 
 
+async def query_stranger_info(websocket, user_id, timeout=10):
+    """
+    获取账号信息并等待回应，失败或超时返回None
+    """
+    return await call_action(
+        websocket, "get_stranger_info", {"user_id": user_id}, timeout=timeout
+    )
+
+
 async def get_friend_list(websocket, no_cache=False):
     """
     获取好友列表
@@ -255,6 +265,15 @@ async def get_friend_list(websocket, no_cache=False):
         return False
 
 
+async def query_friend_list(websocket, no_cache=False, timeout=10):
+    """
+    获取好友列表并等待回应，失败或超时返回None
+    """
+    return await call_action(
+        websocket, "get_friend_list", {"no_cache": no_cache}, timeout=timeout
+    )
+
+
 async def get_like_list(websocket):
     """
     获取点赞列表
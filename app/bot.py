@@ -2,7 +2,6 @@ import websockets
 from config import WS_URL, TOKEN
 from logger import logger
 from handle_events import EventHandler
-import asyncio
 
 
 async def connect_to_bot():
@@ -22,6 +21,7 @@ async def connect_to_bot():
     try:
         # 连接到 WebSocket
         async with websockets.connect(connection_url) as websocket:
+            handler = None
             try:
                 # 将websocket实例化到logger
                 logger.websocket = websocket
@@ -29,15 +29,18 @@ async def connect_to_bot():
                 handler = EventHandler(websocket)  # 为每个连接创建一个独立实例
                 async for message in websocket:
                     try:
-                        # 异步处理消息，不阻塞当前循环
-                        # 使用create_task确保即使处理消息耗时，也不会阻塞后续消息接收
-                        asyncio.create_task(handler.handle_message(websocket, message))
+                        # 只做解析和入队，模块任务由事件队列的 worker 执行，
+                        # 不会阻塞后续消息接收，也不会无限制地创建任务
+                        await handler.handle_message(websocket, message)
                     except Exception as e:
                         logger.error(f"处理消息时出错: {e}")
                         logger.error(f"消息内容: {message}")
             except Exception as e:
                 logger.error(f"WebSocket连接出错: {e}")
                 raise
+            finally:
+                if handler is not None:
+                    await handler.close()
     except Exception as e:
         logger.error(f"WebSocket连接失败: {e}")
         return None
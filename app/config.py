@@ -21,4 +21,46 @@ FEISHU_BOT_URL = os.getenv("FEISHU_BOT_URL")
 # 飞书机器人Secret，选填，掉线时使用
 FEISHU_BOT_SECRET = os.getenv("FEISHU_BOT_SECRET")
 
+# 入站事件分发worker数量，即同时处理的模块任务上限，选填
+EVENT_WORKER_COUNT = int(os.getenv("EVENT_WORKER_COUNT", "32"))
+
+# 入站事件队列容量（待处理的模块任务数），超出后丢弃低优先级任务，选填
+EVENT_QUEUE_SIZE = int(os.getenv("EVENT_QUEUE_SIZE", "5000"))
+
+# 事件循环单次阻塞超过该毫秒数时记录告警，选填
+LOOP_LAG_WARN_MS = int(os.getenv("LOOP_LAG_WARN_MS", "200"))
+
+# CPU密集任务（图像识别等）进程池的工作进程数，实际不超过CPU核心数-1，选填
+PROCESS_POOL_WORKERS = int(os.getenv("PROCESS_POOL_WORKERS", "2"))
+
+# 出站HTTP请求的总连接数上限，选填
+HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "100"))
+
+# 出站HTTP请求对单个主机的连接数上限，选填
+HTTP_MAX_CONNECTIONS_PER_HOST = int(os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "20"))
+
+# 出站HTTP请求未指定超时时的默认超时秒数，选填
+HTTP_DEFAULT_TIMEOUT = float(os.getenv("HTTP_DEFAULT_TIMEOUT", "30"))
+
+# 按主机限制出站HTTP并发请求数，格式：host=并发数,host=并发数，选填
+HTTP_HOST_CONCURRENCY = os.getenv("HTTP_HOST_CONCURRENCY", "")
+
+# 群管操作（踢人、禁言）每秒执行的请求数，所有群共用，选填
+MODERATION_ACTIONS_PER_SECOND = float(os.getenv("MODERATION_ACTIONS_PER_SECOND", "2"))
+
+# 群管操作允许的突发请求数，选填
+MODERATION_ACTION_BURST = int(os.getenv("MODERATION_ACTION_BURST", "5"))
+
+# 批量踢人时单次请求踢出的人数上限，选填
+MODERATION_KICK_BATCH_SIZE = int(os.getenv("MODERATION_KICK_BATCH_SIZE", "20"))
+
+# 有近期发言的群整体核对成员列表的间隔秒数，期间由进退群通知增量更新，选填
+MEMBER_REFRESH_INTERVAL = int(os.getenv("MEMBER_REFRESH_INTERVAL", "1800"))
+
+# 无近期发言的群整体核对成员列表的间隔秒数，选填
+MEMBER_REFRESH_IDLE_INTERVAL = int(os.getenv("MEMBER_REFRESH_IDLE_INTERVAL", "7200"))
+
+# 每秒发起的成员列表刷新请求数，选填
+MEMBER_REFRESH_PER_SECOND = float(os.getenv("MEMBER_REFRESH_PER_SECOND", "0.5"))
+
 # ==================== 配置项结束 ====================
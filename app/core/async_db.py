@@ -0,0 +1,220 @@
+"""
+异步数据库执行器
+
+DataManager 的 sqlite3 调用都是同步的，直接在事件处理协程中执行时，
+一次较慢的落盘或大查询会阻塞整个 websocket 事件循环（包括心跳处理）。
+本模块为每个数据库提供专用线程：
+- 写操作在单个写线程上串行执行，写线程使用连接池为它单独创建的连接，不与事件循环线程共用
+- 读操作在读线程池上并发执行，每个读线程持有独立的只读连接（WAL 模式下读写互不阻塞）
+- run_manager() 在写线程上创建 DataManager 并调用其同步方法，DataManager 使用写线程的连接，
+  便于逐步迁移；run() 执行不使用数据库连接或自行在写线程上获取连接的函数
+
+使用示例：
+    db = get_async_db(db_path)
+    rows = await db.fetch("SELECT user_id FROM blacklist WHERE group_id = ?", (group_id,))
+    await db.execute("DELETE FROM blacklist WHERE user_id = ?", (user_id,))
+    related = await db.run_manager(lambda: DataManager(group_id), "get_related_users", user_id)
+"""
+
+import os
+import sqlite3
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from logger import logger
+from .db_pool import get_connection, CACHE_PRAGMAS, BUSY_TIMEOUT
+
+# 每个数据库的读线程数量
+READ_WORKERS = 2
+
+# 数据库路径 -> 异步执行器
+_databases = {}
+
+_lock = threading.Lock()
+
+
+class AsyncDatabase:
+    """
+    单个数据库的异步执行器
+
+    Args:
+        db_path (str): 数据库文件路径
+        read_workers (int, optional): 读线程数量
+    """
+
+    def __init__(self, db_path, read_workers=READ_WORKERS):
+        self.db_path = db_path
+        name = os.path.basename(db_path)
+        self._writer = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"db-write-{name}"
+        )
+        self._readers = ThreadPoolExecutor(
+            max_workers=read_workers, thread_name_prefix=f"db-read-{name}"
+        )
+        # 读线程各自的只读连接
+        self._local = threading.local()
+        self._read_connections = []
+
+    def _get_read_connection(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # 连接只在所属读线程上使用，关闭时由主线程统一关闭
+            conn = sqlite3.connect(
+                self.db_path, timeout=BUSY_TIMEOUT, check_same_thread=False
+            )
+            for pragma in CACHE_PRAGMAS + ("PRAGMA query_only=ON",):
+                conn.execute(pragma)
+            self._local.conn = conn
+            with _lock:
+                self._read_connections.append(conn)
+        return conn
+
+    def _fetch(self, query, params, fetch_one):
+        cursor = self._get_read_connection().cursor()
+        try:
+            cursor.execute(query, params)
+            return cursor.fetchone() if fetch_one else cursor.fetchall()
+        finally:
+            cursor.close()
+
+    def _execute(self, query, params, many):
+        # 在写线程上调用，连接池为写线程返回单独的连接
+        conn = get_connection(self.db_path)
+        cursor = conn.cursor()
+        try:
+            if many:
+                cursor.executemany(query, params)
+            else:
+                cursor.execute(query, params)
+            conn.commit()
+            return cursor.rowcount
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+
+    async def fetch(self, query, params=()):
+        """
+        在读线程上执行查询
+
+        Returns:
+            list: 查询结果，元组列表
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._readers, self._fetch, query, params, False
+        )
+
+    async def fetch_one(self, query, params=()):
+        """
+        在读线程上执行查询并返回第一行
+
+        Returns:
+            tuple: 第一行结果，没有结果时返回None
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._readers, self._fetch, query, params, True
+        )
+
+    async def execute(self, query, params=()):
+        """
+        在写线程上执行写操作并提交，失败时回滚并抛出异常
+
+        Returns:
+            int: 影响的行数
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._writer, self._execute, query, params, False
+        )
+
+    async def execute_many(self, query, params_list):
+        """
+        在写线程上批量执行写操作并提交，失败时回滚并抛出异常
+
+        Returns:
+            int: 影响的行数
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._writer, self._execute, query, list(params_list), True
+        )
+
+    async def run(self, func, *args):
+        """
+        在写线程上执行同步函数
+
+        函数需要访问数据库时应在函数内通过 get_connection 获取连接，不能使用在事件循环线程上
+        创建的 DataManager（其游标属于事件循环线程的连接），这种情况使用 run_manager。
+
+        Args:
+            func: 同步函数
+            *args: 调用参数
+
+        Returns:
+            函数的返回值
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._writer, func, *args)
+
+    async def run_manager(self, factory, method, *args):
+        """
+        在写线程上创建 DataManager 并调用其方法，用于把 DataManager 的现有方法移出事件循环
+
+        Args:
+            factory: 无参数调用时返回 DataManager 实例（支持 with 语句）
+            method (str): 方法名
+            *args: 调用参数
+
+        Returns:
+            方法的返回值
+        """
+        return await self.run(_call_manager, factory, method, args)
+
+    def close(self):
+        """停止线程并关闭读连接"""
+        self._writer.shutdown(wait=True)
+        self._readers.shutdown(wait=True)
+        with _lock:
+            for conn in self._read_connections:
+                try:
+                    conn.close()
+                except sqlite3.Error as e:
+                    logger.error(f"[DB]关闭只读连接失败 {self.db_path}: {e}")
+            self._read_connections.clear()
+
+
+def _call_manager(factory, method, args):
+    with factory() as manager:
+        return getattr(manager, method)(*args)
+
+
+def get_async_db(db_path):
+    """
+    获取数据库的异步执行器，不存在时创建
+
+    Args:
+        db_path (str): 数据库文件路径
+
+    Returns:
+        AsyncDatabase: 进程内共享的执行器
+    """
+    key = os.path.abspath(db_path)
+    database = _databases.get(key)
+    if database is None:
+        with _lock:
+            database = _databases.get(key)
+            if database is None:
+                database = _databases[key] = AsyncDatabase(key)
+    return database
+
+
+def close_all():
+    """关闭所有异步执行器（在程序退出时调用）"""
+    with _lock:
+        databases = list(_databases.values())
+        _databases.clear()
+    for database in databases:
+        database.close()
@@ -0,0 +1,145 @@
+"""
+SQLite 连接池基准测试
+
+以黑名单查询为例（每条群消息都会查询一次），在临时目录中建库并写入 --rows 条记录，对比单次查询耗时：
+- 每次新建连接：sqlite3.connect + 建表语句 + 查询 + 关闭连接（旧版 DataManager 的行为）
+- 连接池：db_pool.get_connection 取长连接 + run_schema_once + 游标查询 + 关闭游标
+两种方式对同一批随机 (群号, QQ号) 查询，结果应完全一致。
+
+黑名单表没有索引，记录数增大后全表扫描的耗时会盖过连接开销，默认按 100 条记录测试。
+
+用法（在 app 目录下执行）：
+    python -m core.benchmark_db_pool
+    python -m core.benchmark_db_pool --rows 1000 --iterations 5000
+"""
+
+import os
+import time
+import random
+import sqlite3
+import argparse
+import tempfile
+from core.db_pool import get_connection, run_schema_once, close_all
+
+CREATE_TABLE = """CREATE TABLE IF NOT EXISTS blacklist (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    group_id TEXT,
+    user_id TEXT,
+    created_at TEXT
+    )"""
+
+QUERY = "SELECT 1 FROM blacklist WHERE group_id=? AND user_id=?"
+
+
+def prepare_database(db_path, rows, groups, seed=0):
+    """
+    建表并写入随机黑名单记录
+
+    Returns:
+        list: 写入的 (群号, QQ号) 列表
+    """
+    rng = random.Random(seed)
+    records = [
+        (str(100000 + rng.randrange(groups)), str(10000000 + rng.randrange(10**7)))
+        for _ in range(rows)
+    ]
+    conn = sqlite3.connect(db_path)
+    conn.execute(CREATE_TABLE)
+    conn.executemany(
+        "INSERT INTO blacklist (group_id, user_id, created_at) VALUES (?, ?, '')",
+        records,
+    )
+    conn.commit()
+    conn.close()
+    return records
+
+
+def generate_lookups(records, groups, iterations, seed=1):
+    """生成查询列表，约十分之一命中黑名单，其余为随机用户"""
+    rng = random.Random(seed)
+    lookups = []
+    for _ in range(iterations):
+        if rng.random() < 0.1:
+            lookups.append(rng.choice(records))
+        else:
+            lookups.append(
+                (
+                    str(100000 + rng.randrange(groups)),
+                    str(10000000 + rng.randrange(10**7)),
+                )
+            )
+    return lookups
+
+
+def legacy_lookup(db_path, group_id, user_id):
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute(CREATE_TABLE)
+    conn.commit()
+    cursor.execute(QUERY, (group_id, user_id))
+    found = cursor.fetchone() is not None
+    conn.close()
+    return found
+
+
+def _create_table(conn):
+    conn.execute(CREATE_TABLE)
+    conn.commit()
+
+
+def pooled_lookup(db_path, group_id, user_id):
+    conn = get_connection(db_path)
+    cursor = conn.cursor()
+    run_schema_once(db_path, lambda: _create_table(conn), "benchmark")
+    cursor.execute(QUERY, (group_id, user_id))
+    found = cursor.fetchone() is not None
+    cursor.close()
+    return found
+
+
+def run(name, lookup, db_path, lookups):
+    durations = []
+    results = []
+    for group_id, user_id in lookups:
+        start = time.perf_counter()
+        results.append(lookup(db_path, group_id, user_id))
+        durations.append(time.perf_counter() - start)
+    durations.sort()
+    total = sum(durations)
+    p50 = durations[len(durations) // 2]
+    p99 = durations[min(len(durations) - 1, int(len(durations) * 0.99))]
+    print(
+        f"{name}: {len(lookups)} 次查询, 耗时 {total:.3f}s "
+        f"(平均 {total / len(lookups) * 1e6:.1f}us, "
+        f"p50 {p50 * 1e6:.1f}us, p99 {p99 * 1e6:.1f}us), "
+        f"命中 {sum(results)} 次"
+    )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite 连接池基准测试")
+    parser.add_argument("--rows", type=int, default=100, help="黑名单记录数")
+    parser.add_argument("--groups", type=int, default=200, help="模拟群数")
+    parser.add_argument("--iterations", type=int, default=2000, help="查询次数")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = os.path.join(temp_dir, "blacklist.db")
+        records = prepare_database(db_path, args.rows, args.groups)
+        lookups = generate_lookups(records, args.groups, args.iterations)
+        print(f"黑名单 {args.rows} 条记录，{args.groups} 个群")
+        try:
+            # 各预热一次，排除首次打开文件的耗时
+            legacy_lookup(db_path, *lookups[0])
+            pooled_lookup(db_path, *lookups[0])
+            legacy = run("每次新建连接", legacy_lookup, db_path, lookups)
+            pooled = run("连接池", pooled_lookup, db_path, lookups)
+        finally:
+            close_all()
+        mismatches = sum(a != b for a, b in zip(legacy, pooled))
+        print(f"结果不一致: {mismatches} 次")
+
+
+if __name__ == "__main__":
+    main()
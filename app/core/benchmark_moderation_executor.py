@@ -0,0 +1,213 @@
+"""
+群管操作执行器基准测试
+
+用假的 OneBot 连接（收到请求后按固定延迟回应，记录每个群的成员）模拟多个群的批量踢人，对比：
+- 逐个踢出：每个成员单独发送 set_group_kick，之间固定 sleep，不等待回应（旧行为）
+- 执行器：moderation_executor.ModerationExecutor（按群合并批量请求、令牌桶限速、等待回应）
+统计总耗时、请求数和实际被踢出的人数。
+
+假连接模拟上游风控：1 秒内的群管请求超过 --risk-limit 个时，后续请求返回失败。
+加上 --no-batch 时假连接不支持 set_group_kick_members，用于验证执行器回退为逐个踢出。
+加上 --lost-replies 时假连接按比例执行踢人请求但不回应，用于验证执行器在超时后通过成员列表确认结果，
+而不是重复发送请求。
+
+用法（在 app 目录下执行）：
+    python -m core.benchmark_moderation_executor
+    python -m core.benchmark_moderation_executor --groups 5 --members 40 --interval 0.5
+    python -m core.benchmark_moderation_executor --no-batch --rate 4 --burst 8
+    python -m core.benchmark_moderation_executor --lost-replies 0.3
+"""
+
+import json
+import time
+import random
+import asyncio
+import argparse
+from collections import deque
+from api.action import resolve_action_response
+from api.group import set_group_kick
+from core.moderation_executor import ModerationExecutor
+
+
+class FakeOneBotConnection:
+    """
+    假的 OneBot WebSocket 连接
+
+    Args:
+        members (dict): 群号 -> 成员QQ号集合，踢出成功时从中移除
+        latency (float): 回应延迟，单位：秒
+        risk_limit (int): 1 秒内允许的群管请求数，超过时返回失败
+        batch_supported (bool): 是否支持 set_group_kick_members
+        lost_replies (float): 踢人请求执行后不回应的比例
+    """
+
+    def __init__(
+        self, members, latency, risk_limit, batch_supported=True, lost_replies=0.0
+    ):
+        self.members = members
+        self.latency = latency
+        self.risk_limit = risk_limit
+        self.batch_supported = batch_supported
+        self.lost_replies = lost_replies
+        self.random = random.Random(0)
+        self.requests = 0
+        self.rejected = 0
+        self.lost = 0
+        self._recent = deque()
+        self._tasks = set()
+
+    async def send(self, data):
+        payload = json.loads(data)
+        self.requests += 1
+        response = self._execute(payload["action"], payload["params"])
+        if (
+            payload["action"].startswith("set_group_kick")
+            and response["status"] == "ok"
+            and self.random.random() < self.lost_replies
+        ):
+            self.lost += 1
+            return
+        response["echo"] = payload["echo"]
+        task = asyncio.create_task(self._respond(response))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def _execute(self, action, params):
+        if action == "get_group_member_list":
+            members = self.members[str(params["group_id"])]
+            data = [{"user_id": int(user_id), "role": "member"} for user_id in members]
+            return {"status": "ok", "retcode": 0, "data": data}
+        if action == "set_group_kick_members" and not self.batch_supported:
+            return {"status": "failed", "retcode": 1404, "data": None}
+
+        now = time.monotonic()
+        while self._recent and self._recent[0] < now - 1:
+            self._recent.popleft()
+        if len(self._recent) >= self.risk_limit:
+            self.rejected += 1
+            return {"status": "failed", "retcode": 1200, "data": None}
+        self._recent.append(now)
+
+        group_members = self.members[str(params["group_id"])]
+        if action == "set_group_kick_members":
+            user_ids = [str(user_id) for user_id in params["user_id"]]
+        else:
+            user_ids = [str(params["user_id"])]
+        if not all(user_id in group_members for user_id in user_ids):
+            return {"status": "failed", "retcode": 1200, "data": None}
+        group_members.difference_update(user_ids)
+        return {"status": "ok", "retcode": 0, "data": None}
+
+    async def _respond(self, response):
+        await asyncio.sleep(self.latency)
+        # 逐个踢出的请求不是可等待请求，回应直接丢弃
+        resolve_action_response(response)
+
+
+def _build_members(groups, members):
+    return {
+        str(100000 + g): {str(10000000 + g * 1000 + m) for m in range(members)}
+        for g in range(groups)
+    }
+
+
+async def run_legacy(members, args):
+    connection = FakeOneBotConnection(members, args.latency, args.risk_limit)
+    start = time.perf_counter()
+    for group_id, user_ids in members.items():
+        for user_id in sorted(user_ids):
+            await set_group_kick(connection, group_id, user_id)
+            await asyncio.sleep(args.interval)
+    elapsed = time.perf_counter() - start
+    await asyncio.sleep(args.latency * 2)
+    return elapsed, connection
+
+
+async def run_executor(members, args):
+    connection = FakeOneBotConnection(
+        members,
+        args.latency,
+        args.risk_limit,
+        batch_supported=not args.no_batch,
+        lost_replies=args.lost_replies,
+    )
+    executor = ModerationExecutor(
+        args.rate, args.burst, args.batch_size, action_timeout=args.timeout
+    )
+    start = time.perf_counter()
+    # 各群的扫描同时进行，共用执行器的令牌桶
+    reports = await asyncio.gather(
+        *(
+            executor.kick_members(connection, group_id, sorted(user_ids))
+            for group_id, user_ids in members.items()
+        )
+    )
+    elapsed = time.perf_counter() - start
+    confirmed = sum(len(report["succeeded"]) for report in reports)
+    return elapsed, connection, confirmed
+
+
+def _print(name, elapsed, connection, total, confirmed=None):
+    remaining = sum(len(user_ids) for user_ids in connection.members.values())
+    line = (
+        f"{name}: 耗时 {elapsed:.2f}s, 请求 {connection.requests} 次, "
+        f"风控拒绝 {connection.rejected} 次, 实际踢出 {total - remaining}/{total} 人"
+    )
+    if connection.lost:
+        line += f", 丢失回应 {connection.lost} 次"
+    if confirmed is not None:
+        line += f", 确认成功 {confirmed} 人"
+    print(line)
+
+
+async def main_async(args):
+    total = args.groups * args.members
+    print(
+        f"模拟 {args.groups} 个群，每群踢出 {args.members} 人，回应延迟 {args.latency}s，"
+        f"风控阈值 {args.risk_limit} 次/秒"
+    )
+    elapsed, connection = await run_legacy(
+        _build_members(args.groups, args.members), args
+    )
+    _print(f"逐个踢出（间隔{args.interval}s）", elapsed, connection, total)
+    elapsed, connection, confirmed = await run_executor(
+        _build_members(args.groups, args.members), args
+    )
+    _print(
+        f"执行器（{args.rate}次/秒，突发{args.burst}，每批{args.batch_size}人"
+        f"{'，不支持批量' if args.no_batch else ''}）",
+        elapsed,
+        connection,
+        total,
+        confirmed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="群管操作执行器基准测试")
+    parser.add_argument("--groups", type=int, default=3, help="模拟群数")
+    parser.add_argument("--members", type=int, default=30, help="每个群要踢出的人数")
+    parser.add_argument("--latency", type=float, default=0.05, help="回应延迟（秒）")
+    parser.add_argument(
+        "--risk-limit", type=int, default=10, help="假连接每秒允许的群管请求数"
+    )
+    parser.add_argument(
+        "--interval", type=float, default=0.5, help="逐个踢出时的间隔（秒）"
+    )
+    parser.add_argument("--rate", type=float, default=2, help="执行器每秒请求数")
+    parser.add_argument("--burst", type=int, default=5, help="执行器突发请求数")
+    parser.add_argument("--batch-size", type=int, default=20, help="每批踢出人数")
+    parser.add_argument(
+        "--no-batch", action="store_true", help="假连接不支持批量踢人"
+    )
+    parser.add_argument(
+        "--lost-replies", type=float, default=0.0, help="踢人请求执行后不回应的比例"
+    )
+    parser.add_argument(
+        "--timeout", type=float, default=1.0, help="执行器等待回应的超时时间（秒）"
+    )
+    asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
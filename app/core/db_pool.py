@@ -0,0 +1,152 @@
+"""
+SQLite 连接池
+
+各模块的 DataManager 原先每次实例化都新建连接、执行一遍建表语句，退出时关闭连接，
+一条消息经过多个模块就要反复建立/销毁连接。本模块按数据库路径维护进程内长连接：
+- 每个线程使用各自的连接（事件循环线程、数据库写线程等），一个线程的提交或回滚不会影响
+  另一个线程未完成的事务
+- 连接启用 WAL 模式和调优后的 pragma，读写互不阻塞
+- 建表/迁移函数每个进程只执行一次
+- DataManager 只需从长连接上创建游标，退出时关闭游标即可
+
+使用示例：
+    self.conn = get_connection(db_path)
+    self.cursor = self.conn.cursor()
+    run_schema_once(db_path, self._create_table)
+"""
+
+import os
+import sqlite3
+import threading
+from urllib.request import pathname2url
+from logger import logger
+
+# 可写连接的日志参数
+WRITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    # WAL 模式下 NORMAL 已能保证数据库不损坏，只在断电时可能丢失最后的事务
+    "PRAGMA synchronous=NORMAL",
+)
+
+# 所有连接通用的缓存参数
+CACHE_PRAGMAS = (
+    # 内存映射读取 64MB
+    "PRAGMA mmap_size=67108864",
+    # 页缓存 8MB，负数表示单位为 KB
+    "PRAGMA cache_size=-8000",
+    "PRAGMA temp_store=MEMORY",
+)
+
+# 数据库被锁时的等待时间，单位：秒
+BUSY_TIMEOUT = 5
+
+# (数据库路径, 线程ID) -> 长连接
+_connections = {}
+
+# 已执行过的建表函数，(数据库路径, 函数名, 附加标识)
+_initialized_schemas = set()
+
+_lock = threading.RLock()
+
+
+def _normalize_path(db_path):
+    return os.path.abspath(db_path)
+
+
+def get_connection(db_path, read_only=False):
+    """
+    获取当前线程对该数据库的长连接，不存在时创建
+
+    Args:
+        db_path (str): 数据库文件路径
+        read_only (bool, optional): 以只读方式打开，用于随模块分发的数据文件，不切换 WAL
+
+    Returns:
+        sqlite3.Connection: 当前线程内共享的连接，调用方不应关闭，也不应交给其他线程使用
+    """
+    path = _normalize_path(db_path)
+    key = (path, threading.get_ident())
+    conn = _connections.get(key)
+    if conn is not None:
+        return conn
+
+    with _lock:
+        conn = _connections.get(key)
+        if conn is None:
+            # 只读数据文件不存在时按原行为创建空库，由调用方在查询时报错
+            if read_only and os.path.exists(path):
+                conn = sqlite3.connect(
+                    f"file:{pathname2url(path)}?mode=ro",
+                    uri=True,
+                    timeout=BUSY_TIMEOUT,
+                    check_same_thread=False,
+                )
+                pragmas = CACHE_PRAGMAS
+            else:
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                # 允许在程序退出时由主线程关闭
+                conn = sqlite3.connect(
+                    path, timeout=BUSY_TIMEOUT, check_same_thread=False
+                )
+                pragmas = WRITE_PRAGMAS + CACHE_PRAGMAS
+            for pragma in pragmas:
+                try:
+                    conn.execute(pragma)
+                except sqlite3.Error as e:
+                    logger.warning(f"[DB]数据库 {db_path} 设置 {pragma} 失败: {e}")
+            _connections[key] = conn
+            logger.info(f"[DB]已创建数据库长连接: {db_path}")
+        return conn
+
+
+def run_schema_once(db_path, create_func, schema_key=None):
+    """
+    每个进程对同一数据库只执行一次建表/迁移函数
+
+    Args:
+        db_path (str): 数据库文件路径
+        create_func: 建表函数，无参数调用；抛出异常时不标记为已执行，下次重试
+        schema_key (str, optional): 同一建表函数按群/表区分时的附加标识
+
+    Returns:
+        bool: 本次是否执行了建表函数
+    """
+    key = (
+        _normalize_path(db_path),
+        getattr(create_func, "__qualname__", repr(create_func)),
+        schema_key,
+    )
+    if key in _initialized_schemas:
+        return False
+
+    with _lock:
+        if key in _initialized_schemas:
+            return False
+        create_func()
+        _initialized_schemas.add(key)
+        return True
+
+
+def close_all():
+    """关闭所有长连接（在程序退出时调用）"""
+    with _lock:
+        for (db_path, _), conn in _connections.items():
+            try:
+                conn.close()
+            except sqlite3.Error as e:
+                logger.error(f"[DB]关闭数据库连接失败 {db_path}: {e}")
+        _connections.clear()
+        _initialized_schemas.clear()
+
+
+def get_pool_stats():
+    """
+    获取连接池状态
+
+    Returns:
+        dict: 长连接数量、已初始化的表结构数量
+    """
+    return {
+        "connections": len(_connections),
+        "schemas": len(_initialized_schemas),
+    }
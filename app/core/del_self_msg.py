@@ -12,6 +12,9 @@ import time
 
 DEL_MSG_DB_PATH = os.path.join("data", "Core", "del_msg.json")
 
+# 订阅的事件类型，del_msg标记可能出现在任意回应的echo中
+EVENT_KINDS = ["meta_event.lifecycle", "response"]
+
 
 def load_del_msg_data():
     """
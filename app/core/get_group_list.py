@@ -2,13 +2,12 @@ from logger import logger
 from config import OWNER_ID
 from api.group import get_group_list
 from api.message import send_private_msg
-import os
-import json
 import time
 from . import switchs
+from .group_directory import group_directory
 
-DATA_DIR = os.path.join("data", "Core", "get_group_list.json")
-MEMBER_DATA_DIR = os.path.join("data", "Core", "group_member_list")
+# 订阅的事件类型，借助元事件定时刷新，群名变更和进退群通知触发刷新
+EVENT_KINDS = ["meta_event", "notice", "response:get_group_list"]
 
 # 全局变量，记录上次请求时间
 last_request_time = 0
@@ -17,13 +16,9 @@ REQUEST_INTERVAL = 300  # 5分钟，单位：秒
 
 def save_group_list_to_file(item):
     """
-    保存群列表信息到文件，确保文件夹存在
+    更新内存中的群列表，并在后台保存快照文件
     """
-    dir_path = os.path.dirname(DATA_DIR)
-    if not os.path.exists(dir_path):
-        os.makedirs(dir_path, exist_ok=True)
-    with open(DATA_DIR, "w", encoding="utf-8") as f:
-        json.dump(item, f, ensure_ascii=False, indent=2)
+    group_directory.update_groups(item)
 
 
 def get_group_name_by_id(group_id):
@@ -37,22 +32,9 @@ def get_group_name_by_id(group_id):
         str: 群名称，如果找不到则返回None
     """
     try:
-        # 确保群号是字符串格式
-        group_id = str(group_id)
-
-        # 检查文件是否存在
-        if not os.path.exists(DATA_DIR):
-            logger.warning(f"[Core]群列表文件不存在: {DATA_DIR}")
-            return None
-
-        # 读取群列表文件
-        with open(DATA_DIR, "r", encoding="utf-8") as f:
-            group_list = json.load(f)
-
-        # 查找匹配的群号
-        for group in group_list:
-            if str(group.get("group_id")) == group_id:
-                return group.get("group_name")
+        group = group_directory.get_group(group_id)
+        if group is not None:
+            return group.get("group_name")
 
         logger.warning(f"[Core]未找到群号 {group_id} 对应的群名")
         return None
@@ -70,20 +52,11 @@ def get_all_group_ids():
         list: 群号列表，如果获取失败则返回空列表
     """
     try:
-        # 检查文件是否存在
-        if not os.path.exists(DATA_DIR):
-            logger.warning(f"[Core]群列表文件不存在: {DATA_DIR}")
+        group_ids = group_directory.get_group_ids()
+        if not group_ids:
+            logger.warning("[Core]群列表为空")
             return []
 
-        # 读取群列表文件
-        with open(DATA_DIR, "r", encoding="utf-8") as f:
-            group_list = json.load(f)
-
-        # 提取所有群号
-        group_ids = [
-            str(group.get("group_id")) for group in group_list if group.get("group_id")
-        ]
-
         logger.info(f"[Core]获取到 {len(group_ids)} 个群号, 群号列表: {group_ids}")
         return group_ids
 
@@ -109,30 +82,17 @@ def get_group_member_info_by_id(group_id):
               如果找不到则返回None
     """
     try:
-        # 确保群号是字符串格式
-        group_id = str(group_id)
-
-        # 检查文件是否存在
-        if not os.path.exists(DATA_DIR):
-            logger.warning(f"[Core]群列表文件不存在: {DATA_DIR}")
-            return None
-
-        # 读取群列表文件
-        with open(DATA_DIR, "r", encoding="utf-8") as f:
-            group_list = json.load(f)
-
-        # 查找匹配的群号
-        for group in group_list:
-            if str(group.get("group_id")) == group_id:
-                member_info = {
-                    "member_count": group.get("member_count", 0),
-                    "max_member_count": group.get("max_member_count", 0),
-                    "group_name": group.get("group_name", ""),
-                }
-                logger.info(
-                    f"[Core]获取群 {group_id} 成员信息: 当前人数 {member_info['member_count']}, 最大人数 {member_info['max_member_count']}, 群名 {member_info['group_name']}"
-                )
-                return member_info
+        group = group_directory.get_group(group_id)
+        if group is not None:
+            member_info = {
+                "member_count": group.get("member_count", 0),
+                "max_member_count": group.get("max_member_count", 0),
+                "group_name": group.get("group_name", ""),
+            }
+            logger.info(
+                f"[Core]获取群 {group_id} 成员信息: 当前人数 {member_info['member_count']}, 最大人数 {member_info['max_member_count']}, 群名 {member_info['group_name']}"
+            )
+            return member_info
 
         logger.warning(f"[Core]未找到群号 {group_id} 对应的成员信息")
         return None
@@ -144,13 +104,13 @@ def get_group_member_info_by_id(group_id):
 
 def clean_old_group_member_data():
     """
-    清理不在当前群列表中的群成员数据文件
+    清理不在当前群列表中的群成员数据
 
-    检查 group_member_list 目录中的所有文件，如果对应的群号不在当前群列表中，
-    则删除该群的成员数据文件（说明机器人已经不在该群了）
+    检查已保存成员列表的群，如果对应的群号不在当前群列表中，
+    则删除该群的成员数据（说明机器人已经不在该群了）
 
     Returns:
-        tuple: (cleaned_count, error_count) 清理的文件数量和出错的文件数量
+        tuple: (cleaned_count, error_count) 清理的群数量和出错的群数量
     """
     try:
         # 获取当前所有群号
@@ -159,61 +119,33 @@ def clean_old_group_member_data():
             logger.warning("[Core]当前群列表为空，跳过清理群成员数据")
             return 0, 0
 
-        # 检查群成员数据目录是否存在
-        if not os.path.exists(MEMBER_DATA_DIR):
-            logger.info("[Core]群成员数据目录不存在，无需清理")
-            return 0, 0
-
-        # 获取所有群成员数据文件
-        member_data_files = []
-        try:
-            member_data_files = [
-                f for f in os.listdir(MEMBER_DATA_DIR) if f.endswith(".json")
-            ]
-        except Exception as e:
-            logger.error(f"[Core]读取群成员数据目录失败: {e}")
-            return 0, 1
-
-        if not member_data_files:
-            logger.info("[Core]群成员数据目录为空，无需清理")
-            return 0, 0
-
-        # 提取群号（去掉.json后缀）
-        stored_group_ids = [f.replace(".json", "") for f in member_data_files]
-
         # 找出不在当前群列表中的群号
-        groups_to_clean = []
-        for stored_group_id in stored_group_ids:
-            if stored_group_id not in current_group_ids:
-                groups_to_clean.append(stored_group_id)
+        current_group_ids = set(current_group_ids)
+        groups_to_clean = [
+            group_id
+            for group_id in group_directory.get_member_group_ids()
+            if group_id not in current_group_ids
+        ]
 
         if not groups_to_clean:
             logger.info("[Core]所有群成员数据都对应当前群列表，无需清理")
             return 0, 0
 
-        # 删除不在群列表中的群成员数据文件
+        # 删除不在群列表中的群成员数据
         cleaned_count = 0
         error_count = 0
 
         for group_id in groups_to_clean:
             try:
-                file_path = os.path.join(MEMBER_DATA_DIR, f"{group_id}.json")
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-                    cleaned_count += 1
-                    logger.info(f"[Core]已清理群 {group_id} 的成员数据文件")
-                else:
-                    logger.warning(
-                        f"[Core]群 {group_id} 的成员数据文件不存在: {file_path}"
-                    )
+                group_directory.remove_members(group_id)
+                cleaned_count += 1
+                logger.info(f"[Core]已清理群 {group_id} 的成员数据")
             except Exception as e:
                 error_count += 1
-                logger.error(f"[Core]清理群 {group_id} 的成员数据文件失败: {e}")
+                logger.error(f"[Core]清理群 {group_id} 的成员数据失败: {e}")
 
         if cleaned_count > 0:
-            logger.info(
-                f"[Core]群成员数据清理完成，清理了 {cleaned_count} 个群的数据文件"
-            )
+            logger.info(f"[Core]群成员数据清理完成，清理了 {cleaned_count} 个群的数据")
         if error_count > 0:
             logger.error(f"[Core]群成员数据清理过程中出现 {error_count} 个错误")
 
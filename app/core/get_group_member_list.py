@@ -1,40 +1,188 @@
 import asyncio
 import re
+from collections import OrderedDict
 from logger import logger
 from config import OWNER_ID
-from api.group import get_group_member_list
+from api.group import query_group_member_list
 from api.message import send_private_msg
-import os
-import json
 import time
-from .get_group_list import get_all_group_ids
+from .group_directory import group_directory
+from .member_refresh_scheduler import MemberRefreshScheduler
 
-DATA_DIR = os.path.join("data", "Core", "group_member_list")
+# 订阅的事件类型，借助元事件启动刷新调度，群消息标记活跃，进退群、管理员变动、群名片通知增量更新群目录
+EVENT_KINDS = [
+    "meta_event",
+    "message.group",
+    "notice.group_increase",
+    "notice.group_decrease",
+    "notice.group_admin",
+    "notice.group_card",
+    "response:get_group_member_list",
+]
 
-# 全局变量，记录上次请求时间
-last_request_time = 0
-REQUEST_INTERVAL = 300  # 5分钟，单位：秒
+# 主动获取群成员列表时等待回应的超时时间，单位：秒
+FETCH_TIMEOUT = 30
+
+# 缓存完整成员信息（含发言时间、群名片等）的群数量上限，成员QQ号和身份始终保存在群目录中
+MEMBER_LIST_CACHE_SIZE = 20
+
+# 正在获取成员列表的群，群号 -> Task，同一群的并发请求共用一次获取
+_inflight_fetches = {}
+
+# 最近获取的完整成员列表，群号 -> (获取时间戳, 成员列表)
+_member_list_cache = OrderedDict()
 
 
 def save_group_member_list_to_file(group_id, data):
     """
-    保存群成员列表信息到文件，确保文件夹存在
+    更新内存中的群成员列表，并在后台保存成员变化
+    """
+    group_directory.update_members(group_id, data)
+
+
+async def _fetch_member_list(websocket, group_id):
+    data = await query_group_member_list(
+        websocket, group_id, no_cache=True, timeout=FETCH_TIMEOUT
+    )
+    if data is None:
+        return None
+    if data:
+        group_directory.update_members(group_id, data)
+        _member_list_cache[group_id] = (time.time(), data)
+        _member_list_cache.move_to_end(group_id)
+        while len(_member_list_cache) > MEMBER_LIST_CACHE_SIZE:
+            _member_list_cache.popitem(last=False)
+        logger.info(f"[Core]已获取群 {group_id} 的成员列表，共 {len(data)} 个成员")
+    else:
+        logger.warning(
+            f"[Core]群 {group_id} 的成员列表为空，跳过保存，可能是机器人非管理员"
+        )
+    return data
+
+
+async def _await_fetch(websocket, group_id, timeout):
+    """发起或加入同一群正在进行的获取，等待结果"""
+    task = _inflight_fetches.get(group_id)
+    if task is None:
+        task = asyncio.create_task(
+            _fetch_member_list(websocket, group_id),
+            name=f"fetch-group-member-list-{group_id}",
+        )
+        _inflight_fetches[group_id] = task
+        task.add_done_callback(lambda _: _inflight_fetches.pop(group_id, None))
+    try:
+        # 单个调用方超时不取消共用的获取
+        return await asyncio.wait_for(asyncio.shield(task), timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"[Core]等待群 {group_id} 的成员列表超时（{timeout}秒）")
+        return None
+    except Exception as e:
+        logger.error(f"[Core]获取群 {group_id} 的成员列表失败: {e}")
+        return None
+
+
+async def fetch_group_member_list(
+    websocket, group_id, max_age=0, timeout=FETCH_TIMEOUT
+):
+    """
+    获取群的完整成员列表，缓存不超过 max_age 秒时直接返回缓存
+
+    同一群同时只发送一个请求，并发的调用方等待同一个回应。
+
+    Args:
+        websocket: WebSocket连接对象
+        group_id (str或int): 群号
+        max_age (float): 可接受的缓存时长，单位：秒，0表示总是重新获取
+        timeout (float): 等待回应的超时时间，单位：秒
+
+    Returns:
+        list: 群成员信息列表，获取失败或超时返回None
+    """
+    group_id = str(group_id)
+    cached = _member_list_cache.get(group_id)
+    if cached is not None and time.time() - cached[0] <= max_age:
+        return cached[1]
+    return await _await_fetch(websocket, group_id, timeout)
+
+
+async def fetch_group_member_user_ids(
+    websocket, group_id, max_age=0, timeout=FETCH_TIMEOUT
+):
+    """
+    获取群成员QQ号列表，群目录中的成员列表不超过 max_age 秒时直接返回，否则等待重新获取
+
+    Args:
+        websocket: WebSocket连接对象
+        group_id (str或int): 群号
+        max_age (float): 可接受的成员列表时长，单位：秒，0表示总是重新获取
+        timeout (float): 等待回应的超时时间，单位：秒
+
+    Returns:
+        list: QQ号列表（str），获取失败或超时返回None
+    """
+    group_id = str(group_id)
+    age = group_directory.get_members_age(group_id)
+    if age is None or age > max_age:
+        if await _await_fetch(websocket, group_id, timeout) is None:
+            return None
+    return group_directory.get_member_ids(group_id)
+
+
+# 全局群成员列表刷新调度器
+member_refresh_scheduler = MemberRefreshScheduler(fetch_group_member_user_ids)
+
+
+def apply_member_notice(msg):
     """
-    # 文件路径
-    file_path = os.path.join(DATA_DIR, f"{group_id}.json")
-    # 确保文件夹存在
-    os.makedirs(DATA_DIR, exist_ok=True)
-    # 保存数据
-    with open(file_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+    把进退群、管理员变动、群名片通知增量应用到群目录
 
+    通知与群目录不一致（进群的人已在群内、退群的人不在群内等）或该群正在整体获取成员列表时，
+    请求刷新调度器重新获取该群成员列表。
 
-def get_group_member_user_ids(group_id):
+    Args:
+        msg (dict): 通知事件
+    """
+    notice_type = msg.get("notice_type")
+    group_id = str(msg.get("group_id", ""))
+    user_id = str(msg.get("user_id", ""))
+    if not group_id or not user_id:
+        return
+
+    is_self = user_id == str(msg.get("self_id", ""))
+    if notice_type == "group_increase":
+        if is_self:
+            # 机器人加入新群，尽快获取成员列表
+            member_refresh_scheduler.request_refresh(group_id, 0)
+            return
+        applied = group_directory.add_member(group_id, user_id)
+    elif notice_type == "group_decrease":
+        if is_self or msg.get("sub_type") == "kick_me":
+            group_directory.remove_members(group_id)
+            return
+        applied = group_directory.remove_member(group_id, user_id)
+    elif notice_type == "group_admin":
+        role = "admin" if msg.get("sub_type") == "set" else "member"
+        applied = group_directory.set_member_role(group_id, user_id, role)
+    elif notice_type == "group_card":
+        # 群目录不保存群名片，改名片的人不在群目录中说明漏掉了进群通知
+        applied = group_directory.is_member(group_id, user_id)
+    else:
+        return
+
+    if not group_directory.has_members(group_id):
+        return
+    if not applied or group_id in _inflight_fetches:
+        # 正在获取的成员列表可能不包含这次变化
+        member_refresh_scheduler.request_refresh(group_id)
+
+
+def get_group_member_user_ids(group_id, exclude_admins=False):
     """
     根据群号获取群成员QQ号列表
 
     Args:
         group_id (str或int): 群号
+        exclude_admins (bool): 是否排除群主和管理员
 
     Returns:
         list: QQ号列表，如果找不到则返回空列表，QQ号是str类型
@@ -43,24 +191,13 @@ def get_group_member_user_ids(group_id):
         # 确保群号是字符串格式
         group_id = str(group_id)
 
-        # 构建文件路径
-        file_path = os.path.join(DATA_DIR, f"{group_id}.json")
-
-        # 检查文件是否存在
-        if not os.path.exists(file_path):
-            logger.warning(f"[Core]群成员列表文件不存在: {file_path}")
+        if not group_directory.has_members(group_id):
+            logger.warning(f"[Core]群 {group_id} 的成员列表尚未获取")
             return []
 
-        # 读取群成员列表文件
-        with open(file_path, "r", encoding="utf-8") as f:
-            member_list = json.load(f)
-
-        # 提取所有成员的QQ号
-        user_ids = []
-        for member in member_list:
-            user_id = member.get("user_id")
-            if user_id:
-                user_ids.append(str(user_id))
+        user_ids = group_directory.get_member_ids(
+            group_id, roles=("member",) if exclude_admins else None
+        )
 
         logger.info(
             f"[Core]成功获取群 {group_id} 的成员QQ号列表，共 {len(user_ids)} 个成员"
@@ -86,27 +223,11 @@ def get_group_name_by_id(group_id):
         # 确保群号是字符串格式
         group_id = str(group_id)
 
-        # 构建文件路径
-        file_path = os.path.join(DATA_DIR, f"{group_id}.json")
-
-        # 检查文件是否存在
-        if not os.path.exists(file_path):
-            logger.warning(f"[Core]群成员列表文件不存在: {file_path}")
-            return None
+        # 成员列表中没有群名信息，已获取成员列表的群从群列表中获取群名
+        if group_directory.has_members(group_id):
+            from .get_group_list import get_group_name_by_id as get_name_from_list
 
-        # 读取群成员列表文件
-        with open(file_path, "r", encoding="utf-8") as f:
-            member_list = json.load(f)
-
-        # 从第一个成员中获取群号，验证是否匹配
-        if member_list and len(member_list) > 0:
-            stored_group_id = str(member_list[0].get("group_id", ""))
-            if stored_group_id == group_id:
-                # 这里需要从群列表中获取群名，而不是从成员列表
-                # 成员列表中没有群名信息，需要调用群列表相关函数
-                from .get_group_list import get_group_name_by_id as get_name_from_list
-
-                return get_name_from_list(group_id)
+            return get_name_from_list(group_id)
 
         logger.warning(f"[Core]未找到群号 {group_id} 对应的群成员信息")
         return None
@@ -150,27 +271,18 @@ async def handle_events(websocket, msg):
         "echo": null                  # 回显字段，用于请求和响应的匹配
     }
     """
-    global last_request_time
     try:
-        current_time = int(time.time())
-        # 检查距离上次请求是否已超过指定时间
-        if current_time - last_request_time >= REQUEST_INTERVAL:
-            last_request_time = current_time
-            # 延迟2秒让群列表更新
-            await asyncio.sleep(2)
-            group_ids = get_all_group_ids()
-            for group_id in group_ids:
-                await get_group_member_list(websocket, group_id)
-
-        # 群通知事件
-        # 如果有进群退群的通知（系统触发，不受请求间隔限制）
-        if (
-            msg.get("notice_type") == "group_increase"
-            or msg.get("notice_type") == "group_decrease"
-        ):
-            group_id = str(msg.get("group_id"))
-            # 发送获取该群的群成员列表的请求
-            await get_group_member_list(websocket, group_id)
+        member_refresh_scheduler.start(websocket)
+
+        # 群消息只用于标记群活跃，活跃的群刷新更频繁
+        if msg.get("post_type") == "message":
+            member_refresh_scheduler.note_activity(msg.get("group_id"))
+            return
+
+        # 进退群、管理员变动通知，增量更新群目录
+        if msg.get("post_type") == "notice":
+            apply_member_notice(msg)
+            return
 
         # 回应消息事件
         if msg.get("status") == "ok":
@@ -216,24 +328,14 @@ def get_user_role_in_group(group_id, user_id):
         group_id = str(group_id)
         user_id = str(user_id)
 
-        # 构建文件路径
-        file_path = os.path.join(DATA_DIR, f"{group_id}.json")
-
-        # 检查文件是否存在
-        if not os.path.exists(file_path):
-            logger.warning(f"[Core]群成员列表文件不存在: {file_path}")
+        if not group_directory.has_members(group_id):
+            logger.warning(f"[Core]群 {group_id} 的成员列表尚未获取")
             return None
 
-        # 读取群成员列表文件
-        with open(file_path, "r", encoding="utf-8") as f:
-            member_list = json.load(f)
-
-        # 查找指定用户
-        for member in member_list:
-            if str(member.get("user_id")) == user_id:
-                role = member.get("role", "member")
-                logger.info(f"[Core]用户 {user_id} 在群 {group_id} 中的身份为: {role}")
-                return role
+        role = group_directory.get_member_role(group_id, user_id)
+        if role is not None:
+            logger.info(f"[Core]用户 {user_id} 在群 {group_id} 中的身份为: {role}")
+            return role
 
         # 用户不在群内
         logger.warning(f"[Core]用户 {user_id} 不在群 {group_id} 中")
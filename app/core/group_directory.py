@@ -0,0 +1,470 @@
+"""
+群和群成员目录
+
+群列表和群成员列表原本保存在 JSON 文件中，每次查询都要读取并解析整个文件再逐条查找。
+本模块把它们保存在内存索引中：
+- 群号 -> 群信息（群名、人数、最大人数等）
+- 群号 -> {QQ号: 群身份}
+- QQ号 -> 所在群号集合（只包含已获取成员列表的群）
+
+索引在定时刷新的 get_group_list / get_group_member_list 回应到达时整体替换，并记录每个群成员列表的
+更新时间，调用方可据此判断是否需要重新获取；两次刷新之间由进退群、管理员变动通知增量更新（add_member /
+remove_member / set_member_role）。首次查询时从上次保存的快照加载，重启后无需等待刷新即可使用。
+
+快照在单独的写线程中按顺序写入，不阻塞事件循环：
+- 群列表较小，写入临时文件后替换 JSON 文件，进程中断也不会留下不完整的文件
+- 群成员只保存QQ号和群身份，存放在 SQLite 中（MEMBER_DB_PATH），每次更新只写入与上次相比
+  新增、退出和身份变化的成员；旧版按群保存的 JSON 文件在首次加载时导入后删除
+
+使用示例：
+    from core.group_directory import is_member, groups_of
+    if is_member(group_id, user_id): ...
+    for group_id in groups_of(user_id): ...
+"""
+
+import os
+import json
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from logger import logger
+from .db_pool import get_connection, run_schema_once
+
+# 快照文件
+GROUP_LIST_FILE = os.path.join("data", "Core", "get_group_list.json")
+MEMBER_DB_PATH = os.path.join("data", "Core", "group_members.db")
+# 旧版群成员快照目录，每个群一个 JSON 文件
+MEMBER_LIST_DIR = os.path.join("data", "Core", "group_member_list")
+
+# 快照写线程，保证同一快照的多次写入按提交顺序完成
+_writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="group-directory")
+
+
+def _write_json_atomic(path, data):
+    """写入临时文件后替换目标文件"""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp_path, path)
+    except Exception as e:
+        logger.error(f"[Core]保存快照 {path} 失败: {e}")
+
+
+def _read_json(path):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        logger.error(f"[Core]读取快照 {path} 失败: {e}")
+        return None
+
+
+def _create_member_tables():
+    conn = get_connection(MEMBER_DB_PATH)
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS group_members (
+        group_id TEXT,
+        user_id TEXT,
+        role TEXT,
+        PRIMARY KEY (group_id, user_id)
+        ) WITHOUT ROWID"""
+    )
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS member_lists (
+        group_id TEXT PRIMARY KEY,
+        updated_at REAL  -- 成员列表更新时间戳
+        )"""
+    )
+    conn.commit()
+
+
+def _get_member_db():
+    conn = get_connection(MEMBER_DB_PATH)
+    run_schema_once(MEMBER_DB_PATH, _create_member_tables)
+    return conn
+
+
+def _write_member_delta(group_id, upserts, deletes, updated_at):
+    """写入一个群的成员变化，updated_at 为None时删除整个群"""
+    try:
+        conn = _get_member_db()
+        with conn:
+            if updated_at is None:
+                conn.execute("DELETE FROM group_members WHERE group_id = ?", (group_id,))
+                conn.execute("DELETE FROM member_lists WHERE group_id = ?", (group_id,))
+                return
+            if deletes:
+                conn.executemany(
+                    "DELETE FROM group_members WHERE group_id = ? AND user_id = ?",
+                    [(group_id, user_id) for user_id in deletes],
+                )
+            if upserts:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO group_members (group_id, user_id, role) "
+                    "VALUES (?, ?, ?)",
+                    [(group_id, user_id, role) for user_id, role in upserts],
+                )
+            conn.execute(
+                "INSERT OR REPLACE INTO member_lists (group_id, updated_at) VALUES (?, ?)",
+                (group_id, updated_at),
+            )
+    except Exception as e:
+        logger.error(f"[Core]保存群 {group_id} 的成员快照失败: {e}")
+
+
+class GroupDirectory:
+    """群和群成员的内存索引"""
+
+    def __init__(self):
+        # 群号 -> 群信息
+        self._groups = {}
+        # 群号 -> {QQ号: 群身份}
+        self._members = {}
+        # QQ号 -> 所在群号集合
+        self._user_groups = {}
+        # 群号 -> 成员列表更新时间戳（整体获取的时间）
+        self._members_updated_at = {}
+        # 群号 -> 成员最近变化时间戳（整体获取或增量更新）
+        self._members_changed_at = {}
+        # 群列表更新时间戳
+        self.groups_updated_at = 0.0
+        self._loaded = False
+        self._load_lock = threading.Lock()
+
+    def _ensure_loaded(self):
+        if self._loaded:
+            return
+        with self._load_lock:
+            if self._loaded:
+                return
+            if os.path.exists(GROUP_LIST_FILE):
+                group_list = _read_json(GROUP_LIST_FILE)
+                if group_list:
+                    self._set_groups(group_list)
+            self._load_members()
+            self._import_legacy_member_lists()
+            self._loaded = True
+            logger.info(
+                f"[Core]已从快照加载 {len(self._groups)} 个群、"
+                f"{len(self._members)} 个群的成员列表"
+            )
+
+    def _load_members(self):
+        try:
+            conn = _get_member_db()
+            members = {}
+            for group_id, user_id, role in conn.execute(
+                "SELECT group_id, user_id, role FROM group_members"
+            ):
+                members.setdefault(group_id, {})[user_id] = role
+            for group_id, updated_at in conn.execute(
+                "SELECT group_id, updated_at FROM member_lists"
+            ):
+                self._members_updated_at[group_id] = updated_at
+            for group_id, group_members in members.items():
+                self._members[group_id] = group_members
+                for user_id in group_members:
+                    self._user_groups.setdefault(user_id, set()).add(group_id)
+        except Exception as e:
+            logger.error(f"[Core]加载群成员快照失败: {e}")
+
+    def _import_legacy_member_lists(self):
+        """导入旧版按群保存的 JSON 快照，导入后删除文件"""
+        if not os.path.isdir(MEMBER_LIST_DIR):
+            return
+        imported = 0
+        for file_name in os.listdir(MEMBER_LIST_DIR):
+            if not file_name.endswith(".json"):
+                continue
+            path = os.path.join(MEMBER_LIST_DIR, file_name)
+            group_id = file_name[: -len(".json")]
+            if group_id not in self._members:
+                member_list = _read_json(path)
+                if not member_list:
+                    continue
+                updated_at = os.path.getmtime(path)
+                upserts, deletes = self._set_members(group_id, member_list)
+                self._members_updated_at[group_id] = updated_at
+                _write_member_delta(group_id, upserts, deletes, updated_at)
+                imported += 1
+            try:
+                os.remove(path)
+            except OSError as e:
+                logger.error(f"[Core]删除旧版成员快照 {path} 失败: {e}")
+        try:
+            os.rmdir(MEMBER_LIST_DIR)
+        except OSError:
+            pass
+        if imported:
+            logger.info(f"[Core]已将 {imported} 个群的旧版成员快照导入数据库")
+
+    def _set_groups(self, group_list):
+        self._groups = {
+            str(group["group_id"]): group
+            for group in group_list
+            if group.get("group_id")
+        }
+
+    def _set_members(self, group_id, member_list):
+        """
+        替换群成员
+
+        Returns:
+            tuple: (新增或身份变化的 [(QQ号, 群身份)], 退出的 [QQ号])
+        """
+        members = {
+            str(member["user_id"]): member.get("role", "member")
+            for member in member_list
+            if member.get("user_id")
+        }
+        old_members = self._members.get(group_id, {})
+        deletes = list(old_members.keys() - members.keys())
+        for user_id in deletes:
+            self._discard_user_group(user_id, group_id)
+        upserts = []
+        for user_id, role in members.items():
+            old_role = old_members.get(user_id)
+            if old_role is None:
+                self._user_groups.setdefault(user_id, set()).add(group_id)
+            if old_role != role:
+                upserts.append((user_id, role))
+        self._members[group_id] = members
+        return upserts, deletes
+
+    def _discard_user_group(self, user_id, group_id):
+        groups = self._user_groups.get(user_id)
+        if groups is not None:
+            groups.discard(group_id)
+            if not groups:
+                del self._user_groups[user_id]
+
+    # ------------------------------------------------------------------
+    # 更新
+    # ------------------------------------------------------------------
+
+    def update_groups(self, group_list, persist=True):
+        """
+        用 get_group_list 的回应数据替换群列表
+
+        Args:
+            group_list (list): 群信息列表
+            persist (bool): 是否保存快照
+        """
+        self._ensure_loaded()
+        self._set_groups(group_list)
+        self.groups_updated_at = time.time()
+        if persist:
+            self._persist(_write_json_atomic, GROUP_LIST_FILE, group_list)
+
+    def update_members(self, group_id, member_list, persist=True):
+        """
+        用 get_group_member_list 的回应数据替换群成员列表
+
+        Args:
+            group_id (str或int): 群号
+            member_list (list): 群成员信息列表
+            persist (bool): 是否保存快照
+
+        Returns:
+            tuple: (新增或身份变化的 [(QQ号, 群身份)], 退出的 [QQ号])
+        """
+        self._ensure_loaded()
+        group_id = str(group_id)
+        upserts, deletes = self._set_members(group_id, member_list)
+        updated_at = self._members_updated_at[group_id] = time.time()
+        self._members_changed_at[group_id] = updated_at
+        if persist:
+            self._persist(_write_member_delta, group_id, upserts, deletes, updated_at)
+        return upserts, deletes
+
+    def add_member(self, group_id, user_id, role="member"):
+        """
+        增量添加群成员（进群通知），未获取过该群成员列表时不处理
+
+        Returns:
+            bool: 是否添加成功，已在群内或未获取成员列表时返回False
+        """
+        self._ensure_loaded()
+        group_id, user_id = str(group_id), str(user_id)
+        members = self._members.get(group_id)
+        if members is None or user_id in members:
+            return False
+        members[user_id] = role
+        self._user_groups.setdefault(user_id, set()).add(group_id)
+        self._persist_change(group_id, [(user_id, role)], [])
+        return True
+
+    def remove_member(self, group_id, user_id):
+        """
+        增量移除群成员（退群、被踢通知）
+
+        Returns:
+            bool: 是否移除成功，不在群内或未获取成员列表时返回False
+        """
+        self._ensure_loaded()
+        group_id, user_id = str(group_id), str(user_id)
+        members = self._members.get(group_id)
+        if members is None or members.pop(user_id, None) is None:
+            return False
+        self._discard_user_group(user_id, group_id)
+        self._persist_change(group_id, [], [user_id])
+        return True
+
+    def set_member_role(self, group_id, user_id, role):
+        """
+        增量更新群成员身份（管理员变动通知）
+
+        Returns:
+            bool: 是否更新成功，不在群内或未获取成员列表时返回False
+        """
+        self._ensure_loaded()
+        group_id, user_id = str(group_id), str(user_id)
+        members = self._members.get(group_id)
+        if members is None or user_id not in members:
+            return False
+        if members[user_id] != role:
+            members[user_id] = role
+            self._persist_change(group_id, [(user_id, role)], [])
+        return True
+
+    def _persist_change(self, group_id, upserts, deletes):
+        self._members_changed_at[group_id] = time.time()
+        self._persist(
+            _write_member_delta,
+            group_id,
+            upserts,
+            deletes,
+            self._members_updated_at.get(group_id, 0.0),
+        )
+
+    def remove_members(self, group_id, persist=True):
+        """移除群成员列表（机器人已不在该群）"""
+        self._ensure_loaded()
+        group_id = str(group_id)
+        self._members_updated_at.pop(group_id, None)
+        self._members_changed_at.pop(group_id, None)
+        for user_id in self._members.pop(group_id, {}):
+            self._discard_user_group(user_id, group_id)
+        if persist:
+            self._persist(_write_member_delta, group_id, None, None, None)
+
+    def _persist(self, func, *args):
+        try:
+            asyncio.get_running_loop().run_in_executor(_writer, func, *args)
+        except RuntimeError:
+            func(*args)
+
+    # ------------------------------------------------------------------
+    # 查询
+    # ------------------------------------------------------------------
+
+    def get_group(self, group_id):
+        """获取群信息，找不到时返回None"""
+        self._ensure_loaded()
+        return self._groups.get(str(group_id))
+
+    def get_group_ids(self):
+        """获取所有群号"""
+        self._ensure_loaded()
+        return list(self._groups)
+
+    def get_member_group_ids(self):
+        """获取已保存成员列表的群号"""
+        self._ensure_loaded()
+        return list(self._members)
+
+    def has_members(self, group_id):
+        """是否已获取该群的成员列表"""
+        self._ensure_loaded()
+        return str(group_id) in self._members
+
+    def get_members_age(self, group_id):
+        """获取群成员列表距上次更新的秒数，未获取成员列表时返回None"""
+        self._ensure_loaded()
+        updated_at = self._members_updated_at.get(str(group_id))
+        if updated_at is None:
+            return None
+        return max(0.0, time.time() - updated_at)
+
+    def get_members_changed_at(self, group_id):
+        """获取群成员最近变化的时间戳（整体获取或增量更新），未获取成员列表时返回None"""
+        self._ensure_loaded()
+        return self._members_changed_at.get(
+            str(group_id), self._members_updated_at.get(str(group_id))
+        )
+
+    def get_member_count(self, group_id):
+        """获取群成员数量，未获取成员列表时返回None"""
+        self._ensure_loaded()
+        members = self._members.get(str(group_id))
+        return None if members is None else len(members)
+
+    def get_member_ids(self, group_id, roles=None):
+        """
+        获取群成员QQ号列表，未获取成员列表时返回空列表
+
+        Args:
+            group_id (str或int): 群号
+            roles (tuple, optional): 只返回这些群身份的成员，如 ("member",)
+        """
+        self._ensure_loaded()
+        members = self._members.get(str(group_id), {})
+        if roles is None:
+            return list(members)
+        return [user_id for user_id, role in members.items() if role in roles]
+
+    def get_member_role(self, group_id, user_id):
+        """获取用户的群身份（owner/admin/member），不在群内时返回None"""
+        self._ensure_loaded()
+        return self._members.get(str(group_id), {}).get(str(user_id))
+
+    def is_member(self, group_id, user_id):
+        """用户是否在群内"""
+        self._ensure_loaded()
+        return str(user_id) in self._members.get(str(group_id), ())
+
+    def groups_of(self, user_id):
+        """获取用户所在的群号集合（只包含已获取成员列表的群）"""
+        self._ensure_loaded()
+        return set(self._user_groups.get(str(user_id), ()))
+
+    def get_stats(self):
+        """
+        获取目录统计信息
+
+        Returns:
+            dict: 群数量、已获取成员列表的群数量、成员记录数、不同用户数
+        """
+        self._ensure_loaded()
+        return {
+            "groups": len(self._groups),
+            "member_groups": len(self._members),
+            "members": sum(len(members) for members in self._members.values()),
+            "users": len(self._user_groups),
+        }
+
+
+# 全局群目录
+group_directory = GroupDirectory()
+
+update_groups = group_directory.update_groups
+update_members = group_directory.update_members
+add_member = group_directory.add_member
+remove_member = group_directory.remove_member
+set_member_role = group_directory.set_member_role
+remove_members = group_directory.remove_members
+get_group = group_directory.get_group
+get_group_ids = group_directory.get_group_ids
+get_member_group_ids = group_directory.get_member_group_ids
+has_members = group_directory.has_members
+get_members_age = group_directory.get_members_age
+get_members_changed_at = group_directory.get_members_changed_at
+get_member_count = group_directory.get_member_count
+get_member_ids = group_directory.get_member_ids
+get_member_role = group_directory.get_member_role
+is_member = group_directory.is_member
+groups_of = group_directory.groups_of
+get_stats = group_directory.get_stats
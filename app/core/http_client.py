@@ -0,0 +1,254 @@
+"""
+出站 HTTP 客户端
+
+各模块调用外部接口（大模型、电费查询、空教室查询、图片/视频下载等）时原本每次请求都新建
+aiohttp.ClientSession，每次请求都要重新建立 TCP/TLS 连接。这里提供进程共享的客户端：
+- 所有请求共用一个 ClientSession，连接按主机复用（keep-alive），DNS 解析结果缓存
+- 总连接数和单主机连接数受 HTTP_MAX_CONNECTIONS / HTTP_MAX_CONNECTIONS_PER_HOST 限制
+- 可按主机设置并发上限和默认超时：HTTP_HOST_CONCURRENCY 配置项，或代码中调用 configure_host
+- 按主机统计请求数、失败数和耗时，见 get_stats
+- 可将主机重定向到其他地址（set_host_override），测试时可指向本地桩服务
+
+使用示例：
+    async with http_post(url, headers=headers, json=payload, timeout=10) as response:
+        result = await response.json()
+"""
+
+import time
+import asyncio
+import contextlib
+import aiohttp
+from yarl import URL
+from logger import logger
+from config import (
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_CONNECTIONS_PER_HOST,
+    HTTP_DEFAULT_TIMEOUT,
+    HTTP_HOST_CONCURRENCY,
+)
+
+# DNS 解析结果缓存时长，单位：秒
+DNS_CACHE_TTL = 300
+
+# 空闲连接保持时长，单位：秒
+KEEPALIVE_TIMEOUT = 30
+
+
+class HostStats:
+    """单个主机的请求统计"""
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.last_error = None
+
+    def record(self, elapsed, error=None):
+        self.requests += 1
+        self.total_time += elapsed
+        self.max_time = max(self.max_time, elapsed)
+        if error is not None:
+            self.errors += 1
+            self.last_error = error
+
+    def to_dict(self):
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "avg_ms": self.total_time / self.requests * 1000 if self.requests else 0.0,
+            "max_ms": self.max_time * 1000,
+            "last_error": self.last_error,
+        }
+
+
+def _parse_host_concurrency(value):
+    """解析 "host=并发数,host=并发数" 格式的配置"""
+    limits = {}
+    for item in value.split(","):
+        host, _, limit = item.strip().partition("=")
+        if not host or not limit:
+            continue
+        try:
+            limits[host.strip()] = int(limit)
+        except ValueError:
+            logger.warning(f"[HTTP]忽略无效的并发配置: {item}")
+    return limits
+
+
+class HttpClient:
+    """进程共享的 HTTP 客户端，会话在首次请求时于当前事件循环中创建"""
+
+    def __init__(self):
+        self._session = None
+        self._loop = None
+        # 主机 -> {"max_concurrency": int, "timeout": float}
+        self._host_settings = {}
+        # 主机 -> asyncio.Semaphore，随会话一起重建
+        self._semaphores = {}
+        # 主机 -> 替换后的基础地址
+        self._overrides = {}
+        # 主机 -> HostStats
+        self._stats = {}
+
+        for host, limit in _parse_host_concurrency(HTTP_HOST_CONCURRENCY).items():
+            self.configure_host(host, max_concurrency=limit)
+
+    def configure_host(self, host, max_concurrency=None, timeout=None):
+        """
+        设置主机的并发上限和默认超时
+
+        Args:
+            host (str): 主机名
+            max_concurrency (int, optional): 同时进行的请求数上限，为None时不限制（仍受连接数限制）
+            timeout (float, optional): 默认超时时间，单位：秒，请求未指定超时时使用
+        """
+        settings = self._host_settings.setdefault(host, {})
+        if max_concurrency is not None:
+            settings["max_concurrency"] = max_concurrency
+            self._semaphores.pop(host, None)
+        if timeout is not None:
+            settings["timeout"] = timeout
+
+    def set_host_override(self, host, base_url):
+        """
+        将发往某主机的请求改发到其他地址（保留路径和参数），base_url 为None时取消
+
+        Args:
+            host (str): 原主机名
+            base_url (str): 替换地址，如 http://127.0.0.1:8080
+        """
+        if base_url is None:
+            self._overrides.pop(host, None)
+        else:
+            self._overrides[host] = URL(base_url)
+
+    def _get_session(self):
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            connector = aiohttp.TCPConnector(
+                limit=HTTP_MAX_CONNECTIONS,
+                limit_per_host=HTTP_MAX_CONNECTIONS_PER_HOST,
+                ttl_dns_cache=DNS_CACHE_TTL,
+                keepalive_timeout=KEEPALIVE_TIMEOUT,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=HTTP_DEFAULT_TIMEOUT),
+            )
+            self._loop = loop
+            self._semaphores = {}
+        return self._session
+
+    def _get_semaphore(self, host):
+        max_concurrency = self._host_settings.get(host, {}).get("max_concurrency")
+        if not max_concurrency:
+            return None
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = self._semaphores[host] = asyncio.Semaphore(max_concurrency)
+        return semaphore
+
+    def _resolve_url(self, url):
+        url = URL(url)
+        override = self._overrides.get(url.host)
+        if override is not None:
+            url = url.with_scheme(override.scheme).with_host(override.host)
+            url = url.with_port(override.port)
+        return url
+
+    @contextlib.asynccontextmanager
+    async def request(self, method, url, timeout=None, **kwargs):
+        """
+        发送请求，用法与 aiohttp.ClientSession.request 相同
+
+        Args:
+            method (str): 请求方法
+            url (str): 请求地址
+            timeout (float | aiohttp.ClientTimeout, optional): 超时时间，单位：秒，
+                为None时使用主机默认超时，再没有则使用 HTTP_DEFAULT_TIMEOUT
+            **kwargs: 传给 aiohttp 的其他参数（headers、json、data、params、ssl 等）
+
+        Yields:
+            aiohttp.ClientResponse: 响应对象，离开上下文后连接归还连接池
+        """
+        host = URL(url).host
+        if timeout is None:
+            timeout = self._host_settings.get(host, {}).get("timeout")
+        if isinstance(timeout, (int, float)):
+            timeout = aiohttp.ClientTimeout(total=timeout)
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+
+        session = self._get_session()
+        semaphore = self._get_semaphore(host)
+        stats = self._stats.setdefault(host, HostStats())
+        async with semaphore or contextlib.nullcontext():
+            start = time.monotonic()
+            error = None
+            try:
+                async with session.request(
+                    method, self._resolve_url(url), **kwargs
+                ) as response:
+                    if response.status >= 400:
+                        error = f"HTTP {response.status}"
+                    yield response
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                error = f"{type(e).__name__}: {e}"
+                raise
+            finally:
+                stats.record(time.monotonic() - start, error)
+
+    def get_stats(self):
+        """
+        获取按主机统计的请求指标
+
+        Returns:
+            dict: 主机 -> 请求数、失败数、平均/最大耗时（毫秒）、最近一次错误
+        """
+        return {host: stats.to_dict() for host, stats in self._stats.items()}
+
+    async def close(self):
+        """关闭会话及其连接"""
+        session, self._session = self._session, None
+        if session is not None and not session.closed:
+            await session.close()
+
+
+# 全局 HTTP 客户端
+http_client = HttpClient()
+
+
+def http_request(method, url, **kwargs):
+    """发送请求，见 HttpClient.request"""
+    return http_client.request(method, url, **kwargs)
+
+
+def http_get(url, **kwargs):
+    """发送 GET 请求，见 HttpClient.request"""
+    return http_client.request("GET", url, **kwargs)
+
+
+def http_post(url, **kwargs):
+    """发送 POST 请求，见 HttpClient.request"""
+    return http_client.request("POST", url, **kwargs)
+
+
+def configure_host(host, max_concurrency=None, timeout=None):
+    """设置主机的并发上限和默认超时，见 HttpClient.configure_host"""
+    http_client.configure_host(host, max_concurrency, timeout)
+
+
+def set_host_override(host, base_url):
+    """将发往某主机的请求改发到其他地址，见 HttpClient.set_host_override"""
+    http_client.set_host_override(host, base_url)
+
+
+def get_stats():
+    """获取按主机统计的请求指标"""
+    return http_client.get_stats()
+
+
+async def close_all():
+    """关闭共享会话（在程序退出前于事件循环中调用）"""
+    await http_client.close()
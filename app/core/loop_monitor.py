@@ -0,0 +1,83 @@
+"""
+事件循环阻塞监控
+
+周期性地睡眠固定间隔，比较实际唤醒时间与预期时间的差值，差值即事件循环被同步代码
+（数据库、图像处理等）阻塞的时长。超过阈值时记录告警并统计次数。
+"""
+
+import time
+import asyncio
+from logger import logger
+
+# 检测间隔，单位：秒，阻塞时长需覆盖一次唤醒时刻才能被检测到
+CHECK_INTERVAL = 0.1
+
+# 阻塞告警日志的最小间隔，单位：秒，避免持续阻塞时刷屏
+WARN_LOG_INTERVAL = 60
+
+
+class LoopLagMonitor:
+    """
+    事件循环阻塞监控
+
+    Args:
+        warn_threshold_ms (int): 单次阻塞超过该值（毫秒）时记为一次阻塞
+    """
+
+    def __init__(self, warn_threshold_ms):
+        self.warn_threshold = warn_threshold_ms / 1000
+        self._task = None
+
+        # 指标
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self.stall_count = 0
+        self.last_stall_time = None
+        self._last_warn_log_time = 0.0
+
+    def start(self):
+        """启动监控，需在事件循环中调用"""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="loop-lag-monitor")
+
+    async def stop(self):
+        """停止监控"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _run(self):
+        while True:
+            expected = time.monotonic() + CHECK_INTERVAL
+            await asyncio.sleep(CHECK_INTERVAL)
+            lag = max(0.0, time.monotonic() - expected)
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            if lag >= self.warn_threshold:
+                self._record_stall(lag)
+
+    def _record_stall(self, lag):
+        self.stall_count += 1
+        self.last_stall_time = time.time()
+        now = time.monotonic()
+        if now - self._last_warn_log_time >= WARN_LOG_INTERVAL:
+            self._last_warn_log_time = now
+            logger.warning(
+                f"事件循环被阻塞 {lag * 1000:.0f}ms，累计阻塞 {self.stall_count} 次，"
+                f"最长 {self.max_lag * 1000:.0f}ms"
+            )
+
+    def get_stats(self):
+        """
+        获取监控指标
+
+        Returns:
+            dict: 最近一次/最长阻塞时长（毫秒）、阻塞次数、最近一次阻塞的时间戳
+        """
+        return {
+            "last_lag_ms": round(self.last_lag * 1000, 2),
+            "max_lag_ms": round(self.max_lag * 1000, 2),
+            "stall_count": self.stall_count,
+            "last_stall_time": self.last_stall_time,
+        }
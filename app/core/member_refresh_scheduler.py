@@ -0,0 +1,257 @@
+"""
+群成员列表刷新调度
+
+原先每 5 分钟在同一时刻对所有群发送 get_group_member_list，进退群通知也会立即触发整群刷新，
+群多、群大时会在短时间内涌入大量大体积回应。现在进退群、管理员变动由通知增量更新群目录，
+本模块只负责逐群的整体核对：
+- 每个群有各自的下次刷新时间，间隔加入 ±JITTER 的随机浮动，刷新请求分散在整个周期内
+- 近期有发言的群按 MEMBER_REFRESH_INTERVAL 刷新，其余群按 MEMBER_REFRESH_IDLE_INTERVAL 刷新；
+  同时到期时发现偏差的群优先，其次是最近有发言的群
+- 发现偏差时提前刷新：通知与群目录不一致（request_refresh），或群列表中的人数与群目录不一致；
+  DEBOUNCE_DELAY 秒内同一群的多次请求合并为一次刷新
+- 刷新请求经令牌桶限速，每次只等待一个群的回应
+- 其他模块刚获取过的成员列表不再重复获取
+
+使用示例：
+    scheduler = MemberRefreshScheduler(fetch_group_member_user_ids)
+    scheduler.start(websocket)
+    scheduler.note_activity(group_id)
+    scheduler.request_refresh(group_id)
+"""
+
+import time
+import random
+import asyncio
+from logger import logger
+from config import (
+    MEMBER_REFRESH_INTERVAL,
+    MEMBER_REFRESH_IDLE_INTERVAL,
+    MEMBER_REFRESH_PER_SECOND,
+)
+from .rate_limiter import TokenBucket
+from .group_directory import group_directory
+
+# 进退群通知后等待合并的时间，单位：秒
+DEBOUNCE_DELAY = 10
+
+# 刷新间隔的随机浮动比例
+JITTER = 0.2
+
+# 同步群列表的间隔，也是调度循环的最长休眠时间，单位：秒
+SYNC_INTERVAL = 30
+
+# 启动时需要刷新的群分散在这段时间内发起，单位：秒
+STARTUP_SPREAD = 60
+
+# 群列表晚于成员变化这么久时才比较人数，避免群列表尚未反映刚收到的进退群通知，单位：秒
+DRIFT_GRACE = 5
+
+# 调度循环出错后的等待时间，单位：秒
+ERROR_BACKOFF = 5
+
+
+class MemberRefreshScheduler:
+    """
+    群成员列表刷新调度器
+
+    Args:
+        fetch: 获取群成员列表的协程函数，参数为 (websocket, group_id, max_age)，失败时返回None
+        interval (float): 近期有发言的群的刷新间隔，单位：秒
+        idle_interval (float): 其余群的刷新间隔，单位：秒
+        rate (float): 每秒发起的刷新请求数
+    """
+
+    def __init__(
+        self,
+        fetch,
+        interval=MEMBER_REFRESH_INTERVAL,
+        idle_interval=MEMBER_REFRESH_IDLE_INTERVAL,
+        rate=MEMBER_REFRESH_PER_SECOND,
+    ):
+        self.fetch = fetch
+        self.interval = interval
+        self.idle_interval = max(idle_interval, interval)
+        self.bucket = TokenBucket(rate, 1)
+        # 群号 -> 下次刷新时间（monotonic）
+        self._due = {}
+        # 发现偏差、等待刷新的群
+        self._urgent = set()
+        # 群号 -> 最近发言时间（monotonic）
+        self._last_activity = {}
+        self._websocket = None
+        self._task = None
+        self._wakeup = None
+        self._next_sync = 0.0
+
+        # 指标
+        self.refresh_count = 0
+        self.failed_count = 0
+        self.skipped_count = 0
+        self.coalesced_count = 0
+        self.drift_count = 0
+
+    def start(self, websocket):
+        """记录当前连接，调度任务未运行时启动"""
+        self._websocket = websocket
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._next_sync = 0.0
+            self._task = asyncio.create_task(
+                self._run(), name="member-refresh-scheduler"
+            )
+
+    def note_activity(self, group_id):
+        """记录群内有发言，空闲的群转为活跃时按活跃间隔提前刷新"""
+        group_id = str(group_id)
+        now = time.monotonic()
+        if not self._is_active(group_id, now) and group_id in self._due:
+            age = group_directory.get_members_age(group_id)
+            remaining = 0 if age is None else max(0, self.interval - age)
+            self._due[group_id] = min(self._due[group_id], now + remaining)
+        self._last_activity[group_id] = now
+
+    def request_refresh(self, group_id, delay=DEBOUNCE_DELAY):
+        """
+        请求刷新群成员列表，delay 秒内同一群的多次请求合并为一次
+
+        Args:
+            group_id (str或int): 群号
+            delay (float): 等待合并的时间，单位：秒
+        """
+        group_id = str(group_id)
+        if group_id in self._urgent:
+            self.coalesced_count += 1
+            return
+        self._urgent.add(group_id)
+        due = time.monotonic() + delay
+        self._due[group_id] = min(self._due.get(group_id, due), due)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _is_active(self, group_id, now):
+        last_activity = self._last_activity.get(group_id)
+        return last_activity is not None and now - last_activity <= self.interval
+
+    def _interval_for(self, group_id, now):
+        return self.interval if self._is_active(group_id, now) else self.idle_interval
+
+    def _schedule(self, group_id, now):
+        self._due[group_id] = now + self._interval_for(group_id, now) * random.uniform(
+            1 - JITTER, 1 + JITTER
+        )
+
+    def _sync_groups(self, now):
+        """按群列表增删调度的群，新加入的群按快照时长安排首次刷新"""
+        group_ids = set(group_directory.get_group_ids())
+        for group_id in self._due.keys() - group_ids:
+            del self._due[group_id]
+            self._urgent.discard(group_id)
+            self._last_activity.pop(group_id, None)
+        for group_id in group_ids - self._due.keys():
+            age = group_directory.get_members_age(group_id)
+            remaining = 0 if age is None else max(0, self.idle_interval - age)
+            self._due[group_id] = now + remaining + random.uniform(0, STARTUP_SPREAD)
+        self._check_drift(group_ids)
+
+    def _check_drift(self, group_ids):
+        """群列表中的人数与群目录不一致时提前刷新"""
+        groups_updated_at = group_directory.groups_updated_at
+        for group_id in group_ids:
+            if group_id in self._urgent:
+                continue
+            changed_at = group_directory.get_members_changed_at(group_id)
+            if changed_at is None or groups_updated_at < changed_at + DRIFT_GRACE:
+                continue
+            member_count = (group_directory.get_group(group_id) or {}).get(
+                "member_count"
+            )
+            count = group_directory.get_member_count(group_id)
+            if member_count and count is not None and member_count != count:
+                self.drift_count += 1
+                logger.info(
+                    f"[Core]群 {group_id} 的成员数与群列表不一致"
+                    f"（{count}/{member_count}），准备重新获取成员列表"
+                )
+                self.request_refresh(group_id)
+
+    def _next_group(self, now):
+        """取出到期的群中优先级最高的一个，没有时返回None"""
+        best = None
+        best_key = None
+        for group_id, due in self._due.items():
+            if due > now:
+                continue
+            key = (
+                group_id not in self._urgent,
+                -self._last_activity.get(group_id, 0.0),
+                due,
+            )
+            if best_key is None or key < best_key:
+                best, best_key = group_id, key
+        return best
+
+    async def _run(self):
+        while True:
+            try:
+                now = time.monotonic()
+                if now >= self._next_sync:
+                    self._sync_groups(now)
+                    self._next_sync = now + SYNC_INTERVAL
+
+                group_id = self._next_group(now)
+                if group_id is not None:
+                    await self._refresh(group_id)
+                    continue
+
+                next_due = min(self._due.values(), default=self._next_sync)
+                timeout = max(0.05, min(next_due, self._next_sync) - now)
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"[Core]群成员列表刷新调度出错: {e}")
+                await asyncio.sleep(ERROR_BACKOFF)
+
+    async def _refresh(self, group_id):
+        urgent = group_id in self._urgent
+        self._urgent.discard(group_id)
+        # 先安排下次刷新，获取失败也不会反复重试
+        self._schedule(group_id, time.monotonic())
+
+        # 其他模块刚获取过的成员列表，定时刷新时不再重复获取
+        age = group_directory.get_members_age(group_id)
+        if not urgent and age is not None and age < self.interval / 2:
+            self.skipped_count += 1
+            return
+
+        await self.bucket.acquire()
+        if await self.fetch(self._websocket, group_id, 0) is None:
+            self.failed_count += 1
+        else:
+            self.refresh_count += 1
+
+    def get_stats(self):
+        """
+        获取调度统计信息
+
+        Returns:
+            dict: 调度的群数、活跃群数、待合并刷新的群数、刷新次数、失败次数、
+                跳过次数、合并的刷新请求数、人数不一致的次数
+        """
+        now = time.monotonic()
+        return {
+            "groups": len(self._due),
+            "active_groups": sum(
+                1 for group_id in self._due if self._is_active(group_id, now)
+            ),
+            "pending_urgent": len(self._urgent),
+            "refreshed": self.refresh_count,
+            "failed": self.failed_count,
+            "skipped": self.skipped_count,
+            "coalesced": self.coalesced_count,
+            "drift": self.drift_count,
+        }
@@ -0,0 +1,277 @@
+"""
+群管操作执行器
+
+扫描黑名单、清理未验证成员等场景原本对每个成员单独发送 set_group_kick，每次之间固定 sleep，
+数百人的群要等待数分钟，而且发送后不知道是否成功。本模块统一执行踢人和禁言：
+- 踢人按群合并为 set_group_kick_members 批量请求，每次最多 MODERATION_KICK_BATCH_SIZE 人；
+  上游不支持批量接口或批量请求失败时，改为逐个 set_group_kick
+- 所有群管请求共用一个令牌桶，速率和突发数由 MODERATION_ACTIONS_PER_SECOND /
+  MODERATION_ACTION_BURST 配置，多个模块同时执行时总速率也不会超出
+- 每个请求都等待回应，返回实际成功和失败的成员，可传入回调获取进度；踢人请求超时时不重试
+  （请求可能已经执行，只是回应延迟），结束后重新获取群成员列表确认是否已被踢出
+
+使用示例：
+    report = await kick_members(websocket, group_id, user_ids)
+    for user_id in report["succeeded"]:
+        ...
+"""
+
+import time
+from logger import logger
+from api.action import call_action
+from core.rate_limiter import TokenBucket
+from config import (
+    MODERATION_ACTIONS_PER_SECOND,
+    MODERATION_ACTION_BURST,
+    MODERATION_KICK_BATCH_SIZE,
+)
+
+# 等待单个群管请求回应的超时时间，单位：秒
+ACTION_TIMEOUT = 10
+
+# 上游不支持该动作时的 retcode
+RETCODE_UNSUPPORTED = 1404
+
+
+def _is_ok(response):
+    return response is not None and response.get("status") == "ok"
+
+
+class ModerationExecutor:
+    """
+    群管操作执行器
+
+    Args:
+        rate (float): 每秒执行的请求数
+        burst (int): 允许的突发请求数
+        kick_batch_size (int): 单次批量踢人的人数上限
+        action_timeout (float): 等待单个请求回应的超时时间，单位：秒
+    """
+
+    def __init__(
+        self,
+        rate=MODERATION_ACTIONS_PER_SECOND,
+        burst=MODERATION_ACTION_BURST,
+        kick_batch_size=MODERATION_KICK_BATCH_SIZE,
+        action_timeout=ACTION_TIMEOUT,
+    ):
+        self.bucket = TokenBucket(rate, burst)
+        self.kick_batch_size = max(1, kick_batch_size)
+        self.action_timeout = action_timeout
+        # 上游不支持批量踢人时不再尝试
+        self.batch_kick_supported = True
+
+        # 指标
+        self.request_count = 0
+        self.failed_request_count = 0
+        self.kicked_count = 0
+        self.banned_count = 0
+
+    async def _request(self, websocket, action, params):
+        """按速率限制发送一个请求并等待回应，超时或失败时返回None"""
+        await self.bucket.acquire()
+        self.request_count += 1
+        response = await call_action(
+            websocket, action, params, timeout=self.action_timeout, full_response=True
+        )
+        if not _is_ok(response):
+            self.failed_request_count += 1
+        return response
+
+    async def kick_members(
+        self, websocket, group_id, user_ids, reject_add_request=False, progress=None
+    ):
+        """
+        踢出群成员
+
+        Args:
+            websocket: WebSocket连接对象
+            group_id (str或int): 群号
+            user_ids (list): 要踢出的用户QQ号列表，重复的只踢一次
+            reject_add_request (bool): 是否拒绝此人的加群请求
+            progress (callable, optional): 进度回调，参数为 (已处理人数, 总人数)，可为协程函数
+
+        Returns:
+            dict: total 总人数，succeeded 踢出成功的QQ号列表，failed 失败的QQ号列表，
+                unconfirmed 请求超时且无法确认结果的QQ号列表，requests 发送的请求数，
+                elapsed 耗时（秒）
+        """
+        user_ids = list(dict.fromkeys(str(user_id) for user_id in user_ids))
+        report = _new_report(len(user_ids))
+        start = time.monotonic()
+        done = 0
+        # 请求超时、结果未知的用户
+        timed_out = []
+
+        for i in range(0, len(user_ids), self.kick_batch_size):
+            batch = user_ids[i : i + self.kick_batch_size]
+            if len(batch) > 1 and self.batch_kick_supported:
+                response = await self._request(
+                    websocket,
+                    "set_group_kick_members",
+                    {
+                        "group_id": group_id,
+                        "user_id": batch,
+                        "reject_add_request": reject_add_request,
+                    },
+                )
+                report["requests"] += 1
+                if _is_ok(response) or response is None:
+                    # 超时的批量请求可能已经执行，不改为逐个踢出，结束后统一确认
+                    (report["succeeded"] if response else timed_out).extend(batch)
+                    done += len(batch)
+                    await self._report_progress(progress, group_id, done, report)
+                    continue
+                if response.get("retcode") == RETCODE_UNSUPPORTED:
+                    self.batch_kick_supported = False
+                    logger.warning("[Core]上游不支持批量踢人，改为逐个踢出")
+                else:
+                    logger.warning(
+                        f"[Core]群 {group_id} 批量踢出 {len(batch)} 人失败，改为逐个踢出"
+                    )
+
+            for user_id in batch:
+                response = await self._request(
+                    websocket,
+                    "set_group_kick",
+                    {
+                        "group_id": group_id,
+                        "user_id": user_id,
+                        "reject_add_request": reject_add_request,
+                    },
+                )
+                report["requests"] += 1
+                if _is_ok(response):
+                    report["succeeded"].append(user_id)
+                elif response is None:
+                    timed_out.append(user_id)
+                else:
+                    report["failed"].append(user_id)
+                done += 1
+            await self._report_progress(progress, group_id, done, report)
+
+        if timed_out:
+            await self._confirm_kicked(websocket, group_id, timed_out, report)
+
+        self.kicked_count += len(report["succeeded"])
+        report["elapsed"] = time.monotonic() - start
+        if user_ids:
+            logger.info(
+                f"[Core]群 {group_id} 踢人完成：成功 {len(report['succeeded'])} 人，"
+                f"失败 {len(report['failed'])} 人，未确认 {len(report['unconfirmed'])} 人，"
+                f"请求 {report['requests']} 次，耗时 {report['elapsed']:.1f} 秒"
+            )
+        return report
+
+    async def _confirm_kicked(self, websocket, group_id, user_ids, report):
+        """重新获取群成员列表，已不在群内的用户视为踢出成功，获取失败时记为未确认"""
+        from core.get_group_member_list import fetch_group_member_user_ids
+
+        member_ids = await fetch_group_member_user_ids(websocket, group_id)
+        if member_ids is None:
+            logger.warning(
+                f"[Core]群 {group_id} 有 {len(user_ids)} 人的踢人请求超时，"
+                f"且无法获取成员列表确认结果"
+            )
+            report["unconfirmed"].extend(user_ids)
+            return
+        member_ids = set(member_ids)
+        for user_id in user_ids:
+            if user_id in member_ids:
+                report["failed"].append(user_id)
+            else:
+                report["succeeded"].append(user_id)
+
+    async def ban_members(self, websocket, group_id, user_ids, duration, progress=None):
+        """
+        禁言群成员，上游没有批量禁言接口，逐个发送请求
+
+        Args:
+            websocket: WebSocket连接对象
+            group_id (str或int): 群号
+            user_ids (list): 要禁言的用户QQ号列表，重复的只禁言一次
+            duration (int): 禁言时长，单位：秒，0表示解除禁言
+            progress (callable, optional): 进度回调，参数为 (已处理人数, 总人数)，可为协程函数
+
+        Returns:
+            dict: 同 kick_members，请求超时记为失败
+        """
+        user_ids = list(dict.fromkeys(str(user_id) for user_id in user_ids))
+        report = _new_report(len(user_ids))
+        start = time.monotonic()
+
+        for done, user_id in enumerate(user_ids, 1):
+            response = await self._request(
+                websocket,
+                "set_group_ban",
+                {
+                    "group_id": group_id,
+                    "user_id": user_id,
+                    "duration": duration,
+                },
+            )
+            report["requests"] += 1
+            if _is_ok(response):
+                report["succeeded"].append(user_id)
+            else:
+                report["failed"].append(user_id)
+            await self._report_progress(progress, group_id, done, report)
+
+        self.banned_count += len(report["succeeded"])
+        report["elapsed"] = time.monotonic() - start
+        if user_ids:
+            logger.info(
+                f"[Core]群 {group_id} 禁言完成：成功 {len(report['succeeded'])} 人，"
+                f"失败 {len(report['failed'])} 人，耗时 {report['elapsed']:.1f} 秒"
+            )
+        return report
+
+    async def _report_progress(self, progress, group_id, done, report):
+        total = report["total"]
+        if total > self.kick_batch_size and (
+            done == total or done % self.kick_batch_size == 0
+        ):
+            logger.info(f"[Core]群 {group_id} 群管操作进度：{done}/{total}")
+        if progress is None:
+            return
+        try:
+            result = progress(done, total)
+            if hasattr(result, "__await__"):
+                await result
+        except Exception as e:
+            logger.error(f"[Core]群管操作进度回调失败: {e}")
+
+    def get_stats(self):
+        """
+        获取执行统计信息
+
+        Returns:
+            dict: 请求数、失败请求数、踢出人数、禁言人数、是否使用批量踢人、令牌桶状态
+        """
+        return {
+            "requests": self.request_count,
+            "failed_requests": self.failed_request_count,
+            "kicked": self.kicked_count,
+            "banned": self.banned_count,
+            "batch_kick": self.batch_kick_supported,
+            "bucket": self.bucket.get_stats(),
+        }
+
+
+def _new_report(total):
+    return {
+        "total": total,
+        "succeeded": [],
+        "failed": [],
+        "unconfirmed": [],
+        "requests": 0,
+        "elapsed": 0.0,
+    }
+
+
+# 全局群管操作执行器
+moderation_executor = ModerationExecutor()
+
+kick_members = moderation_executor.kick_members
+ban_members = moderation_executor.ban_members
+get_stats = moderation_executor.get_stats
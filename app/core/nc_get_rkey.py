@@ -9,6 +9,9 @@ import time
 
 DATA_DIR = os.path.join("data", "Core", "nc_get_rkey.json")
 
+# 订阅的事件类型，借助元事件定时刷新
+EVENT_KINDS = ["meta_event", "response:nc_get_rkey"]
+
 # 全局变量，记录上次请求时间
 last_request_time = 0
 REQUEST_INTERVAL = 600  # 10分钟，单位：秒
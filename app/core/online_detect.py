@@ -4,6 +4,9 @@ from api.message import send_private_msg
 from utils.feishu import send_feishu_msg
 import time
 
+# 订阅的事件类型
+EVENT_KINDS = ["meta_event"]
+
 # 全局变量
 is_online = None  # 初始状态为None
 last_state_change_time = 0
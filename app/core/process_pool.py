@@ -0,0 +1,86 @@
+"""
+CPU 密集任务进程池
+
+图像解码、二维码识别等纯计算任务放在线程里仍会与事件循环争抢 GIL，
+这里提供一个进程共享的进程池：
+- 工作进程数受 PROCESS_POOL_WORKERS 限制，且至少为事件循环保留一个核心，
+  突发的大量任务只会排队，不会占满所有核心
+- 使用 spawn 方式创建工作进程，避免在已有线程（数据库线程等）的进程中 fork
+- 进程池异常崩溃时自动重建，本次任务退回到线程池执行
+
+提交的函数及参数需可被 pickle，即模块级函数和普通数据（bytes、numpy 数组等）。
+
+使用示例：
+    results = await run_in_process(scan_image, image)
+"""
+
+import os
+import asyncio
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from logger import logger
+from config import PROCESS_POOL_WORKERS
+
+_executor = None
+
+_lock = threading.Lock()
+
+
+def get_worker_count():
+    """
+    获取工作进程数量
+
+    Returns:
+        int: 配置值与（CPU核心数-1）中的较小值，至少为1
+    """
+    cpu_count = os.cpu_count() or 1
+    return max(1, min(PROCESS_POOL_WORKERS, cpu_count - 1))
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _lock:
+            if _executor is None:
+                _executor = ProcessPoolExecutor(
+                    max_workers=get_worker_count(),
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+                logger.info(f"[进程池]已创建进程池，工作进程数: {get_worker_count()}")
+    return _executor
+
+
+async def run_in_process(func, *args):
+    """
+    在进程池中执行函数
+
+    Args:
+        func: 模块级函数
+        *args: 调用参数
+
+    Returns:
+        函数的返回值
+    """
+    global _executor
+    loop = asyncio.get_running_loop()
+    executor = _get_executor()
+    try:
+        return await loop.run_in_executor(executor, func, *args)
+    except BrokenProcessPool:
+        logger.error("[进程池]进程池已损坏，将重建进程池，本次任务在线程中执行")
+        with _lock:
+            if _executor is executor:
+                _executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+        return await loop.run_in_executor(None, func, *args)
+
+
+def close_all():
+    """关闭进程池（在程序退出时调用）"""
+    global _executor
+    with _lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,84 @@
+"""
+令牌桶限流
+
+令牌以固定速率补充，桶满后不再增加；每次操作消耗一个令牌，令牌不足时等待。
+允许短时间内突发不超过桶容量的操作，长期速率不超过补充速率。
+
+使用示例：
+    bucket = TokenBucket(rate=1.0, capacity=10)
+    await bucket.acquire()
+"""
+
+import time
+import asyncio
+
+
+class TokenBucket:
+    """
+    异步令牌桶
+
+    Args:
+        rate (float): 每秒补充的令牌数
+        capacity (int): 桶容量，即允许的最大突发数
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self._updated_at = time.monotonic()
+        self._lock = None
+        self._lock_loop = None
+
+        # 指标
+        self.acquired = 0
+        self.total_wait = 0.0
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    def _get_lock(self):
+        # 锁绑定在首次使用的事件循环上，事件循环变化时重建
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._lock_loop is not loop:
+            self._lock = asyncio.Lock()
+            self._lock_loop = loop
+        return self._lock
+
+    def try_acquire(self):
+        """
+        尝试立即获取一个令牌
+
+        Returns:
+            bool: 是否获取成功
+        """
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            self.acquired += 1
+            return True
+        return False
+
+    async def acquire(self):
+        """获取一个令牌，令牌不足时等待补充，等待者按到达顺序获取"""
+        start = time.monotonic()
+        async with self._get_lock():
+            while not self.try_acquire():
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+        self.total_wait += time.monotonic() - start
+
+    def get_stats(self):
+        """
+        获取限流统计信息
+
+        Returns:
+            dict: 当前令牌数、已获取次数、累计等待时长（秒）
+        """
+        self._refill()
+        return {
+            "tokens": self.tokens,
+            "acquired": self.acquired,
+            "total_wait": self.total_wait,
+        }
@@ -7,6 +7,7 @@ from .switch_manager import SwitchManager
 from .command_handler import SwitchCommandHandler
 from .migration import SwitchMigration
 from .database import db
+from .cache import switch_cache
 
 
 # 兼容性函数，保持原有API不变
@@ -45,6 +46,11 @@ def copy_group_switches(source_group_id, target_group_id):
     return SwitchManager.copy_group_switches(source_group_id, target_group_id)
 
 
+def get_switch_cache_stats():
+    """获取开关缓存的命中统计"""
+    return switch_cache.get_stats()
+
+
 async def handle_module_private_switch(module_name, websocket, user_id, message_id):
     """处理模块私聊开关命令"""
     return await SwitchCommandHandler.handle_module_private_switch(
@@ -74,6 +80,9 @@ try:
 except Exception as e:
     print(f"开关系统自动升级失败: {e}")
 
+# 升级完成后加载开关缓存，加载失败时首次查询会重试
+switch_cache.load()
+
 
 __all__ = [
     "SwitchManager",
@@ -86,6 +95,7 @@ __all__ = [
     "load_group_all_switch",
     "get_all_enabled_groups",
     "copy_group_switches",
+    "get_switch_cache_stats",
     "handle_module_private_switch",
     "handle_module_group_switch",
     "handle_events",
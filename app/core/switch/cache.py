@@ -0,0 +1,123 @@
+"""
+开关状态内存缓存模块
+启动时将 module_switches 全表加载到内存，热路径查询不再访问数据库，
+所有写操作先写入数据库，成功后同步更新缓存
+"""
+
+import threading
+from logger import logger
+from .database import db
+
+
+class SwitchCache:
+    """开关状态缓存，索引为 (模块名, 开关类型, 群号) -> 开关状态"""
+
+    def __init__(self):
+        # 写操作锁，保证数据库写入与缓存更新作为一个整体执行
+        self.lock = threading.RLock()
+        self.switches = {}
+        self.loaded = False
+        # 命中：直接由内存回答的查询；未命中：需要读取数据库的查询
+        self.hit_count = 0
+        self.miss_count = 0
+
+    def load(self):
+        """
+        从数据库加载全部开关状态，覆盖当前缓存
+
+        Returns:
+            bool: 是否加载成功
+        """
+        with self.lock:
+            results = db.execute_query(
+                "SELECT module_name, switch_type, group_id, status FROM module_switches",
+                fetch_all=True,
+            )
+            if results is None:
+                logger.error("[Switch]加载开关缓存失败，将在下次查询时重试")
+                self.loaded = False
+                return False
+
+            self.switches = {
+                (module_name, switch_type, group_id): bool(status)
+                for module_name, switch_type, group_id, status in results
+            }
+            self.loaded = True
+            logger.info(f"[Switch]已加载 {len(self.switches)} 条开关记录到内存缓存")
+            return True
+
+    def _ensure_loaded(self):
+        """缓存未加载时从数据库加载，返回本次查询是否命中缓存"""
+        if self.loaded:
+            self.hit_count += 1
+            return True
+        self.miss_count += 1
+        return self.load()
+
+    def get(self, module_name, switch_type, group_id=None):
+        """
+        查询开关状态，默认关闭
+
+        Args:
+            module_name: 模块名称
+            switch_type: 开关类型，group或private
+            group_id: 群号，私聊开关为None
+
+        Returns:
+            bool: True表示开启，False表示关闭
+        """
+        self._ensure_loaded()
+        return self.switches.get((module_name, switch_type, group_id), False)
+
+    def set(self, module_name, switch_type, group_id, status):
+        """写入数据库成功后更新缓存中的开关状态"""
+        self.switches[(module_name, switch_type, group_id)] = bool(status)
+
+    def remove_group(self, group_id):
+        """删除数据库中的群开关记录后，同步移除缓存中该群的全部开关"""
+        for key in [key for key in self.switches if key[1:] == ("group", group_id)]:
+            del self.switches[key]
+
+    def get_group_switches(self, group_id):
+        """
+        获取某群组所有模块的开关
+
+        Returns:
+            dict: 模块名称 -> 开关状态
+        """
+        self._ensure_loaded()
+        return {
+            module_name: status
+            for (module_name, switch_type, stored_group_id), status in list(
+                self.switches.items()
+            )
+            if switch_type == "group" and stored_group_id == group_id
+        }
+
+    def get_enabled_groups(self, module_name):
+        """获取某模块所有已开启的群号列表"""
+        self._ensure_loaded()
+        return [
+            group_id
+            for (stored_module_name, switch_type, group_id), status in list(
+                self.switches.items()
+            )
+            if stored_module_name == module_name and switch_type == "group" and status
+        ]
+
+    def get_stats(self):
+        """
+        获取缓存统计
+
+        Returns:
+            dict: 缓存记录数、命中次数、未命中次数
+        """
+        return {
+            "size": len(self.switches),
+            "hits": self.hit_count,
+            "misses": self.miss_count,
+        }
+
+
+# 全局开关缓存实例
+switch_cache = SwitchCache()
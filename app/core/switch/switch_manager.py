@@ -5,6 +5,7 @@
 
 from logger import logger
 from .database import db
+from .cache import switch_cache
 
 
 class SwitchManager:
@@ -23,12 +24,7 @@ class SwitchManager:
             bool: True表示开启，False表示关闭
         """
         try:
-            result = db.execute_query(
-                "SELECT status FROM module_switches WHERE module_name = ? AND switch_type = 'group' AND group_id = ?",
-                (module_name, str(group_id)),
-                fetch_one=True,
-            )
-            return bool(result[0]) if result else False
+            return switch_cache.get(module_name, "group", str(group_id))
         except Exception as e:
             logger.error(f"[{module_name}]查询群聊开关状态失败: {e}")
             return False
@@ -45,12 +41,7 @@ class SwitchManager:
             bool: True表示开启，False表示关闭
         """
         try:
-            result = db.execute_query(
-                "SELECT status FROM module_switches WHERE module_name = ? AND switch_type = 'private'",
-                (module_name,),
-                fetch_one=True,
-            )
-            return bool(result[0]) if result else False
+            return switch_cache.get(module_name, "private")
         except Exception as e:
             logger.error(f"[{module_name}]查询私聊开关状态失败: {e}")
             return False
@@ -127,6 +118,12 @@ class SwitchManager:
     @staticmethod
     def _toggle_group_switch_internal(module_name, group_id):
         """群聊开关切换内部实现"""
+        with switch_cache.lock:
+            return SwitchManager._toggle_group_switch_locked(module_name, group_id)
+
+    @staticmethod
+    def _toggle_group_switch_locked(module_name, group_id):
+        """群聊开关切换，调用方需持有缓存锁"""
         # 查询当前状态
         result = db.execute_query(
             "SELECT status FROM module_switches WHERE module_name = ? AND switch_type = 'group' AND group_id = ?",
@@ -137,23 +134,33 @@ class SwitchManager:
         if result:
             # 如果记录存在，切换状态
             new_status = 0 if result[0] else 1
-            db.execute_update(
+            affected_rows = db.execute_update(
                 "UPDATE module_switches SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE module_name = ? AND switch_type = 'group' AND group_id = ?",
                 (new_status, module_name, str(group_id)),
             )
         else:
             # 如果记录不存在，创建新记录，默认开启
             new_status = 1
-            db.execute_update(
+            affected_rows = db.execute_update(
                 "INSERT INTO module_switches (module_name, switch_type, group_id, status) VALUES (?, 'group', ?, ?)",
                 (module_name, str(group_id), new_status),
             )
 
+        # 写入成功后同步缓存
+        if affected_rows > 0:
+            switch_cache.set(module_name, "group", str(group_id), new_status)
+
         return bool(new_status)
 
     @staticmethod
     def _toggle_private_switch_internal(module_name):
         """私聊开关切换内部实现"""
+        with switch_cache.lock:
+            return SwitchManager._toggle_private_switch_locked(module_name)
+
+    @staticmethod
+    def _toggle_private_switch_locked(module_name):
+        """私聊开关切换，调用方需持有缓存锁"""
         # 查询当前状态
         result = db.execute_query(
             "SELECT status FROM module_switches WHERE module_name = ? AND switch_type = 'private'",
@@ -164,18 +171,22 @@ class SwitchManager:
         if result:
             # 如果记录存在，切换状态
             new_status = 0 if result[0] else 1
-            db.execute_update(
+            affected_rows = db.execute_update(
                 "UPDATE module_switches SET status = ?, updated_at = CURRENT_TIMESTAMP WHERE module_name = ? AND switch_type = 'private'",
                 (new_status, module_name),
             )
         else:
             # 如果记录不存在，创建新记录，默认开启
             new_status = 1
-            db.execute_update(
+            affected_rows = db.execute_update(
                 "INSERT INTO module_switches (module_name, switch_type, group_id, status) VALUES (?, 'private', NULL, ?)",
                 (module_name, new_status),
             )
 
+        # 写入成功后同步缓存
+        if affected_rows > 0:
+            switch_cache.set(module_name, "private", None, new_status)
+
         return bool(new_status)
 
     @staticmethod
@@ -190,17 +201,7 @@ class SwitchManager:
             dict: 格式为 {group_id: {module_name1: True, module_name2: False}}
         """
         try:
-            results = db.execute_query(
-                "SELECT module_name, status FROM module_switches WHERE switch_type = 'group' AND group_id = ?",
-                (str(group_id),),
-                fetch_all=True,
-            )
-
-            switch = {group_id: {}}
-            for module_name, status in results or []:
-                switch[group_id][module_name] = bool(status)
-
-            return switch
+            return {group_id: switch_cache.get_group_switches(str(group_id))}
         except Exception as e:
             logger.error(f"获取群组 {group_id} 所有模块开关失败: {e}")
             return {group_id: {}}
@@ -217,13 +218,7 @@ class SwitchManager:
             list: 开启的群号列表
         """
         try:
-            results = db.execute_query(
-                "SELECT group_id FROM module_switches WHERE module_name = ? AND switch_type = 'group' AND status = 1",
-                (module_name,),
-                fetch_all=True,
-            )
-
-            return [row[0] for row in results or []]
+            return switch_cache.get_enabled_groups(module_name)
         except Exception as e:
             logger.error(f"[{module_name}]获取已开启群聊列表失败: {e}")
             return []
@@ -240,13 +235,8 @@ class SwitchManager:
             list: 已开启的模块名称列表
         """
         try:
-            results = db.execute_query(
-                "SELECT module_name FROM module_switches WHERE switch_type = 'group' AND group_id = ? AND status = 1",
-                (str(group_id),),
-                fetch_all=True,
-            )
-
-            return [row[0] for row in results or []]
+            switches = switch_cache.get_group_switches(str(group_id))
+            return [module_name for module_name, status in switches.items() if status]
         except Exception as e:
             logger.error(f"查询群组 {group_id} 已开启模块失败: {e}")
             return []
@@ -320,11 +310,15 @@ class SwitchManager:
                 status_text = "开启" if status else "关闭"
                 copied_modules.append(f"【{module_name}】- {status_text}")
 
-            # 执行批量操作
-            success = db.execute_batch(operations)
+            # 执行批量操作，成功后同步缓存
+            with switch_cache.lock:
+                success = db.execute_batch(operations)
 
-            if not success:
-                return False, [], []
+                if not success:
+                    return False, [], []
+
+                for module_name, status in source_switches:
+                    switch_cache.set(module_name, "group", str(target_group_id), status)
 
             # 计算保持不变的模块
             unchanged_module_names = target_existing_modules - source_module_names
@@ -399,11 +393,14 @@ class SwitchManager:
                     record_count = count_result[0] if count_result else 0
 
                     if record_count > 0:
-                        # 删除该群的所有开关记录
-                        affected_rows = db.execute_update(
-                            "DELETE FROM module_switches WHERE switch_type = 'group' AND group_id = ?",
-                            (group_id,),
-                        )
+                        # 删除该群的所有开关记录，并同步移除缓存
+                        with switch_cache.lock:
+                            affected_rows = db.execute_update(
+                                "DELETE FROM module_switches WHERE switch_type = 'group' AND group_id = ?",
+                                (group_id,),
+                            )
+                            if affected_rows > 0:
+                                switch_cache.remove_group(group_id)
 
                         if affected_rows > 0:
                             cleaned_count += affected_rows
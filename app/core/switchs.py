@@ -3,6 +3,7 @@
 重构后的开关管理系统，拆分为多个模块以提高可维护性：
 - config.py: 配置常量
 - database.py: 数据库操作
+- cache.py: 开关状态内存缓存
 - switch_manager.py: 开关管理核心逻辑
 - migration.py: 数据迁移
 - command_handler.py: 命令处理器
@@ -15,9 +16,14 @@ from .switch import (
     SwitchManager,
     SwitchCommandHandler,
     SwitchMigration,
+    get_switch_cache_stats,
 )
 
 
+# 订阅的事件类型
+EVENT_KINDS = ["message"]
+
+
 # 为了完全向后兼容，提供原有API但使用新的实现
 def is_group_switch_on(group_id, MODULE_NAME):
     """判断群聊开关是否开启，默认关闭"""
@@ -0,0 +1,234 @@
+"""
+入站事件队列
+
+用有界队列和固定数量的分发 worker 替代每个事件无限制地 create_task：
+- 优先级通道：群管/通知类任务先于普通任务，娱乐类（复读、随机消息）最后处理
+- 群公平：同一通道内按群轮转出队，单个刷屏的群不会饿死其他群
+- 背压：队列满时优先丢弃低优先级通道中积压最多的群的最旧任务，并记录丢弃数
+- 指标：队列深度、各通道丢弃数、入队到开始处理的分发延迟
+"""
+
+import time
+import asyncio
+from collections import deque, Counter
+from logger import logger
+
+# 优先级通道，数值越小越先处理
+PRIORITY_HIGH = 0
+PRIORITY_NORMAL = 1
+PRIORITY_LOW = 2
+
+# 模块 EVENT_PRIORITY 声明值与通道的对应关系
+PRIORITY_NAMES = {
+    "high": PRIORITY_HIGH,
+    "normal": PRIORITY_NORMAL,
+    "low": PRIORITY_LOW,
+}
+
+# 延迟统计保留的最近样本数
+LATENCY_SAMPLE_SIZE = 1000
+
+# 丢弃告警日志的最小间隔，单位：秒，避免消息风暴时刷屏
+DROP_LOG_INTERVAL = 60
+
+
+class _Lane:
+    """单个优先级通道，按群分桶并轮转出队"""
+
+    def __init__(self):
+        # 群标识 -> 该群待处理的任务
+        self.buckets = {}
+        # 有待处理任务的群，按轮转顺序排列
+        self.ready = deque()
+        self.size = 0
+
+    def push(self, group_key, item):
+        bucket = self.buckets.get(group_key)
+        if bucket is None:
+            bucket = self.buckets[group_key] = deque()
+            self.ready.append(group_key)
+        bucket.append(item)
+        self.size += 1
+
+    def pop(self):
+        """取出轮转顺序中下一个群的最旧任务"""
+        group_key = self.ready.popleft()
+        bucket = self.buckets[group_key]
+        item = bucket.popleft()
+        if bucket:
+            self.ready.append(group_key)
+        else:
+            del self.buckets[group_key]
+        self.size -= 1
+        return item
+
+    def evict(self):
+        """丢弃积压最多的群的最旧任务，返回被丢弃的任务"""
+        group_key = max(self.buckets, key=lambda key: len(self.buckets[key]))
+        bucket = self.buckets[group_key]
+        item = bucket.popleft()
+        if not bucket:
+            del self.buckets[group_key]
+            self.ready.remove(group_key)
+        self.size -= 1
+        return item
+
+
+class EventQueue:
+    """
+    有界优先级事件队列
+
+    Args:
+        worker_count (int): 分发 worker 数量，即同时运行的任务上限
+        max_size (int): 队列中待处理任务的上限
+    """
+
+    def __init__(self, worker_count, max_size):
+        self.worker_count = max(1, worker_count)
+        self.max_size = max(1, max_size)
+        self.lanes = [_Lane() for _ in PRIORITY_NAMES]
+        self.size = 0
+        # 待处理任务计数，worker 据此等待
+        self._available = asyncio.Semaphore(0)
+        self._workers = []
+
+        # 指标
+        self.enqueued_count = 0
+        self.dispatched_count = 0
+        self.dropped_count = Counter()
+        self.max_depth = 0
+        self._latencies = deque(maxlen=LATENCY_SAMPLE_SIZE)
+        self._max_latency = 0.0
+        self._last_drop_log_time = 0.0
+
+    def start(self):
+        """启动分发 worker，需在事件循环中调用"""
+        if self._workers:
+            return
+        for index in range(self.worker_count):
+            self._workers.append(
+                asyncio.create_task(self._worker(), name=f"event-worker-{index}")
+            )
+        logger.info(
+            f"事件队列已启动，worker数量: {self.worker_count}，队列容量: {self.max_size}"
+        )
+
+    async def stop(self):
+        """停止所有 worker 并丢弃未处理的任务"""
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        for lane in self.lanes:
+            lane.buckets.clear()
+            lane.ready.clear()
+            lane.size = 0
+        self.size = 0
+        self._available = asyncio.Semaphore(0)
+
+    def submit(self, priority, group_key, func, *args):
+        """
+        提交任务
+
+        Args:
+            priority (int): 优先级通道，PRIORITY_HIGH/PRIORITY_NORMAL/PRIORITY_LOW
+            group_key (str): 公平调度的分组标识，通常为群号
+            func: 异步函数
+            *args: 调用参数
+
+        Returns:
+            bool: 是否入队成功，队列已满且没有更低优先级任务可丢弃时返回False
+        """
+        if self.size >= self.max_size and not self._evict_for(priority):
+            self._record_drop(priority)
+            return False
+
+        self.lanes[priority].push(group_key, (time.monotonic(), func, args))
+        self.enqueued_count += 1
+        if self.size < self.max_size:
+            self.size += 1
+            self.max_depth = max(self.max_depth, self.size)
+            self._available.release()
+        return True
+
+    def _evict_for(self, priority):
+        """为指定优先级的新任务腾出位置，从最低优先级通道开始丢弃"""
+        for lane_priority in range(len(self.lanes) - 1, priority - 1, -1):
+            lane = self.lanes[lane_priority]
+            if lane.size:
+                lane.evict()
+                self._record_drop(lane_priority)
+                return True
+        return False
+
+    def _record_drop(self, priority):
+        self.dropped_count[priority] += 1
+        now = time.monotonic()
+        if now - self._last_drop_log_time >= DROP_LOG_INTERVAL:
+            self._last_drop_log_time = now
+            logger.warning(
+                f"事件队列已满（{self.size}/{self.max_size}），正在丢弃任务，"
+                f"累计丢弃: {dict(self.dropped_count)}"
+            )
+
+    def _pop(self):
+        for lane in self.lanes:
+            if lane.size:
+                self.size -= 1
+                return lane.pop()
+        return None
+
+    async def _worker(self):
+        while True:
+            await self._available.acquire()
+            item = self._pop()
+            if item is None:
+                continue
+
+            enqueued_at, func, args = item
+            latency = time.monotonic() - enqueued_at
+            self._latencies.append(latency)
+            self._max_latency = max(self._max_latency, latency)
+            self.dispatched_count += 1
+
+            try:
+                await func(*args)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"事件队列任务执行出错: {e}")
+
+    def get_stats(self):
+        """
+        获取队列指标
+
+        Returns:
+            dict: 队列深度、各通道积压与丢弃数、分发延迟（毫秒）
+        """
+        latencies = sorted(self._latencies)
+
+        def percentile(ratio):
+            if not latencies:
+                return 0.0
+            index = min(len(latencies) - 1, int(len(latencies) * ratio))
+            return round(latencies[index] * 1000, 2)
+
+        return {
+            "depth": self.size,
+            "max_depth": self.max_depth,
+            "lane_depth": {
+                name: self.lanes[priority].size
+                for name, priority in PRIORITY_NAMES.items()
+            },
+            "enqueued": self.enqueued_count,
+            "dispatched": self.dispatched_count,
+            "dropped": {
+                name: self.dropped_count[priority]
+                for name, priority in PRIORITY_NAMES.items()
+            },
+            "latency_ms": {
+                "p50": percentile(0.5),
+                "p99": percentile(0.99),
+                "max": round(self._max_latency * 1000, 2),
+            },
+        }
@@ -1,11 +1,15 @@
 import json
 import asyncio
+from collections import Counter
 from logger import logger
 import os
 import importlib
 import inspect
-from config import OWNER_ID
+from config import OWNER_ID, EVENT_WORKER_COUNT, EVENT_QUEUE_SIZE, LOOP_LAG_WARN_MS
+from event_queue import EventQueue, PRIORITY_HIGH, PRIORITY_NORMAL, PRIORITY_NAMES
 from api.message import send_private_msg
+from api.action import resolve_action_response
+from core.loop_monitor import LoopLagMonitor
 from utils.generate import generate_text_message
 
 
@@ -26,11 +30,65 @@ CORE_MODULES = [
     # 在这里添加其他必须加载的核心模块
 ]
 
+# 订阅所有事件的通配类型，未声明 EVENT_KINDS 的模块默认订阅所有事件
+EVENT_KIND_ALL = "*"
+
+# 回应事件的类型前缀，格式为 response:<echo前缀>，如 response:get_msg
+RESPONSE_KIND = "response"
+RESPONSE_KIND_PREFIX = f"{RESPONSE_KIND}:"
+
+# 这些类型的事件无论模块优先级如何，都进入高优先级通道
+HIGH_PRIORITY_POST_TYPES = ("notice", "request")
+
+# 各类上报事件用于细分类型的字段，如 message.group、notice.group_increase
+EVENT_DETAIL_FIELDS = {
+    "message": "message_type",
+    "message_sent": "message_type",
+    "notice": "notice_type",
+    "request": "request_type",
+    "meta_event": "meta_event_type",
+}
+
+
+def get_event_kinds(msg):
+    """
+    计算事件的类型键，返回 (具体类型, 用于匹配订阅的类型列表)
+
+    上报事件：("message.group", ["*", "message", "message.group"])
+    回应事件：("response", ["*", "response"])，echo 前缀由分发器另行匹配
+    """
+    post_type = msg.get("post_type")
+    if not post_type:
+        return RESPONSE_KIND, [EVENT_KIND_ALL, RESPONSE_KIND]
+
+    detail = msg.get(EVENT_DETAIL_FIELDS.get(post_type, ""), "")
+    if not detail:
+        return post_type, [EVENT_KIND_ALL, post_type]
+
+    kind = f"{post_type}.{detail}"
+    return kind, [EVENT_KIND_ALL, post_type, kind]
+
 
 class EventHandler:
     def __init__(self, websocket):
         self.websocket = websocket
         self.handlers = []
+        # 与 handlers 一一对应的优先级通道
+        self.handler_priorities = []
+        # 事件类型 -> 订阅该类型的处理器下标，加载时建立
+        self.kind_index = {}
+        # echo前缀 -> 订阅该前缀回应事件的处理器下标
+        self.echo_prefix_index = {}
+        # 按类型键缓存的处理器列表，避免每个事件重复合并索引
+        self._route_cache = {}
+        # 各事件类型的分发次数，可通过 get_dispatch_stats() 查看
+        self.dispatch_counter = Counter()
+        # 有界事件队列，由固定数量的 worker 执行模块任务
+        self.event_queue = EventQueue(EVENT_WORKER_COUNT, EVENT_QUEUE_SIZE)
+        self.event_queue.start()
+        # 事件循环阻塞监控
+        self.loop_monitor = LoopLagMonitor(LOOP_LAG_WARN_MS)
+        self.loop_monitor.start()
         # 用于记录成功加载的模块
         self.loaded_modules = []
         # 用于记录加载失败的模块及原因
@@ -81,7 +139,12 @@ class EventHandler:
             try:
                 module = importlib.import_module(module_path)
                 handler = getattr(module, handler_name)
-                self.handlers.append(handler)
+                self._register_handler(
+                    handler,
+                    getattr(module, "EVENT_KINDS", None),
+                    module_path,
+                    PRIORITY_HIGH,
+                )
                 # 记录成功加载的模块
                 self.loaded_modules.append(f"{module_path}.{handler_name}")
                 logger.info(f"已加载核心模块: {module_path}.{handler_name}")
@@ -140,7 +203,15 @@ class EventHandler:
                 if hasattr(module, "handle_events") and inspect.iscoroutinefunction(
                     module.handle_events
                 ):
-                    self.handlers.append(module.handle_events)
+                    self._register_handler(
+                        module.handle_events,
+                        getattr(init_module, "EVENT_KINDS", None),
+                        module_name,
+                        PRIORITY_NAMES.get(
+                            getattr(init_module, "EVENT_PRIORITY", "normal"),
+                            PRIORITY_NORMAL,
+                        ),
+                    )
                     # 记录成功加载的模块
                     self.loaded_modules.append(module_name)
                     logger.info(f"已加载模块: {module_name}")
@@ -157,6 +228,77 @@ class EventHandler:
                 self.failed_modules.append((module_name, str(e)))
                 logger.error(f"加载模块失败: {module_name}, 错误: {e}")
 
+    def _register_handler(self, handler, event_kinds, name, priority):
+        """
+        登记处理器并建立事件类型索引
+
+        Args:
+            handler: 异步事件处理函数
+            event_kinds: 模块声明的订阅类型列表，为None时订阅所有事件
+            name: 模块名称，用于日志
+            priority: 处理器所在的优先级通道
+        """
+        if not event_kinds:
+            event_kinds = [EVENT_KIND_ALL]
+
+        handler_index = len(self.handlers)
+        self.handlers.append(handler)
+        self.handler_priorities.append(priority)
+
+        for kind in event_kinds:
+            if kind.startswith(RESPONSE_KIND_PREFIX):
+                prefix = kind[len(RESPONSE_KIND_PREFIX) :]
+                self.echo_prefix_index.setdefault(prefix, []).append(handler_index)
+            else:
+                self.kind_index.setdefault(kind, []).append(handler_index)
+
+        logger.debug(f"模块 {name} 订阅事件类型: {', '.join(event_kinds)}")
+
+    def _resolve_handlers(self, kinds, echo):
+        """根据事件类型键和echo查找需要唤醒的处理器及其优先级，保持加载顺序"""
+        matched_prefixes = ()
+        if kinds[-1] == RESPONSE_KIND and isinstance(echo, str):
+            matched_prefixes = tuple(
+                prefix for prefix in self.echo_prefix_index if echo.startswith(prefix)
+            )
+
+        cache_key = (kinds[-1], matched_prefixes)
+        handlers = self._route_cache.get(cache_key)
+        if handlers is None:
+            handler_indexes = set()
+            for kind in kinds:
+                handler_indexes.update(self.kind_index.get(kind, ()))
+            for prefix in matched_prefixes:
+                handler_indexes.update(self.echo_prefix_index[prefix])
+            handlers = [
+                (self.handlers[index], self.handler_priorities[index])
+                for index in sorted(handler_indexes)
+            ]
+            self._route_cache[cache_key] = handlers
+        return handlers
+
+    def get_dispatch_stats(self):
+        """
+        获取各事件类型的分发统计
+
+        Returns:
+            dict: {事件类型: 分发次数}，如 {"message.group": 120, "response": 30}
+        """
+        return dict(self.dispatch_counter)
+
+    def get_queue_stats(self):
+        """获取事件队列的深度、丢弃数和分发延迟"""
+        return self.event_queue.get_stats()
+
+    def get_loop_stats(self):
+        """获取事件循环的阻塞时长和阻塞次数"""
+        return self.loop_monitor.get_stats()
+
+    async def close(self):
+        """连接断开时停止事件队列和阻塞监控"""
+        await self.event_queue.stop()
+        await self.loop_monitor.stop()
+
     async def _safe_handle(self, handler, websocket, msg):
         try:
             await handler(websocket, msg)
@@ -185,9 +327,26 @@ class EventHandler:
             ):
                 logger.info(f"接收到websocket消息: {msg}")
 
-            # 每个 handler 独立异步后台处理
-            for handler in self.handlers:
-                asyncio.create_task(self._safe_handle(handler, websocket, msg))
+            # 可等待请求的回应直接交给等待方，不再广播给各模块
+            if resolve_action_response(msg):
+                self.dispatch_counter["response.awaited"] += 1
+                return
+
+            # 只把事件交给订阅了该事件类型的 handler，由事件队列按优先级和群轮转执行
+            kind, kinds = get_event_kinds(msg)
+            self.dispatch_counter[kind] += 1
+            post_type = msg.get("post_type")
+            force_high = not post_type or post_type in HIGH_PRIORITY_POST_TYPES
+            group_key = str(msg.get("group_id") or msg.get("user_id") or "")
+            for handler, priority in self._resolve_handlers(kinds, echo_value):
+                self.event_queue.submit(
+                    PRIORITY_HIGH if force_high else priority,
+                    group_key,
+                    self._safe_handle,
+                    handler,
+                    websocket,
+                    msg,
+                )
 
         except Exception as e:
             logger.error(f"处理websocket消息的逻辑错误: {e}")
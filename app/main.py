@@ -4,6 +4,10 @@ import asyncio
 from datetime import datetime
 from logger import logger
 from bot import connect_to_bot
+from core.db_pool import close_all as close_db_connections
+from core.async_db import close_all as close_async_databases
+from core.process_pool import close_all as close_process_pool
+from core.http_client import close_all as close_http_client
 from config import OWNER_ID, WS_URL, TOKEN, FEISHU_BOT_URL, FEISHU_BOT_SECRET
 
 
@@ -40,19 +44,23 @@ class Application:
         """运行主程序"""
         # 打印当前运行根目录
         logger.info(f"当前运行根目录: {os.getcwd()}")
-        while True:
-            try:
-                result = await connect_to_bot()
-                if result is None:
-                    raise ValueError("连接返回None")
-            except KeyboardInterrupt:
-                logger.error("检测到用户主动退出程序（Ctrl+C），程序已终止。")
-                break
-            except Exception as e:
-                current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                logger.error(f"连接失败，正在重试: {e} 当前时间: {current_time}")
+        try:
+            while True:
+                try:
+                    result = await connect_to_bot()
+                    if result is None:
+                        raise ValueError("连接返回None")
+                except KeyboardInterrupt:
+                    logger.error("检测到用户主动退出程序（Ctrl+C），程序已终止。")
+                    break
+                except Exception as e:
+                    current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    logger.error(f"连接失败，正在重试: {e} 当前时间: {current_time}")
 
-                await asyncio.sleep(2)  # 每2秒重试一次
+                    await asyncio.sleep(2)  # 每2秒重试一次
+        finally:
+            # HTTP 会话需在事件循环关闭前关闭
+            await close_http_client()
 
 
 if __name__ == "__main__":
@@ -61,3 +69,7 @@ if __name__ == "__main__":
         asyncio.run(app.run())
     except KeyboardInterrupt:
         logger.error("检测到用户主动退出程序（Ctrl+C），程序已终止。")
+    finally:
+        close_process_pool()
+        close_async_databases()
+        close_db_connections()
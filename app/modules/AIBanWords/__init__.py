@@ -13,11 +13,26 @@ SWITCH_NAME = "aibw"
 # 模块描述
 MODULE_DESCRIPTION = "大模型敏感词检测"
 
+# 模块订阅的事件类型
+EVENT_KINDS = ["message"]
+
+# 模块任务的优先级通道
+EVENT_PRIORITY = "high"
+
 # 数据目录
 DATA_DIR = os.path.join("data", MODULE_NAME)
 os.makedirs(DATA_DIR, exist_ok=True)
 
 
+# 大模型检测配置
+MODERATION_CACHE_TTL = 6 * 60 * 60  # 检测结果缓存时长，单位：秒
+MODERATION_CACHE_MAX_SIZE = 10000  # 检测结果缓存的最大条目数
+MODERATION_MAX_CONCURRENCY = 4  # 同时进行的大模型请求数上限
+MODERATION_BATCH_SIZE = 8  # 请求排队时单次请求合并检测的最大消息数
+MODERATION_RATE_PER_MINUTE = 60  # 每个API Key每分钟的请求数上限
+MODERATION_BURST = 10  # 每个API Key允许的突发请求数
+
+
 # 模块的一些命令可以在这里定义，方便在其他地方调用，提高代码的复用率
 # 一个主命令，其余子命令都以主命令开头，便于不同模块的命令区分
 # ------------------------------------------------------------
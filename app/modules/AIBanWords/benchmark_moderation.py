@@ -0,0 +1,185 @@
+"""
+大模型检测服务基准测试
+
+启动一个本地的假大模型接口（兼容 chat/completions，按关键词判定，固定延迟），
+把 api.siliconflow.cn 的请求重定向到该接口，对比以下两种方式：
+- 直接调用：每条消息调用一次 llm_client.check_message（旧行为）
+- 检测服务：经过 moderation_service（缓存、合并、批量、限流）
+统计大模型请求数、缓存命中率和每条消息的检测耗时。
+
+模拟流量：多个群在短时间内收到的消息，其中部分为同一条广告在多个群刷屏。
+
+用法（在 app 目录下执行）：
+    python -m modules.AIBanWords.benchmark_moderation
+    python -m modules.AIBanWords.benchmark_moderation --messages 300 --unique 60 --latency 0.5
+    python -m modules.AIBanWords.benchmark_moderation --serve 8080   # 只启动假接口
+"""
+
+import json
+import time
+import random
+import asyncio
+import argparse
+from aiohttp import web
+from core.http_client import set_host_override, close_all as close_http_client
+from .handlers import llm_client
+from .handlers.moderation_service import ModerationService
+
+# 假接口判定为违规的关键词
+RISKY_KEYWORDS = ("兼职", "刷单", "加我", "代写", "破解版", "日结")
+
+SPAM_TEMPLATES = (
+    "寒假兼职日结，手机就能做，加我QQ{}详聊",
+    "四六级代写包过，需要的同学加我{}",
+    "破解版网课资料免费领，进群{}",
+)
+NORMAL_TEMPLATES = (
+    "请问{}号宿舍楼离食堂远吗？",
+    "学长好，想问一下{}专业大一要选哪些课",
+    "有没有{}级的同学一起组队参加比赛",
+)
+
+
+def _judge(text):
+    risky = any(keyword in text for keyword in RISKY_KEYWORDS)
+    return {
+        "is_risky": risky,
+        "type": "TRAFFIC_DIVERSION" if risky else "NORMAL",
+        "reason": "命中引流关键词" if risky else "正常消息",
+        "confidence": 0.9,
+    }
+
+
+def create_fake_llm_app(latency):
+    """
+    创建假大模型接口
+
+    Args:
+        latency (float): 每次请求的固定延迟，单位：秒
+    """
+    app = web.Application()
+    # 请求计数，应用启动后不能再修改 app 的键，计数放在字典中
+    app["stats"] = stats = {"requests": 0}
+
+    async def chat_completions(request):
+        stats["requests"] += 1
+        body = await request.json()
+        content = body["messages"][-1]["content"].removeprefix("待检测消息：")
+        await asyncio.sleep(latency)
+        if content.startswith("["):
+            items = json.loads(content)
+            result = {
+                "results": [
+                    dict(_judge(item["text"]), id=item["id"]) for item in items
+                ]
+            }
+        else:
+            result = _judge(content)
+        return web.json_response(
+            {
+                "choices": [
+                    {"message": {"content": json.dumps(result, ensure_ascii=False)}}
+                ]
+            }
+        )
+
+    app.router.add_post("/v1/chat/completions", chat_completions)
+    return app
+
+
+def generate_traffic(count, unique, seed=0):
+    """
+    生成模拟消息流
+
+    Returns:
+        list: (到达时间（秒）, 消息文本) 列表，按到达时间排序
+    """
+    rng = random.Random(seed)
+    texts = []
+    for i in range(unique):
+        templates = SPAM_TEMPLATES if i % 3 == 0 else NORMAL_TEMPLATES
+        texts.append(rng.choice(templates).format(1000 + i))
+    traffic = []
+    for _ in range(count):
+        text = rng.choice(texts)
+        # 刷屏广告的副本只在空白和全半角上有差异
+        if rng.random() < 0.3:
+            text = text.replace("，", ",") + " "
+        traffic.append((rng.uniform(0, count / 40), text))
+    return sorted(traffic)
+
+
+def _percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent))]
+
+
+async def _replay(traffic, check):
+    start = time.monotonic()
+    latencies = []
+
+    async def _one(arrival, text):
+        await asyncio.sleep(max(0.0, start + arrival - time.monotonic()))
+        sent = time.monotonic()
+        await check(text)
+        latencies.append((time.monotonic() - sent) * 1000)
+
+    await asyncio.gather(*(_one(arrival, text) for arrival, text in traffic))
+    return latencies
+
+
+async def run_benchmark(args):
+    fake_app = create_fake_llm_app(args.latency)
+    runner = web.AppRunner(fake_app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    set_host_override("api.siliconflow.cn", f"http://127.0.0.1:{port}")
+    llm_client.SILICON_FLOW_API_KEY = llm_client.SILICON_FLOW_API_KEY or "benchmark"
+
+    traffic = generate_traffic(args.messages, args.unique)
+    try:
+        for mode in ("直接调用", "检测服务"):
+            fake_app["stats"]["requests"] = 0
+            if mode == "直接调用":
+                check = llm_client.check_message
+            else:
+                service = ModerationService()
+                check = service.check
+            latencies = await _replay(traffic, check)
+            line = (
+                f"{mode}: {len(traffic)} 条消息, 大模型请求 {fake_app['stats']['requests']} 次, "
+                f"p50 {_percentile(latencies, 0.5):.0f}ms, "
+                f"p95 {_percentile(latencies, 0.95):.0f}ms, "
+                f"最大 {max(latencies):.0f}ms"
+            )
+            if mode == "检测服务":
+                stats = service.get_stats()
+                line += (
+                    f", 缓存命中率 {stats['cache_hit_rate']:.1%}, "
+                    f"合并 {stats['coalesced']} 条, "
+                    f"批量检测 {stats['batched_messages']} 条"
+                )
+            print(line)
+    finally:
+        await close_http_client()
+        await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="大模型检测服务基准测试")
+    parser.add_argument("--messages", type=int, default=200, help="模拟消息数")
+    parser.add_argument("--unique", type=int, default=40, help="不同消息内容数")
+    parser.add_argument("--latency", type=float, default=0.3, help="假接口延迟（秒）")
+    parser.add_argument("--serve", type=int, default=0, help="只在指定端口启动假接口")
+    args = parser.parse_args()
+
+    if args.serve:
+        web.run_app(create_fake_llm_app(args.latency), host="127.0.0.1", port=args.serve)
+    else:
+        asyncio.run(run_benchmark(args))
+
+
+if __name__ == "__main__":
+    main()
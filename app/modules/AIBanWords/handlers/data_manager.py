@@ -1,6 +1,6 @@
-import sqlite3
 import os
 from .. import MODULE_NAME
+from core.db_pool import get_connection, run_schema_once
 
 
 class DataManager:
@@ -8,9 +8,9 @@ class DataManager:
         data_dir = os.path.join("data", MODULE_NAME)
         os.makedirs(data_dir, exist_ok=True)
         db_path = os.path.join(data_dir, f"{MODULE_NAME}.db")
-        self.conn = sqlite3.connect(db_path)
+        self.conn = get_connection(db_path)
         self.cursor = self.conn.cursor()
-        self._create_table()
+        run_schema_once(db_path, self._create_table)
 
     def _create_table(self):
         """建表函数，如果表不存在则创建"""
@@ -27,4 +27,4 @@ class DataManager:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.conn.close()
+        self.cursor.close()
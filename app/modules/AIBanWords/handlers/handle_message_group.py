@@ -12,7 +12,7 @@ from utils.generate import (
 from datetime import datetime
 from .data_manager import DataManager
 from core.menu_manager import MenuManager
-from .llm_client import check_message
+from .moderation_service import moderation_service
 from utils.feishu import send_feishu_msg
 from core.get_group_list import get_group_name_by_id
 
@@ -105,8 +105,8 @@ class GroupMessageHandler:
             if "[CQ:" in self.raw_message:
                 return
 
-            # 调用LLM检测
-            result = await check_message(self.raw_message)
+            # 调用LLM检测（相同消息复用缓存结果）
+            result = await moderation_service.check(self.raw_message)
 
             if result.get("is_risky"):
                 reason = result.get("reason", "违规内容")
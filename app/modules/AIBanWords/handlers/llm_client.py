@@ -1,35 +1,18 @@
 import json
 import os
-import aiohttp
 from logger import logger
+from core.http_client import http_post
 from .. import MODULE_NAME
 
 # 配置
 SILICON_FLOW_API_KEY = os.getenv("SILICON_FLOW_API_KEY")
 BASE_URL = "https://api.siliconflow.cn/v1/chat/completions"
 
-
 # Qwen/Qwen2-7B-Instruct, Qwen/Qwen2.5-72B-Instruct
-async def check_message(text, model="Qwen/Qwen2-7B-Instruct"):
-    """
-    检测消息是否违规
-    :param text: 待检测的文本
-    :param model: 使用的模型
-    :return: 字典 {'is_risky': bool, 'reason': str, 'type': str}
-    """
-    if not SILICON_FLOW_API_KEY:
-        # 尝试从硬编码的备用Key获取（仅作为示例，实际应确保环境变量存在）
-        # 或者记录错误并返回安全
-        logger.error(f"[{MODULE_NAME}] 未配置 SILICON_FLOW_API_KEY 环境变量")
-        return {
-            "is_risky": False,
-            "type": "ERROR",
-            "reason": "未配置API Key",
-            "confidence": 0,
-        }
-
-    # 系统提示词
-    system_prompt = """
+DEFAULT_MODEL = "Qwen/Qwen2-7B-Instruct"
+
+# 系统提示词
+SYSTEM_PROMPT = """
     你是一个严厉但公正的“大学新生迎新群”的管理员。你的任务是检测用户发送的消息是否包含违规内容。
     
     请主要关注以下几类违规（Risk Types）：
@@ -53,6 +36,32 @@ async def check_message(text, model="Qwen/Qwen2-7B-Instruct"):
     }
     """
 
+# 批量检测时追加到系统提示词后的说明
+BATCH_PROMPT = """
+    本次需要同时检测多条消息，消息以 JSON 数组给出，每项包含编号 id 和消息内容 text。
+    请对每条消息独立判定，互不影响。请仅以 JSON 格式返回结果，results 中每项对应一条消息并带上原编号，格式如下：
+    {
+        "results": [
+            {"id": 0, "is_risky": true/false, "type": "类型", "reason": "简短的中文理由", "confidence": 0.95}
+        ]
+    }
+    """
+
+
+def _error_result(reason):
+    return {
+        "is_risky": False,
+        "type": "ERROR",
+        "reason": reason,
+        "confidence": 0,
+    }
+
+
+async def _chat(system_prompt, user_content, model):
+    """
+    调用对话接口并解析返回的 JSON
+    :return: 解析后的结果，失败时返回 type 为 ERROR 的结果字典
+    """
     headers = {
         "Authorization": f"Bearer {SILICON_FLOW_API_KEY}",
         "Content-Type": "application/json",
@@ -62,48 +71,83 @@ async def check_message(text, model="Qwen/Qwen2-7B-Instruct"):
         "model": model,
         "messages": [
             {"role": "system", "content": system_prompt},
-            {"role": "user", "content": f"待检测消息：{text}"},
+            {"role": "user", "content": user_content},
         ],
         "temperature": 0.1,
         "response_format": {"type": "json_object"},
     }
 
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.post(BASE_URL, headers=headers, json=data) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    logger.error(
-                        f"[{MODULE_NAME}] API调用失败: {response.status} - {error_text}"
-                    )
-                    return {
-                        "is_risky": False,
-                        "type": "ERROR",
-                        "reason": f"API调用失败: {response.status}",
-                        "confidence": 0,
-                    }
-
-                result = await response.json()
-                content = result["choices"][0]["message"]["content"]
-
-                if isinstance(content, str):
-                    try:
-                        return json.loads(content)
-                    except json.JSONDecodeError:
-                        logger.error(f"[{MODULE_NAME}] JSON解析失败: {content}")
-                        return {
-                            "is_risky": False,
-                            "type": "ERROR",
-                            "reason": "解析响应失败",
-                            "confidence": 0,
-                        }
-                return content
+        async with http_post(BASE_URL, headers=headers, json=data) as response:
+            if response.status != 200:
+                error_text = await response.text()
+                logger.error(
+                    f"[{MODULE_NAME}] API调用失败: {response.status} - {error_text}"
+                )
+                return _error_result(f"API调用失败: {response.status}")
+
+            result = await response.json()
+            content = result["choices"][0]["message"]["content"]
+
+            if isinstance(content, str):
+                try:
+                    return json.loads(content)
+                except json.JSONDecodeError:
+                    logger.error(f"[{MODULE_NAME}] JSON解析失败: {content}")
+                    return _error_result("解析响应失败")
+            return content
 
     except Exception as e:
         logger.error(f"[{MODULE_NAME}] API调用出错: {e}")
-        return {
-            "is_risky": False,
-            "type": "ERROR",
-            "reason": "检测服务异常",
-            "confidence": 0,
-        }
+        return _error_result("检测服务异常")
+
+
+async def check_message(text, model=DEFAULT_MODEL):
+    """
+    检测消息是否违规
+    :param text: 待检测的文本
+    :param model: 使用的模型
+    :return: 字典 {'is_risky': bool, 'reason': str, 'type': str}
+    """
+    if not SILICON_FLOW_API_KEY:
+        # 尝试从硬编码的备用Key获取（仅作为示例，实际应确保环境变量存在）
+        # 或者记录错误并返回安全
+        logger.error(f"[{MODULE_NAME}] 未配置 SILICON_FLOW_API_KEY 环境变量")
+        return _error_result("未配置API Key")
+
+    return await _chat(SYSTEM_PROMPT, f"待检测消息：{text}", model)
+
+
+async def check_messages(texts, model=DEFAULT_MODEL):
+    """
+    在一次请求中检测多条消息
+    :param texts: 待检测的文本列表
+    :param model: 使用的模型
+    :return: 与 texts 一一对应的结果列表；接口调用失败时每项均为错误结果；
+             模型返回的结果缺条或无法对应时返回None，由调用方逐条重试
+    """
+    if not SILICON_FLOW_API_KEY:
+        logger.error(f"[{MODULE_NAME}] 未配置 SILICON_FLOW_API_KEY 环境变量")
+        return [_error_result("未配置API Key") for _ in texts]
+
+    items = [{"id": index, "text": text} for index, text in enumerate(texts)]
+    result = await _chat(
+        SYSTEM_PROMPT + BATCH_PROMPT,
+        f"待检测消息：{json.dumps(items, ensure_ascii=False)}",
+        model,
+    )
+    if isinstance(result, dict) and result.get("type") == "ERROR":
+        return [dict(result) for _ in texts]
+
+    results = result.get("results") if isinstance(result, dict) else None
+    verdicts = {}
+    for item in results if isinstance(results, list) else []:
+        if isinstance(item, dict) and isinstance(item.get("id"), int):
+            verdicts[item.pop("id")] = item
+    if set(verdicts) != set(range(len(texts))):
+        logger.warning(
+            f"[{MODULE_NAME}] 批量检测结果不完整: 期望 {len(texts)} 条，"
+            f"有效 {len(verdicts)} 条"
+        )
+        return None
+    return [verdicts[index] for index in range(len(texts))]
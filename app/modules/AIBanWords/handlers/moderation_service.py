@@ -0,0 +1,247 @@
+"""
+大模型检测服务
+
+群消息不再直接调用 llm_client，而是经过本服务：
+- 结果缓存：消息按归一化文本（NFKC、去首尾空白、合并空白、小写）的 SHA-1 缓存检测结果，
+  同一条广告刷屏到多个群时只调用一次大模型；检测失败的结果不缓存
+- 请求合并：相同消息的并发检测共用同一次请求
+- 批量检测：同时进行的请求数达到 MODERATION_MAX_CONCURRENCY 或被限流时，新消息在队列中等待，
+  队列中积压的多条消息合并为一次请求（最多 MODERATION_BATCH_SIZE 条）；空闲时逐条立即检测，不增加延迟
+- 限流：每个 API Key 一个令牌桶，每次请求（无论合并了几条消息）消耗一个令牌
+- 指标：缓存命中率、合并数、大模型请求数、检测耗时，见 get_stats
+"""
+
+import re
+import time
+import asyncio
+import hashlib
+import unicodedata
+from collections import OrderedDict
+from logger import logger
+from core.rate_limiter import TokenBucket
+from . import llm_client
+from .. import (
+    MODULE_NAME,
+    MODERATION_CACHE_TTL,
+    MODERATION_CACHE_MAX_SIZE,
+    MODERATION_MAX_CONCURRENCY,
+    MODERATION_BATCH_SIZE,
+    MODERATION_RATE_PER_MINUTE,
+    MODERATION_BURST,
+)
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+def normalize_text(text):
+    """归一化消息文本，仅用于计算缓存键，发送给大模型的仍是原文"""
+    text = unicodedata.normalize("NFKC", text)
+    return WHITESPACE_PATTERN.sub(" ", text).strip().lower()
+
+
+def _error_verdict():
+    return {
+        "is_risky": False,
+        "type": "ERROR",
+        "reason": "检测服务异常",
+        "confidence": 0,
+    }
+
+
+def _cache_key(text):
+    return hashlib.sha1(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class _PendingCheck:
+    """队列中等待检测的消息"""
+
+    __slots__ = ("key", "text", "future")
+
+    def __init__(self, key, text, future):
+        self.key = key
+        self.text = text
+        self.future = future
+
+
+class ModerationService:
+    """大模型检测服务，检测任务在首次调用时于当前事件循环中启动"""
+
+    def __init__(self):
+        # 缓存键 -> (过期时间, 检测结果)
+        self._cache = OrderedDict()
+        # 缓存键 -> Future，正在检测的消息
+        self._pending = {}
+        # API Key -> TokenBucket
+        self._buckets = {}
+        self._queue = None
+        self._slots = None
+        self._task = None
+        self._loop = None
+        # 进行中的请求任务，保持引用避免被回收
+        self._dispatching = set()
+
+        # 指标
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.coalesced = 0
+        self.llm_requests = 0
+        self.batched_messages = 0
+        self.verdict_count = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._loop is not loop:
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(MODERATION_MAX_CONCURRENCY)
+            self._pending = {}
+            self._loop = loop
+            self._task = loop.create_task(self._run(), name="ai-ban-words-moderation")
+
+    def _get_bucket(self):
+        api_key = llm_client.SILICON_FLOW_API_KEY or ""
+        bucket = self._buckets.get(api_key)
+        if bucket is None:
+            bucket = self._buckets[api_key] = TokenBucket(
+                MODERATION_RATE_PER_MINUTE / 60, MODERATION_BURST
+            )
+        return bucket
+
+    def _get_cached(self, key):
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        expire_at, verdict = entry
+        if expire_at <= time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return verdict
+
+    def _set_cached(self, key, verdict):
+        if not isinstance(verdict, dict) or verdict.get("type") == "ERROR":
+            return
+        self._cache[key] = (time.monotonic() + MODERATION_CACHE_TTL, verdict)
+        self._cache.move_to_end(key)
+        while len(self._cache) > MODERATION_CACHE_MAX_SIZE:
+            self._cache.popitem(last=False)
+
+    async def check(self, text):
+        """
+        检测消息是否违规
+
+        Args:
+            text (str): 消息文本
+
+        Returns:
+            dict: 检测结果 {'is_risky': bool, 'reason': str, 'type': str, 'confidence': float}
+        """
+        start = time.monotonic()
+        key = _cache_key(text)
+        verdict = self._get_cached(key)
+        if verdict is not None:
+            self.cache_hits += 1
+            return dict(verdict)
+        self.cache_misses += 1
+
+        self._ensure_worker()
+        future = self._pending.get(key)
+        if future is not None:
+            self.coalesced += 1
+        else:
+            future = self._loop.create_future()
+            self._pending[key] = future
+            self._queue.put_nowait(_PendingCheck(key, text, future))
+
+        verdict = dict(await asyncio.shield(future))
+        latency = time.monotonic() - start
+        self.verdict_count += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+        return verdict
+
+    async def _run(self):
+        while True:
+            first = await self._queue.get()
+            await self._slots.acquire()
+            try:
+                await self._get_bucket().acquire()
+            except BaseException:
+                self._slots.release()
+                raise
+            # 等待期间积压的消息合并到同一次请求
+            batch = [first]
+            while len(batch) < MODERATION_BATCH_SIZE and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            task = asyncio.create_task(self._dispatch(batch))
+            self._dispatching.add(task)
+            task.add_done_callback(self._dispatching.discard)
+
+    async def _dispatch(self, batch):
+        try:
+            try:
+                self.llm_requests += 1
+                if len(batch) == 1:
+                    verdicts = [await llm_client.check_message(batch[0].text)]
+                else:
+                    self.batched_messages += len(batch)
+                    verdicts = await llm_client.check_messages(
+                        [item.text for item in batch]
+                    )
+                    if verdicts is None:
+                        # 批量结果无法对应时逐条检测
+                        verdicts = []
+                        for item in batch:
+                            await self._get_bucket().acquire()
+                            self.llm_requests += 1
+                            verdicts.append(await llm_client.check_message(item.text))
+            except Exception as e:
+                logger.error(f"[{MODULE_NAME}] 大模型检测失败: {e}")
+                verdicts = [_error_verdict() for _ in batch]
+            finally:
+                self._slots.release()
+
+            for item, verdict in zip(batch, verdicts):
+                self._set_cached(item.key, verdict)
+                self._resolve(item, verdict)
+        finally:
+            # 任务被取消或结果数量不足时，未得到结果的消息按检测异常返回（不缓存），
+            # 避免等待中的调用方一直挂起
+            for item in batch:
+                self._resolve(item, _error_verdict())
+
+    def _resolve(self, item, verdict):
+        if self._pending.get(item.key) is item.future:
+            del self._pending[item.key]
+        if not item.future.done():
+            item.future.set_result(verdict)
+
+    def get_stats(self):
+        """
+        获取检测服务统计信息
+
+        Returns:
+            dict: 缓存命中率、合并请求数、大模型请求数、批量检测的消息数、平均/最大检测耗时（毫秒）
+        """
+        lookups = self.cache_hits + self.cache_misses
+        return {
+            "cache_size": len(self._cache),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+            "cache_hit_rate": self.cache_hits / lookups if lookups else 0.0,
+            "coalesced": self.coalesced,
+            "llm_requests": self.llm_requests,
+            "batched_messages": self.batched_messages,
+            "queue_size": self._queue.qsize() if self._queue is not None else 0,
+            "avg_latency_ms": (
+                self.total_latency / self.verdict_count * 1000
+                if self.verdict_count
+                else 0.0
+            ),
+            "max_latency_ms": self.max_latency * 1000,
+        }
+
+
+# 全局检测服务
+moderation_service = ModerationService()
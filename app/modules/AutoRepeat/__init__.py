@@ -13,6 +13,12 @@ SWITCH_NAME = "ar"
 # 模块描述
 MODULE_DESCRIPTION = "一个随机复读上一条消息的模块，随机戳一戳上一个说话的人"
 
+# 模块订阅的事件类型
+EVENT_KINDS = ["message"]
+
+# 模块任务的优先级通道
+EVENT_PRIORITY = "low"
+
 # 数据目录
 DATA_DIR = os.path.join("data", MODULE_NAME)
 os.makedirs(DATA_DIR, exist_ok=True)
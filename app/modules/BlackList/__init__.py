@@ -13,10 +13,19 @@ SWITCH_NAME = "BL"
 # 模块描述
 MODULE_DESCRIPTION = "黑名单模块"
 
+# 模块订阅的事件类型
+EVENT_KINDS = ["message", "notice.group_increase", "request", "response:get_msg"]
+
+# 模块任务的优先级通道
+EVENT_PRIORITY = "high"
+
 # 数据目录
 DATA_DIR = os.path.join("data", MODULE_NAME)
 os.makedirs(DATA_DIR, exist_ok=True)
 
+# 扫黑时可接受的群成员列表时长，单位：秒，超过时重新获取
+SCAN_MEMBER_LIST_MAX_AGE = 60
+
 
 # 模块的一些命令可以在这里定义，方便在其他地方调用，提高代码的复用率
 # ------------------------------------------------------------
@@ -1,21 +1,149 @@
 import sqlite3
 import os
+import threading
 from datetime import datetime
 from .. import DATA_DIR
+from core.db_pool import get_connection, run_schema_once
+
+# 全局黑名单在表中的 group_id
+GLOBAL_GROUP_ID = "global"
+
+
+class BlacklistIndex:
+    """
+    黑名单内存索引
+
+    每条群消息、每次进群都要查询黑名单，而绝大多数用户不在黑名单中。索引在首次使用时从数据库加载，
+    之后由 BlackListDataManager 的添加、移除方法在写入数据库后同步更新，查询不再访问数据库。
+    """
+
+    def __init__(self):
+        # 全局黑名单QQ号
+        self.global_users = set()
+        # 群号 -> 群黑名单QQ号集合
+        self.group_users = {}
+        self.loaded = False
+        self.load_lock = threading.Lock()
+
+    def load(self, rows):
+        """用 (group_id, user_id) 记录替换索引"""
+        global_users = set()
+        group_users = {}
+        for group_id, user_id in rows:
+            if group_id == GLOBAL_GROUP_ID:
+                global_users.add(str(user_id))
+            else:
+                group_users.setdefault(str(group_id), set()).add(str(user_id))
+        self.global_users = global_users
+        self.group_users = group_users
+        self.loaded = True
+
+    def add(self, group_id, user_id):
+        if group_id == GLOBAL_GROUP_ID:
+            self.global_users.add(str(user_id))
+        else:
+            self.group_users.setdefault(str(group_id), set()).add(str(user_id))
+
+    def remove(self, group_id, user_id):
+        if group_id == GLOBAL_GROUP_ID:
+            self.global_users.discard(str(user_id))
+            return
+        users = self.group_users.get(str(group_id))
+        if users is not None:
+            users.discard(str(user_id))
+            if not users:
+                del self.group_users[str(group_id)]
+
+    def contains(self, group_id, user_id):
+        """用户是否在群黑名单中（group_id 为 'global' 时查询全局黑名单）"""
+        if group_id == GLOBAL_GROUP_ID:
+            return str(user_id) in self.global_users
+        return str(user_id) in self.group_users.get(str(group_id), ())
+
+    def is_blacklisted(self, group_id, user_id):
+        """用户是否在全局黑名单或群黑名单中"""
+        user_id = str(user_id)
+        return user_id in self.global_users or user_id in self.group_users.get(
+            str(group_id), ()
+        )
+
+    def find_blacklisted(self, group_id, user_ids):
+        """从给定的QQ号中找出在全局黑名单或群黑名单中的用户"""
+        user_ids = {str(user_id) for user_id in user_ids}
+        blacklisted = user_ids & self.global_users
+        blacklisted |= user_ids & self.group_users.get(str(group_id), set())
+        return blacklisted
+
+
+# 全局黑名单索引
+blacklist_index = BlacklistIndex()
+
+
+def _ensure_index_loaded():
+    if not blacklist_index.loaded:
+        # 创建数据管理器时会加载索引
+        with BlackListDataManager():
+            pass
+
+
+def is_user_blacklisted(group_id, user_id):
+    """
+    检查用户是否在黑名单中（包括群黑名单和全局黑名单），只查询内存索引
+
+    Args:
+        group_id (str): 群号
+        user_id (str): 用户QQ号
+
+    Returns:
+        bool: 是否在黑名单中
+    """
+    _ensure_index_loaded()
+    return blacklist_index.is_blacklisted(group_id, user_id)
+
+
+def is_in_global_blacklist(user_id):
+    """检查用户是否在全局黑名单中，只查询内存索引"""
+    _ensure_index_loaded()
+    return blacklist_index.contains(GLOBAL_GROUP_ID, user_id)
+
+
+def find_blacklisted_members(group_id, member_ids):
+    """
+    找出群成员中的黑名单用户（包括群黑名单和全局黑名单），只查询内存索引
+
+    Args:
+        group_id (str): 群号
+        member_ids (list): 群成员QQ号列表
+
+    Returns:
+        list: 黑名单用户QQ号，保持 member_ids 中的顺序
+    """
+    _ensure_index_loaded()
+    blacklisted = blacklist_index.find_blacklisted(group_id, member_ids)
+    return [member_id for member_id in member_ids if str(member_id) in blacklisted]
 
 
 class BlackListDataManager:
     def __init__(self):
         self.db_path = os.path.join(DATA_DIR, "blacklist.db")
-        self.conn = sqlite3.connect(self.db_path)
+        self.conn = get_connection(self.db_path)
         self.cursor = self.conn.cursor()
-        self._create_table()
+        run_schema_once(self.db_path, self._create_table)
+        if not blacklist_index.loaded:
+            self._load_index()
+
+    def _load_index(self):
+        with blacklist_index.load_lock:
+            if blacklist_index.loaded:
+                return
+            self.cursor.execute("SELECT group_id, user_id FROM blacklist")
+            blacklist_index.load(self.cursor.fetchall())
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.conn.close()
+        self.cursor.close()
 
     def _create_table(self):
         """
@@ -63,6 +191,7 @@ class BlackListDataManager:
                 (group_id, user_id, created_at),
             )
             self.conn.commit()
+            blacklist_index.add(group_id, user_id)
             return True
         except sqlite3.Error as e:
             raise Exception(f"添加黑名单失败: {str(e)}")
@@ -81,6 +210,7 @@ class BlackListDataManager:
                 (group_id, user_id),
             )
             self.conn.commit()
+            blacklist_index.remove(group_id, user_id)
             return True
         except sqlite3.Error as e:
             raise Exception(f"移除黑名单失败: {str(e)}")
@@ -91,17 +221,8 @@ class BlackListDataManager:
         :param group_id: 群组ID
         :param user_id: 用户ID
         :return: 是否在黑名单中
-        :raises: Exception 查询失败时抛出异常
         """
-        try:
-            self.cursor.execute(
-                "SELECT COUNT(*) FROM blacklist WHERE group_id = ? AND user_id = ?",
-                (group_id, user_id),
-            )
-            count = self.cursor.fetchone()[0]
-            return count > 0
-        except sqlite3.Error as e:
-            raise Exception(f"查询黑名单失败: {str(e)}")
+        return blacklist_index.contains(group_id, user_id)
 
     def get_group_blacklist(self, group_id: str) -> list:
         """
@@ -138,9 +259,10 @@ class BlackListDataManager:
             self.cursor.execute(
                 """INSERT INTO blacklist (group_id, user_id, created_at) 
                 VALUES (?, ?, ?)""",
-                ("global", user_id, created_at),
+                (GLOBAL_GROUP_ID, user_id, created_at),
             )
             self.conn.commit()
+            blacklist_index.add(GLOBAL_GROUP_ID, user_id)
             return True
         except sqlite3.Error as e:
             raise Exception(f"添加全局黑名单失败: {str(e)}")
@@ -155,9 +277,10 @@ class BlackListDataManager:
         try:
             self.cursor.execute(
                 "DELETE FROM blacklist WHERE group_id = ? AND user_id = ?",
-                ("global", user_id),
+                (GLOBAL_GROUP_ID, user_id),
             )
             self.conn.commit()
+            blacklist_index.remove(GLOBAL_GROUP_ID, user_id)
             return True
         except sqlite3.Error as e:
             raise Exception(f"移除全局黑名单失败: {str(e)}")
@@ -169,15 +292,7 @@ class BlackListDataManager:
         :return: 是否在全局黑名单中
         :raises: Exception 查询失败时抛出异常
         """
-        try:
-            self.cursor.execute(
-                "SELECT COUNT(*) FROM blacklist WHERE group_id = ? AND user_id = ?",
-                ("global", user_id),
-            )
-            count = self.cursor.fetchone()[0]
-            return count > 0
-        except sqlite3.Error as e:
-            raise Exception(f"查询全局黑名单失败: {str(e)}")
+        return blacklist_index.contains(GLOBAL_GROUP_ID, user_id)
 
     def get_global_blacklist(self) -> list:
         """
@@ -188,7 +303,7 @@ class BlackListDataManager:
         try:
             self.cursor.execute(
                 "SELECT user_id, created_at FROM blacklist WHERE group_id = ?",
-                ("global",),
+                (GLOBAL_GROUP_ID,),
             )
             return self.cursor.fetchall()
         except sqlite3.Error as e:
@@ -200,12 +315,5 @@ class BlackListDataManager:
         :param group_id: 群组ID
         :param user_id: 用户ID
         :return: 是否在黑名单中
-        :raises: Exception 查询失败时抛出异常
         """
-        try:
-            # 检查是否在全局黑名单或群黑名单中
-            return self.is_in_global_blacklist(user_id) or self.is_in_blacklist(
-                group_id, user_id
-            )
-        except Exception as e:
-            raise Exception(f"查询用户黑名单状态失败: {str(e)}")
+        return blacklist_index.is_blacklisted(group_id, user_id)
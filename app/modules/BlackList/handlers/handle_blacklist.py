@@ -1,6 +1,6 @@
-from .data_manager import BlackListDataManager
+from .data_manager import BlackListDataManager, find_blacklisted_members
 from api.message import send_group_msg
-from api.group import set_group_kick, get_group_member_list
+from api.group import set_group_kick
 from utils.generate import generate_text_message, generate_reply_message
 from logger import logger
 import re
@@ -11,6 +11,7 @@ from .. import (
     BLACKLIST_SCAN_COMMAND,
     GLOBAL_BLACKLIST_ADD_COMMAND,
     GLOBAL_BLACKLIST_REMOVE_COMMAND,
+    SCAN_MEMBER_LIST_MAX_AGE,
 )
 
 
@@ -512,28 +513,17 @@ class BlackListHandle:
     async def scan_blacklist(self):
         """
         扫描群内黑名单用户并踢出
-        使用等待+读文件的方式，逻辑简单直观
         """
         try:
             # 导入必要模块
-            from core.get_group_member_list import get_group_member_user_ids
-            from api.group import set_group_kick
-            import asyncio
+            from core.get_group_member_list import fetch_group_member_user_ids
+            from core.moderation_executor import kick_members
 
-            # 先获取最新的群成员列表
-            await get_group_member_list(
-                self.websocket,
-                self.group_id,
-                True,  # 不使用缓存
-                note=f"{MODULE_NAME}-update-member-list-{self.group_id}",
+            # 获取最新的群成员QQ号列表，等待回应
+            member_ids = await fetch_group_member_user_ids(
+                self.websocket, self.group_id, max_age=SCAN_MEMBER_LIST_MAX_AGE
             )
 
-            # 等待一下让数据更新
-            await asyncio.sleep(1)
-
-            # 获取群成员QQ号列表
-            member_ids = get_group_member_user_ids(self.group_id)
-
             if not member_ids:
                 await send_group_msg(
                     self.websocket,
@@ -547,12 +537,8 @@ class BlackListHandle:
                 f"[{MODULE_NAME}]开始扫描群 {self.group_id} 的 {len(member_ids)} 个成员"
             )
 
-            # 检查每个成员是否在黑名单中
-            blacklisted_members = []
-            with BlackListDataManager() as data_manager:
-                for member_id in member_ids:
-                    if data_manager.is_user_blacklisted(self.group_id, member_id):
-                        blacklisted_members.append(member_id)
+            # 成员集合与黑名单集合取交集
+            blacklisted_members = find_blacklisted_members(self.group_id, member_ids)
 
             if not blacklisted_members:
                 await send_group_msg(
@@ -574,23 +560,24 @@ class BlackListHandle:
                 note="del_msg=10",
             )
 
-            # 踢出黑名单用户
-            kicked_count = 0
-            kick_messages = []
-
-            for member_id in blacklisted_members:
-                try:
-                    # 踢出用户
-                    await set_group_kick(self.websocket, self.group_id, member_id)
-                    kicked_count += 1
-                    kick_messages.append(f"用户 {member_id}")
-                    await asyncio.sleep(0.5)  # 避免频繁操作
-                except Exception as e:
-                    logger.error(f"[{MODULE_NAME}]踢出用户 {member_id} 失败: {e}")
+            # 踢出黑名单用户，批量请求并按统一速率执行
+            report = await kick_members(
+                self.websocket, self.group_id, blacklisted_members
+            )
+            kicked_count = len(report["succeeded"])
+            for member_id in report["failed"]:
+                logger.error(f"[{MODULE_NAME}]踢出用户 {member_id} 失败")
+            unconfirmed = report["unconfirmed"]
+            if unconfirmed:
+                logger.warning(f"[{MODULE_NAME}]踢出用户 {unconfirmed} 的结果未确认")
 
             # 发送完成消息
-            if kicked_count > 0:
+            if kicked_count > 0 or unconfirmed:
                 completion_message = f"扫黑完成！已踢出 {kicked_count} 个黑名单用户"
+                if unconfirmed:
+                    completion_message += (
+                        f"，另有 {len(unconfirmed)} 人请求超时，结果未确认"
+                    )
                 await send_group_msg(
                     self.websocket,
                     self.group_id,
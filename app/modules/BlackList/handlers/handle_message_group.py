@@ -24,7 +24,7 @@ from utils.generate import (
 from api.group import set_group_kick
 from datetime import datetime
 from .handle_blacklist import BlackListHandle
-from .data_manager import BlackListDataManager
+from .data_manager import is_user_blacklisted, is_in_global_blacklist
 from core.menu_manager import MenuManager
 
 
@@ -132,35 +132,33 @@ class GroupMessageHandler:
         :return: 如果是黑名单用户则返回True，否则返回False
         """
         try:
-            with BlackListDataManager() as data_manager:
-                if data_manager.is_user_blacklisted(self.group_id, self.user_id):
-                    # 如果用户在黑名单中，先撤回消息
-                    await delete_msg(self.websocket, self.message_id)
-
-                    # 判断是全局黑名单还是群黑名单
-                    is_global = data_manager.is_in_global_blacklist(self.user_id)
-                    blacklist_type = "全局黑名单" if is_global else "群黑名单"
-
-                    # 发送警告消息
-                    warning_at = generate_at_message(self.user_id)
-                    warning_msg = generate_text_message(
-                        f"({self.user_id})检测到你是{blacklist_type}用户，将自动撤回消息并将其踢出"
-                    )
-                    await send_group_msg(
-                        self.websocket,
-                        self.group_id,
-                        [warning_at, warning_msg],
-                        note="del_msg=30",
-                    )
-
-                    # 踢出用户并拉黑，拒绝后续加群请求
-                    await set_group_kick(
-                        self.websocket, self.group_id, self.user_id, True
-                    )
-                    logger.info(
-                        f"[{MODULE_NAME}]已踢出{blacklist_type}用户 {self.user_id} 并拒绝后续加群请求"
-                    )
-                    return True
+            # 只查询内存索引，非黑名单用户不访问数据库
+            if is_user_blacklisted(self.group_id, self.user_id):
+                # 如果用户在黑名单中，先撤回消息
+                await delete_msg(self.websocket, self.message_id)
+
+                # 判断是全局黑名单还是群黑名单
+                is_global = is_in_global_blacklist(self.user_id)
+                blacklist_type = "全局黑名单" if is_global else "群黑名单"
+
+                # 发送警告消息
+                warning_at = generate_at_message(self.user_id)
+                warning_msg = generate_text_message(
+                    f"({self.user_id})检测到你是{blacklist_type}用户，将自动撤回消息并将其踢出"
+                )
+                await send_group_msg(
+                    self.websocket,
+                    self.group_id,
+                    [warning_at, warning_msg],
+                    note="del_msg=30",
+                )
+
+                # 踢出用户并拉黑，拒绝后续加群请求
+                await set_group_kick(self.websocket, self.group_id, self.user_id, True)
+                logger.info(
+                    f"[{MODULE_NAME}]已踢出{blacklist_type}用户 {self.user_id} 并拒绝后续加群请求"
+                )
+                return True
             return False
         except Exception as e:
             logger.error(f"[{MODULE_NAME}]检查黑名单用户失败: {e}")
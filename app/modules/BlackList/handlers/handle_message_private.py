@@ -22,6 +22,7 @@ from .. import (
     PRIVATE_BLACKLIST_LIST_COMMAND,
     PRIVATE_BLACKLIST_CLEAR_COMMAND,
     PRIVATE_BLACKLIST_SCAN_COMMAND,
+    SCAN_MEMBER_LIST_MAX_AGE,
 )
 
 
@@ -593,16 +594,14 @@ class BlackListHandlePrivate(BlackListHandle):
 
             # 导入必要的模块
             from core.switchs import get_all_enabled_groups
-            from api.group import get_group_member_list
             from core.get_group_member_list import (
-                get_group_member_user_ids,
+                fetch_group_member_user_ids,
                 get_group_name_by_id,
             )
-            from .data_manager import BlackListDataManager
-            from api.group import set_group_kick
+            from .data_manager import find_blacklisted_members
+            from core.moderation_executor import kick_members
             from api.message import send_group_msg
             from utils.generate import generate_text_message
-            import asyncio
 
             if command_content:
                 # 扫描指定群
@@ -657,20 +656,11 @@ class BlackListHandlePrivate(BlackListHandle):
                 try:
                     group_name = get_group_name_by_id(group_id) or f"群{group_id}"
 
-                    # 先获取最新的群成员列表
-                    await get_group_member_list(
-                        self.websocket,
-                        group_id,
-                        True,  # 不使用缓存
-                        note=f"{MODULE_NAME}-update-member-list-{group_id}",
+                    # 获取最新的群成员QQ号列表，等待回应
+                    member_ids = await fetch_group_member_user_ids(
+                        self.websocket, group_id, max_age=SCAN_MEMBER_LIST_MAX_AGE
                     )
 
-                    # 等待一下让数据更新
-                    await asyncio.sleep(0.5)
-
-                    # 获取群成员QQ号列表
-                    member_ids = get_group_member_user_ids(group_id)
-
                     if not member_ids:
                         scan_results.append(
                             f"{group_name}({group_id})：无法获取群成员列表"
@@ -679,36 +669,31 @@ class BlackListHandlePrivate(BlackListHandle):
                             f"{group_name}({group_id})：无法获取群成员列表"
                         )
                     else:
-                        # 检查每个成员是否在黑名单中
-                        blacklisted_members = []
-                        with BlackListDataManager() as data_manager:
-                            for member_id in member_ids:
-                                if data_manager.is_user_blacklisted(
-                                    group_id, member_id
-                                ):
-                                    blacklisted_members.append(member_id)
+                        # 成员集合与黑名单集合取交集
+                        blacklisted_members = find_blacklisted_members(
+                            group_id, member_ids
+                        )
 
                         if not blacklisted_members:
                             batch_results.append(
                                 f"{group_name}({group_id})：未发现黑名单用户"
                             )
                         else:
-                            # 踢出黑名单用户
-                            kicked_count = 0
-                            kick_user_ids = []
-
-                            for member_id in blacklisted_members:
-                                try:
-                                    # 踢出用户
-                                    await set_group_kick(
-                                        self.websocket, group_id, member_id
-                                    )
-                                    kicked_count += 1
-                                    kick_user_ids.append(f"{member_id}")
-                                except Exception as e:
-                                    logger.error(
-                                        f"[{MODULE_NAME}]踢出用户 {member_id} 失败: {e}"
-                                    )
+                            # 踢出黑名单用户，批量请求并按统一速率执行
+                            report = await kick_members(
+                                self.websocket, group_id, blacklisted_members
+                            )
+                            kick_user_ids = report["succeeded"]
+                            kicked_count = len(kick_user_ids)
+                            for member_id in report["failed"]:
+                                logger.error(
+                                    f"[{MODULE_NAME}]踢出用户 {member_id} 失败"
+                                )
+                            if report["unconfirmed"]:
+                                logger.warning(
+                                    f"[{MODULE_NAME}]群 {group_id} 踢出用户 "
+                                    f"{report['unconfirmed']} 的结果未确认"
+                                )
 
                             # 群内播报
                             if kicked_count > 0:
@@ -2,7 +2,11 @@ from .. import MODULE_NAME
 from logger import logger
 from datetime import datetime
 from core.switchs import is_group_switch_on
-from .data_manager import BlackListDataManager
+from .data_manager import (
+    BlackListDataManager,
+    is_user_blacklisted,
+    is_in_global_blacklist,
+)
 from api.group import set_group_kick
 from api.message import send_group_msg, send_private_msg
 from utils.generate import generate_text_message, generate_at_message
@@ -83,31 +87,28 @@ class GroupNoticeHandler:
         检查用户是否在黑名单中（包括全局黑名单），如果在则踢出并发送警告
         """
         try:
-            with BlackListDataManager() as data_manager:
-                if data_manager.is_user_blacklisted(self.group_id, self.user_id):
-                    # 判断是全局黑名单还是群黑名单
-                    is_global = data_manager.is_in_global_blacklist(self.user_id)
-                    blacklist_type = "全局黑名单" if is_global else "群黑名单"
-
-                    # 发送警告消息
-                    warning_at = generate_at_message(self.user_id)
-                    warning_msg = generate_text_message(
-                        f"({self.user_id})检测到你是{blacklist_type}用户，将自动将其踢出"
-                    )
-                    await send_group_msg(
-                        self.websocket,
-                        self.group_id,
-                        [warning_at, warning_msg],
-                        note="del_msg=30",
-                    )
-
-                    # 踢出用户并拉黑
-                    await set_group_kick(
-                        self.websocket, self.group_id, self.user_id, True
-                    )
-                    logger.info(
-                        f"[{MODULE_NAME}]已踢出{blacklist_type}用户 {self.user_id} 并拒绝后续加群请求"
-                    )
+            if is_user_blacklisted(self.group_id, self.user_id):
+                # 判断是全局黑名单还是群黑名单
+                is_global = is_in_global_blacklist(self.user_id)
+                blacklist_type = "全局黑名单" if is_global else "群黑名单"
+
+                # 发送警告消息
+                warning_at = generate_at_message(self.user_id)
+                warning_msg = generate_text_message(
+                    f"({self.user_id})检测到你是{blacklist_type}用户，将自动将其踢出"
+                )
+                await send_group_msg(
+                    self.websocket,
+                    self.group_id,
+                    [warning_at, warning_msg],
+                    note="del_msg=30",
+                )
+
+                # 踢出用户并拉黑
+                await set_group_kick(self.websocket, self.group_id, self.user_id, True)
+                logger.info(
+                    f"[{MODULE_NAME}]已踢出{blacklist_type}用户 {self.user_id} 并拒绝后续加群请求"
+                )
         except Exception as e:
             logger.error(f"[{MODULE_NAME}]检查并踢出黑名单用户失败: {e}")
 
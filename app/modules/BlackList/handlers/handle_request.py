@@ -2,7 +2,7 @@ from .. import MODULE_NAME
 from logger import logger
 from datetime import datetime
 from core.switchs import is_group_switch_on
-from .data_manager import BlackListDataManager
+from .data_manager import is_user_blacklisted, is_in_global_blacklist
 from api.user import set_group_add_request
 
 
@@ -64,19 +64,16 @@ class RequestHandler:
         处理加群请求
         """
         try:
-            with BlackListDataManager() as data_manager:
-                if data_manager.is_user_blacklisted(self.group_id, self.user_id):
-                    # 判断是全局黑名单还是群黑名单
-                    is_global = data_manager.is_in_global_blacklist(self.user_id)
-                    blacklist_type = "全局黑名单" if is_global else "群黑名单"
-                    reason = f"您在{blacklist_type}中，无法加入群聊"
+            if is_user_blacklisted(self.group_id, self.user_id):
+                # 判断是全局黑名单还是群黑名单
+                is_global = is_in_global_blacklist(self.user_id)
+                blacklist_type = "全局黑名单" if is_global else "群黑名单"
+                reason = f"您在{blacklist_type}中，无法加入群聊"
 
-                    await set_group_add_request(
-                        self.websocket, self.flag, False, reason
-                    )
-                    logger.info(
-                        f"[{MODULE_NAME}]拒绝{blacklist_type}用户 {self.user_id} 加入群 {self.group_id}"
-                    )
+                await set_group_add_request(self.websocket, self.flag, False, reason)
+                logger.info(
+                    f"[{MODULE_NAME}]拒绝{blacklist_type}用户 {self.user_id} 加入群 {self.group_id}"
+                )
         except Exception as e:
             logger.error(f"[{MODULE_NAME}]处理加群请求失败: {e}")
 
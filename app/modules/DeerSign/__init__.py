@@ -5,6 +5,7 @@ MODULE_NAME = "DeerSign"
 MODULE_ENABLED = True
 SWITCH_NAME = "鹿管"
 MODULE_DESCRIPTION = "鹿管签到模块，支持按月签到、补签、代签、日历和排行榜"
+EVENT_KINDS = ["message"]
 
 DATA_DIR = os.path.join("data", MODULE_NAME)
 os.makedirs(DATA_DIR, exist_ok=True)
@@ -2,6 +2,7 @@ import os
 import sqlite3
 from datetime import datetime
 
+from core.db_pool import get_connection, run_schema_once
 from .. import MODULE_NAME
 
 
@@ -10,10 +11,10 @@ class DataManager:
         self.data_dir = os.path.join("data", MODULE_NAME)
         os.makedirs(self.data_dir, exist_ok=True)
         self.db_path = os.path.join(self.data_dir, f"{MODULE_NAME}.db")
-        self.conn = sqlite3.connect(self.db_path)
+        self.conn = get_connection(self.db_path)
         self.conn.row_factory = sqlite3.Row
         self.cursor = self.conn.cursor()
-        self._init_tables()
+        run_schema_once(self.db_path, self._init_tables)
 
     def _init_tables(self):
         self.cursor.execute(
@@ -53,7 +54,7 @@ class DataManager:
             else:
                 self.conn.commit()
         finally:
-            self.conn.close()
+            self.cursor.close()
         return False
 
     @staticmethod
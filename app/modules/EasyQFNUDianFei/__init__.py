@@ -13,6 +13,9 @@ SWITCH_NAME = "eqdf"
 # 模块描述
 MODULE_DESCRIPTION = "曲阜师范大学新校区电费查询模块"
 
+# 模块订阅的事件类型
+EVENT_KINDS = ["message"]
+
 # 数据目录
 DATA_DIR = os.path.join("data", MODULE_NAME)
 os.makedirs(DATA_DIR, exist_ok=True)
@@ -2,6 +2,7 @@ import aiohttp  # 使用 aiohttp
 import asyncio
 import json  # 导入 json
 from logger import logger
+from core.http_client import http_get
 
 
 class ElectricityQuery:
@@ -12,13 +13,11 @@ class ElectricityQuery:
 
     async def _get_data(self, url):
         """执行异步的GET请求"""
-        timeout = aiohttp.ClientTimeout(total=10)  # 设置超时对象
         try:
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.get(url) as response:  # timeout移到session创建时
-                    response.raise_for_status()  # 检查HTTP错误
-                    # 确保使用正确的编码读取响应体
-                    return await response.json(encoding="utf-8")
+            async with http_get(url, timeout=10) as response:
+                response.raise_for_status()  # 检查HTTP错误
+                # 确保使用正确的编码读取响应体
+                return await response.json(encoding="utf-8")
         except aiohttp.ClientError as e:
             logger.error(f"Error fetching data from {url}: {e}")
             return {"code": 500, "msg": f"请求API失败: {e}"}  # 返回统一错误格式
@@ -3,6 +3,7 @@ import os
 from datetime import datetime
 from .. import MODULE_NAME, DATA_DIR
 from logger import logger
+from core.db_pool import get_connection, run_schema_once
 
 
 class DataManager:
@@ -14,10 +15,10 @@ class DataManager:
     def __init__(self):
         self.db_path = os.path.join(DATA_DIR, f"{MODULE_NAME}.db")
         self._ensure_db_exists()
-        self.conn = sqlite3.connect(self.db_path)
+        self.conn = get_connection(self.db_path)
         self.conn.row_factory = sqlite3.Row  # 使查询结果可以通过列名访问
         self.cursor = self.conn.cursor()
-        self._ensure_table_exists()
+        run_schema_once(self.db_path, self._ensure_table_exists)
 
     def _ensure_db_exists(self):
         """确保数据库目录和文件存在"""
@@ -92,7 +93,7 @@ class DataManager:
             logger.error(f"[{MODULE_NAME}]数据库操作异常: {exc_val}")
         else:
             self.conn.commit()
-        self.conn.close()
+        self.cursor.close()
 
     # ============ 用户验证相关操作 ============
 
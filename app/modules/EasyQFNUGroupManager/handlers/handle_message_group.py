@@ -21,7 +21,8 @@ from utils.generate import (
 from datetime import datetime
 from .data_manager import DataManager
 from core.menu_manager import MenuManager
-from core.get_group_member_list import get_group_member_user_ids, is_user_admin_or_owner
+from core.get_group_member_list import get_group_member_user_ids
+from core.group_directory import has_members
 from modules.BlackList.handlers.data_manager import BlackListDataManager
 import re
 
@@ -208,14 +209,10 @@ class GroupMessageHandler:
             recorded_user_ids = dm.get_all_recorded_user_ids(self.group_id)
 
         # 获取群成员列表，找出无记录用户（排除管理员和群主）
-        group_member_ids = get_group_member_user_ids(self.group_id)
-        unrecorded_users = []
-        if group_member_ids:
-            for user_id in group_member_ids:
-                if user_id not in recorded_user_ids:
-                    # 忽略管理员和群主
-                    if not is_user_admin_or_owner(self.group_id, user_id):
-                        unrecorded_users.append(user_id)
+        group_member_ids = get_group_member_user_ids(self.group_id, exclude_admins=True)
+        unrecorded_users = [
+            user_id for user_id in group_member_ids if user_id not in recorded_user_ids
+        ]
 
         # 显示剩余未验证用户（待验证 + 无记录）
         total_unverified = len(pending_users) + len(unrecorded_users)
@@ -277,14 +274,10 @@ class GroupMessageHandler:
             recorded_user_ids = dm.get_all_recorded_user_ids(self.group_id)
 
         # 获取群成员列表，找出无记录用户（排除管理员和群主）
-        group_member_ids = get_group_member_user_ids(self.group_id)
-        unrecorded_users = []
-        if group_member_ids:
-            for user_id in group_member_ids:
-                if user_id not in recorded_user_ids:
-                    # 忽略管理员和群主
-                    if not is_user_admin_or_owner(self.group_id, user_id):
-                        unrecorded_users.append(user_id)
+        group_member_ids = get_group_member_user_ids(self.group_id, exclude_admins=True)
+        unrecorded_users = [
+            user_id for user_id in group_member_ids if user_id not in recorded_user_ids
+        ]
 
         # 计算总待验证人数
         total_count = len(pending_users) + len(unrecorded_users)
@@ -368,10 +361,8 @@ class GroupMessageHandler:
         if self.raw_message.strip() != UNRECORDED_LIST_COMMAND:
             return False
 
-        # 获取群成员列表（从Core数据目录）
-        group_member_ids = get_group_member_user_ids(self.group_id)
-
-        if not group_member_ids:
+        # 群成员列表尚未获取（Core群目录）
+        if not has_members(self.group_id):
             await send_group_msg(
                 self.websocket,
                 self.group_id,
@@ -388,12 +379,10 @@ class GroupMessageHandler:
             recorded_user_ids = dm.get_all_recorded_user_ids(self.group_id)
 
         # 找出在群内但数据库无记录的成员（排除管理员和群主）
-        unrecorded_users = []
-        for user_id in group_member_ids:
-            if user_id not in recorded_user_ids:
-                # 忽略管理员和群主
-                if not is_user_admin_or_owner(self.group_id, user_id):
-                    unrecorded_users.append(user_id)
+        group_member_ids = get_group_member_user_ids(self.group_id, exclude_admins=True)
+        unrecorded_users = [
+            user_id for user_id in group_member_ids if user_id not in recorded_user_ids
+        ]
 
         if not unrecorded_users:
             await send_group_msg(
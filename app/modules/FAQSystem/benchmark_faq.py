@@ -0,0 +1,193 @@
+"""
+问答匹配延迟基准测试
+
+在临时目录中为每种问答库规模生成问答对，按群消息的处理流程（find_best_match，
+相似度在低阈值和高阈值之间时再调用 find_multiple_matches）统计单条消息的 p50/p99 延迟：
+- 旧方式：每条消息新建 AdvancedFAQMatcher（从数据库加载、分词、拟合 TF-IDF）后再匹配
+- 新方式：get_faq_matcher 取进程内共享的匹配器，索引只构建一次
+同时统计首次构建索引和重启后加载持久化索引的耗时，
+并比较两种方式的最佳匹配（问答对ID、相似度）是否一致，出现不一致时退出码为 1。
+
+用法（在 app 目录下执行）：
+    python -m modules.FAQSystem.benchmark_faq
+    python -m modules.FAQSystem.benchmark_faq --sizes 100 1000 --queries 500 --legacy-queries 100
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+import jieba
+from . import HIGH_THRESHOLD, LOW_THRESHOLD, MAX_SUGGESTIONS
+from .handlers import handle_match_qa
+from .handlers.db_manager import FAQDatabaseManager
+from core.db_pool import close_all
+
+SUBJECTS = [
+    "图书馆", "食堂", "宿舍", "教务处", "校医院", "体育馆", "实验室", "快递站",
+    "四六级", "计算机二级", "期末考试", "补考", "选课", "奖学金", "助学金", "校园卡",
+    "学生证", "毕业论文", "实习", "转专业", "社团", "校车", "澡堂", "打印店",
+]
+ACTIONS = [
+    "怎么报名", "几点开门", "在哪里", "怎么办理", "什么时候开始", "需要带什么",
+    "怎么申请", "多少钱", "能不能补办", "找谁负责", "怎么查询", "有什么要求",
+]
+MODIFIERS = ["", "请问", "想问一下", "同学们", "有人知道", "急！"]
+CHATTER = [
+    "今天天气真好", "晚上一起去吃饭吗", "哈哈哈哈", "收到", "谢谢大家",
+    "明天上课吗", "这个表情包好好笑", "有没有人打游戏",
+]
+
+
+def generate_pairs(count, seed=0):
+    """生成不重复的问答对"""
+    rng = random.Random(seed)
+    connectors = ["", "的", "里面", "附近"]
+    combinations = len(MODIFIERS) * len(SUBJECTS) * len(connectors) * len(ACTIONS)
+    questions = set()
+    while len(questions) < count:
+        question = (
+            rng.choice(MODIFIERS)
+            + rng.choice(SUBJECTS)
+            + rng.choice(connectors)
+            + rng.choice(ACTIONS)
+        )
+        if len(questions) >= combinations // 2:
+            # 组合用尽后加编号，模拟大量相近的问题
+            question += str(rng.randrange(10**6))
+        questions.add(question)
+    return [(question, f"答案{i}") for i, question in enumerate(sorted(questions))]
+
+
+def generate_queries(pairs, count, seed=1):
+    """生成查询：原问题、改写的问题和无关闲聊各占一部分"""
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.3:
+            queries.append(rng.choice(pairs)[0])
+        elif roll < 0.7:
+            question = rng.choice(pairs)[0]
+            cut = rng.randrange(len(question))
+            queries.append(
+                rng.choice(MODIFIERS) + question[:cut] + question[cut + 1 :]
+            )
+        else:
+            queries.append(rng.choice(CHATTER))
+    return queries
+
+
+def prepare_group(group_id, pairs):
+    with FAQDatabaseManager(group_id) as db:
+        db.conn.executemany(
+            f"INSERT INTO {db.table_name} (question, answer) VALUES (?, ?)", pairs
+        )
+        db.conn.commit()
+
+
+def handle_query(matcher, query):
+    """与 QaHandler 处理群消息的流程一致，返回最佳匹配的 (问答对ID, 相似度)"""
+    _, _, score, qa_id = matcher.find_best_match(query)
+    if LOW_THRESHOLD <= score < HIGH_THRESHOLD:
+        matcher.find_multiple_matches(
+            query, min_score=LOW_THRESHOLD, max_results=MAX_SUGGESTIONS
+        )
+    return qa_id, round(float(score), 9)
+
+
+def _percentile(durations, q):
+    return durations[min(len(durations) - 1, int(len(durations) * q))]
+
+
+def run(name, get_matcher, queries):
+    durations = []
+    results = []
+    for query in queries:
+        start = time.perf_counter()
+        results.append(handle_query(get_matcher(), query))
+        durations.append(time.perf_counter() - start)
+    durations.sort()
+    print(
+        f"  {name}: {len(queries)} 条消息, "
+        f"p50 {_percentile(durations, 0.5) * 1e3:.1f}ms, "
+        f"p99 {_percentile(durations, 0.99) * 1e3:.1f}ms"
+    )
+    return results
+
+
+def benchmark_size(size, queries_count, legacy_count):
+    """
+    测试一种问答库规模
+
+    Returns:
+        int: 最佳匹配不一致的消息数
+    """
+    group_id = f"benchmark_{size}"
+    pairs = generate_pairs(size)
+    prepare_group(group_id, pairs)
+    queries = generate_queries(pairs, queries_count)
+    print(f"问答对 {size} 个:")
+
+    # 旧方式不使用持久化索引，每条消息都重新分词和拟合
+    handle_match_qa.PERSIST_INDEX = False
+
+    def new_legacy_matcher():
+        matcher = handle_match_qa.AdvancedFAQMatcher(group_id)
+        matcher.build_index()
+        return matcher
+
+    legacy = run("旧方式", new_legacy_matcher, queries[:legacy_count])
+
+    handle_match_qa.PERSIST_INDEX = True
+    handle_match_qa._matchers.pop(group_id, None)
+    start = time.perf_counter()
+    handle_match_qa.get_faq_matcher(group_id)
+    print(f"  首次构建索引: {(time.perf_counter() - start) * 1e3:.0f}ms")
+
+    # 模拟重启：丢弃进程内的匹配器，从持久化索引加载
+    handle_match_qa._matchers.pop(group_id, None)
+    start = time.perf_counter()
+    handle_match_qa.get_faq_matcher(group_id)
+    print(f"  重启后加载持久化索引: {(time.perf_counter() - start) * 1e3:.0f}ms")
+
+    new = run("新方式", lambda: handle_match_qa.get_faq_matcher(group_id), queries)
+
+    mismatches = sum(a != b for a, b in zip(legacy, new))
+    print(f"  最佳匹配一致性比较 {len(legacy)} 条消息, 不一致 {mismatches} 条")
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="问答匹配延迟基准测试")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[100, 1000, 10000], help="问答对数量"
+    )
+    parser.add_argument("--queries", type=int, default=200, help="新方式的消息数")
+    parser.add_argument(
+        "--legacy-queries", type=int, default=50, help="旧方式及一致性比较的消息数"
+    )
+    args = parser.parse_args()
+
+    jieba.initialize()
+    cwd = os.getcwd()
+    mismatches = 0
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # 数据库和索引文件都使用相对路径，切换目录后写入临时目录
+        os.chdir(temp_dir)
+        try:
+            for size in args.sizes:
+                mismatches += benchmark_size(
+                    size, args.queries, min(args.legacy_queries, args.queries)
+                )
+        finally:
+            os.chdir(cwd)
+            close_all()
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,7 @@
-import sqlite3
 import os
 from typing import List, Tuple, Optional
 from modules.FAQSystem import DATA_DIR
+from core.db_pool import get_connection, run_schema_once
 
 
 class FAQDatabaseManager:
@@ -15,9 +15,9 @@ class FAQDatabaseManager:
         self.table_name = f"FAQ_group_{group_id}"
         self.db_path = os.path.join(DATA_DIR, "FAQ_data.db")
         os.makedirs(DATA_DIR, exist_ok=True)
-        self.conn = sqlite3.connect(self.db_path)
+        self.conn = get_connection(self.db_path)
         self.cursor = self.conn.cursor()
-        self._create_table()
+        run_schema_once(self.db_path, self._create_table, self.table_name)
 
     def __enter__(self):
         """
@@ -27,10 +27,9 @@ class FAQDatabaseManager:
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """
-        支持with语句的退出方法，自动关闭数据库连接。
+        支持with语句的退出方法，自动关闭游标，连接由连接池复用。
         """
         self.cursor.close()
-        self.conn.close()
 
     def _create_table(self):
         """
@@ -180,8 +179,7 @@ class FAQDatabaseManager:
         if not os.path.exists(db_path):
             return []
 
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        cursor = get_connection(db_path).cursor()
 
         # 获取所有以FAQ_group_开头的表名
         cursor.execute(
@@ -189,7 +187,7 @@ class FAQDatabaseManager:
         )
         tables = cursor.fetchall()
 
-        conn.close()
+        cursor.close()
 
         # 提取群组ID
         group_ids = []
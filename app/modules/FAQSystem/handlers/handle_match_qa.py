@@ -1,13 +1,38 @@
 import numpy as np
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.feature_extraction.text import TfidfVectorizer, CountVectorizer
 import difflib
 from collections import defaultdict
 import jieba
+from .. import PERSIST_INDEX
 from .db_manager import FAQDatabaseManager
+from .index_store import compute_signature, load_index, save_index
 import scipy.sparse
 from typing import Optional
 
+# 群号 -> 匹配器，进程内共享，索引只在问答对变化后重建
+_matchers = {}
+
+
+def get_faq_matcher(group_id: str) -> "AdvancedFAQMatcher":
+    """
+    获取群的共享匹配器，首次使用时从数据库加载并构建索引。
+    参数:
+        group_id: str 群组ID
+    返回:
+        AdvancedFAQMatcher 已构建索引的匹配器
+    """
+    group_id = str(group_id)
+    matcher = _matchers.get(group_id)
+    if matcher is None:
+        matcher = _matchers[group_id] = AdvancedFAQMatcher(group_id)
+        matcher.build_index()
+    return matcher
+
+
+def _identity_analyzer(tokens):
+    """问题已预先分词，向量化时直接使用分词结果"""
+    return tokens
+
 
 class AdvancedFAQMatcher:
     def __init__(self, group_id: str):
@@ -18,19 +43,52 @@ class AdvancedFAQMatcher:
         """
         self.group_id = group_id
         self.FAQ_pairs = []
-        self.vectorizer = TfidfVectorizer(tokenizer=self._tokenize)
+        # 与 FAQ_pairs 一一对应的分词结果，问答对增删时同步维护，重建索引时无需重新分词
+        self.question_tokens = []
+        self.vectorizer = TfidfVectorizer(analyzer=_identity_analyzer)
         self.tfidf_matrix: Optional[scipy.sparse.csr_matrix] = None
         self.keyword_index = defaultdict(list)
+        # 字符计数矩阵和问题长度，用于批量计算编辑距离相似度的上界
+        # 按原始字符计数（不合并空白、不转小写），与 SequenceMatcher 比较的字符一致
+        self.char_vectorizer = CountVectorizer(analyzer=list)
+        self.char_matrix: Optional[scipy.sparse.csc_matrix] = None
+        self.question_lengths = np.zeros(0)
+        # 问答对变化后索引需要重建，在下一次查询前完成
+        self._dirty = True
         self._load_from_db()
         self.threshold = 0.6
 
     def _load_from_db(self):
         """
-        从数据库加载所有问答对到内存。
+        从数据库加载所有问答对到内存，问题未变化时直接使用持久化的索引。
         """
         with FAQDatabaseManager(self.group_id) as db:
             self.FAQ_pairs = [(id, q, a) for id, q, a in db.get_all_FAQ_pairs()]
 
+        index = load_index(self.group_id) if PERSIST_INDEX else None
+        if index is not None and index["signature"] == compute_signature(
+            self.FAQ_pairs
+        ):
+            self.question_tokens = index["tokens"]
+            self.tfidf_matrix = index["matrix"]
+            if self.tfidf_matrix is not None:
+                self.vectorizer = TfidfVectorizer(
+                    analyzer=_identity_analyzer, vocabulary=index["vocabulary"]
+                )
+                self.vectorizer.idf_ = np.array(index["idf"])
+            self._build_keyword_index()
+            self._build_char_index()
+            self._dirty = False
+            return
+
+        # 问题有变化时复用持久化的分词结果，只对新问题分词
+        cached_tokens = {}
+        if index is not None:
+            cached_tokens = dict(zip(index["questions"], index["tokens"]))
+        self.question_tokens = [
+            cached_tokens.get(q) or self._tokenize(q) for _, q, _ in self.FAQ_pairs
+        ]
+
     def _tokenize(self, text):
         """
         对输入文本进行分词处理，返回分词列表。
@@ -45,7 +103,7 @@ class AdvancedFAQMatcher:
 
     def add_FAQ_pair(self, question, answer):
         """
-        添加新的问答对到内存和数据库。
+        添加新的问答对到内存和数据库，问题已存在时更新答案。
         参数:
             question: str 问题
             answer: str 答案
@@ -53,7 +111,14 @@ class AdvancedFAQMatcher:
         with FAQDatabaseManager(self.group_id) as db:
             result_id = db.add_FAQ_pair(question, answer)
         if result_id:
+            for idx, (FAQ_id, _, _) in enumerate(self.FAQ_pairs):
+                if FAQ_id == result_id:
+                    # 只更新答案，索引不受影响
+                    self.FAQ_pairs[idx] = (result_id, question, answer)
+                    return result_id
             self.FAQ_pairs.append((result_id, question, answer))
+            self.question_tokens.append(self._tokenize(question))
+            self._dirty = True
             return result_id
         return None
 
@@ -66,70 +131,124 @@ class AdvancedFAQMatcher:
             dict 包含删除结果的详细信息
         """
         with FAQDatabaseManager(self.group_id) as db_manager:
-            return db_manager.delete_FAQ_pair(qa_id)
+            result = db_manager.delete_FAQ_pair(qa_id)
+        if result["success"]:
+            for idx, (FAQ_id, _, _) in enumerate(self.FAQ_pairs):
+                if FAQ_id == qa_id:
+                    del self.FAQ_pairs[idx]
+                    del self.question_tokens[idx]
+                    self._dirty = True
+                    break
+        return result
 
     def build_index(self):
         """
         构建TF-IDF索引和关键词倒排索引，用于高效检索。
+        使用缓存的分词结果重新拟合（IDF 依赖全部问题，增删后需整体重算），索引未变化时直接返回。
         """
-        # 检查是否有问答对数据
-        if not self.FAQ_pairs:
-            self.tfidf_matrix = None
-            self.keyword_index.clear()
+        if not self._dirty:
             return
+        self._dirty = False
 
-        # 构建TF-IDF索引
-        questions = [q for _, q, a in self.FAQ_pairs]
-
-        # 检查问题是否为空或只包含停用词
-        if not questions or all(not q.strip() for q in questions):
-            self.tfidf_matrix = None
-            self.keyword_index.clear()
-            return
+        self.tfidf_matrix = None
+        self.vectorizer = TfidfVectorizer(analyzer=_identity_analyzer)
+        self._build_keyword_index()
+        self._build_char_index()
 
         # 检查分词后是否有有效词汇
-        valid_questions = []
-        for q in questions:
-            tokens = self._tokenize(q)
-            if tokens:  # 只保留分词后有内容的问题
-                valid_questions.append(q)
-
-        if not valid_questions:
-            self.tfidf_matrix = None
-            self.keyword_index.clear()
-            return
-
-        try:
-            self.tfidf_matrix = self.vectorizer.fit_transform(valid_questions).tocsr()  # type: ignore
-        except ValueError as e:
-            # 如果仍然出现词汇为空的错误，设置为None
-            if "empty vocabulary" in str(e):
-                self.tfidf_matrix = None
-                self.keyword_index.clear()
-                return
-            else:
-                raise e
-
-        # 构建关键词倒排索引
+        if any(self.question_tokens):
+            try:
+                self.tfidf_matrix = self.vectorizer.fit_transform(self.question_tokens).tocsr()  # type: ignore
+            except ValueError as e:
+                # 如果仍然出现词汇为空的错误，设置为None
+                if "empty vocabulary" not in str(e):
+                    raise e
+
+        if PERSIST_INDEX:
+            self._save_index()
+
+    def _build_keyword_index(self):
+        """
+        根据缓存的分词结果构建关键词倒排索引。
+        """
         self.keyword_index.clear()
-        for idx, (id, q, a) in enumerate(self.FAQ_pairs):
-            keywords = set(self._tokenize(q))
-            for word in keywords:
+        for idx, tokens in enumerate(self.question_tokens):
+            for word in set(tokens):
                 self.keyword_index[word].append(idx)
 
-    def _get_candidate_indices(self, query):
+    def _build_char_index(self):
+        """
+        构建问题的字符计数矩阵，按列存储以便按查询包含的字符取列。
+        """
+        questions = [q for _, q, _ in self.FAQ_pairs]
+        self.question_lengths = np.array([len(q) for q in questions], dtype=float)
+        self.char_matrix = None
+        if questions:
+            self.char_matrix = self.char_vectorizer.fit_transform(questions).tocsc()
+
+    def _seq_ratio_upper_bounds(self, query, indices):
+        """
+        批量计算候选问题与查询的编辑距离相似度上界。
+        即 SequenceMatcher.quick_ratio：两串共有字符数（按多重集计）的两倍除以总长度，
+        SequenceMatcher.ratio 一定不超过该值。
+        参数:
+            query: str 查询文本
+            indices: np.ndarray 候选问题的索引
+        返回:
+            np.ndarray 每个候选问题的相似度上界
+        """
+        query_counts = self.char_vectorizer.transform([query])
+        overlap = np.zeros(len(indices))
+        if query_counts.nnz:
+            columns = self.char_matrix[indices][:, query_counts.indices].toarray()  # type: ignore
+            overlap = np.minimum(columns, query_counts.data).sum(axis=1)
+        return 2.0 * overlap / (len(query) + self.question_lengths[indices])
+
+    def _tfidf_similarities(self, query_tokens, indices):
+        """
+        通过一次稀疏矩阵-向量乘法计算候选问题与查询的TF-IDF余弦相似度（向量已做L2归一化）。
+        参数:
+            query_tokens: list 查询问题的分词结果
+            indices: np.ndarray 候选问题的索引
+        返回:
+            np.ndarray 每个候选问题的相似度
+        """
+        query_vec = self.vectorizer.transform([query_tokens])
+        assert isinstance(self.tfidf_matrix, scipy.sparse.csr_matrix)
+        return (self.tfidf_matrix[indices] @ query_vec.T).toarray().ravel()
+
+    def _save_index(self):
+        """
+        持久化当前索引。
+        """
+        vocabulary = idf = None
+        if self.tfidf_matrix is not None:
+            vocabulary = {
+                word: int(col) for word, col in self.vectorizer.vocabulary_.items()
+            }
+            idf = self.vectorizer.idf_.tolist()
+        save_index(
+            self.group_id,
+            compute_signature(self.FAQ_pairs),
+            [q for _, q, _ in self.FAQ_pairs],
+            self.question_tokens,
+            vocabulary,
+            idf,
+            self.tfidf_matrix,
+        )
+
+    def _get_candidate_indices(self, query_tokens):
         """
         使用关键词倒排索引初步筛选候选问题的索引集合。
         参数:
-            query: str 查询问题
+            query_tokens: list 查询问题的分词结果
         返回:
             list 候选问题的索引列表
         """
         # 使用关键词索引初步筛选候选问题
-        query_keywords = set(self._tokenize(query))
         candidate_indices = set()
 
-        for word in query_keywords:
+        for word in set(query_tokens):
             if word in self.keyword_index:
                 candidate_indices.update(self.keyword_index[word])
 
@@ -146,6 +265,7 @@ class AdvancedFAQMatcher:
         返回:
             (orig_question, orig_answer, score, id) 或 (None, None, score, None)
         """
+        self.build_index()
         if not self.FAQ_pairs or self.tfidf_matrix is None:
             # 如果没有TF-IDF索引，尝试使用纯编辑距离进行匹配
             if not self.FAQ_pairs:
@@ -165,18 +285,13 @@ class AdvancedFAQMatcher:
             return None, None, best_score, None
 
         # 步骤1: 初步筛选候选问题
-        candidate_indices = self._get_candidate_indices(query)
+        query_tokens = self._tokenize(query)
+        indices = np.fromiter(self._get_candidate_indices(query_tokens), dtype=int)
 
         # 步骤2: 计算TF-IDF余弦相似度
-        query_vec = self.vectorizer.transform([query])
-        indices = list(candidate_indices)
-        assert isinstance(self.tfidf_matrix, scipy.sparse.csr_matrix)
-        tfidf_candidates = scipy.sparse.vstack(
-            [self.tfidf_matrix[i] for i in indices]
-        ).tocsr()
-        similarities = cosine_similarity(query_vec, tfidf_candidates)  # type: ignore
+        similarities = self._tfidf_similarities(query_tokens, indices)
         best_candidate_idx = np.argmax(similarities)
-        best_score = similarities[0, best_candidate_idx]
+        best_score = similarities[best_candidate_idx]
         best_FAQ_idx = indices[best_candidate_idx]
 
         # 步骤3: 使用编辑距离进行二次验证
@@ -212,6 +327,7 @@ class AdvancedFAQMatcher:
         返回:
             list，包含 (question, answer, score, qa_id) 的元组列表，按相似度降序排列
         """
+        self.build_index()
         if not self.FAQ_pairs:
             return []
 
@@ -228,37 +344,59 @@ class AdvancedFAQMatcher:
             return results[:max_results]
 
         # 获取候选问题索引
-        candidate_indices = self._get_candidate_indices(query)
-
-        # 计算TF-IDF相似度
-        query_vec = self.vectorizer.transform([query])
-        results = []
+        query_tokens = self._tokenize(query)
+        indices = np.fromiter(self._get_candidate_indices(query_tokens), dtype=int)
+        if max_results <= 0 or not len(indices):
+            return []
 
-        for idx in candidate_indices:
-            FAQ_id, question, answer = self.FAQ_pairs[idx]
+        # 批量计算TF-IDF相似度，并用编辑距离相似度的上界得到组合相似度的上界
+        # 组合相似度 (与find_best_match保持一致)
+        tfidf_sims = self._tfidf_similarities(query_tokens, indices)
+        upper_bounds = 0.3 * tfidf_sims + 0.7 * self._seq_ratio_upper_bounds(
+            query, indices
+        )
 
-            # 计算TF-IDF相似度
-            tfidf_sim = cosine_similarity(query_vec, self.tfidf_matrix[idx : idx + 1])[
-                0, 0
-            ]
+        # 上界低于最小阈值的候选不可能入选
+        positions = np.flatnonzero(upper_bounds >= min_score)
+        scores = {}
 
+        def score(position):
+            FAQ_idx = indices[position]
             # 计算编辑距离相似度
-            seq_sim = difflib.SequenceMatcher(None, query, question).ratio()
-
-            # 组合相似度 (与find_best_match保持一致)
-            combined_score = 0.3 * tfidf_sim + 0.7 * seq_sim
-
-            if combined_score >= min_score:
-                results.append((question, answer, combined_score, FAQ_id))
-
-        # 按相似度降序排列并限制数量
-        results.sort(key=lambda x: x[2], reverse=True)
-        return results[:max_results]
-
+            seq_sim = difflib.SequenceMatcher(
+                None, query, self.FAQ_pairs[FAQ_idx][1]
+            ).ratio()
+            scores[position] = 0.3 * tfidf_sims[position] + 0.7 * seq_sim
+
+        if len(positions) > max_results:
+            # 先精确计算上界最高的 max_results 个候选，
+            # 其中达到阈值的个数已满时，最低分即为入选分数的下界，上界低于它的候选可以跳过
+            top = positions[
+                np.argpartition(-upper_bounds[positions], max_results - 1)[:max_results]
+            ]
+            for position in top:
+                score(position)
+            top_scores = [scores[p] for p in top if scores[p] >= min_score]
+            if len(top_scores) == max_results:
+                positions = positions[upper_bounds[positions] >= min(top_scores)]
+
+        for position in positions:
+            if position not in scores:
+                score(position)
+
+        # 按相似度降序排列并限制数量，相似度相同时按问答对的顺序
+        selected = sorted(
+            (p for p, value in scores.items() if value >= min_score),
+            key=lambda p: (-scores[p], indices[p]),
+        )[:max_results]
+        results = []
+        for position in selected:
+            FAQ_id, question, answer = self.FAQ_pairs[indices[position]]
+            results.append((question, answer, float(scores[position]), FAQ_id))
+        return results
 
 if __name__ == "__main__":
-    matcher = AdvancedFAQMatcher("1234567890")
-    matcher.build_index()
+    matcher = get_faq_matcher("1234567890")
 
     while True:
         query = input("请输入问题: ")
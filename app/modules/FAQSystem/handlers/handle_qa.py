@@ -12,7 +12,7 @@ from .. import (
 )
 from utils.auth import is_group_admin, is_system_admin
 from .db_manager import FAQDatabaseManager
-from .handle_match_qa import AdvancedFAQMatcher
+from .handle_match_qa import get_faq_matcher
 from api.message import send_group_msg, send_group_msg_with_cq, get_msg
 from utils.generate import generate_reply_message, generate_text_message
 import re
@@ -147,7 +147,7 @@ class QaHandler:
 
             # 判断是否为批量添加（多行）
             lines = self.raw_message.strip().splitlines()
-            matcher = AdvancedFAQMatcher(self.group_id)
+            matcher = get_faq_matcher(self.group_id)
             success_list = []
             fail_list = []
 
@@ -347,7 +347,7 @@ class QaHandler:
                 )
                 return
 
-            matcher = AdvancedFAQMatcher(self.group_id)
+            matcher = get_faq_matcher(self.group_id)
             success_results = []
             fail_results = []
 
@@ -525,8 +525,7 @@ class QaHandler:
             if not self.raw_message or len(self.raw_message.strip()) == 0:
                 return
 
-            matcher = AdvancedFAQMatcher(self.group_id)
-            matcher.build_index()
+            matcher = get_faq_matcher(self.group_id)
 
             try:
                 orig_question, answer, score, qa_id = matcher.find_best_match(
@@ -1,6 +1,6 @@
 from .. import MODULE_NAME
 from logger import logger
-from .db_manager import FAQDatabaseManager
+from .handle_match_qa import get_faq_matcher
 from api.message import send_group_msg
 from utils.generate import generate_reply_message, generate_text_message
 
@@ -42,8 +42,9 @@ class ResponseHandler:
             if question and group_id and reply_message_id:
                 answer = self.data.get("raw_message")
                 if answer:
-                    with FAQDatabaseManager(group_id) as db:
-                        result_id = db.add_FAQ_pair(question, answer)
+                    result_id = get_faq_matcher(group_id).add_FAQ_pair(
+                        question, answer
+                    )
                     await send_group_msg(
                         self.websocket,
                         group_id,
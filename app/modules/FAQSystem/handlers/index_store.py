@@ -0,0 +1,112 @@
+"""
+FAQ 索引持久化
+
+把已构建的 TF-IDF 索引（词表、IDF、稀疏矩阵）和每个问题的分词结果保存到磁盘，
+重启后只要问答对的问题未变化即可直接加载，无需重新分词和拟合；
+问题有变化时也只需对新问题分词。
+每个群两个文件：
+- {group_id}.json：问题签名、词表、IDF、问题及其分词结果
+- {group_id}.npz：TF-IDF 稀疏矩阵
+"""
+
+import os
+import json
+import hashlib
+import scipy.sparse
+from logger import logger
+from .. import MODULE_NAME, DATA_DIR
+
+# 索引文件目录
+INDEX_DIR = os.path.join(DATA_DIR, "index")
+
+# 索引文件格式版本，格式变化时递增，旧文件会被忽略并重建
+INDEX_VERSION = 1
+
+
+def compute_signature(FAQ_pairs):
+    """
+    计算问答对中问题的签名，问题增删改后签名随之变化（答案不参与索引，不计入签名）
+
+    参数:
+        FAQ_pairs: list (id, question, answer) 元组列表
+    返回:
+        str 签名
+    """
+    digest = hashlib.sha1()
+    for FAQ_id, question, _ in FAQ_pairs:
+        digest.update(f"{FAQ_id}\x1f{question}\x1e".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _get_paths(group_id):
+    base = os.path.join(INDEX_DIR, str(group_id))
+    return base + ".json", base + ".npz"
+
+
+def load_index(group_id):
+    """
+    加载群的持久化索引
+
+    返回:
+        dict 包含 signature、vocabulary、idf、questions、tokens、matrix，不存在或损坏时返回None
+    """
+    meta_path, matrix_path = _get_paths(group_id)
+    if not os.path.exists(meta_path):
+        return None
+    try:
+        with open(meta_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("version") != INDEX_VERSION:
+            return None
+        index["matrix"] = (
+            scipy.sparse.load_npz(matrix_path).tocsr()
+            if index.get("vocabulary")
+            else None
+        )
+        return index
+    except Exception as e:
+        logger.warning(f"[{MODULE_NAME}]加载群{group_id}的FAQ索引失败，将重建: {e}")
+        return None
+
+
+def save_index(
+    group_id, signature, questions, tokens, vocabulary=None, idf=None, matrix=None
+):
+    """
+    保存群的索引，先写临时文件再替换，避免写入中断留下损坏的文件
+
+    参数:
+        group_id: str 群组ID
+        signature: str 问题签名
+        questions: list 问题列表
+        tokens: list 每个问题的分词结果
+        vocabulary: dict 词表，词 -> 列号，没有有效词汇时为None
+        idf: list IDF 值
+        matrix: scipy.sparse.csr_matrix TF-IDF 矩阵
+    """
+    meta_path, matrix_path = _get_paths(group_id)
+    try:
+        os.makedirs(INDEX_DIR, exist_ok=True)
+        if matrix is not None:
+            # save_npz 会自动补全 .npz 后缀，临时文件名需以 .npz 结尾
+            tmp_matrix_path = matrix_path[:-4] + ".tmp.npz"
+            scipy.sparse.save_npz(tmp_matrix_path, matrix)
+            os.replace(tmp_matrix_path, matrix_path)
+        tmp_meta_path = meta_path + ".tmp"
+        with open(tmp_meta_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "version": INDEX_VERSION,
+                    "signature": signature,
+                    "vocabulary": vocabulary,
+                    "idf": idf,
+                    "questions": questions,
+                    "tokens": tokens,
+                },
+                f,
+                ensure_ascii=False,
+            )
+        os.replace(tmp_meta_path, meta_path)
+    except Exception as e:
+        logger.warning(f"[{MODULE_NAME}]保存群{group_id}的FAQ索引失败: {e}")
+
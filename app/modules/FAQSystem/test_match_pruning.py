@@ -0,0 +1,99 @@
+"""
+find_multiple_matches 剪枝正确性测试
+
+剪枝只跳过组合相似度上界低于阈值的候选，结果应与逐个精确计算完全一致。
+
+用法（在 app 目录下执行）：
+    python -m pytest modules/FAQSystem/test_match_pruning.py
+"""
+
+import difflib
+import random
+import pytest
+
+QUESTIONS = [
+    "怎么报名考试",
+    "怎么    报名    考试",
+    "怎 么 报 名 考 试",
+    "考试报名时间是什么时候",
+    "报名考试需要带什么材料",
+    "四六级  考试  怎么报名",
+    "Exam Registration 怎么办",
+    "exam registration 怎么办",
+    "图书馆几点开门",
+    "图书馆\t几点\n开门",
+    "食堂在哪里",
+    "宿舍 熄灯 时间",
+]
+
+QUERIES = [
+    "怎么    报名    考试",
+    "怎么报名考试",
+    "怎 么 报 名 考 试",
+    "考试   报名",
+    "Exam Registration 怎么办",
+    "图书馆   几点开门",
+    "宿舍熄灯时间",
+    "食堂",
+]
+
+
+@pytest.fixture
+def matcher(tmp_path, monkeypatch):
+    # 模块导入时会在当前目录创建数据目录
+    monkeypatch.chdir(tmp_path)
+    from modules.FAQSystem.handlers import handle_match_qa
+
+    def load(self):
+        self.FAQ_pairs = [(i + 1, q, f"答案{i + 1}") for i, q in enumerate(QUESTIONS)]
+        self.question_tokens = [self._tokenize(q) for _, q, _ in self.FAQ_pairs]
+
+    monkeypatch.setattr(handle_match_qa, "PERSIST_INDEX", False)
+    monkeypatch.setattr(handle_match_qa.AdvancedFAQMatcher, "_load_from_db", load)
+    return handle_match_qa.AdvancedFAQMatcher("0")
+
+
+def unpruned_matches(matcher, query, min_score, max_results):
+    """逐个精确计算所有候选的组合相似度"""
+    matcher.build_index()
+    query_tokens = matcher._tokenize(query)
+    indices = list(matcher._get_candidate_indices(query_tokens))
+    tfidf_sims = matcher._tfidf_similarities(query_tokens, indices)
+    scored = []
+    for position, idx in enumerate(indices):
+        FAQ_id, question, answer = matcher.FAQ_pairs[idx]
+        seq_sim = difflib.SequenceMatcher(None, query, question).ratio()
+        score = 0.3 * tfidf_sims[position] + 0.7 * seq_sim
+        if score >= min_score:
+            scored.append((idx, (question, answer, float(score), FAQ_id)))
+    scored.sort(key=lambda item: (-item[1][2], item[0]))
+    return [result for _, result in scored[:max_results]]
+
+
+def test_whitespace_question_exact_match(matcher):
+    results = matcher.find_multiple_matches("怎么    报名    考试", min_score=0.9)
+    assert results
+    assert results[0][0] == "怎么    报名    考试"
+    assert results[0][2] == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize("query", QUERIES)
+@pytest.mark.parametrize("min_score", [0.3, 0.5, 0.7, 0.9])
+@pytest.mark.parametrize("max_results", [1, 3, 10])
+def test_pruned_equals_unpruned(matcher, query, min_score, max_results):
+    assert matcher.find_multiple_matches(
+        query, min_score=min_score, max_results=max_results
+    ) == unpruned_matches(matcher, query, min_score, max_results)
+
+
+def test_upper_bound_holds_for_random_text(matcher):
+    matcher.build_index()
+    rng = random.Random(0)
+    alphabet = "考试报名 \t　aA怎么"
+    indices = list(range(len(QUESTIONS)))
+    for _ in range(200):
+        query = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 12)))
+        bounds = matcher._seq_ratio_upper_bounds(query, indices)
+        for idx, bound in zip(indices, bounds):
+            ratio = difflib.SequenceMatcher(None, query, QUESTIONS[idx]).ratio()
+            assert ratio <= bound + 1e-12
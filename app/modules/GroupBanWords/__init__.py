@@ -13,6 +13,18 @@ SWITCH_NAME = "GBW"
 # 模块描述
 MODULE_DESCRIPTION = "基于权重的违禁词监控模块，支持自定义违禁词"
 
+# 模块订阅的事件类型
+EVENT_KINDS = [
+    "message",
+    "notice",
+    "response:get_forward_msg",
+    "response:get_group_msg_history",
+    "response:get_msg",
+]
+
+# 模块任务的优先级通道
+EVENT_PRIORITY = "high"
+
 # 数据目录
 DATA_DIR = os.path.join("data", MODULE_NAME)
 os.makedirs(DATA_DIR, exist_ok=True)
@@ -22,6 +34,8 @@ os.makedirs(DATA_DIR, exist_ok=True)
 # ------------------------------------------------------------
 BAN_WORD_WEIGHT_MAX = 100  # 违禁词封顶权重，超过视为违规
 BAN_WORD_DURATION = 30 * 24 * 60 * 60  # 违禁词封禁时长，单位：秒
+BAN_WORD_FOLD_WIDTH = True  # 检测前是否将全角字符折叠为半角
+BAN_WORD_FOLD_TRADITIONAL = True  # 检测前是否将常见繁体字折叠为简体
 
 ADD_BAN_WORD_COMMAND = "添加违禁词"  # 添加违禁词命令（群聊添加群专属，私聊添加全局）
 DELETE_BAN_WORD_COMMAND = "删除违禁词"  # 删除违禁词命令（群聊删除群专属，私聊删除全局）
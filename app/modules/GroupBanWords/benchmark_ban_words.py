@@ -0,0 +1,202 @@
+"""
+违禁词匹配基准测试
+
+在临时数据库中生成全局词库和群词库（普通词、正则词、无效正则、含分组引用的正则，以及与全局词库
+同名但权值不同的群专属词），对随机消息对比：
+- 旧实现：每条消息查询两次词库，对合并后的每个词调用 re.search（无效正则退回字符串包含）
+- 新实现：DataManager.calc_message_weight（词库缓存 + WordMatcher）
+两种实现对每条消息返回的 (总权值, 命中的违禁词列表) 应完全一致，包括列表顺序，出现不一致时退出码为 1。
+
+消息不含空白、中文标点、全角字符和繁体字，即已归一化后的文本；全角、繁体折叠是新增的行为，
+不在一致性比较范围内。旧实现在大词库下很慢，只用前 --legacy-messages 条消息比较。
+
+用法（在 app 目录下执行）：
+    python -m modules.GroupBanWords.benchmark_ban_words
+    python -m modules.GroupBanWords.benchmark_ban_words --global-words 1000 --legacy-messages 2000
+"""
+
+import re
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+from core.db_pool import close_all
+from .handlers.data_manager_words import DataManager
+
+# 生成词和消息使用的字符，不含可折叠的全角字符和繁体字
+ALPHABET = "赌博彩票加微信群代理返利兼职刷单日结点击链接领取红包色情约炮" "vxqQ0123456789"
+
+# 普通聊天用字，消息以这些字为主，部分消息不命中任何词
+NEUTRAL_CHARS = "今天气不错我们去吃饭学习考试老师同学图书馆宿舍食堂明早上课作业" "abcdef"
+
+# 固定加入词库的正则词
+REGEX_WORDS = [
+    r"加.{0,3}微",
+    r"v[x信]",
+    r"\d{6,}",
+    r"(赌|博)彩",
+    r"刷单|兼职",
+    r"^点击",
+    r"链接$",
+    r"(.)\1\1",
+    r"(?i)vx",
+    r"(未闭合",
+    r"[错误",
+    r"返利+",
+]
+
+
+def generate_lexicons(global_count, group_count, seed=0):
+    """
+    生成全局词库和群词库
+
+    Returns:
+        tuple: (全局词库 {词: 权值}, 群词库 {词: 权值})
+    """
+    rng = random.Random(seed)
+
+    def random_word():
+        return "".join(rng.choice(ALPHABET) for _ in range(rng.randint(2, 5)))
+
+    global_words = {word: rng.randint(1, 10) for word in REGEX_WORDS}
+    while len(global_words) < global_count:
+        global_words[random_word()] = rng.randint(1, 10)
+    # 群词库约一半与全局词库同名（权值覆盖），一半为群专属独有
+    shared = rng.sample(sorted(global_words), group_count // 2)
+    group_words = {word: rng.randint(11, 20) for word in shared}
+    while len(group_words) < group_count:
+        group_words[random_word()] = rng.randint(11, 20)
+    return global_words, group_words
+
+
+def generate_messages(count, seed=1):
+    """生成消息，每条消息的违禁字比例随机，从普通聊天到大量违禁内容"""
+    rng = random.Random(seed)
+    messages = []
+    for _ in range(count):
+        ratio = rng.choice((0, 0.05, 0.2, 0.6))
+        messages.append(
+            "".join(
+                rng.choice(ALPHABET if rng.random() < ratio else NEUTRAL_CHARS)
+                for _ in range(rng.randint(5, 60))
+            )
+        )
+    return messages
+
+
+def legacy_calc_message_weight(dm, message):
+    """旧版 DataManager.calc_message_weight"""
+    cursor = dm._conn.cursor()
+    cursor.execute(
+        "SELECT word, weight FROM ban_words WHERE group_id=?", (dm.group_id,)
+    )
+    group_words = dict(cursor.fetchall())
+    cursor.execute(
+        "SELECT word, weight FROM ban_words WHERE group_id=?",
+        (dm.GLOBAL_GROUP_ID,),
+    )
+    global_words = dict(cursor.fetchall())
+
+    merged_words = global_words.copy()
+    merged_words.update(group_words)
+
+    matched_words = []
+    total_weight = 0
+    for word, weight in merged_words.items():
+        try:
+            matched = re.search(word, message)
+        except re.error:
+            matched = word in message
+        if matched:
+            total_weight += weight
+            source = "群专属" if word in group_words else "全局"
+            matched_words.append((f"{word}({source})", weight))
+    return total_weight, matched_words
+
+
+def prepare_database(global_words, group_words, group_id):
+    """写入词库，清空 DataManager 的类级别缓存"""
+    DataManager._lexicons.clear()
+    DataManager._matchers.clear()
+    dm = DataManager(group_id)
+    rows = [
+        (DataManager.GLOBAL_GROUP_ID, word, weight)
+        for word, weight in global_words.items()
+    ]
+    rows += [(group_id, word, weight) for word, weight in group_words.items()]
+    dm._conn.executemany(
+        "INSERT INTO ban_words (group_id, word, weight, update_time) "
+        "VALUES (?, ?, ?, '')",
+        rows,
+    )
+    dm._conn.commit()
+    return dm
+
+
+def run(name, calc, messages):
+    start = time.perf_counter()
+    results = [calc(message) for message in messages]
+    elapsed = time.perf_counter() - start
+    hits = sum(1 for total_weight, _ in results if total_weight)
+    print(
+        f"{name}: {len(messages)} 条消息, 耗时 {elapsed:.2f}s "
+        f"({elapsed / len(messages) * 1e3:.3f}ms/条), 命中 {hits} 条"
+    )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="违禁词匹配基准测试")
+    parser.add_argument(
+        "--global-words", type=int, default=10000, help="全局词库词数"
+    )
+    parser.add_argument("--group-words", type=int, default=200, help="群词库词数")
+    parser.add_argument("--messages", type=int, default=10000, help="新实现的消息数")
+    parser.add_argument(
+        "--legacy-messages", type=int, default=200, help="旧实现及一致性比较的消息数"
+    )
+    args = parser.parse_args()
+
+    group_id = "100000"
+    global_words, group_words = generate_lexicons(args.global_words, args.group_words)
+    messages = generate_messages(max(args.messages, args.legacy_messages))
+    print(
+        f"全局词库 {len(global_words)} 个词，群词库 {len(group_words)} 个词"
+        f"（正则词 {len(REGEX_WORDS)} 个）"
+    )
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        DataManager._db_path = os.path.join(temp_dir, "global_data.db")
+        try:
+            dm = prepare_database(global_words, group_words, group_id)
+            # 首次调用时加载词库、编译匹配器，单独计时
+            start = time.perf_counter()
+            dm.calc_message_weight("")
+            print(f"新实现首次编译匹配器: {(time.perf_counter() - start) * 1e3:.1f}ms")
+
+            legacy_messages = messages[: args.legacy_messages]
+            legacy = run(
+                "旧实现",
+                lambda message: legacy_calc_message_weight(dm, message),
+                legacy_messages,
+            )
+            new = run("新实现", dm.calc_message_weight, messages[: args.messages])
+        finally:
+            DataManager.close_global_connection()
+            close_all()
+
+    mismatches = 0
+    for message, old_result, new_result in zip(legacy_messages, legacy, new):
+        if old_result != new_result:
+            mismatches += 1
+            if mismatches <= 5:
+                print(f"不一致: {message!r}\n  旧: {old_result}\n  新: {new_result}")
+    print(f"一致性比较 {min(len(legacy), len(new))} 条消息, 不一致 {mismatches} 条")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
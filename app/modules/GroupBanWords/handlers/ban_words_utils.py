@@ -1,10 +1,11 @@
 import asyncio
 from datetime import datetime
-import re
 from .. import (
     MODULE_NAME,
     BAN_WORD_WEIGHT_MAX,
     BAN_WORD_DURATION,
+    BAN_WORD_FOLD_WIDTH,
+    BAN_WORD_FOLD_TRADITIONAL,
     UNBAN_WORD_COMMAND,
     KICK_BAN_WORD_COMMAND,
 )
@@ -20,6 +21,7 @@ from api.group import set_group_ban
 from config import OWNER_ID
 from utils.feishu import send_feishu_msg
 from .data_manager_words import DataManager
+from .text_normalizer import strip_message, fold_text
 from core.get_group_list import get_group_name_by_id
 
 
@@ -67,24 +69,22 @@ async def check_and_handle_ban_words(
         )
         return True
 
-    # 文本预处理
-    # 删除所有空格，换行符，制表符
-    raw_message = (
-        raw_message.replace(" ", "")
-        .replace("\n", "")
-        .replace("\r", "")
-        .replace("\t", "")
-    )
-    # 删除所有中文标点符号
-    raw_message = re.sub(
-        r"[，。！？；：\'‘’“”【】「」『』（）《》〈〉…—～·、]", "", raw_message
+    # 文本预处理：删除空白字符和中文标点符号，折叠全角/繁体规避写法
+    # 先删除再折叠，保证全角标点（如"，"）被删除而不是折叠为半角
+    unfolded_message = strip_message(raw_message)
+    raw_message = fold_text(
+        unfolded_message,
+        fold_width=BAN_WORD_FOLD_WIDTH,
+        fold_traditional=BAN_WORD_FOLD_TRADITIONAL,
     )
 
     # 过滤后的消息
     print(f"过滤后的消息: {raw_message}")
 
     # 计算违禁词权重
-    total_weight, matched_words = data_manager.calc_message_weight(raw_message)
+    total_weight, matched_words = data_manager.calc_message_weight(
+        raw_message, unfolded_message
+    )
     is_banned = total_weight >= BAN_WORD_WEIGHT_MAX
 
     if is_banned:
@@ -100,7 +100,7 @@ async def check_and_handle_ban_words(
             with invite_tree_record_data_manager.InviteTreeRecordDataManager(
                 websocket, fake_msg
             ) as itrdm:
-                related_users = itrdm.get_related_invite_users(user_id)
+                related_users = await itrdm.get_related_invite_users_async(user_id)
                 if len(related_users) > 1:
                     invite_chain_info = (
                         f"该用户邀请树相关人员：\n {'  '.join(map(str, related_users))}"
@@ -1,9 +1,19 @@
 import sqlite3
 import os
-import re
 from typing import Optional
 from datetime import datetime
-from .. import MODULE_NAME
+from core.db_pool import get_connection
+from functools import partial
+from .. import MODULE_NAME, BAN_WORD_FOLD_WIDTH, BAN_WORD_FOLD_TRADITIONAL
+from .word_matcher import WordMatcher
+from .text_normalizer import fold_text
+
+# 词库中的词与消息使用相同的折叠规则
+fold_word = partial(
+    fold_text,
+    fold_width=BAN_WORD_FOLD_WIDTH,
+    fold_traditional=BAN_WORD_FOLD_TRADITIONAL,
+)
 
 
 class DataManager:
@@ -12,6 +22,15 @@ class DataManager:
     _conn: Optional[sqlite3.Connection] = None
     _initialized = False
 
+    # 类级别的词库缓存，群号 -> {违禁词: 权值}，增删改时同步更新
+    _lexicons = {}
+    # 类级别的匹配器缓存，群号 -> WordMatcher，词库的词集合变化时重建
+    _matchers = {}
+    # 类级别的白名单缓存，群号 -> 用户ID集合，增删时同步更新
+    _whitelists = {}
+    # 类级别的用户状态缓存，群号 -> {用户ID: 状态}，设置/删除时同步更新
+    _user_statuses = {}
+
     # 全局词库群号常量
     GLOBAL_GROUP_ID = "0"
 
@@ -22,10 +41,6 @@ class DataManager:
         """
         self.group_id = str(group_id)
 
-        # 确保数据目录存在
-        data_dir = os.path.join("data", MODULE_NAME)
-        os.makedirs(data_dir, exist_ok=True)
-
         # 初始化全局数据库连接
         if not DataManager._initialized:
             DataManager._init_global_db()
@@ -34,7 +49,9 @@ class DataManager:
     def _init_global_db(cls):
         """初始化全局数据库连接和表结构"""
         if cls._conn is None:
-            cls._conn = sqlite3.connect(cls._db_path, check_same_thread=False)
+            # 确保数据目录存在
+            os.makedirs(os.path.dirname(cls._db_path), exist_ok=True)
+            cls._conn = get_connection(cls._db_path)
             cls._conn.execute("PRAGMA foreign_keys = ON")
             cls._create_tables()
             cls._initialized = True
@@ -85,6 +102,67 @@ class DataManager:
 
         cls._conn.commit()
 
+    @classmethod
+    def _get_lexicon(cls, group_id):
+        """获取词库缓存，首次使用时从数据库加载"""
+        lexicon = cls._lexicons.get(group_id)
+        if lexicon is None:
+            assert cls._conn is not None  # 添加断言确保连接存在
+            cursor = cls._conn.cursor()
+            cursor.execute(
+                "SELECT word, weight FROM ban_words WHERE group_id=?", (group_id,)
+            )
+            lexicon = cls._lexicons[group_id] = dict(cursor.fetchall())
+        return lexicon
+
+    @classmethod
+    def _get_matcher(cls, group_id):
+        """获取词库的匹配器，不存在时根据词库缓存编译"""
+        matcher = cls._matchers.get(group_id)
+        if matcher is None:
+            matcher = cls._matchers[group_id] = WordMatcher(
+                cls._get_lexicon(group_id), fold=fold_word
+            )
+        return matcher
+
+    def _update_lexicon(self, word, weight=None):
+        """写入数据库后同步词库缓存，weight为None表示删除；词集合变化时丢弃匹配器"""
+        lexicon = self._lexicons.get(self.group_id)
+        if lexicon is None:
+            return
+        if weight is None:
+            lexicon.pop(word, None)
+        elif word in lexicon:
+            lexicon[word] = weight
+            return
+        else:
+            lexicon[word] = weight
+        self._matchers.pop(self.group_id, None)
+
+    @classmethod
+    def _get_whitelist_set(cls, group_id):
+        """获取白名单缓存，首次使用时从数据库加载"""
+        whitelist = cls._whitelists.get(group_id)
+        if whitelist is None:
+            assert cls._conn is not None  # 添加断言确保连接存在
+            cursor = cls._conn.cursor()
+            cursor.execute("SELECT user_id FROM whitelist WHERE group_id=?", (group_id,))
+            whitelist = cls._whitelists[group_id] = {row[0] for row in cursor.fetchall()}
+        return whitelist
+
+    @classmethod
+    def _get_status_map(cls, group_id):
+        """获取用户状态缓存，首次使用时从数据库加载"""
+        statuses = cls._user_statuses.get(group_id)
+        if statuses is None:
+            assert cls._conn is not None  # 添加断言确保连接存在
+            cursor = cls._conn.cursor()
+            cursor.execute(
+                "SELECT user_id, status FROM user_status WHERE group_id=?", (group_id,)
+            )
+            statuses = cls._user_statuses[group_id] = dict(cursor.fetchall())
+        return statuses
+
     def _get_formatted_time(self):
         """获取格式化时间字符串"""
         return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -116,6 +194,7 @@ class DataManager:
             ),
         )
         self._conn.commit()
+        self._update_lexicon(word, weight)
         return True
 
     def get_all_words_and_weight(self):
@@ -145,6 +224,8 @@ class DataManager:
             (new_weight, self._get_formatted_time(), self.group_id, word),
         )
         self._conn.commit()
+        if cursor.rowcount > 0:
+            self._update_lexicon(word, new_weight)
         return cursor.rowcount > 0
 
     def delete_word(self, word):
@@ -161,54 +242,42 @@ class DataManager:
         )
         rows_affected = cursor.rowcount
         self._conn.commit()
+        if rows_affected > 0:
+            self._update_lexicon(word)
         return rows_affected > 0
 
-    def calc_message_weight(self, message):
+    def calc_message_weight(self, message, unfolded_message=None):
         """计算消息的违禁程度（所有命中违禁词的权值求和）
         群专属词库优先级大于全局词库（群号"0"），如果同一个词在两个词库都存在，使用群专属的权重
         Args:
-            message (str): 需要检查的消息文本
+            message (str): 需要检查的消息文本（已折叠全角/繁体）
+            unfolded_message (str, optional): 折叠前的消息，正则词也在其中匹配
         Returns:
             tuple: (总权值, 命中的违禁词列表)
             total_weight: 总权值
             matched_words: 命中的违禁词列表和权值的元组列表
         """
-        assert self._conn is not None  # 添加断言确保连接存在
-        cursor = self._conn.cursor()
+        group_words = self._get_lexicon(self.group_id)
+        global_words = self._get_lexicon(self.GLOBAL_GROUP_ID)
 
-        # 获取群专属违禁词
-        cursor.execute(
-            "SELECT word, weight FROM ban_words WHERE group_id=?", (self.group_id,)
-        )
-        group_words = dict(cursor.fetchall())
-
-        # 获取全局违禁词（群号为"0"）
-        cursor.execute(
-            "SELECT word, weight FROM ban_words WHERE group_id=?",
-            (self.GLOBAL_GROUP_ID,),
+        global_hits = self._get_matcher(self.GLOBAL_GROUP_ID).find(
+            message, unfolded_message
         )
-        global_words = dict(cursor.fetchall())
+        group_hits = self._get_matcher(self.group_id).find(message, unfolded_message)
 
-        # 合并词库，群专属优先
-        merged_words = global_words.copy()
-        merged_words.update(group_words)  # 群专属词库覆盖全局词库
+        # 按合并词库的顺序输出：先全局词库（群专属同名词覆盖权值），再群专属独有的词，
+        # 各词库内按词排序，与数据库按主键索引返回的顺序一致
+        ordered_hits = sorted(global_hits) + sorted(group_hits - global_words.keys())
 
         matched_words = []
         total_weight = 0
-        for word, weight in merged_words.items():
-            try:
-                if re.search(word, message):
-                    total_weight += weight
-                    # 标记来源
-                    source = "群专属" if word in group_words else "全局"
-                    matched_words.append((f"{word}({source})", weight))
-            except re.error:
-                # 如果正则表达式无效，则退回到普通字符串匹配
-                if word in message:
-                    total_weight += weight
-                    # 标记来源
-                    source = "群专属" if word in group_words else "全局"
-                    matched_words.append((f"{word}({source})", weight))
+        for word in ordered_hits:
+            if word in group_words:
+                weight, source = group_words[word], "群专属"
+            else:
+                weight, source = global_words[word], "全局"
+            total_weight += weight
+            matched_words.append((f"{word}({source})", weight))
         return total_weight, matched_words
 
     def add_whitelist_user(self, user_id):
@@ -230,6 +299,8 @@ class DataManager:
             ),
         )
         self._conn.commit()
+        if self.group_id in self._whitelists:
+            self._whitelists[self.group_id].add(str(user_id))
         return True
 
     def delete_whitelist_user(self, user_id):
@@ -242,28 +313,21 @@ class DataManager:
         )
         rows_affected = cursor.rowcount
         self._conn.commit()
+        if self.group_id in self._whitelists:
+            self._whitelists[self.group_id].discard(str(user_id))
         return rows_affected > 0
 
     def is_user_whitelisted(self, user_id):
-        """检查用户是否在白名单中（群专属或全局）"""
-        assert self._conn is not None
-        cursor = self._conn.cursor()
+        """检查用户是否在白名单中（群专属或全局），从内存缓存中查询"""
+        user_id = str(user_id)
 
         # 检查群专属白名单
-        cursor.execute(
-            "SELECT 1 FROM whitelist WHERE group_id=? AND user_id=?",
-            (self.group_id, user_id),
-        )
-        if cursor.fetchone():
+        if user_id in self._get_whitelist_set(self.group_id):
             return True
 
         # 检查全局白名单
         if self.group_id != self.GLOBAL_GROUP_ID:
-            cursor.execute(
-                "SELECT 1 FROM whitelist WHERE group_id=? AND user_id=?",
-                (self.GLOBAL_GROUP_ID, user_id),
-            )
-            if cursor.fetchone():
+            if user_id in self._get_whitelist_set(self.GLOBAL_GROUP_ID):
                 return True
 
         return False
@@ -307,26 +371,22 @@ class DataManager:
             ),
         )
         self._conn.commit()
+        statuses = self._user_statuses.get(str(target_group_id))
+        if statuses is not None:
+            statuses[str(user_id)] = status
         return True
 
     def get_user_status(self, user_id, group_id=None):
-        """获取某用户状态
+        """获取某用户状态，从内存缓存中查询
         Args:
             user_id (str): 用户ID
             group_id (str, optional): 群组ID，如果不提供则使用实例的group_id
         Returns:
             str: 用户状态，如果用户不存在则返回None
         """
-        assert self._conn is not None  # 添加断言确保连接存在
-        cursor = self._conn.cursor()
         # 如果提供了group_id参数则使用，否则使用实例的group_id
-        target_group_id = group_id if group_id is not None else self.group_id
-        cursor.execute(
-            "SELECT status FROM user_status WHERE group_id=? AND user_id=?",
-            (target_group_id, user_id),
-        )
-        result = cursor.fetchone()
-        return result[0] if result else None
+        target_group_id = str(group_id) if group_id is not None else self.group_id
+        return self._get_status_map(target_group_id).get(str(user_id))
 
     def delete_user_status(self, user_id):
         """删除某用户状态
@@ -342,6 +402,8 @@ class DataManager:
             (self.group_id, user_id),
         )
         self._conn.commit()
+        if self.group_id in self._user_statuses:
+            self._user_statuses[self.group_id].pop(str(user_id), None)
         return cursor.rowcount > 0
 
     def get_all_user_status(self):
@@ -432,8 +494,6 @@ class DataManager:
 
     @classmethod
     def close_global_connection(cls):
-        """关闭全局数据库连接（在程序退出时调用）"""
-        if cls._conn:
-            cls._conn.close()
-            cls._conn = None
-            cls._initialized = False
+        """释放全局数据库连接（在程序退出时调用），连接由连接池统一关闭"""
+        cls._conn = None
+        cls._initialized = False
@@ -0,0 +1,99 @@
+"""
+违禁词检测前的文本归一化
+
+原先每条消息都要链式调用多次 replace 再执行一次未编译的 re.sub，这里把规则预先编译：
+- 空白字符（空格、换行符、制表符，以及原先不删除的全角空格 U+3000）和中文标点符号合并为一个
+  预编译正则，一次替换删除
+- 可选：全角字符折叠为半角（如 "ｖｘ" -> "vx"），识别全角规避写法
+- 可选：常见繁体字折叠为简体（如 "賭博" -> "赌博"），识别繁体规避写法
+  折叠使用 str.translate 映射表，仅在文本包含可折叠字符时执行，普通消息不产生额外开销；
+  词库中的普通词在构建匹配器时用同一映射表折叠（fold_text），含全角或繁体字的词仍能命中
+"""
+
+import re
+
+# 需要删除的空白字符，全角空格（U+3000）常用于拆开违禁词，一并删除
+WHITESPACE_CHARS = " \n\r\t\u3000"
+
+# 需要删除的中文标点符号（与原先 re.sub 删除的字符集合一致）
+PUNCTUATION_CHARS = "，。！？；：'‘’“”【】「」『』（）《》〈〉…—～·、"
+
+# 全角字符（U+FF01-U+FF5E）与半角字符（U+0021-U+007E）的码位差
+FULL_WIDTH_OFFSET = 0xFEE0
+
+# 常见繁体字 -> 简体字，覆盖违禁词规避中常用的字
+TRADITIONAL_TO_SIMPLIFIED = (
+    "賭赌錢钱號号碼码網网買买賣卖貨货價价幣币當当場场機机會会員员紅红獎奖資资"
+    "帳账戶户註注冊册領领現现兌兑換换匯汇銀银轉转據据單单賺赚虧亏費费約约騷骚"
+    "黃黄娛娱樂乐點点擊击連连結结鏈链頁页戲戏遊游龍龙鳳凤門门開开關关發发貸贷"
+    "債债務务辦办證证認认這这們们個个說说話话語语請请還还進进過过對对時时間间"
+    "後后從从來来學学習习體体驗验廣广專专業业優优禮礼贈赠搶抢簽签夥伙傳传銷销"
+    "級级團团隊队線线聯联繫系與与為为麼么樣样幾几無无離离獲获賽赛漲涨倉仓盤盘"
+    "擔担財财產产權权穩稳聽听讓让給给國国壞坏藥药槍枪彈弹殺杀滅灭屍尸腦脑髮发"
+    "鬥斗氣气車车馬马魚鱼鳥鸟萬万億亿兩两"
+)
+
+
+# 删除空白字符和中文标点符号的正则
+DELETE_PATTERN = re.compile(
+    "[" + re.escape(WHITESPACE_CHARS + PUNCTUATION_CHARS) + "]+"
+)
+
+
+def _build_fold_table(fold_width, fold_traditional):
+    table = {}
+    if fold_width:
+        for code in range(0xFF01, 0xFF5F):
+            table[code] = code - FULL_WIDTH_OFFSET
+    if fold_traditional:
+        for traditional, simplified in zip(
+            TRADITIONAL_TO_SIMPLIFIED[::2], TRADITIONAL_TO_SIMPLIFIED[1::2]
+        ):
+            table[ord(traditional)] = simplified
+    return table
+
+
+# 折叠选项 -> (映射表, 可折叠字符正则)
+_fold_rules = {}
+
+
+def _get_fold_rule(fold_width, fold_traditional):
+    key = (fold_width, fold_traditional)
+    rule = _fold_rules.get(key)
+    if rule is None:
+        table = _build_fold_table(fold_width, fold_traditional)
+        chars = "".join(chr(code) for code in table)
+        pattern = re.compile("[" + re.escape(chars) + "]") if chars else None
+        rule = _fold_rules[key] = (table, pattern)
+    return rule
+
+
+def strip_message(message):
+    """
+    删除消息中的空白字符和中文标点符号
+
+    Args:
+        message (str): 原始消息
+
+    Returns:
+        str: 删除后的消息
+    """
+    return DELETE_PATTERN.sub("", message)
+
+
+def fold_text(text, fold_width=True, fold_traditional=True):
+    """
+    折叠全角字符和常见繁体字，消息和词库中的词使用同一映射表
+
+    Args:
+        text (str): 文本
+        fold_width (bool, optional): 是否将全角字符折叠为半角
+        fold_traditional (bool, optional): 是否将常见繁体字折叠为简体
+
+    Returns:
+        str: 折叠后的文本
+    """
+    table, pattern = _get_fold_rule(fold_width, fold_traditional)
+    if pattern is not None and pattern.search(text):
+        text = text.translate(table)
+    return text
@@ -0,0 +1,146 @@
+"""
+违禁词匹配器
+
+违禁词既可能是普通字符串，也可能是正则表达式。逐词调用 re.search 在词库较大时代价很高，
+这里把词库编译成一次性的匹配器：
+- 不含正则元字符的词（以及无法编译的正则，原逻辑会退回到字符串匹配）放入 Aho-Corasick 自动机，
+  单次扫描消息即可找出全部命中的词
+- 正则词预先编译，并合并成一个总的正则用于快速排除未命中的消息
+- 传入 fold 时，普通词折叠后放入自动机，与折叠后的消息比较；正则词不折叠（折叠会把全角括号等
+  变成正则元字符），同时匹配折叠前后的消息
+"""
+
+import re
+
+# 正则元字符，不含这些字符的词作为正则匹配时与普通字符串匹配等价
+REGEX_META_CHARS = frozenset(".^$*+?{}[]\\|()")
+
+# 含分组引用或内联标志的正则不能安全地合并到总正则中，只单独匹配
+UNMERGEABLE_PATTERN = re.compile(r"\\\d|\(\?P=|\(\?[aiLmsux-]")
+
+
+class AhoCorasick:
+    """Aho-Corasick 多模式字符串匹配自动机"""
+
+    def __init__(self, words):
+        # 每个状态的转移表、失败指针和输出（已合并失败链上的输出）
+        self.transitions = [{}]
+        self.fail = [0]
+        self.outputs = [()]
+        for word in words:
+            self._insert(word)
+        self._build_fail_links()
+
+    def _insert(self, word):
+        state = 0
+        for char in word:
+            next_state = self.transitions[state].get(char)
+            if next_state is None:
+                next_state = len(self.transitions)
+                self.transitions.append({})
+                self.fail.append(0)
+                self.outputs.append(())
+                self.transitions[state][char] = next_state
+            state = next_state
+        self.outputs[state] = self.outputs[state] + (word,)
+
+    def _build_fail_links(self):
+        queue = list(self.transitions[0].values())
+        for state in queue:
+            for char, next_state in self.transitions[state].items():
+                queue.append(next_state)
+                fail_state = self.fail[state]
+                while fail_state and char not in self.transitions[fail_state]:
+                    fail_state = self.fail[fail_state]
+                self.fail[next_state] = self.transitions[fail_state].get(char, 0)
+                self.outputs[next_state] += self.outputs[self.fail[next_state]]
+
+    def find_all(self, text):
+        """
+        查找文本中出现的所有词
+
+        Returns:
+            set: 命中的词
+        """
+        transitions = self.transitions
+        fail = self.fail
+        outputs = self.outputs
+        found = set()
+        state = 0
+        for char in text:
+            while state and char not in transitions[state]:
+                state = fail[state]
+            state = transitions[state].get(char, 0)
+            if outputs[state]:
+                found.update(outputs[state])
+        return found
+
+
+class WordMatcher:
+    """
+    单个词库的匹配器，命中规则与逐词 re.search（无效正则退回字符串包含）一致
+
+    Args:
+        words: 词库中的所有词
+        fold (callable, optional): 消息使用的折叠函数，普通词用它折叠后再匹配
+    """
+
+    def __init__(self, words, fold=None):
+        # 折叠后的普通词 -> 词库中的原词，多个词可能折叠为同一个
+        self.literal_words = {}
+        self.patterns = []
+        for word in words:
+            if not word or not REGEX_META_CHARS.isdisjoint(word):
+                try:
+                    self.patterns.append((word, re.compile(word)))
+                    continue
+                except re.error:
+                    # 无效正则按普通字符串匹配
+                    pass
+            key = fold(word) if fold else word
+            self.literal_words.setdefault(key, []).append(word)
+
+        self.automaton = (
+            AhoCorasick(self.literal_words) if self.literal_words else None
+        )
+        self.merged_pattern = self._merge_patterns()
+
+    def _merge_patterns(self):
+        """合并可安全合并的正则，任一命中时总正则一定命中"""
+        if not self.patterns:
+            return None
+        if any(UNMERGEABLE_PATTERN.search(word) for word, _ in self.patterns):
+            return None
+        try:
+            return re.compile("|".join(f"(?:{word})" for word, _ in self.patterns))
+        except re.error:
+            return None
+
+    def find(self, message, unfolded_message=None):
+        """
+        查找消息命中的所有词
+
+        Args:
+            message (str): 消息（已折叠）
+            unfolded_message (str, optional): 折叠前的消息，正则词也在其中匹配
+
+        Returns:
+            set: 命中的词（词库中的原词）
+        """
+        found = set()
+        if self.automaton:
+            for key in self.automaton.find_all(message):
+                found.update(self.literal_words[key])
+        if self.patterns:
+            texts = [message]
+            if unfolded_message is not None and unfolded_message != message:
+                texts.append(unfolded_message)
+            for text in texts:
+                if self.merged_pattern is not None and not self.merged_pattern.search(
+                    text
+                ):
+                    continue
+                for word, pattern in self.patterns:
+                    if word not in found and pattern.search(text):
+                        found.add(word)
+        return found
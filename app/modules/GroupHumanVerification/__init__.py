@@ -13,6 +13,12 @@ SWITCH_NAME = "GHV"
 # 模块描述
 MODULE_DESCRIPTION = "基于验证码的入群验证模块"
 
+# 模块订阅的事件类型
+EVENT_KINDS = ["message", "notice", "request", "meta_event", "response:send_group_msg"]
+
+# 模块任务的优先级通道
+EVENT_PRIORITY = "high"
+
 # 数据目录
 DATA_DIR = os.path.join("data", MODULE_NAME)
 os.makedirs(DATA_DIR, exist_ok=True)
@@ -49,6 +55,9 @@ STATUS_KICKED = "管理员已踢出"
 STATUS_UNMUTED = "管理员已解禁"
 """管理员已解禁"""
 
+STATUS_KICK_FAILED = "踢出失败"
+"""警告用尽但踢出失败，不再参与扫描，需管理员手动处理"""
+
 # 用于表示发出验证码的消息的消息ID的echo的note条件
 NOTE_CONDITION = "GHV_VERIFICATION_CODE"
 """用于表示发出验证码的消息的消息ID的echo的note条件"""
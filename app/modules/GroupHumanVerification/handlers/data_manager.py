@@ -1,7 +1,7 @@
-import sqlite3
 import os
 from .. import MODULE_NAME, STATUS_UNVERIFIED, WARNING_COUNT
 from logger import logger
+from core.db_pool import get_connection, run_schema_once
 
 
 class DataManager:
@@ -9,9 +9,9 @@ class DataManager:
         data_dir = os.path.join("data", MODULE_NAME)
         os.makedirs(data_dir, exist_ok=True)
         db_path = os.path.join(data_dir, f"data.db")
-        self.conn = sqlite3.connect(db_path)
+        self.conn = get_connection(db_path)
         self.cursor = self.conn.cursor()
-        self._create_table()
+        run_schema_once(db_path, self._create_table)
 
     def _create_table(self):
         """
@@ -61,7 +61,7 @@ class DataManager:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.conn.close()
+        self.cursor.close()
 
     def add_data(
         self, group_id, user_id, code, status, created_at, warning_count=WARNING_COUNT
@@ -6,11 +6,14 @@ from .. import (
     MODULE_NAME,
     SCAN_VERIFICATION,
     STATUS_KICKED,
+    STATUS_KICK_FAILED,
+    STATUS_UNVERIFIED,
     STATUS_VERIFIED,
     WARNING_COUNT,
     BAN_TIME,
 )
-from api.group import set_group_kick, set_group_ban
+from api.group import set_group_ban
+from core.moderation_executor import kick_members
 from api.message import send_group_msg, send_private_msg, delete_msg
 from utils.generate import generate_text_message, generate_at_message
 from config import OWNER_ID
@@ -94,6 +97,31 @@ class GroupHumanVerificationHandler:
         except Exception as e:
             logger.error(f"[{MODULE_NAME}]处理基于时间的扫描入群验证失败: {e}")
 
+    async def _kick_users(self, group_id, kick_users, dm):
+        """
+        批量踢出警告用尽的用户，踢出成功的标记为已踢出
+
+        踢出失败或结果未确认的标记为踢出失败，不再参与扫描，避免每次扫描都重复禁言、提醒和重试
+
+        返回未能踢出的用户列表
+        """
+        if not kick_users:
+            return []
+        report = await kick_members(self.websocket, group_id, kick_users)
+        for user_id in report["succeeded"]:
+            dm.update_status(group_id, user_id, STATUS_KICKED)
+        not_kicked = report["failed"] + report["unconfirmed"]
+        for user_id in not_kicked:
+            # 等待期间可能已收到退群或被踢通知，只覆盖仍为未验证的记录
+            data = dm.get_data(group_id, user_id)
+            if data and data["status"] == STATUS_UNVERIFIED:
+                dm.update_status(group_id, user_id, STATUS_KICK_FAILED)
+        if not_kicked:
+            logger.warning(
+                f"[{MODULE_NAME}]群{group_id} 踢出用户{not_kicked}失败，已标记为{STATUS_KICK_FAILED}，需手动处理"
+            )
+        return not_kicked
+
     async def _process_single_group(self, group_id, user_list, dm, result_msgs):
         """处理单个群的验证扫描"""
         try:
@@ -129,7 +157,7 @@ class GroupHumanVerificationHandler:
                     # 警告次数为0，踢群并标记为超时
                     kick_users.append(user_id)
                     result_msgs.append(
-                        f"群{group_id} 用户{user_id} 已被踢出（警告用尽）"
+                        f"群{group_id} 用户{user_id} 警告用尽，执行踢出"
                     )
                 await asyncio.sleep(0.05)  # 释放控制权
             # 合并提醒消息，一次性发到群里（每行@和文本分开生成，合成列表）
@@ -154,11 +182,10 @@ class GroupHumanVerificationHandler:
                     message,
                     note="del_msg=60",
                 )
-            for user_id in kick_users:
-                await set_group_kick(self.websocket, group_id, user_id)
-                dm.update_status(group_id, user_id, STATUS_KICKED)
-                # 踢人操作间隔1秒，防止风控
-                await asyncio.sleep(1)
+            for user_id in await self._kick_users(group_id, kick_users, dm):
+                result_msgs.append(
+                    f"群{group_id} 用户{user_id} 踢出失败，已停止提醒，请手动处理"
+                )
 
             # 释放控制权
             await asyncio.sleep(0.05)
@@ -223,7 +250,7 @@ class GroupHumanVerificationHandler:
                     # 警告次数为0，踢群并标记为超时
                     kick_users.append(user_id)
                     result_msgs.append(
-                        f"群{group_id} 用户{user_id} 已被踢出（警告用尽）"
+                        f"群{group_id} 用户{user_id} 警告用尽，执行踢出"
                     )
                 await asyncio.sleep(0.05)  # 释放控制权
 
@@ -256,9 +283,10 @@ class GroupHumanVerificationHandler:
                     note="del_msg=60",
                 )
 
-            for user_id in kick_users:
-                await set_group_kick(self.websocket, group_id, user_id)
-                dm.update_status(group_id, user_id, STATUS_KICKED)
+            for user_id in await self._kick_users(group_id, kick_users, dm):
+                result_msgs.append(
+                    f"群{group_id} 用户{user_id} 踢出失败，已停止提醒，请手动处理"
+                )
 
             # 释放控制权
             await asyncio.sleep(0.05)
@@ -327,7 +355,7 @@ class GroupHumanVerificationHandler:
                     else:
                         # 警告次数为0，踢群并标记为超时
                         kick_users.append(user_id)
-                        result_msgs.append(f"用户{user_id} 已被踢出（警告用尽）")
+                        result_msgs.append(f"用户{user_id} 警告用尽，执行踢出")
                     await asyncio.sleep(0.05)  # 释放控制权
 
                 # 合并提醒消息，一次性发到群里
@@ -359,11 +387,10 @@ class GroupHumanVerificationHandler:
                         note="del_msg=60",
                     )
 
-                for user_id in kick_users:
-                    await set_group_kick(self.websocket, group_id, user_id)
-                    dm.update_status(group_id, user_id, STATUS_KICKED)
-                    # 踢人操作间隔1秒，防止风控
-                    await asyncio.sleep(1)
+                for user_id in await self._kick_users(group_id, kick_users, dm):
+                    result_msgs.append(
+                        f"用户{user_id} 踢出失败，已停止提醒，请手动处理"
+                    )
 
                 # 单独向管理员上报本群的处理结果
                 if result_msgs:
@@ -425,7 +452,7 @@ class GroupHumanVerificationHandler:
                             )
                         else:
                             kick_users.append(user_id)
-                            result_msgs.append(f"用户{user_id} 已被踢出（警告用尽）")
+                            result_msgs.append(f"用户{user_id} 警告用尽，执行踢出")
                     if warning_msg_list:
                         await send_group_msg(self.websocket, group_id, warning_msg_list)
                     if kick_users:
@@ -448,10 +475,7 @@ class GroupHumanVerificationHandler:
                             message,
                             note="del_msg=30",
                         )
-                    for user_id in kick_users:
-                        dm.update_status(group_id, user_id, STATUS_KICKED)
-                        await set_group_kick(self.websocket, group_id, user_id)
-                        await asyncio.sleep(1)
+                    await self._kick_users(group_id, kick_users, dm)
                     await asyncio.sleep(1)
                 else:
                     await send_group_msg(
@@ -15,10 +15,19 @@ MODULE_DESCRIPTION = (
     "群组管理模块，支持群组禁言、解禁、踢出、全员禁言、全员解禁、撤回消息等操作。"
 )
 
+# 模块订阅的事件类型
+EVENT_KINDS = ["message", "request"]
+
+# 模块任务的优先级通道
+EVENT_PRIORITY = "high"
+
 # 数据目录
 DATA_DIR = os.path.join("data", MODULE_NAME)
 os.makedirs(DATA_DIR, exist_ok=True)
 
+# 警告未活跃用户时可接受的群成员列表缓存时长，单位：秒
+INACTIVE_SCAN_MEMBER_LIST_MAX_AGE = 300
+
 
 # 模块的一些命令可以在这里定义，方便在其他地方调用，提高代码的复用率
 # ------------------------------------------------------------
@@ -6,28 +6,27 @@ from logger import logger
 from .. import (
     MODULE_NAME,
     GROUP_RECALL_COMMAND,
-    SCAN_INACTIVE_USER_COMMAND,
     GROUP_TOGGLE_AUTO_APPROVE_COMMAND,
+    INACTIVE_SCAN_MEMBER_LIST_MAX_AGE,
 )
 from api.group import (
     set_group_ban,
     set_group_kick,
     set_group_whole_ban,
-    get_group_member_list,
     set_group_todo,
     set_essence_msg,
 )
-from api.message import send_group_msg, delete_msg, get_group_msg_history
+from api.message import send_group_msg, delete_msg, query_group_msg_history
+from core.get_group_member_list import fetch_group_member_list
 from utils.generate import (
     generate_text_message,
     generate_at_message,
     generate_reply_message,
 )
 import re
+import time
 import random
-import asyncio
 from .data_manager import DataManager
-from .handle_response import TEMP_GROUP_HISTORY_CACHE
 
 
 class GroupManagerHandle:
@@ -308,22 +307,15 @@ class GroupManagerHandle:
             # 移除数量本身（如果误匹配到了）
             targets.discard(str(requested_count))
 
-            # 发送获取群历史消息请求，并通过echo做唯一标记
+            # 获取群历史消息并等待回应
             # 为了跳过命令消息本身，获取数量=请求数量+1
-            note = f"{MODULE_NAME}-recall-mid={self.message_id}"
-            echo_key = f"get_group_msg_history-{self.group_id}-{note}"
-            await get_group_msg_history(
+            messages = await query_group_msg_history(
                 self.websocket,
                 self.group_id,
                 count=max_delete + 1,
                 message_seq=0,
-                note=note,
             )
 
-            # 异步等待响应处理器缓存数据
-            await asyncio.sleep(1)
-            messages = TEMP_GROUP_HISTORY_CACHE.pop(echo_key, None)
-
             if not messages:
                 return
 
@@ -430,13 +422,38 @@ class GroupManagerHandle:
             else:
                 days = 30
 
-            # 发送获取群信息请求
-            await get_group_member_list(
+            # 获取群成员列表并等待回应，发言时间按天统计，几分钟内的缓存即可
+            members = await fetch_group_member_list(
                 self.websocket,
                 self.group_id,
-                False,
-                note=f"{SCAN_INACTIVE_USER_COMMAND}-days={days}",
+                max_age=INACTIVE_SCAN_MEMBER_LIST_MAX_AGE,
+            )
+            if not members:
+                await send_group_msg(
+                    self.websocket,
+                    self.group_id,
+                    [generate_text_message("无法获取群成员列表，请稍后重试")],
+                    note="del_msg=10",
+                )
+                return
+
+            # 计算时间阈值（当前时间戳 - 指定天数的秒数）
+            threshold_time = int(time.time()) - days * 24 * 60 * 60
+
+            # 最后发言时间早于阈值的用户即为超过指定天数未发言
+            message = [
+                generate_at_message(member.get("user_id"))
+                for member in members
+                if member.get("last_sent_time", 0) < threshold_time
+            ]
+            message.append(
+                generate_text_message(
+                    f"\n\n\n以上用户{days}天未发言，请保持活跃，长时间未发言可能会被自动移出群聊，请及时冒泡"
+                )
             )
+
+            # 发送消息
+            await send_group_msg(self.websocket, self.group_id, message)
         except Exception as e:
             logger.error(f"[{MODULE_NAME}]扫描未活跃用户失败: {e}")
 
@@ -13,6 +13,12 @@ SWITCH_NAME = "gmd"
 # 模块描述
 MODULE_DESCRIPTION = "群成员重复检测模块"
 
+# 模块订阅的事件类型
+EVENT_KINDS = ["message", "notice", "response:send_group_msg"]
+
+# 模块任务的优先级通道
+EVENT_PRIORITY = "high"
+
 # 数据目录
 DATA_DIR = os.path.join("data", MODULE_NAME)
 os.makedirs(DATA_DIR, exist_ok=True)
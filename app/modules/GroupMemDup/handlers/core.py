@@ -15,7 +15,7 @@ from .. import (
 )
 from .data_manager import DataManager
 from api.message import send_private_msg, send_group_msg_with_cq
-from core.get_group_member_list import get_group_member_user_ids
+from core.group_directory import groups_of
 
 
 def get_user_groups_in_associated_groups(user_id: str, group_id: str):
@@ -27,10 +27,11 @@ def get_user_groups_in_associated_groups(user_id: str, group_id: str):
     with DataManager() as dm:
         result = dm.get_associated_groups(group_id)
         if result:
+            # 用户所在的群只查询一次，再与各组的群号取交集
+            user_groups = groups_of(user_id)
             for group_name in result:
                 for other_group_id in result[group_name]:
-                    member_list = get_group_member_user_ids(other_group_id)
-                    if user_id in member_list:
+                    if str(other_group_id) in user_groups:
                         user_group_ids.append(other_group_id)
     return user_group_ids, group_name
 
@@ -2,6 +2,7 @@ import sqlite3
 import os
 from datetime import datetime
 from .. import MODULE_NAME
+from core.db_pool import get_connection, run_schema_once
 
 
 class DataManager:
@@ -9,9 +10,9 @@ class DataManager:
         data_dir = os.path.join("data", MODULE_NAME)
         os.makedirs(data_dir, exist_ok=True)
         db_path = os.path.join(data_dir, f"data.db")
-        self.conn = sqlite3.connect(db_path)
+        self.conn = get_connection(db_path)
         self.cursor = self.conn.cursor()
-        self._create_table()
+        run_schema_once(db_path, self._create_table)
 
     def _create_table(self):
         """建表函数，如果表不存在则创建"""
@@ -64,7 +65,7 @@ class DataManager:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.conn.close()
+        self.cursor.close()
 
     def create_group_association(self, group_name, group_ids):
         """
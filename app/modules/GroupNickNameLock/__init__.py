@@ -15,6 +15,9 @@ MODULE_DESCRIPTION = (
     "群昵称锁定，检测群用户昵称是否符合正则，支持正则表达式，支持对单个用户锁定"
 )
 
+# 模块订阅的事件类型
+EVENT_KINDS = ["message", "notice"]
+
 # 数据目录
 DATA_DIR = os.path.join("data", MODULE_NAME)
 os.makedirs(DATA_DIR, exist_ok=True)
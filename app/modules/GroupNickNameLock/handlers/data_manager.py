@@ -1,6 +1,6 @@
-import sqlite3
 import os
 from .. import MODULE_NAME
+from core.db_pool import get_connection, run_schema_once
 
 
 class DataManager:
@@ -8,9 +8,9 @@ class DataManager:
         data_dir = os.path.join("data", MODULE_NAME)
         os.makedirs(data_dir, exist_ok=True)
         db_path = os.path.join(data_dir, f"data.db")
-        self.conn = sqlite3.connect(db_path)
+        self.conn = get_connection(db_path)
         self.cursor = self.conn.cursor()
-        self._create_tables()
+        run_schema_once(db_path, self._create_tables)
 
     def _create_tables(self):
         """建表函数，创建正则、默认名、锁定昵称表"""
@@ -54,7 +54,7 @@ class DataManager:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.conn.close()
+        self.cursor.close()
 
     # 群正则相关
     def set_group_regex(self, group_id, regex):
@@ -13,6 +13,12 @@ SWITCH_NAME = "gqd"
 # 模块描述
 MODULE_DESCRIPTION = "群二维码检测模块，支持检测群内图片或视频中有无二维码并进行处理"
 
+# 模块订阅的事件类型
+EVENT_KINDS = ["message", "notice"]
+
+# 模块任务的优先级通道
+EVENT_PRIORITY = "high"
+
 # 数据目录
 DATA_DIR = os.path.join("data", MODULE_NAME)
 os.makedirs(DATA_DIR, exist_ok=True)
@@ -21,6 +27,15 @@ os.makedirs(DATA_DIR, exist_ok=True)
 # 模块的一些命令可以在这里定义，方便在其他地方调用，提高代码的复用率
 # ------------------------------------------------------------
 
+QR_CACHE_MAX_SIZE = 4096  # 检测结果缓存的最大条目数
+QR_CACHE_TTL = 24 * 60 * 60  # 含二维码的检测结果缓存时长，单位：秒
+QR_CACHE_NEGATIVE_TTL = 10 * 60  # 不含二维码的检测结果缓存时长，单位：秒
+
+QR_VIDEO_MAX_FRAMES = 12  # 每个视频最多抽取识别的帧数
+QR_VIDEO_TIME_BUDGET = 20  # 每个视频抽帧和识别的总时间预算（不含下载），单位：秒
+QR_VIDEO_MAX_DOWNLOAD_SIZE = 100 * 1024 * 1024  # 视频下载大小上限，单位：字节
+QR_VIDEO_DOWNLOAD_TIMEOUT = 120  # 视频下载超时时间，单位：秒
+
 EXAMPLE_COMMAND = "示例命令"  # 示例命令
 
 COMMANDS = {
@@ -0,0 +1,143 @@
+"""
+二维码识别基准测试
+
+对本地图片语料统计每张图片的识别耗时和识别召回率，对比以下模式：
+- 线上配置：分级提前退出 + 时间预算
+- 不限时间：分级提前退出，不限时间预算
+- 全部预处理：尝试全部预处理，不限时间预算（召回率上限）
+语料目录结构：
+    <corpus>/qr/     含二维码的图片
+    <corpus>/no_qr/  不含二维码的图片
+
+用法（在 app 目录下执行）：
+    python -m modules.GroupQRDetector.benchmark_qr <corpus>
+    python -m modules.GroupQRDetector.benchmark_qr <corpus> --generate 50   # 先生成合成语料
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import cv2
+import numpy as np
+from .core.qr_pipeline import scan_image_bytes, SCAN_TIME_BUDGET
+
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".bmp", ".webp")
+
+
+def generate_corpus(corpus_dir, count):
+    """
+    生成合成语料：不同尺寸、明暗模式、噪声的二维码图片，以及同样处理的无码图片
+
+    Args:
+        corpus_dir (str): 语料目录
+        count (int): 每类图片数量
+    """
+    encoder = cv2.QRCodeEncoder.create()
+    rng = random.Random(0)
+    for label in ("qr", "no_qr"):
+        os.makedirs(os.path.join(corpus_dir, label), exist_ok=True)
+    for i in range(count):
+        width, height = rng.choice([(480, 640), (1080, 1920), (3000, 4000)])
+        background = np.full((height, width), rng.randint(150, 255), np.uint8)
+        noise = np.random.default_rng(i).integers(0, 40, (height, width), np.uint8)
+        no_qr = cv2.subtract(background, noise)
+        cv2.putText(
+            no_qr, f"sample {i}", (20, height // 2), 0, width / 400, 0, 3
+        )
+
+        qr_image = no_qr.copy()
+        code = encoder.encode(f"https://example.com/group/{i}")
+        # 四周留出4个模块宽的空白区
+        code = cv2.copyMakeBorder(code, 4, 4, 4, 4, cv2.BORDER_CONSTANT, value=255)
+        side = rng.randint(min(width, height) // 5, min(width, height) // 2)
+        code = cv2.resize(code, (side, side), interpolation=cv2.INTER_NEAREST)
+        x, y = rng.randint(0, width - side), rng.randint(0, height - side)
+        qr_image[y : y + side, x : x + side] = code
+
+        # 部分图片使用暗色模式
+        if i % 4 == 3:
+            qr_image, no_qr = cv2.bitwise_not(qr_image), cv2.bitwise_not(no_qr)
+        cv2.imwrite(os.path.join(corpus_dir, "qr", f"{i}.jpg"), qr_image)
+        cv2.imwrite(os.path.join(corpus_dir, "no_qr", f"{i}.jpg"), no_qr)
+
+
+def _load_corpus(corpus_dir):
+    corpus = []
+    for label in ("qr", "no_qr"):
+        directory = os.path.join(corpus_dir, label)
+        if not os.path.isdir(directory):
+            continue
+        for name in sorted(os.listdir(directory)):
+            if name.lower().endswith(IMAGE_EXTENSIONS):
+                with open(os.path.join(directory, name), "rb") as f:
+                    corpus.append((name, label == "qr", f.read()))
+    return corpus
+
+
+def _percentile(values, percent):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * percent))]
+
+
+def run_benchmark(corpus, early_exit, time_budget):
+    """
+    对语料执行识别并统计
+
+    Returns:
+        dict: 耗时（毫秒）、召回率、误报数
+    """
+    latencies = []
+    detected = false_positives = positives = 0
+    for _, has_qr, image_data in corpus:
+        start = time.perf_counter()
+        results = scan_image_bytes(image_data, early_exit, time_budget)
+        latencies.append((time.perf_counter() - start) * 1000)
+        if has_qr:
+            positives += 1
+            detected += bool(results)
+        elif results:
+            false_positives += 1
+    return {
+        "images": len(corpus),
+        "mean_ms": sum(latencies) / len(latencies),
+        "p50_ms": _percentile(latencies, 0.5),
+        "p95_ms": _percentile(latencies, 0.95),
+        "max_ms": max(latencies),
+        "recall": detected / positives if positives else None,
+        "false_positives": false_positives,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="二维码识别基准测试")
+    parser.add_argument("corpus", help="语料目录，包含 qr/ 和 no_qr/ 子目录")
+    parser.add_argument("--generate", type=int, default=0, help="先生成指定数量的合成语料")
+    args = parser.parse_args()
+
+    if args.generate:
+        generate_corpus(args.corpus, args.generate)
+    corpus = _load_corpus(args.corpus)
+    if not corpus:
+        print(f"语料目录 {args.corpus} 中没有图片")
+        sys.exit(1)
+
+    modes = (
+        ("线上配置", True, SCAN_TIME_BUDGET),
+        ("不限时间", True, None),
+        ("全部预处理", False, None),
+    )
+    for mode, early_exit, time_budget in modes:
+        stats = run_benchmark(corpus, early_exit, time_budget)
+        recall = "-" if stats["recall"] is None else f"{stats['recall']:.1%}"
+        print(
+            f"{mode}: {stats['images']} 张图片, "
+            f"平均 {stats['mean_ms']:.1f}ms, p50 {stats['p50_ms']:.1f}ms, "
+            f"p95 {stats['p95_ms']:.1f}ms, 最大 {stats['max_ms']:.1f}ms, "
+            f"召回率 {recall}, 误报 {stats['false_positives']} 张"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+二维码检测结果缓存
+
+同一张二维码图片/视频经常在多个群被反复转发，这里按内容标识缓存检测结果，进程内所有群共享：
+- 消息段中的文件标识（file_unique/file，由内容计算，转发时不变），命中时无需下载
+- 下载内容的 SHA-1，用于文件标识不同但内容相同的情况
+缓存按 LRU 淘汰，含二维码的结果保留较久；未检测到二维码的结果（视频只抽取部分帧，可能漏检）只短暂保留。
+"""
+
+import time
+from collections import OrderedDict
+from .. import QR_CACHE_MAX_SIZE, QR_CACHE_TTL, QR_CACHE_NEGATIVE_TTL
+
+
+class QRResultCache:
+    """
+    检测结果的 LRU + TTL 缓存
+
+    Args:
+        max_size (int): 最大条目数
+        ttl (int): 含二维码结果的有效期，单位：秒
+        negative_ttl (int): 不含二维码结果的有效期，单位：秒
+    """
+
+    def __init__(self, max_size, ttl, negative_ttl):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        # 键 -> (过期时间, 检测结果)
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, *keys):
+        """
+        按顺序查找第一个命中的键
+
+        Args:
+            *keys: 缓存键，为None的键会被跳过
+
+        Returns:
+            dict: 检测结果的副本，未命中时返回None
+        """
+        now = time.monotonic()
+        for key in keys:
+            entry = self._entries.get(key) if key else None
+            if entry is None:
+                continue
+            expire_at, result = entry
+            if expire_at <= now:
+                del self._entries[key]
+                continue
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(result)
+        self.misses += 1
+        return None
+
+    def set(self, result, *keys):
+        """
+        以多个键缓存同一个检测结果，只缓存检测成功的结果
+
+        Args:
+            result (dict): 检测结果
+            *keys: 缓存键，为None的键会被跳过
+        """
+        if not result.get("success"):
+            return
+        ttl = self.ttl if result.get("has_qr_code") else self.negative_ttl
+        expire_at = time.monotonic() + ttl
+        for key in keys:
+            if not key:
+                continue
+            self._entries[key] = (expire_at, result)
+            self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def get_stats(self):
+        """
+        获取缓存统计信息
+
+        Returns:
+            dict: 条目数、命中数、未命中数、命中率
+        """
+        total = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
+
+
+# 全局检测结果缓存
+qr_result_cache = QRResultCache(QR_CACHE_MAX_SIZE, QR_CACHE_TTL, QR_CACHE_NEGATIVE_TTL)
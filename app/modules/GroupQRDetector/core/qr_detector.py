@@ -1,26 +1,35 @@
 import cv2
-import random
 import os
-import numpy as np
+import tempfile
 import asyncio
+import hashlib
 import platform
-import aiohttp
 from logger import logger
-
-try:
-    from pyzbar import pyzbar
-
-    PYZBAR_AVAILABLE = True
-except ImportError as e:
-    PYZBAR_AVAILABLE = False
-    PYZBAR_ERROR = str(e)
+from core.process_pool import run_in_process
+from core.http_client import http_get
+from .qr_pipeline import PYZBAR_AVAILABLE, PYZBAR_ERROR, scan_image, scan_image_bytes
+from .qr_cache import qr_result_cache
+from .video_sampler import sample_video_frames
+from .. import (
+    QR_VIDEO_MAX_FRAMES,
+    QR_VIDEO_TIME_BUDGET,
+    QR_VIDEO_MAX_DOWNLOAD_SIZE,
+    QR_VIDEO_DOWNLOAD_TIMEOUT,
+)
 
 
 class QRDetector:
     """
     通用二维码检测器类，支持检测图片和视频中的二维码。
+    识别在进程池中执行（见 qr_pipeline），不占用事件循环所在进程的 GIL。
     """
 
+    # 依赖检查只在首次创建实例时执行
+    _dependencies_checked = False
+
+    # 正在检测的缓存键 -> Future，同一文件同时出现在多个群时只检测一次
+    _pending = {}
+
     def __init__(self, output_dir="output_frames"):
         """
         初始化二维码检测器。
@@ -39,7 +48,9 @@ class QRDetector:
             self.opencv_qr_available = False
 
         # 检查依赖并给出友好提示
-        self._check_dependencies()
+        if not QRDetector._dependencies_checked:
+            QRDetector._dependencies_checked = True
+            self._check_dependencies()
 
     def _check_dependencies(self):
         """检查依赖并给出安装建议"""
@@ -98,100 +109,9 @@ class QRDetector:
             self.output_dir = os.getcwd()
             logger.info(f"使用当前目录作为输出目录：{self.output_dir}")
 
-    async def preprocess_image_for_qr(self, image):
-        """
-        对图像进行预处理以提高二维码检测率。
-
-        Args:
-            image: OpenCV图像对象
-
-        Returns:
-            list: 预处理后的图像列表
-        """
-
-        def _process_image():
-            processed_images = []
-
-            # 1. 原始图像
-            processed_images.append(("original", image))
-
-            # 2. 转换为灰度图像
-            gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            processed_images.append(("gray", gray))
-
-            # 3. 直方图均衡化
-            equalized = cv2.equalizeHist(gray)
-            processed_images.append(("equalized", equalized))
-
-            # 4. 对比度限制的自适应直方图均衡化 (CLAHE)
-            clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
-            clahe_img = clahe.apply(gray)
-            processed_images.append(("clahe", clahe_img))
-
-            # 5. 高斯模糊后锐化
-            blurred = cv2.GaussianBlur(gray, (3, 3), 0)
-            sharpened = cv2.addWeighted(gray, 1.5, blurred, -0.5, 0)
-            processed_images.append(("sharpened", sharpened))
-
-            # 6. 自适应阈值处理
-            adaptive_thresh = cv2.adaptiveThreshold(
-                gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
-            )
-            processed_images.append(("adaptive_thresh", adaptive_thresh))
-
-            # 7. Otsu阈值处理
-            _, otsu_thresh = cv2.threshold(
-                gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU
-            )
-            processed_images.append(("otsu_thresh", otsu_thresh))
-
-            # 8. 形态学操作
-            kernel = np.ones((2, 2), np.uint8)
-            morph = cv2.morphologyEx(gray, cv2.MORPH_CLOSE, kernel)
-            processed_images.append(("morphology", morph))
-
-            # 9. 不同尺寸的图像
-            height, width = gray.shape
-            # 放大图像
-            enlarged = cv2.resize(
-                gray, (width * 2, height * 2), interpolation=cv2.INTER_CUBIC
-            )
-            processed_images.append(("enlarged", enlarged))
-
-            # 缩小图像
-            if width > 400 and height > 400:
-                reduced = cv2.resize(
-                    gray, (width // 2, height // 2), interpolation=cv2.INTER_AREA
-                )
-                processed_images.append(("reduced", reduced))
-
-            # 10. 暗色模式处理：反转图像颜色
-            inverted = cv2.bitwise_not(gray)
-            processed_images.append(("inverted_for_dark_mode", inverted))
-
-            # 11. 暗色模式 + 对比度增强
-            inverted_clahe = clahe.apply(inverted)
-            processed_images.append(("inverted_clahe", inverted_clahe))
-
-            # 12. 暗色模式 + 自适应阈值
-            inverted_adaptive = cv2.adaptiveThreshold(
-                inverted, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
-            )
-            processed_images.append(("inverted_adaptive", inverted_adaptive))
-
-            # 13. 暗色模式 + Otsu阈值
-            _, inverted_otsu = cv2.threshold(
-                inverted, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU
-            )
-            processed_images.append(("inverted_otsu", inverted_otsu))
-
-            return processed_images
-
-        return await asyncio.get_event_loop().run_in_executor(None, _process_image)
-
-    async def detect_qr_codes_pyzbar(self, image):
+    async def detect_qr_codes(self, image):
         """
-        使用 pyzbar 检测二维码。
+        检测图片中的二维码（增强版），识别到二维码后不再尝试其余预处理。
 
         Args:
             image: OpenCV图像对象
@@ -199,148 +119,74 @@ class QRDetector:
         Returns:
             list: 检测到的二维码信息列表
         """
-        if not PYZBAR_AVAILABLE:
-            return []
-
-        def _detect():
-            qr_codes = pyzbar.decode(image)
-            results = []
-            for qr_code in qr_codes:
-                qr_data = qr_code.data.decode("utf-8")
-                qr_type = qr_code.type
-
-                points = qr_code.polygon
-                if len(points) == 4:
-                    pts = [(int(point.x), int(point.y)) for point in points]
-                else:
-                    x, y, w, h = qr_code.rect
-                    pts = [(x, y), (x + w, y), (x + w, y + h), (x, y + h)]
-
-                results.append(
-                    {
-                        "data": qr_data,
-                        "type": qr_type,
-                        "points": pts,
-                        "method": "pyzbar",
-                    }
-                )
-            return results
+        results = await run_in_process(scan_image, image)
+        self._log_results(results)
+        return results
 
-        return await asyncio.get_event_loop().run_in_executor(None, _detect)
+    def _log_results(self, results):
+        """记录检测结果"""
+        for result in results:
+            logger.info(
+                f"✅ 检测到二维码 (方法: {result['method']}, 预处理: {result['preprocess_method']})"
+            )
+            logger.info(f"    内容: {result['data']}")
 
-    async def detect_qr_codes_opencv(self, image):
+    async def _detect_cached(self, file_id, detect):
         """
-        使用 OpenCV 检测二维码。
+        按文件标识查找缓存，未命中时执行检测并缓存结果，同一文件的并发检测只执行一次。
 
         Args:
-            image: OpenCV图像对象
+            file_id (str): 消息段中的文件标识，为None时不使用文件标识缓存
+            detect: 执行检测的协程函数
 
         Returns:
-            list: 检测到的二维码信息列表
+            dict: 检测结果，来自缓存时包含 "cached": True
         """
-        if not self.opencv_qr_available:
-            return []
-
-        def _detect():
-            results = []
-            if len(image.shape) == 3:
-                gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
-            else:
-                gray = image
-
+        file_key = f"file:{file_id}" if file_id else None
+        cached = qr_result_cache.get(file_key)
+        if cached is not None:
+            cached["cached"] = True
+            return cached
+        if file_key is None:
+            return await detect()
+
+        pending = QRDetector._pending.get(file_key)
+        if pending is not None:
             try:
-                data, points, _ = self.qr_detector.detectAndDecode(gray)
-                if data:
-                    if points is not None and len(points) > 0:
-                        pts = [(int(point[0]), int(point[1])) for point in points[0]]
-                    else:
-                        pts = []
-
-                    results.append(
-                        {
-                            "data": data,
-                            "type": "QRCODE",
-                            "points": pts,
-                            "method": "opencv",
-                        }
-                    )
-            except Exception as e:
-                logger.error(f"OpenCV QR 检测出错: {e}")
-
-            return results
-
-        return await asyncio.get_event_loop().run_in_executor(None, _detect)
-
-    async def detect_qr_codes(self, image):
-        """
-        检测图片中的二维码（增强版）。
-
-        Args:
-            image: OpenCV图像对象
-
-        Returns:
-            list: 检测到的二维码信息列表
-        """
-        all_results = []
-
-        # 获取预处理后的图像
-        processed_images = await self.preprocess_image_for_qr(image)
-
-        logger.info(f"正在使用 {len(processed_images)} 种预处理方法检测二维码...")
-
-        # 并发检测所有预处理后的图像
-        detection_tasks = []
-
-        for method_name, processed_img in processed_images:
-            # 使用 pyzbar 检测
-            if PYZBAR_AVAILABLE:
-                task = self._detect_with_method(processed_img, method_name, "pyzbar")
-                detection_tasks.append(task)
-
-            # 使用 OpenCV 检测
-            if self.opencv_qr_available:
-                task = self._detect_with_method(processed_img, method_name, "opencv")
-                detection_tasks.append(task)
-
-        # 等待所有检测任务完成
-        if detection_tasks:
-            results_list = await asyncio.gather(*detection_tasks)
-            for results in results_list:
-                all_results.extend(results)
-
-        # 去重：基于二维码内容去重
-        unique_results = []
-        seen_data = set()
-
-        for result in all_results:
-            if result["data"] not in seen_data:
-                seen_data.add(result["data"])
-                unique_results.append(result)
-                logger.info(
-                    f"✅ 检测到二维码 (方法: {result['method']}, 预处理: {result['preprocess_method']})"
-                )
-                logger.info(f"    内容: {result['data']}")
-
-        return unique_results
-
-    async def _detect_with_method(self, image, method_name, detector_type):
-        """使用指定方法和预处理检测二维码的辅助函数"""
-        if detector_type == "pyzbar":
-            results = await self.detect_qr_codes_pyzbar(image)
-        else:
-            results = await self.detect_qr_codes_opencv(image)
-
-        for result in results:
-            result["preprocess_method"] = method_name
-
-        return results
-
-    async def detect_image_from_url(self, image_url):
+                result = dict(await asyncio.shield(pending))
+            except asyncio.CancelledError:
+                # 执行检测的调用方被取消时自行检测，本调用方被取消时继续抛出
+                if pending.cancelled():
+                    return await self._detect_cached(file_id, detect)
+                raise
+            result["cached"] = True
+            return result
+
+        future = asyncio.get_running_loop().create_future()
+        QRDetector._pending[file_key] = future
+        try:
+            result = await detect()
+            qr_result_cache.set(result, file_key)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            # 检测失败时等待中的调用方收到同一异常，标记为已读取以免未等待时告警
+            future.set_exception(e)
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            QRDetector._pending.pop(file_key, None)
+
+    async def detect_image_from_url(self, image_url, file_id=None):
         """
-        从URL下载图片并检测二维码。
+        从URL下载图片并检测二维码，重复的图片直接返回缓存的结果。
 
         Args:
             image_url (str): 图片URL
+            file_id (str, optional): 消息段中的文件标识（file_unique 或 file）
 
         Returns:
             dict: 检测结果
@@ -348,41 +194,55 @@ class QRDetector:
         if not self._validate_url(image_url):
             return {"success": False, "error": "无效的图片URL"}
 
+        return await self._detect_cached(
+            file_id, lambda: self._download_and_detect_image(image_url)
+        )
+
+    async def _download_and_detect_image(self, image_url):
+        """下载图片并检测二维码，内容相同的图片直接返回缓存的结果"""
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(image_url) as response:
-                    if response.status == 200:
-                        image_data = await response.read()
-                        # 将字节数据转换为numpy数组
-                        nparr = np.frombuffer(image_data, np.uint8)
-                        # 解码为OpenCV图像
-                        image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-
-                        if image is not None:
-                            qr_results = await self.detect_qr_codes(image)
-                            return {
-                                "success": True,
-                                "has_qr_code": len(qr_results) > 0,
-                                "qr_codes": qr_results,
-                                "media_type": "image",
-                            }
-                        else:
-                            return {"success": False, "error": "无法解码图片"}
-                    else:
-                        return {
-                            "success": False,
-                            "error": f"下载图片失败: {response.status}",
+            async with http_get(image_url) as response:
+                if response.status == 200:
+                    image_data = await response.read()
+                    content_key = f"sha1:{hashlib.sha1(image_data).hexdigest()}"
+                    cached = qr_result_cache.get(content_key)
+                    if cached is not None:
+                        cached["cached"] = True
+                        return cached
+
+                    # 在进程池中解码图片并检测
+                    qr_results = await run_in_process(scan_image_bytes, image_data)
+
+                    if qr_results is not None:
+                        self._log_results(qr_results)
+                        result = {
+                            "success": True,
+                            "has_qr_code": len(qr_results) > 0,
+                            "qr_codes": qr_results,
+                            "media_type": "image",
                         }
+                        qr_result_cache.set(result, content_key)
+                        return result
+                    else:
+                        return {"success": False, "error": "无法解码图片"}
+                else:
+                    return {
+                        "success": False,
+                        "error": f"下载图片失败: {response.status}",
+                    }
         except Exception as e:
             return {"success": False, "error": f"图片处理失败: {str(e)}"}
 
-    async def detect_video_from_url(self, video_url, max_retries=3):
+    async def detect_video_from_url(
+        self, video_url, max_frames=QR_VIDEO_MAX_FRAMES, file_id=None
+    ):
         """
-        从视频URL检测二维码。
+        从视频URL检测二维码，重复的视频直接返回缓存的结果。
 
         Args:
             video_url (str): 视频URL
-            max_retries (int): 最大重试次数
+            max_frames (int): 最多抽取识别的帧数
+            file_id (str, optional): 消息段中的文件标识（file_unique 或 file）
 
         Returns:
             dict: 检测结果
@@ -390,89 +250,126 @@ class QRDetector:
         if not self._validate_url(video_url):
             return {"success": False, "error": "无效的视频URL"}
 
-        # 获取视频信息
-        video_info = await self._get_video_info(video_url)
-        if not video_info["success"]:
-            return video_info
+        return await self._detect_cached(
+            file_id, lambda: self._detect_video(video_url, max_frames)
+        )
 
-        # 尝试多次检测
-        for attempt in range(max_retries):
-            logger.info(f"🎯 第 {attempt + 1} 次尝试检测视频二维码...")
+    async def _detect_video(self, video_url, max_frames):
+        """
+        下载视频后一次性均匀抽帧，各帧并行识别，任一帧识别到二维码即停止。
+        抽帧和识别共享 QR_VIDEO_TIME_BUDGET 时间预算，超时后返回已有结果。
+        """
+        video_path, error = await self._download_video(video_url)
+        if video_path is None:
+            return {"success": False, "error": error}
 
-            frame_result = await self._extract_single_frame(video_url, video_info)
-            if not frame_result["success"]:
-                continue
+        try:
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + QR_VIDEO_TIME_BUDGET
+            try:
+                sampled = await asyncio.wait_for(
+                    run_in_process(sample_video_frames, video_path, max_frames),
+                    QR_VIDEO_TIME_BUDGET,
+                )
+            except asyncio.TimeoutError:
+                return {"success": False, "error": "视频抽帧超时"}
+            if sampled is None:
+                return {"success": False, "error": "无法打开视频"}
+            if not sampled["frames"]:
+                return {"success": False, "error": "视频不包含任何帧"}
 
-            frame = frame_result["frame"]
-            qr_results = await self.detect_qr_codes(frame)
+            frames = sampled["frames"]
+            logger.info(
+                f"🎯 视频共 {sampled['total_frames']} 帧，抽取 {len(frames)} 帧识别"
+                f"（丢弃重复帧 {sampled['duplicates']} 帧）"
+            )
+
+            async def _scan(frame_index, frame):
+                return frame_index, await run_in_process(scan_image, frame)
 
-            if qr_results:
-                logger.info(
-                    f"✅ 第 {attempt + 1} 次尝试成功检测到 {len(qr_results)} 个二维码！"
+            tasks = [
+                asyncio.ensure_future(_scan(frame_index, frame))
+                for frame_index, frame in frames
+            ]
+            scanned = 0
+            try:
+                for next_done in asyncio.as_completed(
+                    tasks, timeout=max(0, deadline - loop.time())
+                ):
+                    frame_index, qr_results = await next_done
+                    scanned += 1
+                    if qr_results:
+                        self._log_results(qr_results)
+                        logger.info(
+                            f"✅ 第 {frame_index} 帧检测到 {len(qr_results)} 个二维码！"
+                        )
+                        return {
+                            "success": True,
+                            "has_qr_code": True,
+                            "qr_codes": qr_results,
+                            "media_type": "video",
+                            "frame_index": frame_index,
+                            "frames_scanned": scanned,
+                            "total_frames": sampled["total_frames"],
+                        }
+            except asyncio.TimeoutError:
+                logger.warning(
+                    f"视频识别超时，已识别 {scanned}/{len(frames)} 帧，均未检测到二维码"
                 )
-                return {
-                    "success": True,
-                    "has_qr_code": True,
-                    "qr_codes": qr_results,
-                    "media_type": "video",
-                    "attempt": attempt + 1,
-                    "frame_index": frame_result["frame_index"],
-                }
-
-        return {
-            "success": True,
-            "has_qr_code": False,
-            "qr_codes": [],
-            "media_type": "video",
-            "message": f"经过 {max_retries} 次尝试，均未检测到二维码",
-        }
-
-    async def _get_video_info(self, video_url):
-        """获取视频基本信息"""
-
-        def _get_info():
-            cap = cv2.VideoCapture(video_url)
-            if not cap.isOpened():
-                return {"success": False, "error": "无法打开视频URL"}
-
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            fps = cap.get(cv2.CAP_PROP_FPS)
-            width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-            height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-            cap.release()
-
-            if total_frames == 0:
-                return {"success": False, "error": "视频不包含任何帧"}
+            finally:
+                # 已提交但尚未开始的识别任务不再执行
+                for task in tasks:
+                    task.cancel()
 
             return {
                 "success": True,
-                "total_frames": total_frames,
-                "video_info": {"fps": fps, "width": width, "height": height},
+                "has_qr_code": False,
+                "qr_codes": [],
+                "media_type": "video",
+                "frames_scanned": scanned,
+                "total_frames": sampled["total_frames"],
+                "message": f"识别了 {scanned} 帧，均未检测到二维码",
             }
+        finally:
+            try:
+                os.remove(video_path)
+            except OSError as e:
+                logger.warning(f"删除临时视频文件失败: {e}")
 
-        return await asyncio.get_event_loop().run_in_executor(None, _get_info)
-
-    async def _extract_single_frame(self, video_url, video_info):
-        """抽取单个随机帧"""
-
-        def _extract():
-            cap = cv2.VideoCapture(video_url)
-            if not cap.isOpened():
-                return {"success": False, "error": "无法打开视频URL"}
-
-            total_frames = video_info["total_frames"]
-            random_frame_index = random.randint(0, total_frames - 1)
-
-            cap.set(cv2.CAP_PROP_POS_FRAMES, random_frame_index)
-            ret, frame = cap.read()
-            cap.release()
-
-            if not ret:
-                return {"success": False, "error": f"无法读取帧 {random_frame_index}"}
-
-            return {"success": True, "frame": frame, "frame_index": random_frame_index}
+    async def _download_video(self, video_url):
+        """
+        分块下载视频到临时文件，超过 QR_VIDEO_MAX_DOWNLOAD_SIZE 时放弃
 
-        return await asyncio.get_event_loop().run_in_executor(None, _extract)
+        Returns:
+            tuple: (临时文件路径, 错误信息)，下载失败时路径为None
+        """
+        fd, video_path = tempfile.mkstemp(suffix=".mp4", prefix="qr_video_")
+        # 任务被取消（CancelledError 不是 Exception 的子类）时也要删除临时文件
+        downloaded = False
+        try:
+            with os.fdopen(fd, "wb") as f:
+                async with http_get(
+                    video_url, timeout=QR_VIDEO_DOWNLOAD_TIMEOUT
+                ) as response:
+                    if response.status != 200:
+                        raise ValueError(f"下载视频失败: {response.status}")
+                    if (response.content_length or 0) > QR_VIDEO_MAX_DOWNLOAD_SIZE:
+                        raise ValueError("视频过大，跳过检测")
+                    size = 0
+                    async for chunk in response.content.iter_chunked(64 * 1024):
+                        size += len(chunk)
+                        if size > QR_VIDEO_MAX_DOWNLOAD_SIZE:
+                            raise ValueError("视频过大，跳过检测")
+                        f.write(chunk)
+            downloaded = True
+            return video_path, None
+        except ValueError as e:
+            return None, str(e)
+        except Exception as e:
+            return None, f"视频下载失败: {str(e)}"
+        finally:
+            if not downloaded:
+                os.remove(video_path)
 
 
 async def main():
@@ -494,7 +391,9 @@ async def main():
     if result["success"]:
         logger.info(f"\n检测结果:")
         logger.info(f"  总帧数: {result['total_frames']}")
-        logger.info(f"  抽取帧索引: {result['frame_index']}")
+        logger.info(f"  识别帧数: {result['frames_scanned']}")
+        if "frame_index" in result:
+            logger.info(f"  二维码所在帧: {result['frame_index']}")
         logger.info(f"  包含二维码: {result['has_qr_code']}")
         if result["has_qr_code"]:
             logger.info(f"  二维码数量: {len(result['qr_codes'])}")
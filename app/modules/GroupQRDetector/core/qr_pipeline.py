@@ -0,0 +1,216 @@
+"""
+二维码识别流水线
+
+在进程池的工作进程中执行（见 core.process_pool），因此只依赖 cv2/numpy/pyzbar，不使用 logger。
+- 超大图像先缩小到 MAX_IMAGE_SIDE 以内
+- 预处理图像按代价从低到高依次生成，每种预处理先用 pyzbar 再用 OpenCV 识别，
+  识别到二维码后立即返回，大多数含码图片在灰度图上即可识别，无需生成其余预处理图像
+- 单张图片的识别时间超过 SCAN_TIME_BUDGET 后不再尝试后续预处理，
+  避免纹理复杂的无码图片长时间占用工作进程
+- 返回的坐标已换算回原图坐标
+"""
+
+import time
+import cv2
+import numpy as np
+
+try:
+    from pyzbar import pyzbar
+
+    PYZBAR_AVAILABLE = True
+    PYZBAR_ERROR = ""
+except ImportError as e:
+    PYZBAR_AVAILABLE = False
+    PYZBAR_ERROR = str(e)
+
+# 识别前图像最长边的上限，单位：像素，超过时先等比缩小
+MAX_IMAGE_SIDE = 1600
+
+# 最长边不超过该值时才尝试放大2倍，大图放大代价高且收益很小
+ENLARGE_MAX_SIDE = 800
+
+# 单张图片识别的时间预算，单位：秒，超过后不再尝试后续预处理（至少完成第一种）
+SCAN_TIME_BUDGET = 1.5
+
+# 每个工作进程的 OpenCV 检测器
+_opencv_detector = None
+
+
+def _get_opencv_detector():
+    global _opencv_detector
+    if _opencv_detector is None:
+        _opencv_detector = cv2.QRCodeDetector()
+    return _opencv_detector
+
+
+def _decode_pyzbar(image):
+    results = []
+    for qr_code in pyzbar.decode(image):
+        points = qr_code.polygon
+        if len(points) == 4:
+            pts = [(point.x, point.y) for point in points]
+        else:
+            x, y, w, h = qr_code.rect
+            pts = [(x, y), (x + w, y), (x + w, y + h), (x, y + h)]
+        results.append(
+            {
+                "data": qr_code.data.decode("utf-8", errors="replace"),
+                "type": qr_code.type,
+                "points": pts,
+                "method": "pyzbar",
+            }
+        )
+    return results
+
+
+def _decode_opencv(image):
+    try:
+        data, points, _ = _get_opencv_detector().detectAndDecode(image)
+    except cv2.error:
+        return []
+    if not data:
+        return []
+    pts = []
+    if points is not None and len(points) > 0:
+        pts = [(point[0], point[1]) for point in points[0]]
+    return [{"data": data, "type": "QRCODE", "points": pts, "method": "opencv"}]
+
+
+def _get_decoders():
+    decoders = []
+    if PYZBAR_AVAILABLE:
+        decoders.append(_decode_pyzbar)
+    decoders.append(_decode_opencv)
+    return decoders
+
+
+def _iter_variants(gray):
+    """
+    按代价从低到高依次生成预处理图像
+
+    Yields:
+        tuple: (预处理名称, 图像, 相对输入图像的缩放比例)
+    """
+    yield "gray", gray, 1.0
+
+    # Otsu阈值处理
+    _, otsu_thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    yield "otsu_thresh", otsu_thresh, 1.0
+
+    # 暗色模式处理：反转图像颜色
+    inverted = cv2.bitwise_not(gray)
+    yield "inverted_for_dark_mode", inverted, 1.0
+
+    # 直方图均衡化
+    yield "equalized", cv2.equalizeHist(gray), 1.0
+
+    # 对比度限制的自适应直方图均衡化 (CLAHE)
+    clahe = cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8))
+    yield "clahe", clahe.apply(gray), 1.0
+
+    # 暗色模式 + Otsu阈值
+    _, inverted_otsu = cv2.threshold(
+        inverted, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU
+    )
+    yield "inverted_otsu", inverted_otsu, 1.0
+
+    # 暗色模式 + 对比度增强
+    yield "inverted_clahe", clahe.apply(inverted), 1.0
+
+    # 高斯模糊后锐化
+    blurred = cv2.GaussianBlur(gray, (3, 3), 0)
+    yield "sharpened", cv2.addWeighted(gray, 1.5, blurred, -0.5, 0), 1.0
+
+    # 自适应阈值处理
+    yield "adaptive_thresh", cv2.adaptiveThreshold(
+        gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
+    ), 1.0
+
+    # 暗色模式 + 自适应阈值
+    yield "inverted_adaptive", cv2.adaptiveThreshold(
+        inverted, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
+    ), 1.0
+
+    # 形态学操作
+    kernel = np.ones((2, 2), np.uint8)
+    yield "morphology", cv2.morphologyEx(gray, cv2.MORPH_CLOSE, kernel), 1.0
+
+    height, width = gray.shape
+    # 缩小图像
+    if width > 400 and height > 400:
+        yield "reduced", cv2.resize(
+            gray, (width // 2, height // 2), interpolation=cv2.INTER_AREA
+        ), 0.5
+
+    # 放大图像
+    if max(width, height) <= ENLARGE_MAX_SIDE:
+        yield "enlarged", cv2.resize(
+            gray, (width * 2, height * 2), interpolation=cv2.INTER_CUBIC
+        ), 2.0
+
+
+def scan_image(image, early_exit=True, time_budget=SCAN_TIME_BUDGET):
+    """
+    识别图像中的二维码
+
+    Args:
+        image: OpenCV图像对象（BGR或灰度）
+        early_exit (bool, optional): 识别到二维码后是否立即返回，为False时尝试全部预处理（用于评估召回率）
+        time_budget (float, optional): 时间预算，单位：秒，为None时不限制
+
+    Returns:
+        list: 识别到的二维码信息列表（按内容去重）
+    """
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+
+    # 超大图像先缩小
+    scale = 1.0
+    height, width = gray.shape
+    if max(height, width) > MAX_IMAGE_SIDE:
+        scale = MAX_IMAGE_SIDE / max(height, width)
+        gray = cv2.resize(
+            gray,
+            (max(1, int(width * scale)), max(1, int(height * scale))),
+            interpolation=cv2.INTER_AREA,
+        )
+
+    deadline = None if time_budget is None else time.monotonic() + time_budget
+    decoders = _get_decoders()
+    results = []
+    seen_data = set()
+    for method_name, variant, variant_scale in _iter_variants(gray):
+        for decode in decoders:
+            for result in decode(variant):
+                if result["data"] in seen_data:
+                    continue
+                seen_data.add(result["data"])
+                # 坐标换算回原图
+                factor = scale * variant_scale
+                result["points"] = [
+                    (int(x / factor), int(y / factor)) for x, y in result["points"]
+                ]
+                result["preprocess_method"] = method_name
+                results.append(result)
+            if results and early_exit:
+                return results
+        if deadline is not None and time.monotonic() > deadline:
+            break
+    return results
+
+
+def scan_image_bytes(image_data, early_exit=True, time_budget=SCAN_TIME_BUDGET):
+    """
+    解码图片文件数据并识别其中的二维码，解码直接输出灰度图以减少开销
+
+    Args:
+        image_data (bytes): 图片文件数据
+        early_exit (bool, optional): 同 scan_image
+        time_budget (float, optional): 同 scan_image
+
+    Returns:
+        list: 识别到的二维码信息列表，图片无法解码时返回None
+    """
+    image = cv2.imdecode(np.frombuffer(image_data, np.uint8), cv2.IMREAD_GRAYSCALE)
+    if image is None:
+        return None
+    return scan_image(image, early_exit, time_budget)
@@ -0,0 +1,95 @@
+"""
+视频抽帧
+
+与 qr_pipeline 相同，在进程池的工作进程中执行，不使用 logger。
+- 视频已下载到本地临时文件，只打开一次 VideoCapture，按帧号顺序一次读完所有采样帧
+- 采样位置在视频中均匀分布（取每段的中点），相邻采样点间隔较大时直接定位，间隔较小时顺序跳帧
+- 与上一张保留帧几乎相同的帧（静态画面）被丢弃，不重复识别
+- 返回的帧已转为灰度图并缩小到 MAX_IMAGE_SIDE 以内，减少跨进程传输的数据量
+"""
+
+import cv2
+import numpy as np
+from .qr_pipeline import MAX_IMAGE_SIDE
+
+# 相邻采样点间隔超过该帧数时直接定位，否则顺序跳帧（定位需从关键帧重新解码）
+SEEK_MIN_GAP = 30
+
+# 判断帧是否重复时使用的缩略图边长，单位：像素
+THUMBNAIL_SIDE = 32
+
+# 缩略图各像素差的最大值低于该值时视为与上一张保留帧重复，
+# 使用最大值而不是平均值，画面角落新出现的小二维码也不会被当作重复帧
+DUPLICATE_FRAME_DIFF = 16
+
+
+def _sample_positions(total_frames, max_frames):
+    """在视频中均匀选取采样帧号"""
+    count = min(max_frames, total_frames)
+    positions = ((np.arange(count) + 0.5) * total_frames / count).astype(int)
+    return sorted(set(int(position) for position in positions))
+
+
+def _to_gray(frame):
+    gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+    height, width = gray.shape
+    if max(height, width) > MAX_IMAGE_SIDE:
+        scale = MAX_IMAGE_SIDE / max(height, width)
+        gray = cv2.resize(
+            gray,
+            (max(1, int(width * scale)), max(1, int(height * scale))),
+            interpolation=cv2.INTER_AREA,
+        )
+    return gray
+
+
+def sample_video_frames(video_path, max_frames):
+    """
+    从本地视频文件中均匀抽取帧并去除重复帧
+
+    Args:
+        video_path (str): 视频文件路径
+        max_frames (int): 最多抽取的帧数
+
+    Returns:
+        dict: total_frames（总帧数）、frames（(帧号, 灰度图) 列表）、duplicates（丢弃的重复帧数），
+              视频无法打开时返回None
+    """
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        return None
+    try:
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        if total_frames <= 0:
+            return {"total_frames": 0, "frames": [], "duplicates": 0}
+
+        frames = []
+        duplicates = 0
+        last_thumbnail = None
+        position = 0
+        for target in _sample_positions(total_frames, max_frames):
+            if target - position > SEEK_MIN_GAP:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+                position = target
+            while position < target and cap.grab():
+                position += 1
+            ok, frame = cap.read()
+            if not ok:
+                break
+            position += 1
+
+            gray = _to_gray(frame)
+            thumbnail = cv2.resize(
+                gray, (THUMBNAIL_SIDE, THUMBNAIL_SIDE), interpolation=cv2.INTER_AREA
+            ).astype(np.int16)
+            if (
+                last_thumbnail is not None
+                and np.abs(thumbnail - last_thumbnail).max() < DUPLICATE_FRAME_DIFF
+            ):
+                duplicates += 1
+                continue
+            last_thumbnail = thumbnail
+            frames.append((target, gray))
+        return {"total_frames": total_frames, "frames": frames, "duplicates": duplicates}
+    finally:
+        cap.release()
@@ -98,10 +98,15 @@ class GroupMessageHandler:
 
         # 根据媒体类型调用相应的检测方法
         if media_type == "video":
-            result = await self.qr_detector.detect_video_from_url(url)
+            result = await self.qr_detector.detect_video_from_url(
+                url, file_id=self._get_media_file_id(media_type)
+            )
         else:
             return
 
+        if result.get("cached"):
+            logger.info(f"[{MODULE_NAME}]{media_type}命中检测结果缓存")
+
         # 处理检测结果
         if result["success"] and result["has_qr_code"]:
             await self._handle_qr_detected(media_type)
@@ -124,6 +129,24 @@ class GroupMessageHandler:
 
         return None, None
 
+    def _get_media_file_id(self, media_type):
+        """
+        从消息段中获取媒体文件标识，相同内容的文件标识相同，用于检测结果缓存
+
+        Args:
+            media_type (str): 媒体类型，即消息段类型
+
+        Returns:
+            str: 文件标识，不存在时返回None
+        """
+        if not isinstance(self.message, list):
+            return None
+        for segment in self.message:
+            if segment.get("type") == media_type:
+                data = segment.get("data", {})
+                return data.get("file_unique") or data.get("file")
+        return None
+
     def _decode_url(self, url):
         """
         解码URL
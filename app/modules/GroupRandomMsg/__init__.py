@@ -13,6 +13,12 @@ SWITCH_NAME = "grm"
 # 模块描述
 MODULE_DESCRIPTION = "群随机消息，每隔半小时随机从数据库中获取一条消息发送"
 
+# 模块订阅的事件类型
+EVENT_KINDS = ["message", "meta_event"]
+
+# 模块任务的优先级通道
+EVENT_PRIORITY = "low"
+
 # 数据目录
 DATA_DIR = os.path.join("data", MODULE_NAME)
 os.makedirs(DATA_DIR, exist_ok=True)
@@ -13,10 +13,54 @@ SWITCH_NAME = "GSD"
 # 模块描述
 MODULE_DESCRIPTION = "群聊刷屏检测"
 
+# 模块订阅的事件类型
+EVENT_KINDS = ["message"]
+
+# 模块任务的优先级通道
+EVENT_PRIORITY = "high"
+
 # 数据目录
 DATA_DIR = os.path.join("data", MODULE_NAME)
 os.makedirs(DATA_DIR, exist_ok=True)
 
+# 刷屏检测默认阈值，可在 DATA_DIR/group_thresholds.json 中按群覆盖
+# 时间窗口内的消息数量阈值
+SPAM_THRESHOLD = 5
+# 高频消息的时间窗口（秒）
+SPAM_TIME_WINDOW = 1.0
+# 连续相同消息数量阈值
+IDENTICAL_MESSAGE_THRESHOLD = 3
+# 连续相同消息的时间窗口（秒）
+IDENTICAL_MESSAGE_WINDOW = 60
+# 单条消息允许的最大换行数
+NEWLINE_LIMIT = 100
+# 禁言分钟数
+BAN_MINUTES = 3
+
+# 按群覆盖的阈值配置文件，格式：{"群号": {"spam_threshold": 8, "ban_minutes": 10}}
+GROUP_THRESHOLDS_FILE = os.path.join(DATA_DIR, "group_thresholds.json")
+
+# 用户超过该时间（秒）没有发言则清除其消息记录
+TRACKER_IDLE_TTL = 600
+# 最多记录的（群，用户）数量，超过时清除最久未发言的记录
+TRACKER_MAX_ENTRIES = 200000
+
+# 跨群刷屏检测：同一内容在 RAID_WINDOW 秒内由至少 RAID_MIN_ACCOUNTS 个账号
+# 或在至少 RAID_MIN_GROUPS 个群中发送，视为协同刷屏
+RAID_WINDOW = 10
+RAID_MIN_ACCOUNTS = 3
+RAID_MIN_GROUPS = 3
+# 参与检测的文本最短长度（归一化后），过短的消息在多个群中重复很常见
+RAID_MIN_TEXT_LENGTH = 8
+# 内容被判定为刷屏后，该时间（秒）内再次出现直接撤回并禁言
+RAID_BLOCK_TTL = 600
+# 协同刷屏的禁言分钟数
+RAID_BAN_MINUTES = 60
+# 最多记录的内容指纹数量，超过时清除最久未出现的指纹
+RAID_MAX_FINGERPRINTS = 50000
+# 撤回和禁言操作的合并间隔（秒），同一时间段内的操作合并执行
+RAID_ACTION_INTERVAL = 0.5
+
 
 # 模块的一些命令可以在这里定义，方便在其他地方调用，提高代码的复用率
 # ------------------------------------------------------------
@@ -0,0 +1,169 @@
+"""
+刷屏检测消息记录基准测试
+
+模拟大量用户在多个群中发言，对比两种消息记录方式的处理耗时和内存占用：
+- 旧结构：按群、用户保存全部消息时间戳和原文的列表（时间戳 pop(0) 清理，内容只增不减），
+  每条消息对全部历史重建列表做重复检测
+- 新结构：spam_tracker.SpamTracker（环形缓冲区、内容哈希、空闲记录清除）
+
+模拟流量：消息时间按每秒 rate 条推进，用户活跃度服从长尾分布，少量用户会刷屏或重复发言；
+两种结构判定出的刷屏次数应基本一致（旧结构的重复检测取的是最早的消息内容，结果会有差异）。
+
+用法（在 app 目录下执行）：
+    python -m modules.GroupSpamDetection.benchmark_spam
+    python -m modules.GroupSpamDetection.benchmark_spam --users 100000 --messages 1000000 --rate 200
+"""
+
+import time
+import random
+import argparse
+import tracemalloc
+from collections import defaultdict
+from .handlers.spam_tracker import SpamTracker, DEFAULT_THRESHOLDS
+
+
+class LegacyTracker:
+    """旧版 GroupSpamDetectionHandle 的消息记录方式"""
+
+    def __init__(self):
+        self.message_timestamps = defaultdict(lambda: defaultdict(list))
+        self.message_contents = defaultdict(lambda: defaultdict(list))
+
+    def check(self, group_id, user_id, now, content):
+        thresholds = DEFAULT_THRESHOLDS
+        timestamps = self.message_timestamps[group_id][user_id]
+        contents = self.message_contents[group_id][user_id]
+        contents.append(content)
+        timestamps.append(now)
+        while timestamps and now - timestamps[0] > thresholds.spam_time_window:
+            timestamps.pop(0)
+        flooding = len(timestamps) >= thresholds.spam_threshold
+        one_minute_ago = now - thresholds.identical_message_window
+        recent_contents = [
+            msg for t, msg in zip(timestamps, contents) if t >= one_minute_ago
+        ]
+        repeating = False
+        if len(recent_contents) >= thresholds.identical_message_threshold:
+            last_msgs = recent_contents[-thresholds.identical_message_threshold :]
+            repeating = all(msg == last_msgs[0] for msg in last_msgs)
+        return flooding, repeating
+
+
+class NewTracker:
+    def __init__(self):
+        self.tracker = SpamTracker()
+
+    def check(self, group_id, user_id, now, content):
+        thresholds = DEFAULT_THRESHOLDS
+        history = self.tracker.record(
+            group_id, user_id, now, content, thresholds.history_size
+        )
+        flooding = history.is_flooding(
+            now, thresholds.spam_threshold, thresholds.spam_time_window
+        )
+        repeating = history.is_repeating(
+            now,
+            thresholds.identical_message_threshold,
+            thresholds.identical_message_window,
+        )
+        return flooding, repeating
+
+
+def generate_traffic(users, groups, messages, rate, seed=0):
+    """
+    生成模拟消息流
+
+    Returns:
+        list: (时间戳, 群号, 用户QQ号, 消息内容) 列表，按时间排序
+    """
+    rng = random.Random(seed)
+    user_groups = [str(100000 + rng.randrange(groups)) for _ in range(users)]
+    # 长尾活跃度：少数用户贡献大部分消息
+    weights = [1 / (i + 1) ** 0.8 for i in range(users)]
+    senders = rng.choices(range(users), weights=weights, k=messages)
+    traffic = []
+    now = 1_700_000_000.0
+    i = 0
+    while i < messages:
+        now += rng.expovariate(rate)
+        user = senders[i]
+        user_id = str(10000000 + user)
+        group_id = user_groups[user]
+        roll = rng.random()
+        if roll < 0.002:
+            # 刷屏：短时间内连续发送多条
+            burst = min(6, messages - i)
+            for _ in range(burst):
+                traffic.append((int(now), group_id, user_id, f"刷屏{rng.random()}"))
+                now += 0.05
+            i += burst
+            continue
+        if roll < 0.004:
+            burst = min(3, messages - i)
+            text = f"重复消息{user}"
+            for _ in range(burst):
+                traffic.append((int(now), group_id, user_id, text))
+                now += rng.uniform(2, 10)
+            i += burst
+            continue
+        traffic.append((int(now), group_id, user_id, f"消息{rng.randrange(10**9)}"))
+        i += 1
+    return sorted(traffic)
+
+
+def _replay(tracker, traffic):
+    flooding_count = repeating_count = 0
+    for now, group_id, user_id, content in traffic:
+        # 每条消息都是新的字符串对象，与实际收到的事件一致
+        content = content.encode().decode()
+        flooding, repeating = tracker.check(group_id, user_id, now, content)
+        flooding_count += flooding
+        repeating_count += repeating
+    return flooding_count, repeating_count
+
+
+def run(name, tracker_class, traffic):
+    # 耗时和内存分两次测量，tracemalloc 会显著拖慢分配较多的一方
+    tracker = tracker_class()
+    start = time.perf_counter()
+    flooding_count, repeating_count = _replay(tracker, traffic)
+    elapsed = time.perf_counter() - start
+    del tracker
+
+    tracemalloc.start()
+    tracker = tracker_class()
+    _replay(tracker, traffic)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    line = (
+        f"{name}: {len(traffic)} 条消息, 耗时 {elapsed:.2f}s "
+        f"({elapsed / len(traffic) * 1e6:.2f}us/条), "
+        f"内存 {current / 1024 / 1024:.1f}MB (峰值 {peak / 1024 / 1024:.1f}MB), "
+        f"高频 {flooding_count} 次, 重复 {repeating_count} 次"
+    )
+    if isinstance(tracker, NewTracker):
+        stats = tracker.tracker.get_stats()
+        line += f", 保留记录 {stats['entries']} 条, 清除 {stats['evicted']} 条"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="刷屏检测消息记录基准测试")
+    parser.add_argument("--users", type=int, default=100000, help="模拟用户数")
+    parser.add_argument("--groups", type=int, default=500, help="模拟群数")
+    parser.add_argument("--messages", type=int, default=1000000, help="模拟消息数")
+    parser.add_argument("--rate", type=float, default=100, help="每秒消息数")
+    args = parser.parse_args()
+
+    traffic = generate_traffic(args.users, args.groups, args.messages, args.rate)
+    span = traffic[-1][0] - traffic[0][0]
+    print(
+        f"模拟 {args.users} 个用户、{args.groups} 个群，"
+        f"{len(traffic)} 条消息，时间跨度 {span / 3600:.1f} 小时"
+    )
+    run("旧结构", LegacyTracker, traffic)
+    run("新结构", NewTracker, traffic)
+
+
+if __name__ == "__main__":
+    main()
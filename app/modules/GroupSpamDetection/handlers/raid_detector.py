@@ -0,0 +1,267 @@
+"""
+跨群协同刷屏检测
+
+机器人账号常在同一时间向多个群发送相同的内容，单群单用户的刷屏检测无法发现。本检测器在所有开启
+本模块的群之间共享：
+- 每条消息计算内容指纹：去掉 CQ 码（图片保留文件名，同一张图片在各群的文件名相同）、NFKC 归一化、
+  去除空白和标点、转小写后取 BLAKE2b 摘要；过短的纯文本和表情包不参与检测
+- 每个指纹保留 RAID_WINDOW 秒内的发送记录，同一内容由至少 RAID_MIN_ACCOUNTS 个账号在两个以上的群中发送，
+  或在至少 RAID_MIN_GROUPS 个群中发送时判定为协同刷屏（同一群内的复读不算）
+- 判定后撤回窗口内的全部相关消息并禁言发送者，RAID_BLOCK_TTL 秒内再次出现的同一内容直接撤回并禁言
+- 撤回和禁言操作每 RAID_ACTION_INTERVAL 秒合并执行一次，相同账号在同一群只禁言一次，每个群只发送一次提示
+- 指纹按最后出现时间排序，超过窗口且未被拦截的指纹会被清除，总数不超过 RAID_MAX_FINGERPRINTS
+"""
+
+import re
+import asyncio
+import hashlib
+import unicodedata
+from collections import OrderedDict, deque
+from logger import logger
+from api.group import set_group_ban
+from api.message import delete_msg, send_group_msg
+from utils.generate import generate_text_message
+from .. import (
+    MODULE_NAME,
+    RAID_WINDOW,
+    RAID_MIN_ACCOUNTS,
+    RAID_MIN_GROUPS,
+    RAID_MIN_TEXT_LENGTH,
+    RAID_BLOCK_TTL,
+    RAID_BAN_MINUTES,
+    RAID_MAX_FINGERPRINTS,
+    RAID_ACTION_INTERVAL,
+)
+
+CQ_CODE_PATTERN = re.compile(r"\[CQ:(\w+)((?:,[^\]]*)?)\]")
+IMAGE_FILE_PATTERN = re.compile(r"(?:^|,)file=([^,]+)")
+IMAGE_STICKER_PATTERN = re.compile(r"(?:^|,)sub_type=1(?:,|$)")
+# 空白、标点和符号，刷屏内容常在其中插入随机字符规避检测
+NOISE_PATTERN = re.compile(r"[\W_]+")
+
+
+def fingerprint(raw_message):
+    """
+    计算消息的内容指纹
+
+    Args:
+        raw_message (str): 原始消息（CQ 码格式）
+
+    Returns:
+        bytes: 指纹，不参与检测的消息返回None
+    """
+    images = []
+
+    def _replace(match):
+        # 图片用文件名代替，表情包（sub_type=1）和其他 CQ 码（@、回复、表情等）忽略
+        if match.group(1) == "image":
+            params = match.group(2)
+            file_match = IMAGE_FILE_PATTERN.search(params)
+            if file_match and not IMAGE_STICKER_PATTERN.search(params):
+                images.append(file_match.group(1))
+        return " "
+
+    text = CQ_CODE_PATTERN.sub(_replace, raw_message)
+    text = NOISE_PATTERN.sub("", unicodedata.normalize("NFKC", text)).lower()
+    if not images and len(text) < RAID_MIN_TEXT_LENGTH:
+        return None
+    payload = text + "\0" + "\0".join(images)
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=8).digest()
+
+
+class _Sighting:
+    """一次发送记录"""
+
+    __slots__ = ("time", "group_id", "user_id", "message_id")
+
+    def __init__(self, time, group_id, user_id, message_id):
+        self.time = time
+        self.group_id = group_id
+        self.user_id = user_id
+        self.message_id = message_id
+
+
+class _FingerprintWindow:
+    """单个内容指纹在时间窗口内的发送记录"""
+
+    __slots__ = ("sightings", "last_seen", "blocked_until", "punished")
+
+    def __init__(self):
+        self.sightings = deque()
+        self.last_seen = 0.0
+        # 判定为刷屏后拦截到的时间
+        self.blocked_until = 0.0
+        # 已禁言的（群号，用户QQ号）
+        self.punished = set()
+
+
+class RaidDetector:
+    """跨群协同刷屏检测器，撤回和禁言在首次检测到刷屏时于当前事件循环中合并执行"""
+
+    def __init__(self):
+        # 指纹 -> _FingerprintWindow，按最后出现时间排序
+        self._windows = OrderedDict()
+        self._websocket = None
+        # 等待执行的撤回消息ID、禁言的（群号，用户QQ号）、需要提示的群
+        self._recalls = []
+        self._bans = []
+        self._warn_groups = set()
+        self._flush_task = None
+
+        # 指标
+        self.raid_count = 0
+        self.recall_count = 0
+        self.ban_count = 0
+        self.evicted_count = 0
+
+    def observe(self, group_id, user_id, message_id, raw_message, now):
+        """
+        记录一条消息并判断是否属于协同刷屏，属于时登记撤回和禁言操作
+
+        Args:
+            group_id (str): 群号
+            user_id (str): 发送者QQ号
+            message_id (str): 消息ID
+            raw_message (str): 原始消息
+            now (float): 消息时间戳（秒）
+
+        Returns:
+            bool: 是否属于协同刷屏
+        """
+        key = fingerprint(raw_message)
+        if key is None:
+            return False
+
+        window = self._windows.get(key)
+        if window is None:
+            window = self._windows[key] = _FingerprintWindow()
+        else:
+            self._windows.move_to_end(key)
+        window.last_seen = now
+        sighting = _Sighting(now, group_id, user_id, message_id)
+
+        if window.blocked_until >= now:
+            self._punish(window, [sighting])
+            self._evict(now)
+            return True
+
+        sightings = window.sightings
+        sightings.append(sighting)
+        while sightings and sightings[0].time < now - RAID_WINDOW:
+            sightings.popleft()
+
+        accounts = {item.user_id for item in sightings}
+        groups = {item.group_id for item in sightings}
+        is_raid = len(groups) >= RAID_MIN_GROUPS or (
+            len(accounts) >= RAID_MIN_ACCOUNTS and len(groups) >= 2
+        )
+        if is_raid:
+            self.raid_count += 1
+            window.blocked_until = now + RAID_BLOCK_TTL
+            logger.warning(
+                f"[{MODULE_NAME}] 检测到跨群协同刷屏：{RAID_WINDOW}秒内{len(accounts)}个账号"
+                f"在{len(groups)}个群发送相同内容，群{sorted(groups)}，账号{sorted(accounts)}"
+            )
+            self._punish(window, list(sightings))
+            sightings.clear()
+
+        self._evict(now)
+        return is_raid
+
+    def _punish(self, window, sightings):
+        for sighting in sightings:
+            self._recalls.append(sighting.message_id)
+            target = (sighting.group_id, sighting.user_id)
+            if target not in window.punished:
+                window.punished.add(target)
+                self._bans.append(target)
+                self._warn_groups.add(sighting.group_id)
+
+    def _evict(self, now):
+        """清除超过窗口且未被拦截的指纹，以及超出数量上限时最久未出现的指纹"""
+        windows = self._windows
+        expire_before = now - RAID_WINDOW
+        while windows:
+            oldest = next(iter(windows.values()))
+            if len(windows) <= RAID_MAX_FINGERPRINTS and (
+                oldest.last_seen >= expire_before or oldest.blocked_until >= now
+            ):
+                break
+            windows.popitem(last=False)
+            self.evicted_count += 1
+
+    async def handle(self, websocket, group_id, user_id, message_id, raw_message, now):
+        """
+        检测消息是否属于协同刷屏，属于时撤回并禁言（操作合并后在后台执行）
+
+        Returns:
+            bool: 是否属于协同刷屏
+        """
+        if not self.observe(group_id, user_id, message_id, raw_message, now):
+            return False
+        self._websocket = websocket
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(
+                self._flush_later(), name="group-spam-raid-actions"
+            )
+        return True
+
+    async def _flush_later(self):
+        # 执行期间新登记的操作在下一轮执行
+        while self._recalls:
+            await asyncio.sleep(RAID_ACTION_INTERVAL)
+            await self.flush()
+
+    async def flush(self):
+        """执行已登记的撤回和禁言操作"""
+        recalls, self._recalls = self._recalls, []
+        bans, self._bans = self._bans, []
+        warn_groups, self._warn_groups = self._warn_groups, set()
+        websocket = self._websocket
+        if websocket is None:
+            return
+        try:
+            for message_id in recalls:
+                await delete_msg(websocket, message_id)
+            for group_id, user_id in bans:
+                await set_group_ban(
+                    websocket, group_id, user_id, RAID_BAN_MINUTES * 60
+                )
+            for group_id in warn_groups:
+                await send_group_msg(
+                    websocket,
+                    group_id,
+                    [
+                        generate_text_message(
+                            "检测到多个群同时出现相同的刷屏内容，已撤回相关消息并禁言发送者"
+                        )
+                    ],
+                    note="del_msg=120",
+                )
+            self.recall_count += len(recalls)
+            self.ban_count += len(bans)
+            logger.info(
+                f"[{MODULE_NAME}] 跨群刷屏处理完成：撤回{len(recalls)}条消息，禁言{len(bans)}次，"
+                f"涉及{len(warn_groups)}个群"
+            )
+        except Exception as e:
+            logger.error(f"[{MODULE_NAME}] 跨群刷屏处理失败: {e}")
+
+    def get_stats(self):
+        """
+        获取检测统计信息
+
+        Returns:
+            dict: 当前记录的指纹数、检测到的刷屏次数、撤回消息数、禁言次数、清除的指纹数
+        """
+        return {
+            "fingerprints": len(self._windows),
+            "raids": self.raid_count,
+            "recalls": self.recall_count,
+            "bans": self.ban_count,
+            "evicted": self.evicted_count,
+        }
+
+
+# 全局跨群刷屏检测器
+raid_detector = RaidDetector()
@@ -0,0 +1,261 @@
+"""
+刷屏检测的消息记录
+
+每个（群，用户）只保留最近几条消息的时间戳和内容哈希，保存在固定长度的环形缓冲区中：
+- 高频检测：缓冲区中倒数第 spam_threshold 条消息在时间窗口内即为刷屏，O(1)
+- 重复检测：缓冲区中最近 identical_message_threshold 条内容哈希相同且都在时间窗口内即为刷屏
+- 内容只保存哈希，不保存原文
+- 记录按最后发言时间排序，超过 TRACKER_IDLE_TTL 秒未发言或总数超过 TRACKER_MAX_ENTRIES 时清除最旧的记录，
+  长时间运行内存占用不会持续增长
+
+各群的阈值默认取模块 __init__ 中的配置，可在 GROUP_THRESHOLDS_FILE 中按群覆盖，文件修改后自动重新加载。
+"""
+
+import os
+import json
+import time
+from collections import OrderedDict
+from logger import logger
+from .. import (
+    MODULE_NAME,
+    SPAM_THRESHOLD,
+    SPAM_TIME_WINDOW,
+    IDENTICAL_MESSAGE_THRESHOLD,
+    IDENTICAL_MESSAGE_WINDOW,
+    NEWLINE_LIMIT,
+    BAN_MINUTES,
+    GROUP_THRESHOLDS_FILE,
+    TRACKER_IDLE_TTL,
+    TRACKER_MAX_ENTRIES,
+)
+
+
+class SpamThresholds:
+    """单个群的刷屏检测阈值"""
+
+    __slots__ = (
+        "spam_threshold",
+        "spam_time_window",
+        "identical_message_threshold",
+        "identical_message_window",
+        "newline_limit",
+        "ban_minutes",
+    )
+
+    def __init__(self, **overrides):
+        self.spam_threshold = SPAM_THRESHOLD
+        self.spam_time_window = SPAM_TIME_WINDOW
+        self.identical_message_threshold = IDENTICAL_MESSAGE_THRESHOLD
+        self.identical_message_window = IDENTICAL_MESSAGE_WINDOW
+        self.newline_limit = NEWLINE_LIMIT
+        self.ban_minutes = BAN_MINUTES
+        for name, value in overrides.items():
+            if name in self.__slots__:
+                setattr(self, name, type(getattr(self, name))(value))
+
+    @property
+    def history_size(self):
+        """判定所需保留的消息条数"""
+        return max(self.spam_threshold, self.identical_message_threshold, 1)
+
+
+DEFAULT_THRESHOLDS = SpamThresholds()
+
+# 按群覆盖的阈值，群号 -> SpamThresholds
+_group_thresholds = {}
+_group_thresholds_mtime = None
+_group_thresholds_checked_at = None
+
+# 检查配置文件是否修改的间隔（秒），避免每条消息都读取文件状态
+THRESHOLDS_CHECK_INTERVAL = 10
+
+
+def _reload_group_thresholds():
+    global _group_thresholds, _group_thresholds_mtime, _group_thresholds_checked_at
+    checked_at = time.monotonic()
+    if (
+        _group_thresholds_checked_at is not None
+        and checked_at - _group_thresholds_checked_at < THRESHOLDS_CHECK_INTERVAL
+    ):
+        return
+    _group_thresholds_checked_at = checked_at
+    try:
+        mtime = os.path.getmtime(GROUP_THRESHOLDS_FILE)
+    except OSError:
+        _group_thresholds, _group_thresholds_mtime = {}, None
+        return
+    if mtime == _group_thresholds_mtime:
+        return
+    _group_thresholds_mtime = mtime
+    try:
+        with open(GROUP_THRESHOLDS_FILE, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        _group_thresholds = {
+            str(group_id): SpamThresholds(**overrides)
+            for group_id, overrides in data.items()
+        }
+        logger.info(
+            f"[{MODULE_NAME}] 已加载{len(_group_thresholds)}个群的刷屏检测阈值"
+        )
+    except Exception as e:
+        _group_thresholds = {}
+        logger.error(f"[{MODULE_NAME}] 加载群阈值配置失败: {e}")
+
+
+def get_group_thresholds(group_id):
+    """
+    获取群的刷屏检测阈值
+
+    Args:
+        group_id (str): 群号
+
+    Returns:
+        SpamThresholds: 该群的阈值，未配置时返回默认阈值
+    """
+    _reload_group_thresholds()
+    return _group_thresholds.get(str(group_id), DEFAULT_THRESHOLDS)
+
+
+class UserHistory:
+    """
+    单个用户在单个群中的最近消息
+
+    时间戳和内容哈希保存在两个等长的列表中作为环形缓冲区，pos 为下一条消息写入的位置，
+    倒数第 k 条消息位于下标 pos - k（利用负下标回绕）。
+    """
+
+    __slots__ = (
+        "timestamps",
+        "hashes",
+        "pos",
+        "count",
+        "last_seen",
+        "warned_minute",
+    )
+
+    def __init__(self, history_size):
+        self.timestamps = [0.0] * history_size
+        self.hashes = [None] * history_size
+        self.pos = 0
+        # 已记录的消息条数，不超过缓冲区长度
+        self.count = 0
+        self.last_seen = 0.0
+        # 上次警告的分钟，同一分钟内只警告一次
+        self.warned_minute = -1
+
+    @property
+    def history_size(self):
+        return len(self.timestamps)
+
+    def add(self, now, content_hash):
+        pos = self.pos
+        self.timestamps[pos] = now
+        self.hashes[pos] = content_hash
+        pos += 1
+        self.pos = 0 if pos == len(self.timestamps) else pos
+        if self.count < len(self.timestamps):
+            self.count += 1
+        self.last_seen = now
+
+    def resize(self, history_size):
+        """扩大缓冲区（群阈值调大后），保留已有记录"""
+        size = len(self.timestamps)
+        order = [(self.pos + i) % size for i in range(size)]
+        padding = history_size - size
+        self.timestamps = [self.timestamps[i] for i in order] + [0.0] * padding
+        self.hashes = [self.hashes[i] for i in order] + [None] * padding
+        self.pos = size
+
+    def is_flooding(self, now, count, window):
+        """最近 count 条消息是否都在 window 秒内"""
+        return (
+            self.count >= count and now - self.timestamps[self.pos - count] <= window
+        )
+
+    def is_repeating(self, now, count, window):
+        """最近 count 条消息是否内容相同且都在 window 秒内"""
+        if self.count < count:
+            return False
+        hashes = self.hashes
+        pos = self.pos
+        last = hashes[pos - 1]
+        if not all(hashes[pos - i] == last for i in range(2, count + 1)):
+            return False
+        return now - self.timestamps[pos - count] <= window
+
+
+class SpamTracker:
+    """所有群所有用户的消息记录，按最后发言时间排序"""
+
+    def __init__(self, idle_ttl=TRACKER_IDLE_TTL, max_entries=TRACKER_MAX_ENTRIES):
+        self.idle_ttl = idle_ttl
+        self.max_entries = max_entries
+        # (群号, 用户QQ号) -> UserHistory
+        self._entries = OrderedDict()
+        # 下次按空闲时间清除记录的时间，每秒最多清除一次
+        self._next_sweep = 0.0
+        self.evicted_count = 0
+
+    def record(self, group_id, user_id, now, content, history_size):
+        """
+        记录一条消息
+
+        Args:
+            group_id (str): 群号
+            user_id (str): 用户QQ号
+            now (float): 消息时间戳（秒）
+            content (str): 消息内容，只保存哈希
+            history_size (int): 需要保留的消息条数
+
+        Returns:
+            UserHistory: 该用户的消息记录
+        """
+        key = (group_id, user_id)
+        history = self._entries.get(key)
+        if history is None:
+            history = self._entries[key] = UserHistory(history_size)
+        else:
+            self._entries.move_to_end(key)
+            if history.history_size < history_size:
+                history.resize(history_size)
+        history.add(now, hash(content))
+        if now >= self._next_sweep or len(self._entries) > self.max_entries:
+            self._evict(now)
+        return history
+
+    def get(self, group_id, user_id):
+        """获取用户的消息记录，没有时返回None"""
+        return self._entries.get((group_id, user_id))
+
+    def _evict(self, now):
+        """清除空闲超时的记录，以及超出数量上限时最久未发言的记录"""
+        self._next_sweep = now + 1
+        entries = self._entries
+        expire_before = now - self.idle_ttl
+        evicted = 0
+        for history in entries.values():
+            if (
+                history.last_seen >= expire_before
+                and len(entries) - evicted <= self.max_entries
+            ):
+                break
+            evicted += 1
+        for _ in range(evicted):
+            entries.popitem(last=False)
+        self.evicted_count += evicted
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get_stats(self):
+        """
+        获取记录统计信息
+
+        Returns:
+            dict: 当前记录数、累计清除的记录数
+        """
+        return {"entries": len(self._entries), "evicted": self.evicted_count}
+
+
+# 全局消息记录
+spam_tracker = SpamTracker()
@@ -13,6 +13,9 @@ SWITCH_NAME = "gw"
 # 模块描述
 MODULE_DESCRIPTION = "入群欢迎退群提醒模块"
 
+# 模块订阅的事件类型
+EVENT_KINDS = ["message", "notice"]
+
 # 数据目录
 DATA_DIR = os.path.join("data", MODULE_NAME)
 os.makedirs(DATA_DIR, exist_ok=True)
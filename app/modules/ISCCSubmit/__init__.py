@@ -7,6 +7,7 @@ SWITCH_NAME = "iscc"
 MODULE_DESCRIPTION = (
     "ISCC 平台自动提交 flag 模块，同时支持擂台赛提交监控（按心跳轮询指定 team_id，新提交通知管理员）"
 )
+EVENT_KINDS = ["message", "meta_event"]
 
 DATA_DIR = os.path.join("data", MODULE_NAME)
 os.makedirs(DATA_DIR, exist_ok=True)
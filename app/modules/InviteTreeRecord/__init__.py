@@ -13,6 +13,9 @@ SWITCH_NAME = "ITR"
 # 模块描述
 MODULE_DESCRIPTION = "邀请树记录"
 
+# 模块订阅的事件类型
+EVENT_KINDS = ["message", "notice"]
+
 # 数据目录
 DATA_DIR = os.path.join("data", MODULE_NAME)
 os.makedirs(DATA_DIR, exist_ok=True)
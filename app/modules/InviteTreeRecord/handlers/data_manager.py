@@ -4,6 +4,8 @@ from .. import DATA_DIR
 from logger import logger
 import shutil
 from datetime import datetime
+from core.db_pool import get_connection, run_schema_once
+from core.async_db import get_async_db
 
 
 class InviteTreeRecordDataManager:
@@ -31,10 +33,10 @@ class InviteTreeRecordDataManager:
         # 执行数据库迁移
         self._migrate_database()
 
-        self.conn = sqlite3.connect(self.db_path)
+        self.conn = get_connection(self.db_path)
         self.cursor = self.conn.cursor()
-        self._create_table()
-        self._upgrade_table()
+        run_schema_once(self.db_path, self._create_table)
+        run_schema_once(self.db_path, self._upgrade_table)
 
     def __enter__(self):
         return self
@@ -160,9 +162,9 @@ class InviteTreeRecordDataManager:
 
     def _close(self):
         """
-        关闭数据库连接
+        关闭游标，连接由连接池复用
         """
-        self.conn.close()
+        self.cursor.close()
 
     def add_invite_tree_record(self):
         """
@@ -382,6 +384,26 @@ class InviteTreeRecordDataManager:
         )
         return list(related_users)
 
+    async def get_full_invite_chain_str_async(self, user_id, show_time=False):
+        """
+        在数据库线程上生成完整邀请树，递归查询不阻塞事件循环
+        """
+        return await get_async_db(self.db_path).run_manager(
+            self._new_manager, "get_full_invite_chain_str", user_id, show_time
+        )
+
+    async def get_related_invite_users_async(self, user_id):
+        """
+        在数据库线程上查询上下级所有相关邀请者，递归查询不阻塞事件循环
+        """
+        return await get_async_db(self.db_path).run_manager(
+            self._new_manager, "get_related_invite_users", user_id
+        )
+
+    def _new_manager(self):
+        """在数据库写线程上创建使用该线程连接的 DataManager"""
+        return InviteTreeRecordDataManager(self.websocket, self.msg)
+
     def delete_invite_record_by_invited_id(self, invited_id):
         """
         根据群号和被邀请者id删除所有相关邀请记录。
@@ -126,7 +126,7 @@ class GroupMessageHandler:
             )
             return True
 
-        invite_chain_str = invite_tree_record.get_full_invite_chain_str(
+        invite_chain_str = await invite_tree_record.get_full_invite_chain_str_async(
             operator_id, show_time=show_time
         )
 
@@ -167,7 +167,9 @@ class GroupMessageHandler:
             )
             return True
 
-        related_users = invite_tree_record.get_related_invite_users(operator_id)
+        related_users = await invite_tree_record.get_related_invite_users_async(
+            operator_id
+        )
 
         # 执行踢出操作
         await self._execute_kick_users(related_users, invite_tree_record)
@@ -229,7 +231,9 @@ class GroupMessageHandler:
             )
             return True
 
-        related_users = invite_tree_record.get_related_invite_users(operator_id)
+        related_users = await invite_tree_record.get_related_invite_users_async(
+            operator_id
+        )
 
         # 30天的秒数
         ban_duration = 30 * 24 * 60 * 60  # 2592000 秒
@@ -13,6 +13,9 @@ SWITCH_NAME = "kr"
 # 模块描述
 MODULE_DESCRIPTION = "关键词回复模块，完全匹配，只回复内容，不会回复其他多余文字，是 FAQ 系统的补充，不设置权限，任何人都可以添加关键词回复，但只有管理员可以删除关键词回复"
 
+# 模块订阅的事件类型
+EVENT_KINDS = ["message"]
+
 # 数据目录
 DATA_DIR = os.path.join("data", MODULE_NAME)
 os.makedirs(DATA_DIR, exist_ok=True)
@@ -1,7 +1,7 @@
-import sqlite3
 import os
 from logger import logger
 from .. import MODULE_NAME
+from core.db_pool import get_connection, run_schema_once
 
 
 class DataManager:
@@ -12,9 +12,9 @@ class DataManager:
         data_dir = os.path.join("data", MODULE_NAME)
         os.makedirs(data_dir, exist_ok=True)
         db_path = os.path.join(data_dir, f"data.db")
-        self.conn = sqlite3.connect(db_path)
+        self.conn = get_connection(db_path)
         self.cursor = self.conn.cursor()
-        self._create_table()
+        run_schema_once(db_path, self._create_table)
 
     def _create_table(self):
         """
@@ -42,9 +42,9 @@ class DataManager:
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         """
-        退出上下文管理器时关闭数据库连接
+        退出上下文管理器时关闭游标，连接由连接池复用
         """
-        self.conn.close()
+        self.cursor.close()
 
     def add_keyword(self, group_id, keyword, reply, adder_qq, add_time):
         """
@@ -1,5 +1,5 @@
-import sqlite3
 import os
+from core.db_pool import get_connection
 
 
 class DataManager:
@@ -7,7 +7,7 @@ class DataManager:
         # 数据库文件位于模块目录下
         module_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
         db_path = os.path.join(module_dir, "freshman_questions.db")
-        self.conn = sqlite3.connect(db_path)
+        self.conn = get_connection(db_path, read_only=True)
         self.cursor = self.conn.cursor()
 
     def search_questions(self, keyword: str, limit: int = 5) -> list:
@@ -41,4 +41,4 @@ class DataManager:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.conn.close()
+        self.cursor.close()
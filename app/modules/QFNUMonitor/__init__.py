@@ -33,6 +33,9 @@ SWITCH_NAME = "qfnum"
 # 模块描述
 MODULE_DESCRIPTION = "曲阜师范大学教务处通知公告监控"
 
+# 模块订阅的事件类型
+EVENT_KINDS = ["message", "meta_event"]
+
 # 数据目录
 DATA_DIR = os.path.join("data", MODULE_NAME)
 os.makedirs(DATA_DIR, exist_ok=True)
@@ -1,13 +1,13 @@
 """
 硅基流动大模型 API 客户端
-使用 aiohttp 进行异步请求
+通过共享的 HTTP 客户端（core.http_client）进行异步请求
 用于生成公告内容的智能摘要
 """
 
 import os
-import aiohttp
 from typing import Optional
 from logger import logger
+from core.http_client import http_post
 from .. import MODULE_NAME
 
 
@@ -88,34 +88,32 @@ class SiliconFlowAPI:
                 "max_tokens": 512,
             }
 
-            timeout = aiohttp.ClientTimeout(total=self.TIMEOUT)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(
-                    self.API_URL, json=payload, headers=headers
-                ) as response:
-                    if response.status != 200:
-                        logger.error(
-                            f"[{MODULE_NAME}] 硅基流动 API 调用失败，状态码: {response.status}"
-                        )
-                        text = await response.text()
-                        logger.error(f"[{MODULE_NAME}] 响应内容: {text}")
-                        return None
-
-                    result = await response.json()
-                    summary = (
-                        result.get("choices", [{}])[0]
-                        .get("message", {})
-                        .get("content", "")
+            async with http_post(
+                self.API_URL, json=payload, headers=headers, timeout=self.TIMEOUT
+            ) as response:
+                if response.status != 200:
+                    logger.error(
+                        f"[{MODULE_NAME}] 硅基流动 API 调用失败，状态码: {response.status}"
                     )
+                    text = await response.text()
+                    logger.error(f"[{MODULE_NAME}] 响应内容: {text}")
+                    return None
 
-                    if summary:
-                        # 截取到最大长度
-                        if len(summary) > max_length:
-                            summary = summary[:max_length] + "..."
-                        logger.info(f"[{MODULE_NAME}] 成功生成摘要，长度: {len(summary)}")
-                        return summary.strip()
+                result = await response.json()
+                summary = (
+                    result.get("choices", [{}])[0]
+                    .get("message", {})
+                    .get("content", "")
+                )
 
-                    return None
+                if summary:
+                    # 截取到最大长度
+                    if len(summary) > max_length:
+                        summary = summary[:max_length] + "..."
+                    logger.info(f"[{MODULE_NAME}] 成功生成摘要，长度: {len(summary)}")
+                    return summary.strip()
+
+                return None
 
         except TimeoutError:
             logger.error(f"[{MODULE_NAME}] 硅基流动 API 调用超时")
@@ -179,31 +177,29 @@ class SiliconFlowAPI:
                 "max_tokens": 300,
             }
 
-            timeout = aiohttp.ClientTimeout(total=self.TIMEOUT)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                async with session.post(
-                    self.API_URL, json=payload, headers=headers
-                ) as response:
-                    if response.status != 200:
-                        logger.error(
-                            f"[{MODULE_NAME}] 硅基流动 API 调用失败，状态码: {response.status}"
-                        )
-                        return None
-
-                    result = await response.json()
-                    summary = (
-                        result.get("choices", [{}])[0]
-                        .get("message", {})
-                        .get("content", "")
+            async with http_post(
+                self.API_URL, json=payload, headers=headers, timeout=self.TIMEOUT
+            ) as response:
+                if response.status != 200:
+                    logger.error(
+                        f"[{MODULE_NAME}] 硅基流动 API 调用失败，状态码: {response.status}"
                     )
+                    return None
 
-                    if summary:
-                        logger.info(
-                            f"[{MODULE_NAME}] 成功生成 URL 摘要，长度: {len(summary)}"
-                        )
-                        return summary.strip()
+                result = await response.json()
+                summary = (
+                    result.get("choices", [{}])[0]
+                    .get("message", {})
+                    .get("content", "")
+                )
 
-                    return None
+                if summary:
+                    logger.info(
+                        f"[{MODULE_NAME}] 成功生成 URL 摘要，长度: {len(summary)}"
+                    )
+                    return summary.strip()
+
+                return None
 
         except Exception as e:
             logger.error(f"[{MODULE_NAME}] 生成 URL 摘要异常: {e}")
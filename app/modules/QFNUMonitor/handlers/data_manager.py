@@ -3,12 +3,12 @@ QFNUMonitor 数据管理器
 用于存储已通知的公告信息，避免重复通知
 """
 
-import sqlite3
 import os
 from typing import Optional
 from datetime import datetime
 from .. import MODULE_NAME, DATA_DIR
 from logger import logger
+from core.db_pool import get_connection, run_schema_once
 
 
 class DataManager:
@@ -17,9 +17,9 @@ class DataManager:
     def __init__(self):
         os.makedirs(DATA_DIR, exist_ok=True)
         db_path = os.path.join(DATA_DIR, f"{MODULE_NAME}.db")
-        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn = get_connection(db_path)
         self.cursor = self.conn.cursor()
-        self._create_tables()
+        run_schema_once(db_path, self._create_tables)
 
     def _create_tables(self):
         """创建数据表"""
@@ -187,8 +187,8 @@ class DataManager:
         self.close()
 
     def close(self):
-        """关闭数据库连接"""
+        """关闭游标，连接由连接池复用"""
         try:
-            self.conn.close()
+            self.cursor.close()
         except Exception:
             pass
@@ -12,6 +12,9 @@ SWITCH_NAME = "rp"
 # 模块描述
 MODULE_DESCRIPTION = "主要用于把私聊bot、加bot为好友，邀请bot入群等操作的通知报告"
 
+# 模块订阅的事件类型
+EVENT_KINDS = ["message", "request", "response:get_msg", "response:send_private_msg"]
+
 # 数据目录
 DATA_DIR = os.path.join("data", MODULE_NAME)
 os.makedirs(DATA_DIR, exist_ok=True)
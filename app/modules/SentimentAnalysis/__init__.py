@@ -12,6 +12,9 @@ SWITCH_NAME = "SA"
 # 模块描述
 MODULE_DESCRIPTION = "舆情监控模块，使用LTP+BERT模型进行情绪分析"
 
+# 模块订阅的事件类型
+EVENT_KINDS = ["message"]
+
 # 数据目录
 DATA_DIR = os.path.join("data", MODULE_NAME)
 os.makedirs(DATA_DIR, exist_ok=True)
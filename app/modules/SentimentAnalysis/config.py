@@ -24,3 +24,13 @@ REQUEST_TIMEOUT = int(os.getenv("REQUEST_TIMEOUT", "30"))
 # 消息处理配置
 AUTO_DELETE_NEGATIVE_MSG = os.getenv("AUTO_DELETE_NEGATIVE_MSG", "True").lower() in ("true", "1", "yes")  # 是否自动删除判定为负面的消息
 ADMIN_NOTIFICATION = os.getenv("ADMIN_NOTIFICATION", "True").lower() in ("true", "1", "yes")  # 是否通知管理员
+
+# 本地预筛配置
+LOCAL_PREFILTER_ENABLED = os.getenv("LOCAL_PREFILTER_ENABLED", "False").lower() in ("true", "1", "yes")  # 是否启用本地预筛放行，关闭时所有消息都调用远程模型；用线上标注数据评估召回率后再开启
+LOCAL_PREFILTER_SHADOW = os.getenv("LOCAL_PREFILTER_SHADOW", "True").lower() in ("true", "1", "yes")  # 未启用放行时是否仍计算本地得分并写入审计日志（影子模式），用于评估预筛
+LOCAL_ESCALATION_THRESHOLD = float(os.getenv("LOCAL_ESCALATION_THRESHOLD", "0.25"))  # 本地负面得分达到此值的消息才调用远程模型
+
+# 审计日志配置
+AUDIT_LOG_FLUSH_SIZE = int(os.getenv("AUDIT_LOG_FLUSH_SIZE", "100"))  # 缓冲的记录数达到此值时立即写入文件
+AUDIT_LOG_FLUSH_INTERVAL = float(os.getenv("AUDIT_LOG_FLUSH_INTERVAL", "5"))  # 缓冲的记录最长等待写入的时间（秒）
+AUDIT_LOG_RETENTION_DAYS = int(os.getenv("AUDIT_LOG_RETENTION_DAYS", "30"))  # 日志文件保留天数
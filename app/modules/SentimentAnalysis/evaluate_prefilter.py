@@ -0,0 +1,152 @@
+"""
+本地预筛离线评估
+
+对带标注的消息样本计算本地负面得分，统计不同上送阈值下：
+- 上送率：需要调用远程模型的消息占比（越低越省调用）
+- 召回率：标注为负面的消息中被上送的比例（未上送的负面消息会被直接放行）
+- 非负面消息上送率：线上消息绝大多数为非负面，实际的远程调用量主要由该值决定
+样本为 JSONL 文件，每行 {"text": "消息内容", "label": "negative" 或 "non_negative"}，
+可从线上日志中抽样人工标注后替换默认样本。默认样本是按情绪词典编写的示例，只用于检查脚本和词典
+是否正常，不能说明线上召回率。
+
+加上 --audit-log 时改用审计日志中远程模型的判定作为标注（本地预筛默认以影子模式运行，所有消息
+都经过远程模型），按当前词典重新打分；开启 LOCAL_PREFILTER_ENABLED 前应先用它评估。
+
+用法（在 app 目录下执行）：
+    python -m modules.SentimentAnalysis.evaluate_prefilter
+    python -m modules.SentimentAnalysis.evaluate_prefilter <sample.jsonl> --thresholds 0.2 0.25 0.3
+    python -m modules.SentimentAnalysis.evaluate_prefilter --audit-log 7
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from .config import LOCAL_ESCALATION_THRESHOLD
+from .handlers.local_scorer import score_negativity
+from .handlers.audit_log import iter_entries
+
+DEFAULT_SAMPLE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "prefilter_eval_sample.jsonl"
+)
+
+
+def load_sample(path):
+    """
+    加载标注样本
+
+    Returns:
+        list: (消息内容, 是否负面) 列表
+    """
+    sample = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                item = json.loads(line)
+                sample.append((item["text"], item["label"] == "negative"))
+    return sample
+
+
+def load_audit_log(days):
+    """
+    从审计日志加载远程模型判定过的消息，远程判定作为标注
+
+    Returns:
+        list: (消息内容, 是否负面) 列表
+    """
+    return [
+        (entry["text"], entry["verdict"] == "negative")
+        for entry in iter_entries(days)
+        if entry.get("stage") == "remote"
+        and entry.get("verdict") in ("negative", "non_negative")
+        and entry.get("text")
+    ]
+
+
+def evaluate(scored, threshold):
+    """
+    统计指定阈值下的上送率和召回率
+
+    Args:
+        scored (list): (消息内容, 是否负面, 本地得分) 列表
+        threshold (float): 上送阈值
+
+    Returns:
+        dict: 上送率、召回率、非负面消息的上送率、漏报的负面消息
+    """
+    escalated = [item for item in scored if item[2] >= threshold]
+    negatives = [item for item in scored if item[1]]
+    non_negatives = [item for item in scored if not item[1]]
+    missed = [item for item in negatives if item[2] < threshold]
+    false_escalated = [item for item in non_negatives if item[2] >= threshold]
+    return {
+        "escalation_rate": len(escalated) / len(scored),
+        "recall": 1 - len(missed) / len(negatives) if negatives else None,
+        "false_escalation_rate": (
+            len(false_escalated) / len(non_negatives) if non_negatives else None
+        ),
+        "missed": missed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="本地预筛离线评估")
+    parser.add_argument("sample", nargs="?", default=DEFAULT_SAMPLE, help="标注样本文件")
+    parser.add_argument(
+        "--audit-log",
+        type=int,
+        metavar="DAYS",
+        help="改用最近 DAYS 天审计日志中远程模型的判定作为标注",
+    )
+    parser.add_argument(
+        "--thresholds",
+        type=float,
+        nargs="+",
+        default=[0.1, 0.2, 0.25, 0.3, 0.4, 0.5],
+        help="要评估的上送阈值",
+    )
+    args = parser.parse_args()
+
+    if args.audit_log:
+        sample = load_audit_log(args.audit_log)
+        source = f"最近 {args.audit_log} 天的审计日志"
+    else:
+        sample = load_sample(args.sample)
+        source = f"样本文件 {args.sample}"
+    if not sample:
+        print(f"{source}中没有可用的标注数据")
+        sys.exit(1)
+
+    # 首次调用需加载词典，不计入耗时
+    score_negativity("预热")
+    start = time.perf_counter()
+    scored = [(text, negative, score_negativity(text)) for text, negative in sample]
+    elapsed_us = (time.perf_counter() - start) / len(sample) * 1e6
+    print(
+        f"样本 {len(sample)} 条（负面 {sum(1 for _, n in sample if n)} 条），"
+        f"本地打分平均 {elapsed_us:.0f}µs/条"
+    )
+
+    thresholds = sorted(set(args.thresholds) | {LOCAL_ESCALATION_THRESHOLD})
+    for threshold in thresholds:
+        stats = evaluate(scored, threshold)
+        recall = "-" if stats["recall"] is None else f"{stats['recall']:.1%}"
+        false_rate = stats["false_escalation_rate"]
+        false_rate = "-" if false_rate is None else f"{false_rate:.1%}"
+        mark = "  <- 当前配置" if threshold == LOCAL_ESCALATION_THRESHOLD else ""
+        print(
+            f"阈值 {threshold:.2f}: 上送率 {stats['escalation_rate']:.1%}, "
+            f"召回率 {recall}, 非负面消息上送率 {false_rate}{mark}"
+        )
+
+    missed = evaluate(scored, LOCAL_ESCALATION_THRESHOLD)["missed"]
+    if missed:
+        print("当前配置下未上送的负面消息：")
+        for text, _, score in missed:
+            print(f"  {score:.2f}  {text}")
+
+
+if __name__ == "__main__":
+    main()
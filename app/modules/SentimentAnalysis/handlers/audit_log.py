@@ -0,0 +1,222 @@
+"""
+情绪分析审计日志
+
+每条分析结果记录为一行 JSON（JSONL），按天写入 DATA_DIR/logs/sentiment_YYYY-MM-DD.jsonl：
+- 写入只追加到内存缓冲区，缓冲区达到 AUDIT_LOG_FLUSH_SIZE 条或距上次写入超过
+  AUDIT_LOG_FLUSH_INTERVAL 秒时，在线程池中批量写入文件，不阻塞事件循环
+- 日期变化后，之前的日志文件压缩为 .jsonl.gz，超过 AUDIT_LOG_RETENTION_DAYS 天的文件被删除
+- 进程退出时写入缓冲区中剩余的记录
+- query_negative_rate 逐行读取指定天数内的日志统计各群的负面消息占比，不会一次性加载整个文件
+
+记录字段：
+    ts          时间戳（秒）
+    group_id    群号
+    user_id     用户QQ号
+    user_name   用户名
+    text        消息内容
+    stage       判定阶段：local（本地预筛）、remote（远程模型）、skip（空消息）
+    verdict     判定结果：negative、non_negative、error
+    confidence  远程模型给出的置信度
+    local_score 本地预筛得分
+    error       错误信息
+"""
+
+import os
+import gzip
+import json
+import time
+import atexit
+import shutil
+import asyncio
+import threading
+from datetime import date, datetime, timedelta
+from logger import logger
+from ..config import (
+    AUDIT_LOG_FLUSH_SIZE,
+    AUDIT_LOG_FLUSH_INTERVAL,
+    AUDIT_LOG_RETENTION_DAYS,
+)
+from .. import DATA_DIR
+
+LOG_DIR = os.path.join(DATA_DIR, "logs")
+LOG_PREFIX = "sentiment_"
+
+
+def _log_path(day, compressed=False):
+    suffix = ".jsonl.gz" if compressed else ".jsonl"
+    return os.path.join(LOG_DIR, f"{LOG_PREFIX}{day.isoformat()}{suffix}")
+
+
+def _parse_day(file_name):
+    """从日志文件名中解析日期，不是日志文件时返回None"""
+    if not file_name.startswith(LOG_PREFIX):
+        return None
+    day = file_name[len(LOG_PREFIX) :].split(".", 1)[0]
+    try:
+        return date.fromisoformat(day)
+    except ValueError:
+        return None
+
+
+class SentimentAuditLog:
+    """缓冲写入的审计日志，写入线程与事件循环通过锁交换缓冲区"""
+
+    def __init__(self):
+        self._buffer = []
+        self._lock = threading.Lock()
+        # 保证同一时间只有一个线程写文件
+        self._write_lock = threading.Lock()
+        self._flush_task = None
+        self._flush_loop = None
+        self._current_day = None
+        atexit.register(self.flush)
+
+    def write(self, **fields):
+        """
+        记录一条分析结果
+
+        Args:
+            **fields: 记录字段，见模块说明，ts 缺省时使用当前时间
+        """
+        fields.setdefault("ts", time.time())
+        with self._lock:
+            self._buffer.append(fields)
+            size = len(self._buffer)
+        self._ensure_flush_task()
+        if size >= AUDIT_LOG_FLUSH_SIZE:
+            self._flush_in_background()
+
+    def _ensure_flush_task(self):
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if (
+            self._flush_task is None
+            or self._flush_task.done()
+            or self._flush_loop is not loop
+        ):
+            self._flush_loop = loop
+            self._flush_task = loop.create_task(
+                self._flush_periodically(), name="sentiment-audit-log"
+            )
+
+    def _flush_in_background(self):
+        try:
+            asyncio.get_running_loop().run_in_executor(None, self.flush)
+        except RuntimeError:
+            self.flush()
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(AUDIT_LOG_FLUSH_INTERVAL)
+            if self._buffer:
+                await asyncio.get_running_loop().run_in_executor(None, self.flush)
+
+    def flush(self):
+        """把缓冲区中的记录写入文件（同步执行，应在线程池中调用）"""
+        # 在写锁内交换缓冲区，先取出的记录一定先写入，轮转后不会再有旧记录写入
+        with self._write_lock:
+            with self._lock:
+                entries, self._buffer = self._buffer, []
+            if not entries:
+                return
+            try:
+                os.makedirs(LOG_DIR, exist_ok=True)
+                # 按记录所属日期分组，跨零点的缓冲区写入各自的文件
+                lines_by_day = {}
+                for entry in entries:
+                    day = datetime.fromtimestamp(entry["ts"]).date()
+                    lines_by_day.setdefault(day, []).append(
+                        json.dumps(entry, ensure_ascii=False)
+                    )
+                for day, lines in lines_by_day.items():
+                    with open(_log_path(day), "a", encoding="utf-8") as f:
+                        f.write("\n".join(lines) + "\n")
+
+                today = max(lines_by_day)
+                if self._current_day is not None:
+                    today = max(today, self._current_day)
+                # 日期变化，或写入了之前日期的记录（跨零点的缓冲区）时，压缩之前的日志文件
+                if self._current_day != today or min(lines_by_day) < today:
+                    self._current_day = today
+                    self._rotate(today)
+            except Exception as e:
+                logger.error(f"[SentimentAnalysis] 写入审计日志失败: {e}")
+
+    def _rotate(self, today):
+        """压缩今天之前的日志文件，删除超过保留天数的文件"""
+        expire_day = today - timedelta(days=AUDIT_LOG_RETENTION_DAYS)
+        for file_name in os.listdir(LOG_DIR):
+            day = _parse_day(file_name)
+            if day is None or day >= today:
+                continue
+            path = os.path.join(LOG_DIR, file_name)
+            if day < expire_day:
+                os.remove(path)
+            elif file_name.endswith(".jsonl"):
+                with open(path, "rb") as src, gzip.open(
+                    _log_path(day, compressed=True), "ab"
+                ) as dst:
+                    shutil.copyfileobj(src, dst)
+                os.remove(path)
+
+
+def iter_entries(days=7):
+    """
+    逐行读取最近若干天的日志记录（包括已压缩的文件）
+
+    Args:
+        days (int): 天数，包括今天
+
+    Yields:
+        dict: 日志记录
+    """
+    if not os.path.isdir(LOG_DIR):
+        return
+    first_day = date.today() - timedelta(days=days - 1)
+    for file_name in sorted(os.listdir(LOG_DIR)):
+        day = _parse_day(file_name)
+        if day is None or day < first_day:
+            continue
+        path = os.path.join(LOG_DIR, file_name)
+        opener = gzip.open if file_name.endswith(".gz") else open
+        with opener(path, "rt", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    # 进程异常退出时最后一行可能不完整
+                    continue
+
+
+def query_negative_rate(group_id=None, days=7):
+    """
+    统计最近若干天各群的负面消息占比（同步读取文件，在事件循环中应通过线程池调用）
+
+    Args:
+        group_id: 群号，为None时统计所有群
+        days (int): 天数，包括今天
+
+    Returns:
+        dict: 群号 -> {"total": 分析的消息数, "negative": 负面消息数, "rate": 负面占比}
+    """
+    audit_log.flush()
+    stats = {}
+    for entry in iter_entries(days):
+        entry_group = str(entry.get("group_id"))
+        if group_id is not None and entry_group != str(group_id):
+            continue
+        if entry.get("verdict") not in ("negative", "non_negative"):
+            continue
+        group_stats = stats.setdefault(entry_group, {"total": 0, "negative": 0})
+        group_stats["total"] += 1
+        if entry["verdict"] == "negative":
+            group_stats["negative"] += 1
+    for group_stats in stats.values():
+        group_stats["rate"] = group_stats["negative"] / group_stats["total"]
+    return stats
+
+
+# 全局审计日志
+audit_log = SentimentAuditLog()
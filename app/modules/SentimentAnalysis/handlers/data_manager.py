@@ -10,6 +10,9 @@ class SentimentDataManager:
 
     CONFIG_FILE = "config.json"
 
+    # 配置在进程内共享：首次使用时读取文件，之后每条消息不再读取，修改时写回文件
+    _shared_config = None
+
     def __init__(self, group_id):
         self.group_id = str(group_id)
         self.config_path = os.path.join(DATA_DIR, self.CONFIG_FILE)
@@ -17,20 +20,25 @@ class SentimentDataManager:
 
     def _load_config(self):
         """
-        加载配置文件
+        加载配置文件（已加载时直接返回共享的配置）
         """
+        if SentimentDataManager._shared_config is not None:
+            return SentimentDataManager._shared_config
+
         if os.path.exists(self.config_path):
             with open(self.config_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+                config = json.load(f)
         else:
             # 默认配置
-            return {
+            config = {
                 "global": {
                     "enabled": True,
                     "threshold": 0.7
                 },
                 "groups": {}
             }
+        SentimentDataManager._shared_config = config
+        return config
 
     def _save_config(self):
         """
@@ -0,0 +1,85 @@
+"""
+本地负面情绪预筛
+
+远程模型调用前的第一阶段：用 jieba 分词后按情绪词典打分，得分低于 LOCAL_ESCALATION_THRESHOLD 的消息
+直接判定为非负面，不再调用远程模型；得分达到阈值的消息（可能负面或无法确定）交给远程模型判定。
+本地阶段只负责放行，不会单独把消息判定为负面，撤回等处理仍以远程模型结果为准。
+放行默认关闭（LOCAL_PREFILTER_ENABLED），以影子模式运行：只计算得分写入审计日志，消息仍全部上送，
+用线上数据评估召回率后再开启。
+
+使用独立的 jieba.Tokenizer 并加载情绪词，不影响其他模块（如 FAQ 匹配）使用的默认分词词典；
+首次分词需加载词典（约1秒），调用方应在线程池中执行。
+"""
+
+import math
+import threading
+import jieba
+from .sentiment_lexicon import (
+    NEGATIVE_WORDS,
+    NEGATORS,
+    INTENSIFIERS,
+    EMPHATIC_PUNCTUATION,
+)
+
+# 否定词后负面词的权重系数
+NEGATION_FACTOR = 0.2
+
+# 程度副词后负面词的权重系数
+INTENSIFIER_FACTOR = 1.5
+
+# 情绪激动的标点附加的权重
+PUNCTUATION_WEIGHT = 0.15
+
+_tokenizer = None
+_tokenizer_lock = threading.Lock()
+
+
+def _get_tokenizer():
+    global _tokenizer
+    if _tokenizer is None:
+        with _tokenizer_lock:
+            if _tokenizer is None:
+                tokenizer = jieba.Tokenizer()
+                for word in NEGATIVE_WORDS:
+                    tokenizer.add_word(word, freq=100000)
+                for word in NEGATORS | INTENSIFIERS:
+                    tokenizer.add_word(word)
+                _tokenizer = tokenizer
+    return _tokenizer
+
+
+def score_negativity(text):
+    """
+    计算消息的负面得分
+
+    Args:
+        text (str): 消息文本
+
+    Returns:
+        float: 0-1 之间的负面得分，越大越可能是负面情绪
+    """
+    if not text:
+        return 0.0
+    text = text.lower()
+
+    total = 0.0
+    previous = []
+    # 关闭 HMM 新词发现，避免负面词与相邻字被合并成未登录词（如“分太坑”）
+    for token in _get_tokenizer().lcut(text, HMM=False):
+        token = token.strip()
+        if not token:
+            continue
+        weight = NEGATIVE_WORDS.get(token)
+        if weight is not None:
+            if any(word in NEGATORS for word in previous[-2:]):
+                weight *= NEGATION_FACTOR
+            elif previous and previous[-1] in INTENSIFIERS:
+                weight *= INTENSIFIER_FACTOR
+            total += weight
+        previous.append(token)
+
+    if any(mark in text for mark in EMPHATIC_PUNCTUATION):
+        total += PUNCTUATION_WEIGHT
+
+    # 映射到 0-1：单个强负面词约 0.63，单个弱负面词约 0.30
+    return 1 - math.exp(-total)
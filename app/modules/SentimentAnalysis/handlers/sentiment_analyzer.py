@@ -1,48 +1,59 @@
-import aiohttp
+from core.http_client import http_post
 import asyncio
-import os
-from datetime import datetime
 from logger import logger
 from ..config import (
     SIJI_BASE_URL,
     SIJI_API_KEY,
     SIJI_MODEL_NAME,
     NEGATIVE_SENTIMENT_THRESHOLD,
-    REQUEST_TIMEOUT
+    REQUEST_TIMEOUT,
+    LOCAL_PREFILTER_ENABLED,
+    LOCAL_PREFILTER_SHADOW,
+    LOCAL_ESCALATION_THRESHOLD,
 )
-from .. import DATA_DIR
 from .data_manager import SentimentDataManager
+from .local_scorer import score_negativity
+from .audit_log import audit_log
 
 
 class SentimentAnalyzer:
     """
     情绪分析器，用于调用硅基流动API进行情绪分析
+    消息先经过本地预筛（见 local_scorer），启用放行时只有可能为负面的消息才调用远程API；
+    影子模式下只计算并记录本地得分，所有消息仍调用远程API
     """
+
+    # 本地预筛统计（进程内所有实例共享）
+    local_passed_count = 0
+    escalated_count = 0
+    # 影子模式下本地得分低于阈值（启用放行时会被放行）的消息数，及其中远程判定为负面的数量
+    shadow_passed_count = 0
+    shadow_missed_count = 0
     
     def __init__(self):
         self.base_url = SIJI_BASE_URL
         self.api_key = SIJI_API_KEY
         self.model_name = SIJI_MODEL_NAME
         self.timeout = REQUEST_TIMEOUT
-        # 创建日志文件路径
-        self.log_file = os.path.join(DATA_DIR, "sentiment_analysis_log.txt")
 
-    def _write_log(self, log_entry):
+    def _write_log(self, group_id, user_id, user_name, text, **fields):
         """
-        将分析结果写入日志文件
+        将分析结果写入审计日志（缓冲写入，不阻塞事件循环）
         
         Args:
-            log_entry (str): 日志条目
+            group_id: 群号
+            user_id: 用户ID
+            user_name: 用户名
+            text (str): 消息内容
+            **fields: 其他记录字段（stage、verdict、confidence 等），见 audit_log
         """
-        try:
-            # 确保目录存在
-            os.makedirs(os.path.dirname(self.log_file), exist_ok=True)
-            
-            # 写入日志文件，追加模式
-            with open(self.log_file, "a", encoding="utf-8") as f:
-                f.write(f"{datetime.now().strftime('%Y-%m-%d %H:%M:%S')} - {log_entry}\n")
-        except Exception as e:
-            logger.error(f"[SentimentAnalysis] 写入日志文件失败: {e}")
+        audit_log.write(
+            group_id=group_id,
+            user_id=user_id,
+            user_name=user_name,
+            text=text,
+            **fields
+        )
 
     async def analyze_sentiment(self, text, group_id=None, user_id=None, user_name=None):
         """
@@ -69,10 +80,36 @@ class SentimentAnalyzer:
                 "details": {}
             }
             # 记录日志
-            log_entry = f"群 {group_id} 用户 {user_id}({user_name}): '{text}' - 空消息或无效消息"
-            self._write_log(log_entry)
+            self._write_log(group_id, user_id, user_name, text, stage="skip", verdict="non_negative")
             return result
 
+        # 本地预筛：启用放行时得分低于阈值的消息直接判定为非负面，不调用远程API；
+        # 影子模式下只记录得分
+        local_score = None
+        shadow_passed = False
+        if LOCAL_PREFILTER_ENABLED or LOCAL_PREFILTER_SHADOW:
+            local_score = await asyncio.get_running_loop().run_in_executor(
+                None, score_negativity, text
+            )
+            below_threshold = local_score < LOCAL_ESCALATION_THRESHOLD
+            if not LOCAL_PREFILTER_ENABLED:
+                shadow_passed = below_threshold
+                if shadow_passed:
+                    SentimentAnalyzer.shadow_passed_count += 1
+            elif below_threshold:
+                SentimentAnalyzer.local_passed_count += 1
+                self._write_log(
+                    group_id, user_id, user_name, text,
+                    stage="local", verdict="non_negative", local_score=round(local_score, 3)
+                )
+                return {
+                    "is_negative": False,
+                    "confidence": 0.0,
+                    "details": {"local_score": local_score}
+                }
+            else:
+                SentimentAnalyzer.escalated_count += 1
+
         try:
             # 构建请求URL (使用聊天补全API而不是预测API)
             url = f"{self.base_url}/chat/completions"
@@ -100,46 +137,59 @@ class SentimentAnalyzer:
                 "max_tokens": 50
             }
             
-            # 创建异步HTTP客户端
-            timeout = aiohttp.ClientTimeout(total=self.timeout)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                # 发送POST请求
-                async with session.post(url, headers=headers, json=payload) as response:
-                    if response.status == 200:
-                        result = await response.json()
+            # 发送POST请求（共享连接池）
+            async with http_post(
+                url, headers=headers, json=payload, timeout=self.timeout
+            ) as response:
+                if response.status == 200:
+                    result = await response.json()
                         
-                        # 获取阈值
-                        data_manager = SentimentDataManager(group_id)
-                        threshold = data_manager.get_threshold(group_id)
+                    # 获取阈值
+                    data_manager = SentimentDataManager(group_id)
+                    threshold = data_manager.get_threshold(group_id)
                         
-                        # 解析结果
-                        sentiment_result = self._parse_sentiment_result(result, threshold)
+                    # 解析结果
+                    sentiment_result = self._parse_sentiment_result(result, threshold)
+                    if shadow_passed and sentiment_result["is_negative"]:
+                        SentimentAnalyzer.shadow_missed_count += 1
+                        logger.info(
+                            f"[SentimentAnalysis] 本地预筛影子模式漏报（得分 {local_score:.2f}）: {text}"
+                        )
                         
-                        # 记录日志
-                        log_entry = f"群 {group_id} 用户 {user_id}({user_name}): '{text}' - 情绪: {'负面' if sentiment_result['is_negative'] else '非负面'}, 置信度: {sentiment_result['confidence']:.2f}"
-                        self._write_log(log_entry)
+                    # 记录日志
+                    self._write_log(
+                        group_id, user_id, user_name, text,
+                        stage="remote",
+                        verdict="negative" if sentiment_result["is_negative"] else "non_negative",
+                        confidence=sentiment_result["confidence"],
+                        local_score=round(local_score, 3) if local_score is not None else None
+                    )
                         
-                        return sentiment_result
-                    else:
-                        error_text = await response.text()
-                        logger.error(f"[SentimentAnalysis] API请求失败: {response.status} - {error_text}")
+                    return sentiment_result
+                else:
+                    error_text = await response.text()
+                    logger.error(f"[SentimentAnalysis] API请求失败: {response.status} - {error_text}")
                         
-                        # 记录错误日志
-                        log_entry = f"群 {group_id} 用户 {user_id}({user_name}): '{text}' - API请求失败: {response.status}"
-                        self._write_log(log_entry)
+                    # 记录错误日志
+                    self._write_log(
+                        group_id, user_id, user_name, text,
+                        stage="remote", verdict="error", error=f"API请求失败: {response.status}"
+                    )
                         
-                        return {
-                            "is_negative": False,
-                            "confidence": 0.0,
-                            "details": {"error": f"API请求失败: {response.status}"}
-                        }
+                    return {
+                        "is_negative": False,
+                        "confidence": 0.0,
+                        "details": {"error": f"API请求失败: {response.status}"}
+                    }
                         
         except asyncio.TimeoutError:
             logger.error(f"[SentimentAnalysis] API请求超时: {text}")
             
             # 记录超时日志
-            log_entry = f"群 {group_id} 用户 {user_id}({user_name}): '{text}' - API请求超时"
-            self._write_log(log_entry)
+            self._write_log(
+                group_id, user_id, user_name, text,
+                stage="remote", verdict="error", error="API请求超时"
+            )
             
             return {
                 "is_negative": False,
@@ -150,8 +200,10 @@ class SentimentAnalyzer:
             logger.error(f"[SentimentAnalysis] 情绪分析异常: {e}")
             
             # 记录异常日志
-            log_entry = f"群 {group_id} 用户 {user_id}({user_name}): '{text}' - 情绪分析异常: {str(e)}"
-            self._write_log(log_entry)
+            self._write_log(
+                group_id, user_id, user_name, text,
+                stage="remote", verdict="error", error=f"情绪分析异常: {str(e)}"
+            )
             
             return {
                 "is_negative": False,
@@ -234,4 +286,21 @@ class SentimentAnalyzer:
                 "is_negative": False,
                 "confidence": 0.0,
                 "details": {"error": str(e), "raw_result": api_result}
-            }
\ No newline at end of file
+            }
+
+    @classmethod
+    def get_prefilter_stats(cls):
+        """
+        获取本地预筛统计信息
+
+        Returns:
+            dict: 本地放行数、上送远程数、上送率、影子模式下会被放行的消息数及其中的漏报数
+        """
+        total = cls.local_passed_count + cls.escalated_count
+        return {
+            "local_passed": cls.local_passed_count,
+            "escalated": cls.escalated_count,
+            "escalation_rate": cls.escalated_count / total if total else 0.0,
+            "shadow_passed": cls.shadow_passed_count,
+            "shadow_missed": cls.shadow_missed_count,
+        }
@@ -0,0 +1,137 @@
+"""
+本地预筛使用的情绪词典
+
+NEGATIVE_WORDS 的权重表示该词单独出现时的负面程度：
+- 1.0：辱骂、脏话、极端表达，基本可以确定需要远程模型判定
+- 0.6：明显的不满、投诉、维权类表达
+- 0.35：较弱的负面情绪，常见于正常吐槽，需与其他信号叠加才会上送
+"""
+
+NEGATIVE_WORDS = {
+    # 辱骂、脏话
+    "傻逼": 1.0,
+    "傻b": 1.0,
+    "煞笔": 1.0,
+    "沙比": 1.0,
+    "sb": 1.0,
+    "智障": 1.0,
+    "脑残": 1.0,
+    "弱智": 1.0,
+    "废物": 1.0,
+    "垃圾": 1.0,
+    "辣鸡": 1.0,
+    "狗东西": 1.0,
+    "畜生": 1.0,
+    "贱人": 1.0,
+    "滚": 1.0,
+    "滚蛋": 1.0,
+    "去死": 1.0,
+    "死全家": 1.0,
+    "妈的": 1.0,
+    "他妈": 1.0,
+    "他妈的": 1.0,
+    "tmd": 1.0,
+    "尼玛": 1.0,
+    "nmsl": 1.0,
+    "cnm": 1.0,
+    "操你": 1.0,
+    "草泥马": 1.0,
+    "fuck": 1.0,
+    "shit": 1.0,
+    "有病": 1.0,
+    "神经病": 1.0,
+    "恶心": 1.0,
+    "恶心人": 1.0,
+    "不要脸": 1.0,
+    "黑心": 1.0,
+    "骗子": 1.0,
+    "人渣": 1.0,
+    "混蛋": 1.0,
+    "王八蛋": 1.0,
+    "狗屎": 1.0,
+    "贱": 1.0,
+    "脑子有问题": 1.0,
+    "脑子有病": 1.0,
+    "脑子进水": 1.0,
+    "没脑子": 1.0,
+    "是个什么东西": 1.0,
+    "算什么东西": 1.0,
+    "去你的": 1.0,
+    # 极端表达
+    "想死": 1.0,
+    "不想活": 1.0,
+    "自杀": 1.0,
+    "跳楼": 1.0,
+    "杀了": 1.0,
+    "恨死": 1.0,
+    "憎恨": 1.0,
+    # 不满、投诉、维权
+    "投诉": 0.6,
+    "举报": 0.6,
+    "曝光": 0.6,
+    "维权": 0.6,
+    "抗议": 0.6,
+    "退钱": 0.6,
+    "退费": 0.6,
+    "乱收费": 0.6,
+    "割韭菜": 0.6,
+    "欺骗": 0.6,
+    "骗钱": 0.6,
+    "坑人": 0.6,
+    "压榨": 0.6,
+    "形式主义": 0.6,
+    "不公平": 0.6,
+    "太差": 0.6,
+    "差劲": 0.6,
+    "烂透": 0.6,
+    "什么玩意": 0.6,
+    "离谱": 0.6,
+    "气死": 0.6,
+    "愤怒": 0.6,
+    "讨厌": 0.6,
+    "恨": 0.6,
+    "可恶": 0.6,
+    "什么东西": 0.6,
+    "烦死": 0.6,
+    "受够": 0.6,
+    "绝望": 0.6,
+    "崩溃": 0.6,
+    "抑郁": 0.6,
+    "痛苦": 0.6,
+    "卧槽": 0.6,
+    "我靠": 0.6,
+    "靠": 0.6,
+    "草": 0.6,
+    "wtf": 0.6,
+    "屎": 0.6,
+    # 较弱的负面情绪
+    "失望": 0.35,
+    "无语": 0.35,
+    "难受": 0.35,
+    "伤心": 0.35,
+    "郁闷": 0.35,
+    "烦": 0.35,
+    "坑": 0.35,
+    "差": 0.35,
+    "烂": 0.35,
+    "难吃": 0.35,
+    "不好": 0.35,
+    "服了": 0.35,
+    "吐了": 0.35,
+    "醉了": 0.35,
+    "凭什么": 0.35,
+    "破": 0.35,
+    "浪费时间": 0.35,
+    "停水": 0.35,
+    "停电": 0.35,
+    "断网": 0.35,
+}
+
+# 否定词：出现在负面词前时大幅减弱负面程度（如“不难受”）
+NEGATORS = {"不", "没", "没有", "别", "不是", "无", "不会", "不太"}
+
+# 程度副词：出现在负面词前时加强负面程度（如“太恶心”）
+INTENSIFIERS = {"太", "很", "非常", "特别", "真", "真的", "超", "巨", "贼", "好", "最", "极其"}
+
+# 连续出现时视为情绪激动的标点
+EMPHATIC_PUNCTUATION = ("!!", "！！", "??", "？？", "?!", "？！")
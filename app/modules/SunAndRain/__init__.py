@@ -13,6 +13,9 @@ SWITCH_NAME = "sar"
 # 模块描述
 MODULE_DESCRIPTION = "阳光和雨露，新生军训特色文字游戏（按年份存储数据）"
 
+# 模块订阅的事件类型
+EVENT_KINDS = ["message", "notice"]
+
 # 数据目录
 DATA_DIR = os.path.join("data", MODULE_NAME)
 os.makedirs(DATA_DIR, exist_ok=True)
@@ -1,3 +1,4 @@
+from core.db_pool import run_schema_once
 from .database_base import DatabaseBase
 from ... import CONSECUTIVE_BONUS_CONFIG
 
@@ -7,7 +8,7 @@ class CheckinRecordsHandler(DatabaseBase):
 
     def __init__(self, year=None):
         super().__init__(year)
-        self._create_checkin_records_table()
+        run_schema_once(self.db_path, self._create_checkin_records_table)
 
     def _create_checkin_records_table(self):
         """创建签到记录表 checkin_records"""
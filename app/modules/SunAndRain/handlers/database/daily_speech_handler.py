@@ -1,3 +1,4 @@
+from core.db_pool import run_schema_once
 from .database_base import DatabaseBase
 from datetime import datetime, timezone, timedelta
 
@@ -7,7 +8,7 @@ class DailySpeechHandler(DatabaseBase):
 
     def __init__(self, year=None):
         super().__init__(year)
-        self._create_daily_speech_table()
+        run_schema_once(self.db_path, self._create_daily_speech_table)
 
     def _create_daily_speech_table(self):
         """创建每日发言统计表 daily_speech_stats"""
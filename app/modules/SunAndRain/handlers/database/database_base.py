@@ -1,6 +1,6 @@
-import sqlite3
 import os
 from datetime import datetime
+from core.db_pool import get_connection
 from ... import MODULE_NAME
 
 
@@ -18,14 +18,14 @@ class DatabaseBase:
         db_filename = f"sar_{self.year}.db"
         self.db_path = os.path.join(self.data_dir, db_filename)
 
-        self.conn = sqlite3.connect(self.db_path)
+        self.conn = get_connection(self.db_path)
         self.cursor = self.conn.cursor()
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.conn.close()
+        self.cursor.close()
 
     def create_table(self, table_name, table_schema):
         """创建表的通用方法"""
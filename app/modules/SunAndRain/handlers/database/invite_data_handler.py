@@ -1,3 +1,4 @@
+from core.db_pool import run_schema_once
 from .database_base import DatabaseBase
 from datetime import datetime
 
@@ -7,7 +8,7 @@ class InviteDataHandler(DatabaseBase):
 
     def __init__(self, year=None):
         super().__init__(year)
-        self._create_invite_data_table()
+        run_schema_once(self.db_path, self._create_invite_data_table)
 
     def _create_invite_data_table(self):
         """创建邀请数据表 invite_data"""
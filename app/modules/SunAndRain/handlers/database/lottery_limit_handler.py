@@ -1,5 +1,6 @@
 import sqlite3
 from datetime import datetime, timedelta
+from core.db_pool import run_schema_once
 from .database_base import DatabaseBase
 
 
@@ -8,8 +9,8 @@ class LotteryLimitHandler(DatabaseBase):
 
     def __init__(self, year=None):
         super().__init__(year)
-        self._create_lottery_limit_table()
-        self._create_daily_lottery_table()
+        run_schema_once(self.db_path, self._create_lottery_limit_table)
+        run_schema_once(self.db_path, self._create_daily_lottery_table)
 
     def _create_lottery_limit_table(self):
         """创建抽奖限制表"""
@@ -1,3 +1,4 @@
+from core.db_pool import run_schema_once
 from .database_base import DatabaseBase
 
 
@@ -6,7 +7,7 @@ class UserCheckinHandler(DatabaseBase):
 
     def __init__(self, year=None):
         super().__init__(year)
-        self._create_user_checkin_table()
+        run_schema_once(self.db_path, self._create_user_checkin_table)
 
     def _create_user_checkin_table(self):
         """创建用户基本信息表 user_checkin"""
@@ -27,6 +27,7 @@ from api.message import send_group_msg
 from utils.generate import generate_text_message, generate_reply_message
 from datetime import datetime
 from .database.data_manager import DataManager
+from core.async_db import get_async_db
 from core.menu_manager import MenuManager
 import random
 
@@ -95,8 +96,11 @@ class GroupMessageHandler:
         try:
             if self.raw_message.startswith(SIGN_IN_COMMAND):
                 with DataManager() as dm:
+                    db = get_async_db(dm.db_path)
                     # 首先检查用户是否已经选择了类型
-                    user_info = dm.get_user_info(self.group_id, self.user_id)
+                    user_info = await db.run_manager(
+                        DataManager, "get_user_info", self.group_id, self.user_id
+                    )
 
                     if user_info["code"] != 200 or not user_info["data"]:
                         # 用户没有选择类型
@@ -123,7 +127,13 @@ class GroupMessageHandler:
                     user_type = user_info["data"][0][3]  # type字段
 
                     # 执行签到
-                    result = dm.daily_checkin(self.group_id, self.user_id, user_type)
+                    result = await db.run_manager(
+                        DataManager,
+                        "daily_checkin",
+                        self.group_id,
+                        self.user_id,
+                        user_type,
+                    )
                     await send_group_msg(
                         self.websocket,
                         self.group_id,
@@ -13,6 +13,16 @@ SWITCH_NAME = "tp"
 # 模块描述
 MODULE_DESCRIPTION = "模板模块"
 
+# 模块订阅的事件类型，事件分发器只会把匹配的事件交给本模块，未声明时订阅所有事件
+# 可选：message、message.group、notice、notice.group_increase、request、
+# meta_event、meta_event.heartbeat、response（所有回应）、response:<echo前缀>
+# 请按模块实际处理的事件删减，以减少无关事件的唤醒
+EVENT_KINDS = ["message", "notice", "request", "meta_event", "response"]
+
+# 模块任务的优先级通道：high（群管、风控类）、normal（默认）、low（娱乐类）
+# 消息风暴时高优先级任务先处理，队列满时先丢弃低优先级任务
+EVENT_PRIORITY = "normal"
+
 # 数据目录
 DATA_DIR = os.path.join("data", MODULE_NAME)
 os.makedirs(DATA_DIR, exist_ok=True)
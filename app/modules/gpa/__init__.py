@@ -13,6 +13,9 @@ SWITCH_NAME = "gpa"
 # 模块描述
 MODULE_DESCRIPTION = "绩点查询模块，支持查询绩点百分位排名"
 
+# 模块订阅的事件类型
+EVENT_KINDS = ["message"]
+
 # 数据目录
 DATA_DIR = os.path.join("data", MODULE_NAME)
 os.makedirs(DATA_DIR, exist_ok=True)
@@ -15,20 +15,21 @@ import sqlite3
 import os
 import math
 from typing import Optional, List, Dict, Any
+from core.db_pool import get_connection
 
 
 class DataManager:
     """
     GPA 数据库管理类
 
-    支持上下文管理器协议，自动处理连接的创建和关闭。
+    支持上下文管理器协议，连接由连接池复用，退出时关闭游标。
     """
 
     def __init__(self):
         """初始化数据库连接"""
         # 数据库文件路径在模块目录下
         self.db_path = os.path.join(os.path.dirname(__file__), "..", "gpa_ranking.db")
-        self.conn = sqlite3.connect(self.db_path)
+        self.conn = get_connection(self.db_path, read_only=True)
         self.conn.row_factory = sqlite3.Row
         self.cursor = self.conn.cursor()
 
@@ -37,8 +38,8 @@ class DataManager:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """退出上下文：关闭连接"""
-        self.conn.close()
+        """退出上下文：关闭游标"""
+        self.cursor.close()
         return False
 
     def find_class_by_fuzzy_name(self, fuzzy_name: str) -> List[str]:
@@ -13,6 +13,9 @@ SWITCH_NAME = "qfnukjs"
 # 模块描述
 MODULE_DESCRIPTION = "曲阜师范大学空教室查询模块，群消息包含“空教室”时自动调用 AI 查询接口"
 
+# 模块订阅的事件类型
+EVENT_KINDS = ["message", "meta_event", "response:send_group_msg"]
+
 # 数据目录
 DATA_DIR = os.path.join("data", MODULE_NAME)
 os.makedirs(DATA_DIR, exist_ok=True)
@@ -1,10 +1,9 @@
 import json
 import os
 
-import aiohttp
-
 from .. import MODULE_NAME
 from logger import logger
+from core.http_client import http_post
 from .scheduled_config import get_api_key
 
 
@@ -137,26 +136,25 @@ def extract_classrooms(data):
 async def query_empty_classroom_data(text):
     headers = get_request_headers()
     payload = {"text": text}
-    timeout = aiohttp.ClientTimeout(total=QUERY_TIMEOUT_SECONDS)
-
-    async with aiohttp.ClientSession(timeout=timeout) as session:
-        async with session.post(
-            f"{BASE_URL}/api/v1/open/ai-query",
-            json=payload,
-            headers=headers,
-        ) as response:
-            response_text = await response.text()
-            if response.status >= 400:
-                logger.error(
-                    f"[{MODULE_NAME}]空教室查询接口返回异常: "
-                    f"status={response.status}, body={response_text[:500]}"
-                )
-                raise RuntimeError("空教室查询失败，请稍后再试。")
-
-            try:
-                return json.loads(response_text)
-            except json.JSONDecodeError:
-                return response_text
+
+    async with http_post(
+        f"{BASE_URL}/api/v1/open/ai-query",
+        json=payload,
+        headers=headers,
+        timeout=QUERY_TIMEOUT_SECONDS,
+    ) as response:
+        response_text = await response.text()
+        if response.status >= 400:
+            logger.error(
+                f"[{MODULE_NAME}]空教室查询接口返回异常: "
+                f"status={response.status}, body={response_text[:500]}"
+            )
+            raise RuntimeError("空教室查询失败，请稍后再试。")
+
+        try:
+            return json.loads(response_text)
+        except json.JSONDecodeError:
+            return response_text
 
 
 async def query_empty_classroom_direct(building, start_node, end_node, date_offset=0):
@@ -167,26 +165,25 @@ async def query_empty_classroom_direct(building, start_node, end_node, date_offs
         "start_node": start_node,
         "end_node": end_node,
     }
-    timeout = aiohttp.ClientTimeout(total=QUERY_TIMEOUT_SECONDS)
-
-    async with aiohttp.ClientSession(timeout=timeout) as session:
-        async with session.post(
-            f"{BASE_URL}/api/v1/open/query",
-            json=payload,
-            headers=headers,
-        ) as response:
-            response_text = await response.text()
-            if response.status >= 400:
-                logger.error(
-                    f"[{MODULE_NAME}]空教室直接查询接口返回异常: "
-                    f"status={response.status}, body={response_text[:500]}"
-                )
-                raise RuntimeError("空教室查询失败，请稍后再试。")
-
-            try:
-                return json.loads(response_text)
-            except json.JSONDecodeError:
-                return response_text
+
+    async with http_post(
+        f"{BASE_URL}/api/v1/open/query",
+        json=payload,
+        headers=headers,
+        timeout=QUERY_TIMEOUT_SECONDS,
+    ) as response:
+        response_text = await response.text()
+        if response.status >= 400:
+            logger.error(
+                f"[{MODULE_NAME}]空教室直接查询接口返回异常: "
+                f"status={response.status}, body={response_text[:500]}"
+            )
+            raise RuntimeError("空教室查询失败，请稍后再试。")
+
+        try:
+            return json.loads(response_text)
+        except json.JSONDecodeError:
+            return response_text
 
 
 async def query_empty_classroom_text(text):
@@ -13,6 +13,9 @@ SWITCH_NAME = "xmg"
 # 模块描述
 MODULE_DESCRIPTION = "王者荣耀小马糕收集与高价查询"
 
+# 模块订阅的事件类型
+EVENT_KINDS = ["message", "response:get_msg"]
+
 # 数据目录
 DATA_DIR = os.path.join("data", MODULE_NAME)
 os.makedirs(DATA_DIR, exist_ok=True)
@@ -12,6 +12,7 @@ import sqlite3
 import os
 from datetime import datetime
 from typing import Optional, List, Dict, Any
+from core.db_pool import get_connection, run_schema_once
 from .. import MODULE_NAME
 
 
@@ -19,7 +20,7 @@ class DataManager:
     """
     数据库管理类
 
-    支持上下文管理器协议，自动处理连接的创建、提交和关闭。
+    支持上下文管理器协议，自动处理提交和游标关闭，连接由连接池复用。
     基于 TABLES 定义自动检测并迁移数据库结构。
     """
 
@@ -50,11 +51,11 @@ class DataManager:
         os.makedirs(self.data_dir, exist_ok=True)
 
         self.db_path = os.path.join(self.data_dir, f"{MODULE_NAME}.db")
-        self.conn = sqlite3.connect(self.db_path)
+        self.conn = get_connection(self.db_path)
         self.conn.row_factory = sqlite3.Row
         self.cursor = self.conn.cursor()
 
-        self._auto_migrate()
+        run_schema_once(self.db_path, self._auto_migrate)
 
     def _auto_migrate(self):
         """自动检测并迁移数据库结构"""
@@ -103,14 +104,14 @@ class DataManager:
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
-        """退出上下文：异常时回滚，正常时提交，最后关闭连接"""
+        """退出上下文：异常时回滚，正常时提交，最后关闭游标"""
         try:
             if exc_type is not None:
                 self.conn.rollback()
             else:
                 self.conn.commit()
         finally:
-            self.conn.close()
+            self.cursor.close()
         return False
 
     # ==================== 数据操作方法 ====================
@@ -13,6 +13,9 @@ LOGS_DIR = "logs"
 # 天数
 DAYS = 4
 
+# 订阅的事件类型，借助心跳定时检查
+EVENT_KINDS = ["meta_event.heartbeat"]
+
 
 async def clean_logs(websocket, msg):
     """清理日志"""